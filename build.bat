@@ -5,7 +5,7 @@ Rem the windows installer for Mamba, Mamba 3D and Mamba Realtime
 
 Rem CLEANING
 pushd src\mambaApi\
-python setup_visualcpp_SSE2.py clean -a
+python setup.py clean -a
 popd
 rmdir /Q /S src\mambaApi\dist
 del /Q /F src\mambaApi\python\mambaCore.py
@@ -26,7 +26,7 @@ del /Q /F src\mambaAddons\mamba3D\swig\mamba3DApi_wrap.c
 
 Rem COMPILING Mamba Library
 pushd src\mambaApi\
-python setup_visualcpp_SSE2.py build_ext bdist_wininst --install-script=mamba_post_install.py --bitmap=../../doc/style/mamba_logo.bmp
+python setup.py build_ext bdist_wininst --install-script=mamba_post_install.py --bitmap=../../doc/style/mamba_logo.bmp
 popd
 
 Rem COMPILING Mamba Realtime
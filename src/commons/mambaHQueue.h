@@ -0,0 +1,116 @@
+/**
+ * \file mambaHQueue.h
+ * \date 10-17-2026
+ *
+ * This file contains the hierarchical queue shared by the flooding algorithms
+ * (watershed, basins and hierarchical builds) of the library and of its
+ * addons.
+ *
+ * The copyright license of Mamba is reminded here :
+ *
+ * Copyright (c) <2009>, <Nicolas BEUCHER and ARMINES for the Centre de
+ * Morphologie Mathématique(CMM), common research center to ARMINES and MINES
+ * Paristech>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish,
+ * distribute, sublicense, and/or sell copies of the Software, and to permit
+ * persons to whom the Software is furnished to do so, subject to the following
+ * conditions: The above copyright notice and this permission notice shall be
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright
+ * holders shall not be used in advertising or otherwise to promote the sale,
+ * use or other dealings in this Software without their prior written
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#ifndef MB_hqueueH
+#define MB_hqueueH
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/****************************************/
+/* Includes                             */
+/****************************************/
+#include "mambaCommon.h"
+
+/****************************************/
+/* Defines                              */
+/****************************************/
+
+/** Number of levels of the hierarchical queue */
+#define MB_HQ_LEVELS 256
+
+/** Value used to specify the end of a list of the hierarchical queue */
+#define MB_HQ_END 0xFFFFFFFF
+
+/****************************************/
+/* Structures and Typedef               */
+/****************************************/
+
+/**
+ * Hierarchical queue : one FIFO list per level. The elements of the lists
+ * are the linear indices of the pixels (x + y*width, and + z*width*height for
+ * the 3D images) and the lists are chained through the 'next' array, which
+ * is allocated by the user with one entry per element.
+ */
+typedef struct {
+    /** next element of each element in its list (MB_HQ_END ends the list) */
+    Uint32 *next;
+    /** first element of the list of each level */
+    Uint32 first[MB_HQ_LEVELS];
+    /** last element of the list of each level */
+    Uint32 last[MB_HQ_LEVELS];
+} MB_HQueue;
+
+/****************************************/
+/* functions                            */
+/****************************************/
+
+/**
+ * Empties all the lists of the hierarchical queue.
+ * \param hq the hierarchical queue
+ */
+static INLINE void MB_HQ_Reset(MB_HQueue *hq)
+{
+    int i;
+
+    for (i = 0; i < MB_HQ_LEVELS; i++) {
+        hq->first[i] = MB_HQ_END;
+        hq->last[i] = MB_HQ_END;
+    }
+}
+
+/**
+ * Appends an element at the end of the list of a level.
+ * \param hq the hierarchical queue
+ * \param level the level of the list
+ * \param index the element (linear index of the pixel)
+ */
+static INLINE void MB_HQ_Push(MB_HQueue *hq, Uint32 level, Uint32 index)
+{
+    hq->next[index] = MB_HQ_END;
+    if (hq->last[level]!=MB_HQ_END)
+        hq->next[hq->last[level]] = index;
+    else
+        hq->first[level] = index;
+    hq->last[level] = index;
+}
+
+#ifdef __cplusplus
+}
+#endif
+
+#endif /* MB_hqueueH */
@@ -37,7 +37,7 @@ typedef void (TSWITCHEP) (void *ctx, int x, int y, int z);
 
 /** Structure holding the function contextual information 
  * such as the size of the image processed, the pointer to the pixel lines
- * the array of tokens and the current flooding level
+ * the hierarchical queue and the current flooding level
  */
 typedef struct {
     /** The width of the images processed */
@@ -47,10 +47,8 @@ typedef struct {
     /** The length of the processed images */
     Uint32 length;
     
-    /** The memory used to hold the elements of the hierarchical list */
-    MB3D_Token *TokensArray;
-    /** The hierarchical list entries for watershed segmentation */
-    MB3D_ListControl HierarchicalList[256];
+    /** The hierarchical queue for watershed segmentation */
+    MB_HQueue hq;
     
     /** offset in the marker image lines */
     Uint32 linoff_marker;
@@ -60,8 +58,6 @@ typedef struct {
     Uint32 linoff_src;
     /** image sequence for the src */
     MB_Image **seq_src;
-    /** size in byte of the marker image lines */
-    Uint32 bytes_marker;
     
     /** Variable indicating which level in the hierarchical list
      * the "water" as attained. Only this level and above can be filled with new
@@ -78,54 +74,22 @@ typedef struct {
  ****************************************/
 
 /**
- * Inserts a token in the hierarchical list
+ * Inserts a pixel in the hierarchical list
  * \param local_ctx pointer to the structure holding all the information needed 
  * by the algorithm
  * \param x the position in x of the concerned pixel
  * \param y the position in y of the concerned pixel
  * \param z the position in z of the concerned pixel
- * \param bytes number of bytes inside the line
+ * \param value the value determines in which list to insert it
  */
 static INLINE void MB3D_InsertInHierarchicalList(MB3D_Basins_Ctx *local_ctx, int x, int y, int z, PIX8 value)
 {
-    int position;
-    int lposition;
-    int lx, ly, lz;
-    
-    /* the token corresponding to the pixel process is */
-    /* updated/created. */
-    position = x + y*local_ctx->width + z*local_ctx->width*local_ctx->height;
-    local_ctx->TokensArray[position].nextx = MB3D_LIST_END;
-    local_ctx->TokensArray[position].nexty = MB3D_LIST_END;
-    local_ctx->TokensArray[position].nextz = MB3D_LIST_END;
-    
     /* insertion in the hierarchical list */
     /* the value is normed as we do not want to process */
     /* already flooded levels */
     value = (value < (local_ctx->current_water_level)) ? (local_ctx->current_water_level) : value;
-    /* the token is inserted after the last value in the list */
-    lx = local_ctx->HierarchicalList[value].lastx;
-    ly = local_ctx->HierarchicalList[value].lasty;
-    lz = local_ctx->HierarchicalList[value].lastz;
-    lposition = lx+ly*local_ctx->width + lz*local_ctx->width*local_ctx->height;
-    if (lposition>=0) {
-        /*There is a last value, the list is not empty*/
-        local_ctx->TokensArray[lposition].nextx = x;
-        local_ctx->TokensArray[lposition].nexty = y;
-        local_ctx->TokensArray[lposition].nextz = z;
-        local_ctx->HierarchicalList[value].lastx = x;
-        local_ctx->HierarchicalList[value].lasty = y;
-        local_ctx->HierarchicalList[value].lastz = z;
-    }
-    else {
-        /* The list is empty, so we create it.*/
-        local_ctx->HierarchicalList[value].firstx = x;
-        local_ctx->HierarchicalList[value].firsty = y;
-        local_ctx->HierarchicalList[value].firstz = z;
-        local_ctx->HierarchicalList[value].lastx = x;
-        local_ctx->HierarchicalList[value].lasty = y;
-        local_ctx->HierarchicalList[value].lastz = z;
-    }
+    MB_HQ_Push(&local_ctx->hq, value,
+               x + (y + z*local_ctx->height)*local_ctx->width);
 }
 
 /**
@@ -135,16 +99,12 @@ static INLINE void MB3D_InsertInHierarchicalList(MB3D_Basins_Ctx *local_ctx, int
  */
 static INLINE void MB3D_HierarchyInit(MB3D_Basins_Ctx *local_ctx)
 {
-    Uint32 i,x,y,z;
+    Uint32 x,y,z;
     PIX32 *p;
     MB_Image *im;
     
-    /*All the controls are reset */
-    for(i=0;i<256;i++) {
-         local_ctx->HierarchicalList[i].firstx = local_ctx->HierarchicalList[i].lastx = MB3D_LIST_END;
-         local_ctx->HierarchicalList[i].firsty = local_ctx->HierarchicalList[i].lasty = MB3D_LIST_END;
-         local_ctx->HierarchicalList[i].firstz = local_ctx->HierarchicalList[i].lastz = MB3D_LIST_END;
-    }
+    /*All the lists are emptied */
+    MB_HQ_Reset(&local_ctx->hq);
     
     /* The first marker are inserted inside the hierarchical list */
     /* all the other pixels are tagged as not processed */
@@ -152,10 +112,10 @@ static INLINE void MB3D_HierarchyInit(MB3D_Basins_Ctx *local_ctx)
     for(z=0; z<local_ctx->length; z++) {
         im = local_ctx->seq_marker[z];
         for(y=0; y<local_ctx->height; y++) {
-            for(x=0; x<local_ctx->bytes_marker; x+=4) {
-                p = (PIX32 *) (im->PLINES[y+MB_Y_TOP(im)] + local_ctx->linoff_marker + x);
+            p = (PIX32 *) (im->PLINES[y+MB_Y_TOP(im)] + local_ctx->linoff_marker);
+            for(x=0; x<local_ctx->width; x++, p++) {
                 if (((*p)&0x00ffffff)!=0)
-                    MB3D_InsertInHierarchicalList(local_ctx,x/4,y,z,0);
+                    MB3D_InsertInHierarchicalList(local_ctx,x,y,z,0);
                else
                    *p = 0x01000000;
             }
@@ -276,7 +236,7 @@ static void MB3D_InsertNeighbors_fcc(void *ctx, int x, int y, int z)
  ****************************************/
  
 /**
- * Simulates the flooding process using the hierarchical list. Tokens are
+ * Simulates the flooding process using the hierarchical list. Pixels are
  * extracted out of the current water level list and processed. The process consists
  * in inserting in the list all its neighbors that are not already processed.
  * \param local_ctx pointer to the structure holding all the information needed 
@@ -285,19 +245,15 @@ static void MB3D_InsertNeighbors_fcc(void *ctx, int x, int y, int z)
  */
 static INLINE void MB3D_Flooding(MB3D_Basins_Ctx *local_ctx, Uint32 max_level)
 {
-    int fx,fy,fz,pos;
-    Uint32 i;
+    Uint32 i, pos, t;
     
     for(i=0; i<max_level; i++, local_ctx->current_water_level++) {
-        fx = local_ctx->HierarchicalList[local_ctx->current_water_level].firstx;
-        fy = local_ctx->HierarchicalList[local_ctx->current_water_level].firsty;
-        fz = local_ctx->HierarchicalList[local_ctx->current_water_level].firstz;
-        while(fx>=0) {
-            pos = fx+fy*local_ctx->width+fz*local_ctx->width*local_ctx->height;
-            local_ctx->InsertNeighbors(local_ctx,fx,fy,fz);
-            fx = local_ctx->TokensArray[pos].nextx;
-            fy = local_ctx->TokensArray[pos].nexty;
-            fz = local_ctx->TokensArray[pos].nextz;
+        pos = local_ctx->hq.first[local_ctx->current_water_level];
+        while(pos!=MB_HQ_END) {
+            t = pos/local_ctx->width;
+            local_ctx->InsertNeighbors(local_ctx, pos%local_ctx->width,
+                                       t%local_ctx->height, t/local_ctx->height);
+            pos = local_ctx->hq.next[pos];
         }
     }
 }
@@ -359,11 +315,10 @@ MB3D_errcode MB3D_Basins(MB3D_Image *src, MB3D_Image *marker, unsigned int max_l
     local_ctx.seq_marker = &marker->seq[0];
     local_ctx.linoff_src  = MB_LINE_OFFSET(src->seq[0]);
     local_ctx.linoff_marker = MB_LINE_OFFSET(marker->seq[0]);
-    local_ctx.bytes_marker = MB_LINE_COUNT(marker->seq[0]);
     
-    /* Allocating the token array */
-    local_ctx.TokensArray = malloc(local_ctx.width*local_ctx.height*local_ctx.length*sizeof(MB3D_Token));
-    if(local_ctx.TokensArray==NULL){
+    /* Allocating the hierarchical queue (one element per pixel) */
+    local_ctx.hq.next = malloc(local_ctx.width*local_ctx.height*local_ctx.length*sizeof(Uint32));
+    if(local_ctx.hq.next==NULL){
         /* in case allocation goes wrong */
         return ERR_CANT_ALLOCATE_MEMORY;
     } 
@@ -381,8 +336,8 @@ MB3D_errcode MB3D_Basins(MB3D_Image *src, MB3D_Image *marker, unsigned int max_l
     /* Actual flooding */
     MB3D_Flooding(&local_ctx, max_level);
     
-    /* freeing the token array */
-    free(local_ctx.TokensArray);
+    /* freeing the hierarchical queue */
+    free(local_ctx.hq.next);
     
     return NO_ERR;
 }
@@ -37,7 +37,7 @@ typedef void (TSWITCHEP) (void *ctx, int x, int y, int z);
 
 /** Structure holding the function contextual information 
  * such as the size of the processed image, the pointer to the pixel lines,
- * the array of tokens and the current flooding level
+ * the hierarchical queue and the current flooding level
  */
 typedef struct {
     /** The width of the processed images */
@@ -47,12 +47,10 @@ typedef struct {
     /** The length of the processed images */
     Uint32 length;
     
-    /** The memory used to hold the elements of the hierarchical list */
-    MB3D_Token *TokensArray;
-    /** The hierarchical list entries for watershed segmentation */
-    MB3D_ListControl HierarchicalList[256];
+    /** The hierarchical queue used for the build (two elements per pixel) */
+    MB_HQueue hq;
     /** The memory to hold the status of each pixel */
-    Uint32 *pix_status;
+    PIX8 *pix_status;
     
     /** offset in the mask image lines */
     Uint32 linoff_mask;
@@ -80,113 +78,49 @@ typedef struct {
  ****************************************/
 
 /**
- * Inserts a token in the hierarchical list
- * This function only uses the tokens of the first half (for initialization)
+ * Inserts a pixel in the hierarchical list
+ * This function only uses the elements of the first half (for initialization)
  * \param local_ctx pointer to the structure holding all the information needed 
  * by the algorithm
  * \param x the position in x of the concerned pixel
  * \param y the position in y of the concerned pixel
  * \param z the position in z of the concerned pixel
- * \param bytes number of bytes inside the line
+ * \param value the value determines in which list to insert it
  */
 static INLINE void MB3D_InsertInHierarchicalList_1(
     MB3D_Hierarbld_Ctx *local_ctx,
     int x, int y, int z,
     PIX8 value)
 {
-    int position;
-    int lposition;
-    int lx, ly, lz;
-    
-    /* the token corresponding to the pixel process is */
-    /* updated/created. */
-    position = x + y*local_ctx->width + z*local_ctx->width*local_ctx->height;
-    local_ctx->TokensArray[position].nextx = MB3D_LIST_END;
-    local_ctx->TokensArray[position].nexty = MB3D_LIST_END;
-    local_ctx->TokensArray[position].nextz = MB3D_LIST_END;
-    
-    /* insertion in the hierarchical list */
-    /* the token is inserted after the last value in the list */
-    lx = local_ctx->HierarchicalList[value].lastx;
-    ly = local_ctx->HierarchicalList[value].lasty;
-    lz = local_ctx->HierarchicalList[value].lastz;
-    lposition = lx+ly*local_ctx->width+lz*local_ctx->width*local_ctx->height;
-    if (lposition>=0) {
-        /*There is a last value, the list is not empty*/
-        local_ctx->TokensArray[lposition].nextx = x;
-        local_ctx->TokensArray[lposition].nexty = y;
-        local_ctx->TokensArray[lposition].nextz = z;
-        local_ctx->HierarchicalList[value].lastx = x;
-        local_ctx->HierarchicalList[value].lasty = y;
-        local_ctx->HierarchicalList[value].lastz = z;
-    }
-    else {
-        /* The list is empty, so we create it.*/
-        local_ctx->HierarchicalList[value].firstx = x;
-        local_ctx->HierarchicalList[value].firsty = y;
-        local_ctx->HierarchicalList[value].firstz = z;
-        local_ctx->HierarchicalList[value].lastx = x;
-        local_ctx->HierarchicalList[value].lasty = y;
-        local_ctx->HierarchicalList[value].lastz = z;
-    }
+    MB_HQ_Push(&local_ctx->hq, value,
+               x + (y + z*local_ctx->height)*local_ctx->width);
 }
 
 /**
- * Inserts a token in the hierarchical list
- * This function only uses the tokens of the second half (for flooding).
+ * Inserts a pixel in the hierarchical list
+ * This function only uses the elements of the second half (for flooding).
  * The function also changes the status of the pixel to QUEUED.
  * \param local_ctx pointer to the structure holding all the information needed 
  * by the algorithm
  * \param x the position in x of the concerned pixel
  * \param y the position in y of the concerned pixel
  * \param z the position in z of the concerned pixel
- * \param bytes number of bytes inside the line
+ * \param value the value determines in which list to insert it
  */
 static INLINE void MB3D_InsertInHierarchicalList_2(
     MB3D_Hierarbld_Ctx *local_ctx, 
     int x, int y, int z,
     PIX8 value)
 {
-    int position;
-    int lposition;
-    int lx, ly, lz;
+    Uint32 position = x + (y + z*local_ctx->height)*local_ctx->width;
     
-    /* the token corresponding to the pixel process is */
-    /* updated/created. */
-    /* the y is increased by local_ctx->height to make sure the second half */
-    /* of the token is used */
-    position = x + y*local_ctx->width + (z+local_ctx->length)*local_ctx->width*local_ctx->height;
-    local_ctx->TokensArray[position].nextx = MB3D_LIST_END;
-    local_ctx->TokensArray[position].nexty = MB3D_LIST_END;
-    local_ctx->TokensArray[position].nextz = MB3D_LIST_END;
-    
-    /* insertion in the hierarchical list */
-    /* the token is inserted after the last value in the list */
-    lx = local_ctx->HierarchicalList[value].lastx;
-    ly = local_ctx->HierarchicalList[value].lasty;
-    lz = local_ctx->HierarchicalList[value].lastz;
-    lposition = lx+ly*local_ctx->width+lz*local_ctx->width*local_ctx->height;
-    if (lposition>=0) {
-        /*There is a last value, the list is not empty*/
-        local_ctx->TokensArray[lposition].nextx = x;
-        local_ctx->TokensArray[lposition].nexty = y;
-        local_ctx->TokensArray[lposition].nextz = z+local_ctx->length;
-        local_ctx->HierarchicalList[value].lastx = x;
-        local_ctx->HierarchicalList[value].lasty = y;
-        local_ctx->HierarchicalList[value].lastz = z+local_ctx->length;
-    }
-    else {
-        /* The list is empty, so we create it.*/
-        local_ctx->HierarchicalList[value].firstx = x;
-        local_ctx->HierarchicalList[value].firsty = y;
-        local_ctx->HierarchicalList[value].firstz = z+local_ctx->length;
-        local_ctx->HierarchicalList[value].lastx = x;
-        local_ctx->HierarchicalList[value].lasty = y;
-        local_ctx->HierarchicalList[value].lastz = z+local_ctx->length;
-    }
+    /* the number of pixels is added to the position to make sure the */
+    /* second half of the elements is used */
+    MB_HQ_Push(&local_ctx->hq, value,
+               position + local_ctx->width*local_ctx->height*local_ctx->length);
     
     /* change the pixel status */
-    local_ctx->pix_status[x+y*local_ctx->width+z*local_ctx->width*local_ctx->height] = 0x1;
+    local_ctx->pix_status[position] = 0x1;
 }
 
 /**
@@ -196,16 +130,12 @@ static INLINE void MB3D_InsertInHierarchicalList_2(
  */
 static INLINE void MB3D_HierarchyInit(MB3D_Hierarbld_Ctx *local_ctx)
 {
-    Uint32 i,x,y,z;
+    Uint32 x,y,z;
     MB_Image *srcdest, *mask;
     PLINE pvalue, pmask;
     
-    /*All the control are reset */
-    for(i=0;i<256;i++) {
-        local_ctx->HierarchicalList[i].firstx = local_ctx->HierarchicalList[i].lastx = MB3D_LIST_END;
-        local_ctx->HierarchicalList[i].firsty = local_ctx->HierarchicalList[i].lasty = MB3D_LIST_END;
-        local_ctx->HierarchicalList[i].firstz = local_ctx->HierarchicalList[i].lastz = MB3D_LIST_END;
-    }
+    /*All the lists are emptied */
+    MB_HQ_Reset(&local_ctx->hq);
      
     /* All the pixels are inserted inside the hierarchical list */
     local_ctx->current_water_level = 255;
@@ -223,7 +153,7 @@ static INLINE void MB3D_HierarchyInit(MB3D_Hierarbld_Ctx *local_ctx)
     }
 
     /* All pixels status are set to 0 (CANDIDATE) */
-    memset(local_ctx->pix_status, 0, local_ctx->width*local_ctx->height*local_ctx->length*sizeof(Uint32));
+    memset(local_ctx->pix_status, 0, local_ctx->width*local_ctx->height*local_ctx->length);
 }
 
 /****************************************
@@ -343,7 +273,7 @@ static void MB3D_InsertNeighbors_fcc(void *ctx, int x, int y, int z)
  ****************************************/
  
 /**
- * Simulates the flooding process using the hierarchical list. Tokens are
+ * Simulates the flooding process using the hierarchical list. Pixels are
  * extracted out of the current water level list and processed. The process consists
  * in inserting in the list all its neighbor that are not already processed.
  * \param local_ctx pointer to the structure holding all the information needed 
@@ -351,19 +281,18 @@ static void MB3D_InsertNeighbors_fcc(void *ctx, int x, int y, int z)
  */
 static INLINE void MB3D_Flooding(MB3D_Hierarbld_Ctx *local_ctx)
 {
-    int fx,fy,fz,pos;
-    Uint32 i;
+    Uint32 i, pos, i_pos, t, size;
     
+    size = local_ctx->width*local_ctx->height*local_ctx->length;
     for(i=0; i<256; i++, local_ctx->current_water_level = 255-i) {
-        fx = local_ctx->HierarchicalList[local_ctx->current_water_level].firstx;
-        fy = local_ctx->HierarchicalList[local_ctx->current_water_level].firsty;
-        fz = local_ctx->HierarchicalList[local_ctx->current_water_level].firstz;
-        while(fx>=0) {
-            pos = fx+fy*local_ctx->width+fz*local_ctx->width*local_ctx->height;
-            local_ctx->InsertNeighbors(local_ctx,fx,fy,fz%(local_ctx->length));
-            fx = local_ctx->TokensArray[pos].nextx;
-            fy = local_ctx->TokensArray[pos].nexty;
-            fz = local_ctx->TokensArray[pos].nextz;
+        pos = local_ctx->hq.first[local_ctx->current_water_level];
+        while(pos!=MB_HQ_END) {
+            /* the elements of the second half are the same pixels */
+            i_pos = (pos<size) ? pos : pos-size;
+            t = i_pos/local_ctx->width;
+            local_ctx->InsertNeighbors(local_ctx, i_pos%local_ctx->width,
+                                       t%local_ctx->height, t/local_ctx->height);
+            pos = local_ctx->hq.next[pos];
         }
     }
 }
@@ -413,18 +342,19 @@ MB3D_errcode MB3D_HierarBld(MB3D_Image *mask, MB3D_Image *srcdest, enum MB3D_gri
     local_ctx.linoff_mask = MB_LINE_OFFSET(mask->seq[0]);
     local_ctx.bytes = MB_LINE_COUNT(mask->seq[0]);
     
-    /* Allocating the token array */
-    /* We need two token per pixel for this algorithm */
+    /* Allocating the hierarchical queue */
+    /* We need two elements per pixel for this algorithm */
     /* the init will use the first half and the flooding the other */
-    local_ctx.TokensArray = malloc(2*local_ctx.width*local_ctx.height*local_ctx.length*sizeof(MB3D_Token));
-    if(local_ctx.TokensArray==NULL){
+    local_ctx.hq.next = malloc(2*local_ctx.width*local_ctx.height*local_ctx.length*sizeof(Uint32));
+    if(local_ctx.hq.next==NULL){
         /* in case allocation goes wrong */
         return ERR_CANT_ALLOCATE_MEMORY;
     }
     /* Allocating the pixel status array */
-    local_ctx.pix_status = malloc(local_ctx.width*local_ctx.height*local_ctx.length*sizeof(Uint32));
+    local_ctx.pix_status = malloc(local_ctx.width*local_ctx.height*local_ctx.length);
     if(local_ctx.pix_status==NULL){
         /* in case allocation goes wrong */
+        free(local_ctx.hq.next);
         return ERR_CANT_ALLOCATE_MEMORY;
     }
     
@@ -441,8 +371,8 @@ MB3D_errcode MB3D_HierarBld(MB3D_Image *mask, MB3D_Image *srcdest, enum MB3D_gri
     /* Actual flooding */
     MB3D_Flooding(&local_ctx);
     
-    /* freeing the token array */
-    free(local_ctx.TokensArray);
+    /* freeing the hierarchical queue */
+    free(local_ctx.hq.next);
     /* freeing the pixel status array */
     free(local_ctx.pix_status);
     
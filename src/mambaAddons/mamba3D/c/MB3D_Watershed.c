@@ -50,11 +50,11 @@
 
 
 /** typedef for the definition of neighbor function arguments */
-typedef MB3D_Token (TSWITCHEP) (void *ctx, int x, int y, int z);
+typedef void (TSWITCHEP) (void *ctx, int x, int y, int z);
 
 /** Structure holding the function contextual information 
  * such as the size of the processed image, the pointer to the pixel lines,
- * the array of tokens and the current flooding level
+ * the hierarchical queue and the current flooding level
  */
 typedef struct {
     /** The width of the processed images */
@@ -64,16 +64,18 @@ typedef struct {
     /** The length of the processed images */
     Uint32 length;
     
-    /** The memory used to hold the elements of the hierarchical list */
-    MB3D_Token *TokensArray;
-    /** The hierarchical list entries for watershed segmentation */
-    MB3D_ListControl HierarchicalList[256];
+    /** The hierarchical queue for watershed segmentation */
+    MB_HQueue hq;
     /**
-     * List of pixels that will be inserted into the hierarchical list if the
-     * the parent pixel (their neighbor which is currently processed) is
-     * tagged 
+     * Pixels (positions in x, y and z) that will be inserted into the
+     * hierarchical list if the parent pixel (their neighbor which is
+     * currently processed) is tagged 
      */
-    MB3D_ListControl toreinsertList;
+    int toreinsertx[26];
+    int toreinserty[26];
+    int toreinsertz[26];
+    /** Number of pixels to reinsert */
+    Uint32 nb_toreinsert;
     
     /** offset in the marker image lines */
     Uint32 linoff_marker;
@@ -83,8 +85,6 @@ typedef struct {
     Uint32 linoff_src;
     /** image sequence for the src */
     MB_Image **seq_src;
-    /** size in byte of the marker image lines */
-    Uint32 bytes_marker;
     
     /** Variable indicating which level in the hierarchical list
      * the "water" as attained. Only this level and above can be filled with new
@@ -101,7 +101,7 @@ typedef struct {
  ****************************************/
 
 /**
- * Inserts a token in the hierarchical list
+ * Inserts a pixel in the hierarchical list
  * \param local_ctx pointer to the structure holding all the information needed 
  * by the algorithm
  * \param x the position in x of the concerned pixel
@@ -114,46 +114,15 @@ static INLINE void MB3D_InsertInHierarchicalList(
     int x, int y, int z,
     PIX8 value)
 {
-    int position;
     PIX32 *p;
-    int lx, ly, lz;
     MB_Image *im;
     
-    /* the token corresponding to the pixel process is */
-    /* updated/created. */
-    position = x + y*local_ctx->width + z*local_ctx->width*local_ctx->height;
-    local_ctx->TokensArray[position].nextx = MB3D_LIST_END;
-    local_ctx->TokensArray[position].nexty = MB3D_LIST_END;
-    local_ctx->TokensArray[position].nextz = MB3D_LIST_END;
-    
     /* insertion in the hierarchical list */
     /* the value is normed as we do not want to process */
     /* already flooded level */
     value = (value < (local_ctx->current_water_level)) ? (local_ctx->current_water_level) : value;
-    
-    /* the token is inserted after the last value in the list */
-    lx = local_ctx->HierarchicalList[value].lastx;
-    ly = local_ctx->HierarchicalList[value].lasty;
-    lz = local_ctx->HierarchicalList[value].lastz;
-    position = lx+ly*local_ctx->width+lz*local_ctx->width*local_ctx->height;
-    if (position>=0) {
-        /*There is a last value, the list is not empty*/
-        local_ctx->TokensArray[position].nextx = x;
-        local_ctx->TokensArray[position].nexty = y;
-        local_ctx->TokensArray[position].nextz = z;
-        local_ctx->HierarchicalList[value].lastx = x;
-        local_ctx->HierarchicalList[value].lasty = y;
-        local_ctx->HierarchicalList[value].lastz = z;
-    }
-    else {
-        /* The list is empty, so we create it.*/
-        local_ctx->HierarchicalList[value].firstx = x;
-        local_ctx->HierarchicalList[value].firsty = y;
-        local_ctx->HierarchicalList[value].firstz = z;
-        local_ctx->HierarchicalList[value].lastx = x;
-        local_ctx->HierarchicalList[value].lasty = y;
-        local_ctx->HierarchicalList[value].lastz = z;
-    }
+    MB_HQ_Push(&local_ctx->hq, value,
+               x + (y + z*local_ctx->height)*local_ctx->width);
     
     /* The marker image is updated with the tag value in the pixel position */
     im = local_ctx->seq_marker[z];
@@ -168,26 +137,22 @@ static INLINE void MB3D_InsertInHierarchicalList(
  */
 static INLINE void MB3D_HierarchyInit(MB3D_Watershed_Ctx *local_ctx)
 {
-    Uint32 x,y,z,i;
+    Uint32 x,y,z;
     PIX32 *p;
     MB_Image *im;
     
-    /*All the control are reset */
-    for(i=0;i<256;i++) {
-        local_ctx->HierarchicalList[i].firstx = local_ctx->HierarchicalList[i].lastx = MB3D_LIST_END;
-        local_ctx->HierarchicalList[i].firsty = local_ctx->HierarchicalList[i].lasty = MB3D_LIST_END;
-        local_ctx->HierarchicalList[i].firstz = local_ctx->HierarchicalList[i].lastz = MB3D_LIST_END;
-    }
+    /*All the lists are emptied */
+    MB_HQ_Reset(&local_ctx->hq);
     
     /* The first marker are inserted inside the hierarchical list */
     local_ctx->current_water_level = 0;
     for(z=0; z<local_ctx->length; z++) {
         im = local_ctx->seq_marker[z];
         for(y=0; y<local_ctx->height; y++) {
-            for(x=0; x<local_ctx->bytes_marker; x+=4) {
-                p = (PIX32 *) (im->PLINES[y+MB_Y_TOP(im)] + local_ctx->linoff_marker + x);
+            p = (PIX32 *) (im->PLINES[y+MB_Y_TOP(im)] + local_ctx->linoff_marker);
+            for(x=0; x<local_ctx->width; x++, p++) {
                 if (READ_LABEL(p)!=0) {
-                    MB3D_InsertInHierarchicalList(local_ctx,x/4,y,z,0);
+                    MB3D_InsertInHierarchicalList(local_ctx,x,y,z,0);
                 } else {
                     *p = CANDIDATE;
                 }
@@ -207,9 +172,7 @@ static INLINE void MB3D_HierarchyInit(MB3D_Watershed_Ctx *local_ctx)
  */
 static INLINE void MB3D_ClearReinsertList(MB3D_Watershed_Ctx *local_ctx)
 {
-    local_ctx->toreinsertList.firstx = local_ctx->toreinsertList.lastx = MB3D_LIST_END;
-    local_ctx->toreinsertList.firsty = local_ctx->toreinsertList.lasty = MB3D_LIST_END;
-    local_ctx->toreinsertList.firstz = local_ctx->toreinsertList.lastz = MB3D_LIST_END;
+    local_ctx->nb_toreinsert = 0;
 }
 
 /**
@@ -218,44 +181,16 @@ static INLINE void MB3D_ClearReinsertList(MB3D_Watershed_Ctx *local_ctx)
  * by the algorithm
  * \param x the position in x of the concerned pixel
  * \param y the position in y of the concerned pixel
+ * \param z the position in z of the concerned pixel
  */
 static INLINE void MB3D_InsertInReinsertList(
     MB3D_Watershed_Ctx *local_ctx,
     int x, int y, int z)
 {
-    int position;
-    int lx, ly, lz;
-    
-    /* the token corresponding to the pixel process is */
-    /* updated/created. */
-    position = x + y*local_ctx->width + z*local_ctx->width*local_ctx->height;
-    local_ctx->TokensArray[position].nextx = MB3D_LIST_END;
-    local_ctx->TokensArray[position].nexty = MB3D_LIST_END;
-    local_ctx->TokensArray[position].nextz = MB3D_LIST_END;
-    
-    /* the token is inserted after the last value in the list */
-    lx = local_ctx->toreinsertList.lastx;
-    ly = local_ctx->toreinsertList.lasty;
-    lz = local_ctx->toreinsertList.lastz;
-    position = lx+ly*local_ctx->width+lz*local_ctx->width*local_ctx->height;
-    if (position>=0) {
-        /*There is a last value, the list is not empty*/
-        local_ctx->TokensArray[position].nextx = x;
-        local_ctx->TokensArray[position].nexty = y;
-        local_ctx->TokensArray[position].nextz = z;
-        local_ctx->toreinsertList.lastx = x;
-        local_ctx->toreinsertList.lasty = y;
-        local_ctx->toreinsertList.lastz = z;
-    }
-    else {
-        /* The list is empty, so we create it.*/
-        local_ctx->toreinsertList.firstx = x;
-        local_ctx->toreinsertList.firsty = y;
-        local_ctx->toreinsertList.firstz = z;
-        local_ctx->toreinsertList.lastx = x;
-        local_ctx->toreinsertList.lasty = y;
-        local_ctx->toreinsertList.lastz = z;
-    }
+    local_ctx->toreinsertx[local_ctx->nb_toreinsert] = x;
+    local_ctx->toreinserty[local_ctx->nb_toreinsert] = y;
+    local_ctx->toreinsertz[local_ctx->nb_toreinsert] = z;
+    local_ctx->nb_toreinsert++;
 }
 
 /**
@@ -266,26 +201,19 @@ static INLINE void MB3D_InsertInReinsertList(
  */
 static INLINE void MB3D_ReinsertFromList(MB3D_Watershed_Ctx *local_ctx)
 {
-    int x,y,z,pos;
-    MB3D_Token next_token;
+    Uint32 i;
+    int x,y,z;
     PIX8 value;
     MB_Image *im;
 
-    x = local_ctx->toreinsertList.firstx;
-    y = local_ctx->toreinsertList.firsty;
-    z = local_ctx->toreinsertList.firstz;
-    while(x>=0) {
-        /* The next token is evaluated first since reinsertion will destroy the info */
-        pos = x+y*local_ctx->width+z*local_ctx->width*local_ctx->height;
-        next_token = local_ctx->TokensArray[pos];
+    for(i=0; i<local_ctx->nb_toreinsert; i++) {
+        x = local_ctx->toreinsertx[i];
+        y = local_ctx->toreinserty[i];
+        z = local_ctx->toreinsertz[i];
         /* the pixel is inserted into the hierarchical list */
         im = local_ctx->seq_src[z];
         value = *(im->PLINES[y+MB_Y_TOP(im)] + local_ctx->linoff_src + x);
         MB3D_InsertInHierarchicalList(local_ctx, x, y, z, value);
-        /* the next pixel is extracted */
-        x = next_token.nextx;
-        y = next_token.nexty;
-        z = next_token.nextz;
     }
 }
 
@@ -324,14 +252,12 @@ const int fccNbDir[6][13][3] = {
  * \param x the x position of the pixel processed
  * \param y the x position of the pixel processed
  * \param z the z position of the pixel processed
- *
- * \return the function return the next token (pixel) that must be process
  */
-static MB3D_Token MB3D_InsertNeighbors_cube(void *ctx, int x, int y, int z)
+static void MB3D_InsertNeighbors_cube(void *ctx, int x, int y, int z)
 {
     Uint32 neighbor;
     PIX32 *p, *pix, tag;
-    int nbx,nby,nbz,pos;
+    int nbx,nby,nbz;
     MB_Image *im;
     MB3D_Watershed_Ctx *local_ctx = (MB3D_Watershed_Ctx *) ctx;
     
@@ -391,10 +317,6 @@ static MB3D_Token MB3D_InsertNeighbors_cube(void *ctx, int x, int y, int z)
     if( !IS_PIXEL(pix, WTS_LAB) ) {
         MB3D_ReinsertFromList(local_ctx);
     }
-
-    /* what is the next token to process */
-    pos = x+y*local_ctx->width+z*local_ctx->width*local_ctx->height;
-    return local_ctx->TokensArray[pos];
 }
 
 /**
@@ -407,14 +329,12 @@ static MB3D_Token MB3D_InsertNeighbors_cube(void *ctx, int x, int y, int z)
  * \param x the x position of the pixel processed
  * \param y the x position of the pixel processed
  * \param z the z position of the pixel processed
- *
- * \return the function return the next token (pixel) that must be process
  */
-static MB3D_Token MB3D_InsertNeighbors_fcc(void *ctx, int x, int y, int z)
+static void MB3D_InsertNeighbors_fcc(void *ctx, int x, int y, int z)
 {
     Uint32 neighbor;
     PIX32 *p, *pix, tag;
-    int nbx,nby,nbz,pos,dirSelect;
+    int nbx,nby,nbz,dirSelect;
     MB_Image *im;
     MB3D_Watershed_Ctx *local_ctx = (MB3D_Watershed_Ctx *) ctx;
     
@@ -478,10 +398,6 @@ static MB3D_Token MB3D_InsertNeighbors_fcc(void *ctx, int x, int y, int z)
     if( !IS_PIXEL(pix, WTS_LAB) ) {
         MB3D_ReinsertFromList(local_ctx);
     }
-
-    /* what is the next token to process */
-    pos = x+y*local_ctx->width+z*local_ctx->width*local_ctx->height;
-    return local_ctx->TokensArray[pos];
 }
 
 /****************************************
@@ -489,7 +405,7 @@ static MB3D_Token MB3D_InsertNeighbors_fcc(void *ctx, int x, int y, int z)
  ****************************************/
  
 /**
- * Simulates the flooding process using the hierarchical list. Tokens are
+ * Simulates the flooding process using the hierarchical list. Pixels are
  * extracted out of the current water level list and processed. The process consists
  * in inserting in the list all its neighbors that are not already processed.
  * \param local_ctx pointer to the structure holding all the information needed 
@@ -498,19 +414,15 @@ static MB3D_Token MB3D_InsertNeighbors_fcc(void *ctx, int x, int y, int z)
  */
 static INLINE void MB3D_Flooding(MB3D_Watershed_Ctx *local_ctx, Uint32 max_level)
 {
-    Uint32 i;
-    int fx,fy,fz;
-    MB3D_Token next_token;
+    Uint32 i, pos, t;
     
     for(i=0; i<max_level; i++, local_ctx->current_water_level++) {
-        fx = local_ctx->HierarchicalList[local_ctx->current_water_level].firstx;
-        fy = local_ctx->HierarchicalList[local_ctx->current_water_level].firsty;
-        fz = local_ctx->HierarchicalList[local_ctx->current_water_level].firstz;
-        while(fx>=0) {
-            next_token = local_ctx->InsertNeighbors(local_ctx,fx,fy,fz);
-            fx = next_token.nextx;
-            fy = next_token.nexty;
-            fz = next_token.nextz;
+        pos = local_ctx->hq.first[local_ctx->current_water_level];
+        while(pos!=MB_HQ_END) {
+            t = pos/local_ctx->width;
+            local_ctx->InsertNeighbors(local_ctx, pos%local_ctx->width,
+                                       t%local_ctx->height, t/local_ctx->height);
+            pos = local_ctx->hq.next[pos];
         }
     }
 }
@@ -530,10 +442,10 @@ static INLINE void MB3D_ControlPass(MB3D_Watershed_Ctx *local_ctx)
     
     /* All the pixels are checked */
     for(z=0; z<local_ctx->length; z++) {
+        im = local_ctx->seq_marker[z];
         for(y=0; y<local_ctx->height; y++) {
-            for(x=0; x<local_ctx->bytes_marker; x+=4) {
-                im = local_ctx->seq_marker[z];
-                p = (PIX32 *) (im->PLINES[y+MB_Y_TOP(im)] + local_ctx->linoff_marker + x);
+            p = (PIX32 *) (im->PLINES[y+MB_Y_TOP(im)] + local_ctx->linoff_marker);
+            for(x=0; x<local_ctx->width; x++, p++) {
                 switch ((*p)&0xFF000000) {
                 case CANDIDATE:
                     /* Untagged pixel */
@@ -604,11 +516,10 @@ MB3D_errcode MB3D_Watershed(MB3D_Image *src, MB3D_Image *marker, unsigned int ma
     local_ctx.seq_marker = &marker->seq[0];
     local_ctx.linoff_src  = MB_LINE_OFFSET(src->seq[0]);
     local_ctx.linoff_marker = MB_LINE_OFFSET(marker->seq[0]);
-    local_ctx.bytes_marker = MB_LINE_COUNT(marker->seq[0]);
     
-    /* Allocating the token array */
-    local_ctx.TokensArray = malloc(local_ctx.width*local_ctx.height*local_ctx.length*sizeof(MB3D_Token));
-    if(local_ctx.TokensArray==NULL){
+    /* Allocating the hierarchical queue (one element per pixel) */
+    local_ctx.hq.next = malloc(local_ctx.width*local_ctx.height*local_ctx.length*sizeof(Uint32));
+    if(local_ctx.hq.next==NULL){
         /* in case allocation goes wrong */
         return ERR_CANT_ALLOCATE_MEMORY;
     } 
@@ -630,8 +541,8 @@ MB3D_errcode MB3D_Watershed(MB3D_Image *src, MB3D_Image *marker, unsigned int ma
     if (max_level==256) 
         MB3D_ControlPass(&local_ctx);
     
-    /* freeing the token array */
-    free(local_ctx.TokensArray);
+    /* freeing the hierarchical queue */
+    free(local_ctx.hq.next);
     
     return NO_ERR;
 }
@@ -40,6 +40,7 @@
  * the library, The global header is meant for the outside world.
  */
 #include "mamba3DApi.h"
+#include "mambaHQueue.h"
 #include <stdio.h>
 #include <stdlib.h>
 #include <stdint.h>
@@ -121,19 +121,10 @@ static INLINE void ADD_LINE_1_8_32(PLINE *plines_out, Uint32 linoff_out,
 static INLINE void ADD_LINE_8_8_8(PLINE *plines_out, Uint32 linoff_out,
                                   PLINE *plines_in1, Uint32 linoff_in1,
                                   PLINE *plines_in2, Uint32 linoff_in2,
-                                  Uint32 bytes_in) 
+                                  Uint32 bytes_in)
 {
     Uint32 i;
 
-#ifdef __SSE2__
-    __m128i *pin1 = (__m128i*) (*plines_in1+linoff_in1);
-    __m128i *pin2 = (__m128i*) (*plines_in2+linoff_in2);
-    __m128i *pout = (__m128i*) (*plines_out+linoff_out);
-    
-    for(i=0;i<bytes_in;i+=16,pin1++,pin2++,pout++) {
-        (*pout) = _mm_adds_epu8((*pin2),(*pin1));
-    }
-#else
     Uint16 prov;
     
     PLINE pin1 = (PLINE) (*plines_in1+linoff_in1);
@@ -145,8 +136,28 @@ static INLINE void ADD_LINE_8_8_8(PLINE *plines_out, Uint32 linoff_out,
         /* saturation operation */
         *pout = (prov > 255) ? 255 : (PIX8) prov;
     }
-#endif
 }
+
+#ifdef MB_SIMD_X86
+/**
+ * Same as ADD_LINE_8_8_8 using SSE2 instructions.
+ */
+static INLINE MB_TARGET_SSE2 void ADD_LINE_8_8_8_SSE2(PLINE *plines_out, Uint32 linoff_out,
+                                                      PLINE *plines_in1, Uint32 linoff_in1,
+                                                      PLINE *plines_in2, Uint32 linoff_in2,
+                                                      Uint32 bytes_in)
+{
+    Uint32 i;
+
+    __m128i *pin1 = (__m128i*) (*plines_in1+linoff_in1);
+    __m128i *pin2 = (__m128i*) (*plines_in2+linoff_in2);
+    __m128i *pout = (__m128i*) (*plines_out+linoff_out);
+    
+    for(i=0;i<bytes_in;i+=16,pin1++,pin2++,pout++) {
+        (*pout) = _mm_adds_epu8((*pin2),(*pin1));
+    }
+}
+#endif
  
 /**
  * Add the 8-bit pixels of a line to the 8-bits pixels of another. 
@@ -263,6 +274,157 @@ static INLINE void ADD_LINE_8_32_32(PLINE *plines_out, Uint32 linoff_out,
     }
 }
 
+/****************************************/
+/* Wide SIMD functions                  */
+/****************************************/
+#ifdef MB_SIMD_X86
+
+/**
+ * Addition of two 8-bit images (saturated) using AVX2.
+ * \param plines_out pointer on the destination image pixel line
+ * \param linoff_out offset inside the destination image line
+ * \param plines_in1 pointer on the source image 1 pixel line
+ * \param linoff_in1 offset inside the source image 1 line
+ * \param plines_in2 pointer on the source image 2 pixel line
+ * \param linoff_in2 offset inside the source image 2 line
+ * \param bytes_in number of bytes inside the line
+ */
+static INLINE MB_TARGET_AVX2 void ADD_LINE_8_8_8_AVX2(PLINE *plines_out, Uint32 linoff_out,
+                                                      PLINE *plines_in1, Uint32 linoff_in1,
+                                                      PLINE *plines_in2, Uint32 linoff_in2,
+                                                      Uint32 bytes_in)
+{
+    Uint32 i;
+    __m256i a, b;
+
+    PLINE pin1 = (PLINE) (*plines_in1+linoff_in1);
+    PLINE pin2 = (PLINE) (*plines_in2+linoff_in2);
+    PLINE pout = (PLINE) (*plines_out+linoff_out);
+
+    /* lines are only aligned on 16 bytes, unaligned accesses are used */
+    for(i=0;i<bytes_in;i+=32) {
+        a = _mm256_loadu_si256((__m256i *) (pin1+i));
+        b = _mm256_loadu_si256((__m256i *) (pin2+i));
+        _mm256_storeu_si256((__m256i *) (pout+i), _mm256_adds_epu8(a, b));
+    }
+}
+
+/**
+ * Addition of two 8-bit images (saturated) using AVX-512.
+ * \param plines_out pointer on the destination image pixel line
+ * \param linoff_out offset inside the destination image line
+ * \param plines_in1 pointer on the source image 1 pixel line
+ * \param linoff_in1 offset inside the source image 1 line
+ * \param plines_in2 pointer on the source image 2 pixel line
+ * \param linoff_in2 offset inside the source image 2 line
+ * \param bytes_in number of bytes inside the line
+ */
+static INLINE MB_TARGET_AVX512 void ADD_LINE_8_8_8_AVX512(PLINE *plines_out, Uint32 linoff_out,
+                                                          PLINE *plines_in1, Uint32 linoff_in1,
+                                                          PLINE *plines_in2, Uint32 linoff_in2,
+                                                          Uint32 bytes_in)
+{
+    Uint32 i;
+    __m512i a, b;
+
+    PLINE pin1 = (PLINE) (*plines_in1+linoff_in1);
+    PLINE pin2 = (PLINE) (*plines_in2+linoff_in2);
+    PLINE pout = (PLINE) (*plines_out+linoff_out);
+
+    /* lines are only aligned on 16 bytes, unaligned accesses are used */
+    for(i=0;i<bytes_in;i+=64) {
+        a = _mm512_loadu_si512((__m512i *) (pin1+i));
+        b = _mm512_loadu_si512((__m512i *) (pin2+i));
+        _mm512_storeu_si512((__m512i *) (pout+i), _mm512_adds_epu8(a, b));
+    }
+}
+
+/**
+ * Addition of two 32-bit images using AVX2.
+ * \param plines_out pointer on the destination image pixel line
+ * \param linoff_out offset inside the destination image line
+ * \param plines_in1 pointer on the source image 1 pixel line
+ * \param linoff_in1 offset inside the source image 1 line
+ * \param plines_in2 pointer on the source image 2 pixel line
+ * \param linoff_in2 offset inside the source image 2 line
+ * \param bytes_in number of bytes inside the line
+ */
+static INLINE MB_TARGET_AVX2 void ADD_LINE_32_32_32_AVX2(PLINE *plines_out, Uint32 linoff_out,
+                                                         PLINE *plines_in1, Uint32 linoff_in1,
+                                                         PLINE *plines_in2, Uint32 linoff_in2,
+                                                         Uint32 bytes_in)
+{
+    Uint32 i;
+    __m256i a, b;
+
+    PLINE pin1 = (PLINE) (*plines_in1+linoff_in1);
+    PLINE pin2 = (PLINE) (*plines_in2+linoff_in2);
+    PLINE pout = (PLINE) (*plines_out+linoff_out);
+
+    /* lines are only aligned on 16 bytes, unaligned accesses are used */
+    for(i=0;i<bytes_in;i+=32) {
+        a = _mm256_loadu_si256((__m256i *) (pin1+i));
+        b = _mm256_loadu_si256((__m256i *) (pin2+i));
+        _mm256_storeu_si256((__m256i *) (pout+i), _mm256_add_epi32(a, b));
+    }
+}
+
+/**
+ * Addition of two 32-bit images using AVX-512.
+ * \param plines_out pointer on the destination image pixel line
+ * \param linoff_out offset inside the destination image line
+ * \param plines_in1 pointer on the source image 1 pixel line
+ * \param linoff_in1 offset inside the source image 1 line
+ * \param plines_in2 pointer on the source image 2 pixel line
+ * \param linoff_in2 offset inside the source image 2 line
+ * \param bytes_in number of bytes inside the line
+ */
+static INLINE MB_TARGET_AVX512 void ADD_LINE_32_32_32_AVX512(PLINE *plines_out, Uint32 linoff_out,
+                                                             PLINE *plines_in1, Uint32 linoff_in1,
+                                                             PLINE *plines_in2, Uint32 linoff_in2,
+                                                             Uint32 bytes_in)
+{
+    Uint32 i;
+    __m512i a, b;
+
+    PLINE pin1 = (PLINE) (*plines_in1+linoff_in1);
+    PLINE pin2 = (PLINE) (*plines_in2+linoff_in2);
+    PLINE pout = (PLINE) (*plines_out+linoff_out);
+
+    /* lines are only aligned on 16 bytes, unaligned accesses are used */
+    for(i=0;i<bytes_in;i+=64) {
+        a = _mm512_loadu_si512((__m512i *) (pin1+i));
+        b = _mm512_loadu_si512((__m512i *) (pin2+i));
+        _mm512_storeu_si512((__m512i *) (pout+i), _mm512_add_epi32(a, b));
+    }
+}
+
+#endif
+
+/****************************************/
+/* Band functions                       */
+/****************************************/
+
+MB_BAND_FUNC_3(ADD_BAND_1_8_8, ADD_LINE_1_8_8)
+MB_BAND_FUNC_3(ADD_BAND_1_8_32, ADD_LINE_1_8_32)
+MB_BAND_FUNC_3(ADD_BAND_8_8_8, ADD_LINE_8_8_8)
+MB_BAND_FUNC_3(ADD_BAND_8_8_32, ADD_LINE_8_8_32)
+MB_BAND_FUNC_3(ADD_BAND_32_32_32, ADD_LINE_32_32_32)
+MB_BAND_FUNC_3(ADD_BAND_1_32_32, ADD_LINE_1_32_32)
+MB_BAND_FUNC_3(ADD_BAND_8_32_32, ADD_LINE_8_32_32)
+#ifdef MB_SIMD_X86
+MB_TARGET_SSE2 MB_BAND_FUNC_3(ADD_BAND_8_8_8_SSE2, ADD_LINE_8_8_8_SSE2)
+MB_TARGET_AVX2 MB_BAND_FUNC_3(ADD_BAND_8_8_8_AVX2, ADD_LINE_8_8_8_AVX2)
+MB_TARGET_AVX512 MB_BAND_FUNC_3(ADD_BAND_8_8_8_AVX512, ADD_LINE_8_8_8_AVX512)
+MB_TARGET_AVX2 MB_BAND_FUNC_3(ADD_BAND_32_32_32_AVX2, ADD_LINE_32_32_32_AVX2)
+MB_TARGET_AVX512 MB_BAND_FUNC_3(ADD_BAND_32_32_32_AVX512, ADD_LINE_32_32_32_AVX512)
+#endif
+
+/* Versions of the band functions for each SIMD level */
+static MB_BandFn * const ADD_BANDS_8_8_8[MB_SIMD_LEVELS] =
+    MB_SIMD_TABLE(ADD_BAND_8_8_8, ADD_BAND_8_8_8_SSE2, ADD_BAND_8_8_8_SSE2, ADD_BAND_8_8_8_AVX2, ADD_BAND_8_8_8_AVX512);
+static MB_BandFn * const ADD_BANDS_32_32_32[MB_SIMD_LEVELS] =
+    MB_SIMD_TABLE(ADD_BAND_32_32_32, ADD_BAND_32_32_32, ADD_BAND_32_32_32, ADD_BAND_32_32_32_AVX2, ADD_BAND_32_32_32_AVX512);
 
 /**
  * Adds the pixels of two images and put the result in the third image.
@@ -283,9 +445,7 @@ static INLINE void ADD_LINE_8_32_32(PLINE *plines_out, Uint32 linoff_out,
  */
 MB_errcode MB_Add(MB_Image *src1, MB_Image *src2, MB_Image *dest) {
 
-    PLINE *plines_in1, *plines_in2, *plines_out;
-    Uint32 linoff_in1, linoff_in2, linoff_out, bytes_in;
-    Uint32 i;
+    MB_LinesCtx ctx;
     
     /* verification over image size compatibility */
     if (!MB_CHECK_SIZE_3(src1, src2, dest))
@@ -302,15 +462,15 @@ MB_errcode MB_Add(MB_Image *src1, MB_Image *src2, MB_Image *dest) {
         return ERR_BAD_DEPTH;
 
     /* Setting up the pointers */
-    plines_in1 = &src1->PLINES[MB_Y_TOP(src1)];
-    plines_in2 = &src2->PLINES[MB_Y_TOP(src2)];
-    plines_out = &dest->PLINES[MB_Y_TOP(dest)];
+    ctx.plines_in1 = &src1->PLINES[MB_Y_TOP(src1)];
+    ctx.plines_in2 = &src2->PLINES[MB_Y_TOP(src2)];
+    ctx.plines_out = &dest->PLINES[MB_Y_TOP(dest)];
     
     /* Setting up offset */
-    linoff_in1 = MB_LINE_OFFSET(src1);
-    linoff_in2 = MB_LINE_OFFSET(src2);
-    linoff_out = MB_LINE_OFFSET(dest);
-    bytes_in = MB_LINE_COUNT(src1);
+    ctx.linoff_in1 = MB_LINE_OFFSET(src1);
+    ctx.linoff_in2 = MB_LINE_OFFSET(src2);
+    ctx.linoff_out = MB_LINE_OFFSET(dest);
+    ctx.bytes_in = MB_LINE_COUNT(src1);
     
     /* Evaluating the addition case : 
      * 9 cases can happen depending of the two input images depth
@@ -327,50 +487,36 @@ MB_errcode MB_Add(MB_Image *src1, MB_Image *src2, MB_Image *dest) {
     /* binary + 8 bits images */
     case MB_PAIR_1_8:
         if (dest->depth == 8) {
-            for (i = 0; i < src1->height;i++, plines_out++, plines_in1++, plines_in2++) {    
-                ADD_LINE_1_8_8(plines_out, linoff_out, plines_in1, linoff_in1, plines_in2, linoff_in2, bytes_in);
-            }
+            MB_RunBands(ADD_BAND_1_8_8, &ctx, src1->height, ctx.bytes_in);
         }
         if (dest->depth == 32) {
-            for (i = 0; i < src1->height;i++, plines_out++, plines_in1++, plines_in2++) {
-                ADD_LINE_1_8_32(plines_out, linoff_out, plines_in1, linoff_in1, plines_in2, linoff_in2, bytes_in);
-            }
+            MB_RunBands(ADD_BAND_1_8_32, &ctx, src1->height, ctx.bytes_in);
         }
         break;
 
     /* two 8 bits images */
     case MB_PAIR_8_8:
         if(dest->depth == 8) {
-            for (i = 0; i < src1->height;i++, plines_out++, plines_in1++, plines_in2++) {
-                ADD_LINE_8_8_8(plines_out, linoff_out, plines_in1, linoff_in1, plines_in2, linoff_in2, bytes_in);
-            }
+            MB_RunBands(MB_SIMD_SELECT(ADD_BANDS_8_8_8), &ctx, src1->height, ctx.bytes_in);
         }
         if(dest->depth == 32) {
-            for (i = 0; i < src1->height;i++, plines_out++, plines_in1++, plines_in2++) {
-                ADD_LINE_8_8_32(plines_out, linoff_out, plines_in1, linoff_in1, plines_in2, linoff_in2, bytes_in);
-            }
+            MB_RunBands(ADD_BAND_8_8_32, &ctx, src1->height, ctx.bytes_in);
         }
         break;
 
     /* two 32 bits images */
     case MB_PAIR_32_32:
-        for (i = 0; i < src1->height;i++, plines_out++, plines_in1++, plines_in2++) {
-            ADD_LINE_32_32_32(plines_out, linoff_out, plines_in1, linoff_in1, plines_in2, linoff_in2, bytes_in);
-        }
+        MB_RunBands(MB_SIMD_SELECT(ADD_BANDS_32_32_32), &ctx, src1->height, ctx.bytes_in);
         break;
 
     /* binary image + 32 bits image */
     case MB_PAIR_1_32:
-        for (i = 0; i < src1->height;i++, plines_out++, plines_in1++, plines_in2++) {
-            ADD_LINE_1_32_32(plines_out, linoff_out, plines_in1, linoff_in1, plines_in2, linoff_in2, bytes_in);
-        }
+        MB_RunBands(ADD_BAND_1_32_32, &ctx, src1->height, ctx.bytes_in);
         break;
 
     /*8 bits image + 32 bits image*/
     case MB_PAIR_8_32:
-        for (i = 0; i < src1->height;i++, plines_out++, plines_in1++, plines_in2++) {
-            ADD_LINE_8_32_32(plines_out, linoff_out, plines_in1, linoff_in1, plines_in2, linoff_in2, bytes_in);
-        }
+        MB_RunBands(ADD_BAND_8_32_32, &ctx, src1->height, ctx.bytes_in);
         break;
 
     /* Other cases are impossible and provoke an error */
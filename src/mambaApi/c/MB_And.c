@@ -60,6 +60,12 @@ static INLINE void AND_LINE(PLINE *plines_out, Uint32 linoff_out,
     }
 }
 
+/****************************************/
+/* Band functions                       */
+/****************************************/
+
+MB_BAND_FUNC_3(AND_BAND, AND_LINE)
+
 /**
  * Performs a bitwise AND between the pixels of two images.
  * \param src1 image 1
@@ -68,9 +74,7 @@ static INLINE void AND_LINE(PLINE *plines_out, Uint32 linoff_out,
  * \return An error code (NO_ERR if successful)
  */
 MB_errcode MB_And(MB_Image *src1, MB_Image *src2, MB_Image *dest) {
-    Uint32 i;
-    PLINE *plines_in1, *plines_in2, *plines_out;
-    Uint32 linoff_out, linoff_in1, linoff_in2, bytes_in;
+    MB_LinesCtx ctx;
     
     /* verification over depth and size */
     if (!MB_CHECK_SIZE_3(src1, src2, dest)) {
@@ -81,13 +85,13 @@ MB_errcode MB_And(MB_Image *src1, MB_Image *src2, MB_Image *dest) {
     }
 
     /* Setting up line pointers */
-    plines_in1 = &src1->PLINES[MB_Y_TOP(src1)];
-    plines_in2 = &src2->PLINES[MB_Y_TOP(src2)];
-    plines_out = &dest->PLINES[MB_Y_TOP(dest)];
-    linoff_in1 = MB_LINE_OFFSET(src1);
-    linoff_in2 = MB_LINE_OFFSET(src2);
-    linoff_out = MB_LINE_OFFSET(dest);
-    bytes_in = MB_LINE_COUNT(src1);
+    ctx.plines_in1 = &src1->PLINES[MB_Y_TOP(src1)];
+    ctx.plines_in2 = &src2->PLINES[MB_Y_TOP(src2)];
+    ctx.plines_out = &dest->PLINES[MB_Y_TOP(dest)];
+    ctx.linoff_in1 = MB_LINE_OFFSET(src1);
+    ctx.linoff_in2 = MB_LINE_OFFSET(src2);
+    ctx.linoff_out = MB_LINE_OFFSET(dest);
+    ctx.bytes_in = MB_LINE_COUNT(src1);
 
     /* The two source images must have the same */
     /* depth */
@@ -101,9 +105,7 @@ MB_errcode MB_And(MB_Image *src1, MB_Image *src2, MB_Image *dest) {
     }
 
     /* for all the lines */
-    for (i = 0; i < src1->height; i++, plines_in1++, plines_in2++, plines_out++) {
-        AND_LINE(plines_out,linoff_out,plines_in1,linoff_in1,plines_in2,linoff_in2,bytes_in);
-    }
+    MB_RunBands(AND_BAND, &ctx, src1->height, ctx.bytes_in);
 
     return NO_ERR;
 }
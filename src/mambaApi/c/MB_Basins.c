@@ -39,7 +39,7 @@ typedef void (TSWITCHEP) (void *ctx, int x, int y);
 
 /** Structure holding the function contextual information 
  * such as the size of the image processed, the pointer to the pixel lines
- * the array of tokens and the current flooding level
+ * the hierarchical queue and the current flooding level
  */
 typedef struct {
     /** The width of the images processed */
@@ -47,10 +47,8 @@ typedef struct {
     /** The height of the images processed */
     Uint32 height;
     
-    /** The memory used to hold the elements of the hierarchical list */
-    MB_Token *TokensArray;
-    /** The hierarchical list entries for watershed segmentation */
-    MB_ListControl HierarchicalList[256];
+    /** The hierarchical queue for watershed segmentation */
+    MB_HQueue hq;
     
     /** pointer to the lines of the marker image */
     PLINE *plines_marker;
@@ -60,8 +58,6 @@ typedef struct {
     PLINE *plines_src;
     /** offset in the source image lines */
     Uint32 linoff_src;
-    /** size in byte of the marker image lines */
-    Uint32 bytes_marker;
     
     /** Variable indicating which level in the hierarchical list
      * the "water" as attained. Only this level and above can be filled with new
@@ -79,47 +75,20 @@ typedef struct {
  ****************************************/
 
 /**
- * Inserts a token in the hierarchical list
+ * Inserts a pixel in the hierarchical list
  * \param local_ctx pointer to the structure holding all the information needed 
  * by the algorithm
  * \param x the position in x of the concerned pixel
  * \param y the position in y of the concerned pixel
- * \param bytes number of bytes inside the line
+ * \param value the value determines in which list to insert it
  */
 static INLINE void MB_InsertInHierarchicalList(MB_Basins_Ctx *local_ctx, int x, int y, PIX8 value)
 {
-    int position;
-    int lposition;
-    int lx, ly;
-    
-    /* the token corresponding to the pixel process is */
-    /* updated/created. */
-    position = x + y*local_ctx->width;
-    local_ctx->TokensArray[position].nextx = MB_LIST_END;
-    local_ctx->TokensArray[position].nexty = MB_LIST_END;
-    
     /* insertion in the hierarchical list */
     /* the value is normed as we do not want to process */
     /* already flooded levels */
     value = (value < (local_ctx->current_water_level)) ? (local_ctx->current_water_level) : value;
-    /* the token is inserted after the last value in the list */
-    lx = local_ctx->HierarchicalList[value].lastx;
-    ly = local_ctx->HierarchicalList[value].lasty;
-    lposition = lx+ly*local_ctx->width;
-    if (lposition>=0) {
-        /*There is a last value, the list is not empty*/
-        local_ctx->TokensArray[lposition].nextx = x;
-        local_ctx->TokensArray[lposition].nexty = y;
-        local_ctx->HierarchicalList[value].lastx = x;
-        local_ctx->HierarchicalList[value].lasty = y;
-    }
-    else {
-        /* The list is empty, so we create it.*/
-        local_ctx->HierarchicalList[value].firstx = x;
-        local_ctx->HierarchicalList[value].firsty = y;
-        local_ctx->HierarchicalList[value].lastx = x;
-        local_ctx->HierarchicalList[value].lasty = y;
-    }
+    MB_HQ_Push(&local_ctx->hq, value, x + y*local_ctx->width);
 }
 
 /**
@@ -132,20 +101,17 @@ static INLINE void MB_HierarchyInit(MB_Basins_Ctx *local_ctx)
      Uint32 i,j;
      PIX32 *p;
      
-     /*All the controls are reset */
-     for(i=0;i<256;i++) {
-          local_ctx->HierarchicalList[i].firstx = local_ctx->HierarchicalList[i].lastx = MB_LIST_END;
-          local_ctx->HierarchicalList[i].firsty = local_ctx->HierarchicalList[i].lasty = MB_LIST_END;
-     }
+     /*All the lists are emptied */
+     MB_HQ_Reset(&local_ctx->hq);
      
      /* The first markers are inserted inside the hierarchical list */
      /* all the other pixels are tagged as not processed */
      local_ctx->current_water_level = 0;
      for(i=0; i<local_ctx->height; i++) {
-          for(j=0; j<local_ctx->bytes_marker; j+=4) {
-                p = (PIX32 *) (local_ctx->plines_marker[i] + local_ctx->linoff_marker + j);
+          p = (PIX32 *) (local_ctx->plines_marker[i] + local_ctx->linoff_marker);
+          for(j=0; j<local_ctx->width; j++, p++) {
                 if (((*p)&0x00ffffff)!=0)
-                     MB_InsertInHierarchicalList(local_ctx,j/4,i,0);
+                     MB_InsertInHierarchicalList(local_ctx,j,i,0);
                 else
                     *p = 0x01000000;
           }
@@ -243,7 +209,7 @@ static void MB_InsertNeighbors_hexagonal(void *ctx, int x, int y)
  ****************************************/
  
 /**
- * Simulates the flooding process using the hierarchical list. Tokens are
+ * Simulates the flooding process using the hierarchical list. Pixels are
  * extracted out of the current water level list and processed. The process consists
  * in inserting in the list all its neighbors that are not already processed.
  * \param local_ctx pointer to the structure holding all the information needed 
@@ -252,17 +218,13 @@ static void MB_InsertNeighbors_hexagonal(void *ctx, int x, int y)
  */
 static INLINE void MB_Flooding(MB_Basins_Ctx *local_ctx, Uint32 max_level)
 {
-    int fx,fy,pos;
-    Uint32 i;
+    Uint32 i, pos;
     
     for(i=0; i<max_level; i++, local_ctx->current_water_level++) {
-        fx = local_ctx->HierarchicalList[local_ctx->current_water_level].firstx;
-        fy = local_ctx->HierarchicalList[local_ctx->current_water_level].firsty;
-        while(fx>=0) {
-            pos = fx+fy*local_ctx->width;
-            local_ctx->InsertNeighbors(local_ctx,fx,fy);
-            fx = local_ctx->TokensArray[pos].nextx;
-            fy = local_ctx->TokensArray[pos].nexty;
+        pos = local_ctx->hq.first[local_ctx->current_water_level];
+        while(pos!=MB_HQ_END) {
+            local_ctx->InsertNeighbors(local_ctx, pos%local_ctx->width, pos/local_ctx->width);
+            pos = local_ctx->hq.next[pos];
         }
     }
 }
@@ -320,11 +282,10 @@ MB_errcode MB_Basins(MB_Image *src, MB_Image *marker, Uint32 max_level, enum MB_
     local_ctx.plines_marker = &marker->PLINES[MB_Y_TOP(marker)];
     local_ctx.linoff_src  = MB_LINE_OFFSET(src);
     local_ctx.linoff_marker = MB_LINE_OFFSET(marker);
-    local_ctx.bytes_marker = MB_LINE_COUNT(marker);
     
-    /* Allocating the token array */
-    local_ctx.TokensArray = MB_malloc(src->width*src->height*sizeof(MB_Token));
-    if(local_ctx.TokensArray==NULL){
+    /* Allocating the hierarchical queue (one element per pixel) */
+    local_ctx.hq.next = MB_malloc(src->width*src->height*sizeof(Uint32));
+    if(local_ctx.hq.next==NULL){
         /* in case allocation goes wrong */
         return ERR_CANT_ALLOCATE_MEMORY;
     }
@@ -342,8 +303,8 @@ MB_errcode MB_Basins(MB_Image *src, MB_Image *marker, Uint32 max_level, enum MB_
     /* Actual flooding */
     MB_Flooding(&local_ctx, max_level);
     
-    /* freeing the token array */
-    MB_free(local_ctx.TokensArray);
+    /* freeing the hierarchical queue */
+    MB_free(local_ctx.hq.next);
     
     return NO_ERR;
 }
@@ -48,22 +48,11 @@ static INLINE void BLD_LINE(PLINE *plines_germ, PLINE *plines_germ_nbr, Uint32 l
                             PLINE *plines_mask, Uint32 linoff_mask,
                             Uint32 bytes_in, Uint64 *volume)
 {
-    Uint32 i;
-    Uint64 vol=0;
-    PIX32 a;
-    
     PIX32 *germ = (PIX32 *) (*plines_germ+linoff_germ); /* inout image */
     PIX32 *mask = (PIX32 *) (*plines_mask+linoff_mask);
     PIX32 *germ_nbr = (PIX32 *) (*plines_germ_nbr+linoff_germ); /* inout image shifted */
-    
-    for(i=0;i<bytes_in;i+=4,germ++,mask++,germ_nbr++) {
-        a = (*germ)>(*germ_nbr) ? (*germ) : (*germ_nbr);
-        a = a<(*mask) ? a : (*mask);
-        *germ = a;
-        vol += a;
-    }
 
-    *volume += vol;
+    *volume += MB_BldLine32(germ, germ_nbr, mask, bytes_in/4);
 }
 
 /**
@@ -103,30 +92,23 @@ static INLINE void BLD_LINE_LEFT(PLINE *plines_germ, PLINE *plines_germ_nbr, Uin
                                  PLINE *plines_mask, Uint32 linoff_mask, 
                                  Uint32 bytes_in, Uint64 *volume) 
 {
-    Uint32 i;
-    Uint64 vol=0;
+    Uint64 vol;
     PIX32 edge_val = GREY_FILL_VALUE(MB_EMPTY_EDGE);
     PIX32 a;
+    Uint32 nb_pix = bytes_in/4;
 
-    PIX32 *germ = (PIX32 *) (*plines_germ+linoff_germ+bytes_in-4);  /* inout image */
-    PIX32 *mask = (PIX32 *) (*plines_mask+linoff_mask+bytes_in-4);
-    PIX32 *germ_nbr = (PIX32 *) (*plines_germ_nbr+linoff_germ+bytes_in); /* inout image shifted */
-    
-    /* the first pixel is inside the edge */
-    a = (*germ)>(edge_val) ? (*germ) : edge_val;
-    a = a<(*mask) ? a : (*mask);
-    *germ = a;
+    PIX32 *germ = (PIX32 *) (*plines_germ+linoff_germ); /* inout image */
+    PIX32 *mask = (PIX32 *) (*plines_mask+linoff_mask);
+    PIX32 *germ_nbr = (PIX32 *) (*plines_germ_nbr+linoff_germ); /* inout image shifted */
+
+    /* the last pixel is inside the edge */
+    a = germ[nb_pix-1]>edge_val ? germ[nb_pix-1] : edge_val;
+    a = a<mask[nb_pix-1] ? a : mask[nb_pix-1];
+    germ[nb_pix-1] = a;
     vol = a;
-    germ--;
-    mask--;
-    germ_nbr--;
-    for(i=0;i<bytes_in-4;i+=4,germ--,mask--,germ_nbr--) {
-        a = (*germ)>(*germ_nbr) ? (*germ) : (*germ_nbr);
-        a = a<(*mask) ? a : (*mask);
-        *germ = a;
-        vol += a;
-    }
-    
+    /* the other pixels are computed with their right neighbor */
+    vol += MB_BldLine32(germ, germ_nbr+1, mask, nb_pix-1);
+
     *volume += vol;
 }
 
@@ -177,30 +159,23 @@ static INLINE void BLD_LINE_RIGHT(PLINE *plines_germ, PLINE *plines_germ_nbr, Ui
                                   PLINE *plines_mask, Uint32 linoff_mask, 
                                   Uint32 bytes_in, Uint64 *volume) 
 {
-    Uint32 i;
-    Uint64 vol=0;
+    Uint64 vol;
     PIX32 edge_val = GREY_FILL_VALUE(MB_EMPTY_EDGE);
     PIX32 a;
+    Uint32 nb_pix = bytes_in/4;
 
     PIX32 *germ = (PIX32 *) (*plines_germ+linoff_germ); /* inout image */
     PIX32 *mask = (PIX32 *) (*plines_mask+linoff_mask);
-    PIX32 *germ_nbr = (PIX32 *) (*plines_germ_nbr+linoff_germ-4); /* inout image shifted */
-    
+    PIX32 *germ_nbr = (PIX32 *) (*plines_germ_nbr+linoff_germ); /* inout image shifted */
+
     /* the first pixel is inside the edge */
-    a = (*germ)>(edge_val) ? (*germ) : edge_val;
-    a = a<(*mask) ? a : (*mask);
-    *germ = a;
+    a = germ[0]>edge_val ? germ[0] : edge_val;
+    a = a<mask[0] ? a : mask[0];
+    germ[0] = a;
     vol = a;
-    germ++;
-    mask++;
-    germ_nbr++;
-    for(i=0;i<bytes_in-4;i+=4,germ++,mask++,germ_nbr++) {
-        a = (*germ)>(*germ_nbr) ? (*germ) : (*germ_nbr);
-        a = a<(*mask) ? a : (*mask);
-        *germ = a;
-        vol += a;
-    }
-    
+    /* the other pixels are computed with their left neighbor */
+    vol += MB_BldLine32(germ+1, germ_nbr, mask+1, nb_pix-1);
+
     *volume += vol;
 }
 
@@ -0,0 +1,452 @@
+/**
+ * \file MB_Build.c
+ * \date 10-17-2026
+ *
+ */
+
+
+/*
+ * Copyright (c) <2009>, <Nicolas BEUCHER and ARMINES for the Centre de
+ * Morphologie Mathématique(CMM), common research center to ARMINES and MINES
+ * Paristech>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish,
+ * distribute, sublicense, and/or sell copies of the Software, and to permit
+ * persons to whom the Software is furnished to do so, subject to the following
+ * conditions: The above copyright notice and this permission notice shall be
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright
+ * holders shall not be used in advertising or otherwise to promote the sale,
+ * use or other dealings in this Software without their prior written
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+
+/*
+ * This file contains the reconstruction of an image inside a mask for the
+ * binary, 8-bit and 32-bit images, using the hybrid algorithm of L. Vincent
+ * ("Morphological grayscale reconstruction in image analysis: applications
+ * and efficient algorithms", IEEE Transactions on Image Processing, 1993).
+ * A raster scan and an anti-raster scan propagate the values along the
+ * scanning order, then a FIFO queue propagates them from the pixels which can
+ * still change. A pixel only enters the queue when its value increases, so
+ * the cost of the reconstruction depends on the size of the image and not on
+ * the length of the geodesic paths (as for the successive builds by
+ * neighbors).
+ *
+ * The images are copied into two buffers surrounded by a border of one pixel
+ * holding 0, so that the neighbors of a pixel are always inside the buffers.
+ * The buffers hold one byte per pixel for the binary and 8-bit images (8
+ * times the memory of a binary image, 1 time the memory of an 8-bit image,
+ * for each buffer) and 32-bit values for the 32-bit images. The positions in
+ * the buffers are 32-bit values, larger images are refused. The dual
+ * reconstruction is the reconstruction of the complemented images.
+ */
+
+/** Context of the reconstruction */
+typedef struct {
+    /** size of the images */
+    Uint32 width;
+    Uint32 height;
+    /** number of values in a line of the buffers (border included) */
+    Uint32 stride;
+    /** the image reconstructed and the mask (with their border), PIX8 values
+     * for the binary and 8-bit images, Uint32 values for the 32-bit images */
+    void *marker;
+    void *mask;
+    /** offsets of the neighbors in the buffers for the even and odd lines,
+     * the neighbors preceding the pixel in the raster scan first */
+    int offsets[2][8];
+    /** number of neighbors preceding the pixel in the raster scan */
+    Uint32 nb_prev;
+    /** number of neighbors */
+    Uint32 nb;
+    /** 1 if the neighbors depend on the line (hexagonal grid) */
+    Uint32 hexagonal;
+    /** the FIFO queue of pixels (circular buffer of positions) */
+    Uint32 *queue;
+    Uint32 qsize;
+    Uint32 qhead;
+    Uint32 qcount;
+} MB_Build_Ctx;
+
+/****************************************/
+/* FIFO queue                           */
+/****************************************/
+
+/* Doubles the size of the queue, returns 0 if the memory is lacking */
+static int MB_GrowQueue(MB_Build_Ctx *ctx)
+{
+    Uint32 *queue;
+    Uint32 i;
+
+    if (ctx->qsize>0x7FFFFFFF)
+        return 0;
+    queue = (Uint32 *) MB_malloc(2*((size_t) ctx->qsize)*sizeof(Uint32));
+    if (queue==NULL)
+        return 0;
+    for (i = 0; i < ctx->qcount; i++)
+        queue[i] = ctx->queue[(ctx->qhead+i)%ctx->qsize];
+    MB_free(ctx->queue);
+    ctx->queue = queue;
+    ctx->qsize *= 2;
+    ctx->qhead = 0;
+    return 1;
+}
+
+/* Adds a pixel at the end of the queue, returns 0 if the memory is lacking */
+static INLINE int MB_PushPixel(MB_Build_Ctx *ctx, Uint32 pos)
+{
+    Uint32 i;
+
+    if (ctx->qcount==ctx->qsize && !MB_GrowQueue(ctx))
+        return 0;
+    i = ctx->qhead+ctx->qcount;
+    if (i>=ctx->qsize)
+        i -= ctx->qsize;
+    ctx->queue[i] = pos;
+    ctx->qcount++;
+    return 1;
+}
+
+/* Removes the first pixel of the queue */
+static INLINE Uint32 MB_PopPixel(MB_Build_Ctx *ctx)
+{
+    Uint32 pos = ctx->queue[ctx->qhead];
+
+    ctx->qhead++;
+    if (ctx->qhead==ctx->qsize)
+        ctx->qhead = 0;
+    ctx->qcount--;
+    return pos;
+}
+
+/****************************************/
+/* Buffers                              */
+/****************************************/
+
+/*
+ * Computes the offsets of the neighbors in the buffers. The neighbors
+ * preceding the pixel in the raster scan (above it or on its left) are put
+ * first.
+ */
+static void MB_BuildOffsets(MB_Build_Ctx *ctx, enum MB_grid_t grid)
+{
+    Uint32 par, i, n, k;
+    int dx, dy, pass;
+
+    ctx->hexagonal = (grid!=MB_SQUARE_GRID);
+    n = ctx->hexagonal ? 6 : 8;
+    for (par = 0; par < 2; par++) {
+        k = 0;
+        for (pass = 0; pass < 2; pass++) {
+            for (i = 1; i <= n; i++) {
+                dx = ctx->hexagonal ? hxNbDir[par][i][0] : sqNbDir[i][0];
+                dy = ctx->hexagonal ? hxNbDir[par][i][1] : sqNbDir[i][1];
+                if ((dy<0 || (dy==0 && dx<0)) == (pass==0))
+                    ctx->offsets[par][k++] = dx + dy*((int) ctx->stride);
+            }
+            if (pass==0)
+                ctx->nb_prev = k;
+        }
+    }
+    ctx->nb = n;
+}
+
+/*
+ * Reads a line of pixels into a line of the buffers (PIX8 values for the
+ * binary and 8-bit images, Uint32 values for the 32-bit images). The values
+ * are complemented with 'inv' (dual reconstruction).
+ */
+static void MB_ReadBuildLine(PLINE line, Uint32 depth, void *buf, Uint32 width, Uint32 inv)
+{
+    Uint32 i;
+    Uint32 *pin;
+    PIX8 *buf8 = (PIX8 *) buf;
+    Uint32 *buf32 = (Uint32 *) buf;
+
+    switch (depth) {
+    case 1:
+        pin = (Uint32 *) line;
+        for (i = 0; i < width; i++)
+            buf8[i] = (PIX8) (((pin[i/32]>>(i%32))&1) ^ inv);
+        break;
+    case 8:
+        for (i = 0; i < width; i++)
+            buf8[i] = (PIX8) (line[i] ^ inv);
+        break;
+    default:
+        pin = (Uint32 *) line;
+        for (i = 0; i < width; i++)
+            buf32[i] = pin[i] ^ inv;
+        break;
+    }
+}
+
+/*
+ * Writes a line of the buffers into a line of pixels. The values are
+ * complemented with 'inv' (dual reconstruction).
+ */
+static void MB_WriteBuildLine(PLINE line, Uint32 depth, void *buf, Uint32 width, Uint32 inv)
+{
+    Uint32 i, word;
+    Uint32 *pout;
+    PIX8 *buf8 = (PIX8 *) buf;
+    Uint32 *buf32 = (Uint32 *) buf;
+
+    switch (depth) {
+    case 1:
+        pout = (Uint32 *) line;
+        for (i = 0, word = 0; i < width; i++) {
+            word |= ((buf8[i] ^ inv)&1)<<(i%32);
+            if ((i%32)==31) {
+                pout[i/32] = word;
+                word = 0;
+            }
+        }
+        break;
+    case 8:
+        for (i = 0; i < width; i++)
+            line[i] = (PIX8) (buf8[i] ^ inv);
+        break;
+    default:
+        pout = (Uint32 *) line;
+        for (i = 0; i < width; i++)
+            pout[i] = buf32[i] ^ inv;
+        break;
+    }
+}
+
+/****************************************/
+/* Reconstruction                       */
+/****************************************/
+
+/*
+ * Defines the function 'name' propagating the values of the marker buffer
+ * inside the mask buffer, both holding values of type T. The function
+ * returns 0 if the memory is lacking.
+ */
+#define MB_HYBRID_BUILD(name, T) \
+static int name(MB_Build_Ctx *ctx) \
+{ \
+    T *J = (T *) ctx->marker; \
+    T *I = (T *) ctx->mask; \
+    Uint32 x, y, k, p, q; \
+    T v; \
+    int *off; \
+    \
+    /* raster scan, the preceding neighbors are propagated */ \
+    for (y = 0; y < ctx->height; y++) { \
+        off = ctx->offsets[y&1]; \
+        p = (y+1)*ctx->stride + 1; \
+        for (x = 0; x < ctx->width; x++, p++) { \
+            v = J[p]; \
+            for (k = 0; k < ctx->nb_prev; k++) \
+                v = (J[p+off[k]]>v) ? J[p+off[k]] : v; \
+            J[p] = (v<I[p]) ? v : I[p]; \
+        } \
+    } \
+    \
+    /* anti-raster scan, the following neighbors are propagated and the */ \
+    /* pixels which can still increase a neighbor are queued */ \
+    for (y = ctx->height; y-- > 0; ) { \
+        off = ctx->offsets[y&1]; \
+        p = (y+1)*ctx->stride + ctx->width; \
+        for (x = 0; x < ctx->width; x++, p--) { \
+            v = J[p]; \
+            for (k = ctx->nb_prev; k < ctx->nb; k++) \
+                v = (J[p+off[k]]>v) ? J[p+off[k]] : v; \
+            v = (v<I[p]) ? v : I[p]; \
+            J[p] = v; \
+            for (k = ctx->nb_prev; k < ctx->nb; k++) { \
+                q = p+off[k]; \
+                if (J[q]<v && J[q]<I[q]) { \
+                    if (!MB_PushPixel(ctx, p)) \
+                        return 0; \
+                    break; \
+                } \
+            } \
+        } \
+    } \
+    \
+    /* propagation of the queued pixels in all the directions */ \
+    while (ctx->qcount>0) { \
+        p = MB_PopPixel(ctx); \
+        off = ctx->offsets[ctx->hexagonal ? ((p/ctx->stride-1)&1) : 0]; \
+        v = J[p]; \
+        for (k = 0; k < ctx->nb; k++) { \
+            q = p+off[k]; \
+            if (J[q]<v && J[q]!=I[q]) { \
+                J[q] = (v<I[q]) ? v : I[q]; \
+                if (!MB_PushPixel(ctx, q)) \
+                    return 0; \
+            } \
+        } \
+    } \
+    \
+    return 1; \
+}
+
+MB_HYBRID_BUILD(MB_HybridBuild8, PIX8)
+MB_HYBRID_BUILD(MB_HybridBuild32, Uint32)
+
+/*
+ * Reconstructs srcdest inside mask (dual reconstruction if dual is 1).
+ */
+static MB_errcode MB_BuildImage(MB_Image *mask, MB_Image *srcdest, enum MB_grid_t grid, Uint32 dual)
+{
+    MB_Build_Ctx ctx;
+    PLINE *plines_mask, *plines_srcdest;
+    Uint32 y, x, p, inv, pixsize;
+    Uint64 count, size;
+    PIX8 *marker8, *mask8;
+    Uint32 *marker32, *mask32;
+    int done;
+    MB_errcode err = NO_ERR;
+
+    /* verification over depth and size */
+    if (!MB_CHECK_SIZE_2(srcdest, mask)) {
+        return ERR_BAD_SIZE;
+    }
+
+    /* the two images must have the same depth */
+    switch (MB_PROBE_PAIR(srcdest, mask)) {
+    case MB_PAIR_1_1:
+        inv = dual ? 1 : 0;
+        break;
+    case MB_PAIR_8_8:
+        inv = dual ? 0xFF : 0;
+        break;
+    case MB_PAIR_32_32:
+        inv = dual ? 0xFFFFFFFF : 0;
+        break;
+    default:
+        return ERR_BAD_DEPTH;
+    }
+
+    ctx.width = srcdest->width;
+    ctx.height = srcdest->height;
+    ctx.stride = ctx.width+2;
+    MB_BuildOffsets(&ctx, grid);
+
+    /* the positions in the buffers must fit in 32 bits */
+    count = ((Uint64) ctx.stride)*(ctx.height+2);
+    pixsize = (srcdest->depth==32) ? sizeof(Uint32) : sizeof(PIX8);
+    size = count*pixsize;
+    if (count>0xFFFFFFFF || size!=(Uint64) (size_t) size) {
+        return ERR_CANT_ALLOCATE_MEMORY;
+    }
+
+    /* allocating the buffers (the border is cleared) and the queue */
+    ctx.marker = MB_huge_malloc(size);
+    ctx.mask = MB_huge_malloc(size);
+    ctx.qsize = 4*(ctx.width+ctx.height);
+    ctx.qhead = 0;
+    ctx.qcount = 0;
+    ctx.queue = (Uint32 *) MB_malloc(ctx.qsize*sizeof(Uint32));
+    if (ctx.marker==NULL || ctx.mask==NULL || ctx.queue==NULL) {
+        MB_aligned_free(ctx.marker);
+        MB_aligned_free(ctx.mask);
+        MB_free(ctx.queue);
+        return ERR_CANT_ALLOCATE_MEMORY;
+    }
+    marker8 = (PIX8 *) ctx.marker;
+    mask8 = (PIX8 *) ctx.mask;
+    marker32 = (Uint32 *) ctx.marker;
+    mask32 = (Uint32 *) ctx.mask;
+    MB_memset(marker8, 0, ctx.stride*pixsize);
+    MB_memset(mask8, 0, ctx.stride*pixsize);
+    MB_memset(marker8+((size_t) (ctx.height+1))*ctx.stride*pixsize, 0, ctx.stride*pixsize);
+    MB_memset(mask8+((size_t) (ctx.height+1))*ctx.stride*pixsize, 0, ctx.stride*pixsize);
+
+    /* the image is reconstructed from its infimum with the mask */
+    plines_mask = &mask->PLINES[MB_Y_TOP(mask)];
+    plines_srcdest = &srcdest->PLINES[MB_Y_TOP(srcdest)];
+    for (y = 0; y < ctx.height; y++) {
+        p = (y+1)*ctx.stride;
+        if (pixsize==sizeof(Uint32)) {
+            marker32[p] = mask32[p] = 0;
+            marker32[p+ctx.stride-1] = mask32[p+ctx.stride-1] = 0;
+            MB_ReadBuildLine(plines_mask[y]+MB_LINE_OFFSET(mask), mask->depth,
+                             mask32+p+1, ctx.width, inv);
+            MB_ReadBuildLine(plines_srcdest[y]+MB_LINE_OFFSET(srcdest), srcdest->depth,
+                             marker32+p+1, ctx.width, inv);
+            for (x = p+1; x <= p+ctx.width; x++)
+                marker32[x] = (marker32[x]<mask32[x]) ? marker32[x] : mask32[x];
+        } else {
+            marker8[p] = mask8[p] = 0;
+            marker8[p+ctx.stride-1] = mask8[p+ctx.stride-1] = 0;
+            MB_ReadBuildLine(plines_mask[y]+MB_LINE_OFFSET(mask), mask->depth,
+                             mask8+p+1, ctx.width, inv);
+            MB_ReadBuildLine(plines_srcdest[y]+MB_LINE_OFFSET(srcdest), srcdest->depth,
+                             marker8+p+1, ctx.width, inv);
+            for (x = p+1; x <= p+ctx.width; x++)
+                marker8[x] = (marker8[x]<mask8[x]) ? marker8[x] : mask8[x];
+        }
+    }
+
+    if (pixsize==sizeof(Uint32))
+        done = MB_HybridBuild32(&ctx);
+    else
+        done = MB_HybridBuild8(&ctx);
+    if (done) {
+        for (y = 0; y < ctx.height; y++) {
+            p = (y+1)*ctx.stride+1;
+            MB_WriteBuildLine(plines_srcdest[y]+MB_LINE_OFFSET(srcdest), srcdest->depth,
+                              (pixsize==sizeof(Uint32)) ? (void *) (marker32+p) : (void *) (marker8+p),
+                              ctx.width, inv);
+        }
+    } else {
+        err = ERR_CANT_ALLOCATE_MEMORY;
+    }
+
+    MB_aligned_free(ctx.marker);
+    MB_aligned_free(ctx.mask);
+    MB_free(ctx.queue);
+
+    return err;
+}
+
+/**
+ * (re)Builds an image according to a mask image using the hybrid algorithm
+ * (raster scans and FIFO queue). Works with binary, 8-bit and 32-bit images.
+ * The result is identical to the successive builds by neighbors in all the
+ * directions, but its computation time does not depend on the length of the
+ * geodesic paths.
+ *
+ * \param mask the mask image
+ * \param srcdest the rebuild image
+ * \param grid the grid used (either square or hexagonal)
+ *
+ * \return An error code (NO_ERR if successful)
+ */
+MB_errcode MB_Build(MB_Image *mask, MB_Image *srcdest, enum MB_grid_t grid) {
+    return MB_BuildImage(mask, srcdest, grid, 0);
+}
+
+/**
+ * Dual (re)builds an image according to a mask image using the hybrid
+ * algorithm (raster scans and FIFO queue). Works with binary, 8-bit and
+ * 32-bit images (see MB_Build).
+ *
+ * \param mask the mask image
+ * \param srcdest the rebuild image
+ * \param grid the grid used (either square or hexagonal)
+ *
+ * \return An error code (NO_ERR if successful)
+ */
+MB_errcode MB_DualBuild(MB_Image *mask, MB_Image *srcdest, enum MB_grid_t grid) {
+    return MB_BuildImage(mask, srcdest, grid, 1);
+}
@@ -93,6 +93,13 @@ static INLINE void CONDIV_LINE_32_32(PLINE *plines_out, Uint32 linoff_out,
     }
 }
 
+/****************************************/
+/* Band functions                       */
+/****************************************/
+
+MB_BAND_FUNC_2P(CONDIV_BAND_8_8, CONDIV_LINE_8_8, Uint32)
+MB_BAND_FUNC_2P(CONDIV_BAND_32_32, CONDIV_LINE_32_32, Uint32)
+
 /**
  * Divides (quotient) the pixels of an image by a constant value.
  * \param src the source image
@@ -102,9 +109,7 @@ static INLINE void CONDIV_LINE_32_32(PLINE *plines_out, Uint32 linoff_out,
  */
 MB_errcode MB_ConDiv(MB_Image *src, Uint32 value, MB_Image *dest)
 {
-    Uint32 i;
-    PLINE *plines_in, *plines_out;
-    Uint32 linoff_out, linoff_in, bytes_in;
+    MB_LinesCtx ctx;
     
     /* verification over image size compatibility */
     if (!MB_CHECK_SIZE_2(src, dest)) {
@@ -112,11 +117,12 @@ MB_errcode MB_ConDiv(MB_Image *src, Uint32 value, MB_Image *dest)
     }
 
     /* Setting up line pointers */
-    plines_in = &src->PLINES[MB_Y_TOP(src)];
-    plines_out = &dest->PLINES[MB_Y_TOP(dest)];
-    linoff_in = MB_LINE_OFFSET(src);
-    linoff_out = MB_LINE_OFFSET(dest);
-    bytes_in = MB_LINE_COUNT(src);
+    ctx.plines_in1 = &src->PLINES[MB_Y_TOP(src)];
+    ctx.plines_out = &dest->PLINES[MB_Y_TOP(dest)];
+    ctx.linoff_in1 = MB_LINE_OFFSET(src);
+    ctx.linoff_out = MB_LINE_OFFSET(dest);
+    ctx.bytes_in = MB_LINE_COUNT(src);
+    ctx.param1 = (Uint32) value;
     
     /* verification over value (cannot divide by 0) */
     if (value==0) {
@@ -129,15 +135,11 @@ MB_errcode MB_ConDiv(MB_Image *src, Uint32 value, MB_Image *dest)
 
     case MB_PAIR_8_8:
         /* division with saturation */
-        for (i = 0;i < src->height;i++, plines_in++, plines_out++) {
-            CONDIV_LINE_8_8( plines_out, linoff_out, plines_in, linoff_in, bytes_in, value );
-        }
+        MB_RunBands(CONDIV_BAND_8_8, &ctx, src->height, ctx.bytes_in);
         break;
 
     case MB_PAIR_32_32:
-        for (i = 0;i < src->height;i++, plines_in++, plines_out++) {
-            CONDIV_LINE_32_32( plines_out, linoff_out, plines_in, linoff_in, bytes_in, value );
-        }
+        MB_RunBands(CONDIV_BAND_32_32, &ctx, src->height, ctx.bytes_in);
         break;
 
     default:
@@ -91,6 +91,13 @@ static INLINE void CONMUL_LINE_32_32(PLINE *plines_out, Uint32 linoff_out,
     }
 }
 
+/****************************************/
+/* Band functions                       */
+/****************************************/
+
+MB_BAND_FUNC_2P(CONMUL_BAND_8_8, CONMUL_LINE_8_8, Uint32)
+MB_BAND_FUNC_2P(CONMUL_BAND_32_32, CONMUL_LINE_32_32, Uint32)
+
 /**
  * Multiplies a constant value to the pixels of an image.
  * \param src the source image
@@ -100,9 +107,7 @@ static INLINE void CONMUL_LINE_32_32(PLINE *plines_out, Uint32 linoff_out,
  */
 MB_errcode MB_ConMul(MB_Image *src, Uint32 value, MB_Image *dest)
 {
-    Uint32 i;
-    PLINE *plines_in, *plines_out;
-    Uint32 linoff_out, linoff_in, bytes_in;
+    MB_LinesCtx ctx;
     
     /* verification over image size compatibility */
     if (!MB_CHECK_SIZE_2(src, dest)) {
@@ -110,11 +115,12 @@ MB_errcode MB_ConMul(MB_Image *src, Uint32 value, MB_Image *dest)
     }
 
     /* Setting up line pointers */
-    plines_in = &src->PLINES[MB_Y_TOP(src)];
-    plines_out = &dest->PLINES[MB_Y_TOP(dest)];
-    linoff_in = MB_LINE_OFFSET(src);
-    linoff_out = MB_LINE_OFFSET(dest);
-    bytes_in = MB_LINE_COUNT(src);
+    ctx.plines_in1 = &src->PLINES[MB_Y_TOP(src)];
+    ctx.plines_out = &dest->PLINES[MB_Y_TOP(dest)];
+    ctx.linoff_in1 = MB_LINE_OFFSET(src);
+    ctx.linoff_out = MB_LINE_OFFSET(dest);
+    ctx.bytes_in = MB_LINE_COUNT(src);
+    ctx.param1 = (Uint32) value;
 
     /* The two images must have the same */
     /* depth */
@@ -122,15 +128,11 @@ MB_errcode MB_ConMul(MB_Image *src, Uint32 value, MB_Image *dest)
 
     case MB_PAIR_8_8:
         /* addition with saturation */
-        for (i = 0;i < src->height;i++, plines_in++, plines_out++) {
-            CONMUL_LINE_8_8( plines_out, linoff_out, plines_in, linoff_in, bytes_in, value );
-        }
+        MB_RunBands(CONMUL_BAND_8_8, &ctx, src->height, ctx.bytes_in);
         break;
 
     case MB_PAIR_32_32:
-        for (i = 0;i < src->height;i++, plines_in++, plines_out++) {
-            CONMUL_LINE_32_32( plines_out, linoff_out, plines_in, linoff_in, bytes_in, value );
-        }
+        MB_RunBands(CONMUL_BAND_32_32, &ctx, src->height, ctx.bytes_in);
         break;
 
     default:
@@ -52,6 +52,22 @@ static INLINE void FILL_LINE(PLINE *plines, Uint32 linoff, Uint32 bytes, Uint32
     }
 }
 
+/**
+ * Fills the lines first to last-1 of an image with a pattern value.
+ * \param ctx the lines context (the pattern is given in param1)
+ * \param first first line of the band
+ * \param last line following the last line of the band
+ */
+static void FILL_BAND(void *ctx, Uint32 first, Uint32 last)
+{
+    MB_LinesCtx *c = (MB_LinesCtx *) ctx;
+    Uint32 i;
+
+    for (i = first; i < last; i++) {
+        FILL_LINE(c->plines_out+i, c->linoff_out, c->bytes_in, c->param1);
+    }
+}
+
 /**
  * Fills an image with a specific value
  * \param dest the image
@@ -59,14 +75,13 @@ static INLINE void FILL_LINE(PLINE *plines, Uint32 linoff, Uint32 bytes, Uint32
  * \return An error code (NO_ERR if successful)
  */
 MB_errcode MB_ConSet(MB_Image *dest, Uint32 value) {
-    Uint32 i,pattern32;
-    PLINE *plines;
-    Uint32 linoff, bytes;
+    Uint32 pattern32;
+    MB_LinesCtx ctx;
 
     /* Setting up line pointers */
-    plines = &dest->PLINES[MB_Y_TOP(dest)];
-    linoff = MB_LINE_OFFSET(dest);
-    bytes = MB_LINE_COUNT(dest);
+    ctx.plines_out = &dest->PLINES[MB_Y_TOP(dest)];
+    ctx.linoff_out = MB_LINE_OFFSET(dest);
+    ctx.bytes_in = MB_LINE_COUNT(dest);
     
     /* pattern depends on the depth of the image */
     switch(dest->depth) {
@@ -97,9 +112,8 @@ MB_errcode MB_ConSet(MB_Image *dest, Uint32 value) {
     }
 
     /* Lines fill */
-    for(i = 0; i < dest->height; i++, plines++) {
-        FILL_LINE( plines, linoff, bytes, pattern32 );
-    }
+    ctx.param1 = pattern32;
+    MB_RunBands(FILL_BAND, &ctx, dest->height, ctx.bytes_in);
 
     return NO_ERR;
 } 
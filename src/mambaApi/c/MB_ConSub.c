@@ -50,7 +50,34 @@ static INLINE void CONSUB_LINE_8_8(PLINE *plines_out, Uint32 linoff_out,
 {
     Uint32 i;
 
-#ifdef __SSE2__
+    Sint16 prov;
+
+    PLINE pin = (PLINE) (*plines_in+linoff_in);
+    PLINE pout = (PLINE) (*plines_out+linoff_out);
+
+    for(i=0;i<bytes_in;i++,pin++,pout++){
+        prov = *pin-ubvalue;
+        if (prov > 255) {
+            *pout = 255;
+        } else { 
+            if (prov < 0) 
+                *pout = 0;
+            else 
+                *pout = (PIX8) prov;
+        }
+    }
+}
+
+#ifdef MB_SIMD_X86
+/**
+ * Same as CONSUB_LINE_8_8 using SSE2 instructions.
+ */
+static INLINE MB_TARGET_SSE2 void CONSUB_LINE_8_8_SSE2(PLINE *plines_out, Uint32 linoff_out,
+                                                       PLINE *plines_in, Uint32 linoff_in,
+                                                       Uint32 bytes_in, Sint16 ubvalue)
+{
+    Uint32 i;
+
     __m128i *pin, *pout, constv;
     PIX8 satvalue;
     
@@ -89,26 +116,107 @@ static INLINE void CONSUB_LINE_8_8(PLINE *plines_out, Uint32 linoff_out,
         }
     }
     
-#else
-    Sint16 prov;
+}
 
-    PLINE pin = (PLINE) (*plines_in+linoff_in);
-    PLINE pout = (PLINE) (*plines_out+linoff_out);
+/**
+ * Same as CONSUB_LINE_8_8 using AVX2 instructions.
+ */
+static INLINE MB_TARGET_AVX2 void CONSUB_LINE_8_8_AVX2(PLINE *plines_out, Uint32 linoff_out,
+                                                       PLINE *plines_in, Uint32 linoff_in,
+                                                       Uint32 bytes_in, Sint16 ubvalue)
+{
+    Uint32 i;
 
-    for(i=0;i<bytes_in;i++,pin++,pout++){
-        prov = *pin-ubvalue;
-        if (prov > 255) {
-            *pout = 255;
-        } else { 
-            if (prov < 0) 
-                *pout = 0;
-            else 
-                *pout = (PIX8) prov;
+    __m256i *pin, *pout, constv;
+    PIX8 satvalue;
+    
+    pin = (__m256i*) (*plines_in+linoff_in);
+    pout = (__m256i*) (*plines_out+linoff_out);
+    
+    /* Computing the saturated value to subtract */
+    /* or add if the value is negative */
+    if (ubvalue<0) {
+        /* the value is negative */
+        /* we add its absolute value to the pixels */
+        if (ubvalue<-255) {
+            satvalue = 255;
+        } else {
+            satvalue = (PIX8) abs(ubvalue);
+        }
+        
+        constv = _mm256_set1_epi8 (satvalue);
+        
+        for(i=0;i<bytes_in;i+=32,pin++,pout++) {
+            _mm256_storeu_si256(pout, _mm256_adds_epu8(_mm256_loadu_si256(pin),constv));
+        }
+        
+    } else {
+        /* the value is positive */
+        /* we substract it to the pixels */
+        if (ubvalue>255) {
+            satvalue = 255;
+        } else {
+            satvalue = (PIX8) ubvalue;
+        }
+        constv = _mm256_set1_epi8 (satvalue);
+        
+        for(i=0;i<bytes_in;i+=32,pin++,pout++) {
+            _mm256_storeu_si256(pout, _mm256_subs_epu8(_mm256_loadu_si256(pin),constv));
         }
     }
-#endif
+    
 }
 
+/**
+ * Same as CONSUB_LINE_8_8 using AVX-512 instructions.
+ */
+static INLINE MB_TARGET_AVX512 void CONSUB_LINE_8_8_AVX512(PLINE *plines_out, Uint32 linoff_out,
+                                                         PLINE *plines_in, Uint32 linoff_in,
+                                                         Uint32 bytes_in, Sint16 ubvalue)
+{
+    Uint32 i;
+
+    __m512i *pin, *pout, constv;
+    PIX8 satvalue;
+    
+    pin = (__m512i*) (*plines_in+linoff_in);
+    pout = (__m512i*) (*plines_out+linoff_out);
+    
+    /* Computing the saturated value to subtract */
+    /* or add if the value is negative */
+    if (ubvalue<0) {
+        /* the value is negative */
+        /* we add its absolute value to the pixels */
+        if (ubvalue<-255) {
+            satvalue = 255;
+        } else {
+            satvalue = (PIX8) abs(ubvalue);
+        }
+        
+        constv = _mm512_set1_epi8 (satvalue);
+        
+        for(i=0;i<bytes_in;i+=64,pin++,pout++) {
+            _mm512_storeu_si512(pout, _mm512_adds_epu8(_mm512_loadu_si512(pin),constv));
+        }
+        
+    } else {
+        /* the value is positive */
+        /* we substract it to the pixels */
+        if (ubvalue>255) {
+            satvalue = 255;
+        } else {
+            satvalue = (PIX8) ubvalue;
+        }
+        constv = _mm512_set1_epi8 (satvalue);
+        
+        for(i=0;i<bytes_in;i+=64,pin++,pout++) {
+            _mm512_storeu_si512(pout, _mm512_subs_epu8(_mm512_loadu_si512(pin),constv));
+        }
+    }
+    
+}
+#endif
+
 /**
  * Subtracts a constant value to a 32-bits pixels image and places the 
  * result in a 32-bits image.
@@ -156,6 +264,24 @@ static INLINE void CONSUB_LINE_8_32(PLINE *plines_out, Uint32 linoff_out,
         *pout = ((PIX32) *pin)-value;
     }
 }
+
+/****************************************/
+/* Band functions                       */
+/****************************************/
+
+MB_BAND_FUNC_2P(CONSUB_BAND_8_8, CONSUB_LINE_8_8, Sint16)
+MB_BAND_FUNC_2P(CONSUB_BAND_32_32, CONSUB_LINE_32_32, Sint32)
+MB_BAND_FUNC_2P(CONSUB_BAND_8_32, CONSUB_LINE_8_32, Sint32)
+#ifdef MB_SIMD_X86
+MB_TARGET_SSE2 MB_BAND_FUNC_2P(CONSUB_BAND_8_8_SSE2, CONSUB_LINE_8_8_SSE2, Sint16)
+MB_TARGET_AVX2 MB_BAND_FUNC_2P(CONSUB_BAND_8_8_AVX2, CONSUB_LINE_8_8_AVX2, Sint16)
+MB_TARGET_AVX512 MB_BAND_FUNC_2P(CONSUB_BAND_8_8_AVX512, CONSUB_LINE_8_8_AVX512, Sint16)
+#endif
+
+/* Versions of the band functions for each SIMD level */
+static MB_BandFn * const CONSUB_BANDS_8_8[MB_SIMD_LEVELS] =
+    MB_SIMD_TABLE(CONSUB_BAND_8_8, CONSUB_BAND_8_8_SSE2, CONSUB_BAND_8_8_SSE2, CONSUB_BAND_8_8_AVX2, CONSUB_BAND_8_8_AVX512);
+
 /**
  * Subtracts a constant value to the pixels of an image.
  * \param src the source image
@@ -165,9 +291,7 @@ static INLINE void CONSUB_LINE_8_32(PLINE *plines_out, Uint32 linoff_out,
  */
 MB_errcode MB_ConSub(MB_Image *src, Sint32 value, MB_Image *dest)
 {
-    Uint32 i;
-    PLINE *plines_in, *plines_out;
-    Uint32 linoff_out, linoff_in, bytes_in;
+    MB_LinesCtx ctx;
     
     /* verification over image size compatibility */
     if (!MB_CHECK_SIZE_2(src, dest)) {
@@ -175,11 +299,12 @@ MB_errcode MB_ConSub(MB_Image *src, Sint32 value, MB_Image *dest)
     }
     
     /* Setting up line pointers */
-    plines_in = &src->PLINES[MB_Y_TOP(src)];
-    plines_out = &dest->PLINES[MB_Y_TOP(dest)];
-    linoff_in = MB_LINE_OFFSET(src);
-    linoff_out = MB_LINE_OFFSET(dest);
-    bytes_in = MB_LINE_COUNT(src);
+    ctx.plines_in1 = &src->PLINES[MB_Y_TOP(src)];
+    ctx.plines_out = &dest->PLINES[MB_Y_TOP(dest)];
+    ctx.linoff_in1 = MB_LINE_OFFSET(src);
+    ctx.linoff_out = MB_LINE_OFFSET(dest);
+    ctx.bytes_in = MB_LINE_COUNT(src);
+    ctx.param1 = (Uint32) value;
     
     /* The two images must have the same */
     /* depth */
@@ -187,21 +312,15 @@ MB_errcode MB_ConSub(MB_Image *src, Sint32 value, MB_Image *dest)
     
     case MB_PAIR_8_8:
         /* subtraction with saturation */
-        for (i = 0; i < src->height; i++, plines_in++, plines_out++) {
-            CONSUB_LINE_8_8( plines_out, linoff_out, plines_in, linoff_in, bytes_in, (Sint16) value );
-        }
+        MB_RunBands(MB_SIMD_SELECT(CONSUB_BANDS_8_8), &ctx, src->height, ctx.bytes_in);
         break;
 
     case MB_PAIR_32_32:
-        for (i = 0; i < src->height; i++, plines_in++, plines_out++) {
-            CONSUB_LINE_32_32( plines_out, linoff_out, plines_in, linoff_in, bytes_in, value );
-        }
+        MB_RunBands(CONSUB_BAND_32_32, &ctx, src->height, ctx.bytes_in);
         break;
 
     case MB_PAIR_8_32:
-        for (i = 0; i < src->height; i++, plines_in++, plines_out++) {
-            CONSUB_LINE_8_32( plines_out, linoff_out, plines_in, linoff_in, bytes_in, value );
-        }
+        MB_RunBands(CONSUB_BAND_8_32, &ctx, src->height, ctx.bytes_in);
         break;
         
     default:
@@ -82,6 +82,66 @@ MB_errcode MB_Convert(MB_Image *src, MB_Image *dest) {
     return ERR_BAD_DEPTH;
 }
 
+/**
+ * Converts a line of binary pixels into a line of 8-bit pixels.
+ * \param plines_out pointer on the destination image pixel line
+ * \param linoff_out offset inside the destination image line
+ * \param plines_in pointer on the source image pixel line
+ * \param linoff_in offset inside the source image line
+ * \param bytes_in number of bytes inside the source (binary) line
+ */
+static INLINE void CONVERT_LINE_1_8(PLINE *plines_out, Uint32 linoff_out,
+                                    PLINE *plines_in, Uint32 linoff_in,
+                                    Uint32 bytes_in)
+{
+    Uint32 i,u,pix_reg;
+    Uint32 *pin = (Uint32 *) (*plines_in+linoff_in);
+    Uint8 *pout = (Uint8 *) (*plines_out+linoff_out);
+
+    for(i=0; i<bytes_in*CHARBIT; i+=32,pin++) { /* <- this function is not windowed */
+        pix_reg = *pin;
+        for(u=0;u<32;u++,pout++){
+            /* for all the pixels inside the pixel register */
+            *pout = (pix_reg&1) ? 0xFF : 0;
+            pix_reg = pix_reg>>1;
+        }
+    }
+}
+
+/**
+ * Converts a line of 8-bit pixels into a line of binary pixels.
+ * \param plines_out pointer on the destination image pixel line
+ * \param linoff_out offset inside the destination image line
+ * \param plines_in pointer on the source image pixel line
+ * \param linoff_in offset inside the source image line
+ * \param bytes_in number of bytes inside the source (8-bit) line
+ */
+static INLINE void CONVERT_LINE_8_1(PLINE *plines_out, Uint32 linoff_out,
+                                    PLINE *plines_in, Uint32 linoff_in,
+                                    Uint32 bytes_in)
+{
+    Uint32 i;
+    Sint32 u;
+    Uint32 *pout = (Uint32 *) (*plines_out+linoff_out);
+    Uint32 pix_reg;
+
+    for(i=0; i<bytes_in; i+=32,pout++) { /* <- this function is not windowed */
+        /* building the pixel register */
+        pix_reg = 0;
+        for(u=31;u>-1;u--){
+            pix_reg = (pix_reg<<1) | (*(*plines_in+linoff_in+i+u)==0xFF);
+        }
+        *pout = pix_reg;
+    }
+}
+
+/****************************************/
+/* Band functions                       */
+/****************************************/
+
+MB_BAND_FUNC_2(CONVERT_BAND_1_8, CONVERT_LINE_1_8)
+MB_BAND_FUNC_2(CONVERT_BAND_8_1, CONVERT_LINE_8_1)
+
 /**
  * Converts a binary image to an 8-bit image.
  * Pixels to True are set to 255 and to 0 otherwise
@@ -90,35 +150,21 @@ MB_errcode MB_Convert(MB_Image *src, MB_Image *dest) {
  * \return An error code (NO_ERR if successful)
  */
 MB_errcode MB_Convert1to8(MB_Image *src, MB_Image *dest) {
-    Uint32 i,j,u,pix_reg;
-    PLINE *plines_in, *plines_out;
-    Uint32 linoff_out, linoff_in;
-    Uint32 *pin;
-    Uint8 *pout;
+    MB_LinesCtx ctx;
 
     /* verification to ensure depth coherency with function purpose */
     if(MB_PROBE_PAIR(src, dest) != MB_PAIR_1_8)
         return ERR_BAD_DEPTH;
         
     /* Setting up line pointers */
-    plines_in = &src->PLINES[MB_Y_TOP(src)];
-    plines_out = &dest->PLINES[MB_Y_TOP(dest)];
-    linoff_in = MB_X_LEFT(src);
-    linoff_out = MB_X_LEFT(dest);
+    ctx.plines_in1 = &src->PLINES[MB_Y_TOP(src)];
+    ctx.plines_out = &dest->PLINES[MB_Y_TOP(dest)];
+    ctx.linoff_in1 = MB_X_LEFT(src);
+    ctx.linoff_out = MB_X_LEFT(dest);
+    ctx.bytes_in = MB_LINE_COUNT(src);
     
     /* converting the 1-bit values in 8-bit values */
-    for(j=0; j<src->height; j++,plines_in++,plines_out++) {
-        pin = (Uint32 *) (*plines_in+linoff_in);
-        pout = (Uint8 *) (*plines_out+linoff_out);
-        for(i=0; i<src->width; i+=32,pin++) { /* <- this function is not windowed */
-            pix_reg = *pin;
-            for(u=0;u<32;u++,pout++){
-                /* for all the pixels inside the pixel register */
-                *pout = (pix_reg&1) ? 0xFF : 0;
-                pix_reg = pix_reg>>1;
-            }    
-        }
-    }
+    MB_RunBands(CONVERT_BAND_1_8, &ctx, src->height, MB_LINE_COUNT(dest));
     
     return NO_ERR;
 }
@@ -131,36 +177,23 @@ MB_errcode MB_Convert1to8(MB_Image *src, MB_Image *dest) {
  * \return An error code (NO_ERR if successful)
  */
 MB_errcode MB_Convert8to1(MB_Image *src, MB_Image *dest) {    
-    Uint32 i,j;
-    Sint32 u;
-    PLINE *plines_in, *plines_out;
-    Uint32 linoff_out, linoff_in;
-    Uint32 *pout, pix_reg;
+    MB_LinesCtx ctx;
 
     /* verification to ensure depth coherency with function purpose */
     if(MB_PROBE_PAIR(src, dest) != MB_PAIR_8_1)
         return ERR_BAD_DEPTH;
 
     /* Setting up line pointers */
-    plines_in = &src->PLINES[MB_Y_TOP(src)];
-    plines_out = &dest->PLINES[MB_Y_TOP(dest)];
-    linoff_in = MB_X_LEFT(src);
-    linoff_out = MB_X_LEFT(dest);
+    ctx.plines_in1 = &src->PLINES[MB_Y_TOP(src)];
+    ctx.plines_out = &dest->PLINES[MB_Y_TOP(dest)];
+    ctx.linoff_in1 = MB_X_LEFT(src);
+    ctx.linoff_out = MB_X_LEFT(dest);
+    ctx.bytes_in = MB_LINE_COUNT(src);
     
     /* converting the 8-bit values in 1-bit values */
     /* if 8-bit value is equal to 255 (white) the bit is set to 1 */
     /* and 0 in all other cases */
-    for(j=0; j<src->height; j++,plines_in++,plines_out++) {
-        pout = (Uint32 *) (*plines_out+linoff_out);
-        for(i=0; i<src->width; i+=32,pout++) { /* <- this function is not windowed */
-            /* building the pixel register */
-            pix_reg = 0;
-            for(u=31;u>-1;u--){
-                pix_reg = (pix_reg<<1) | (*(*plines_in+linoff_in+i+u)==0xFF);
-            }
-            *pout = pix_reg;
-        }
-    }    
+    MB_RunBands(CONVERT_BAND_8_1, &ctx, src->height, ctx.bytes_in);
     
     return NO_ERR;
 }
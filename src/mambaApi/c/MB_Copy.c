@@ -34,6 +34,22 @@
  */
 #include "mambaApi_loc.h"
 
+/**
+ * Copies the lines first to last-1 of an image into another.
+ * \param ctx the lines context
+ * \param first first line of the band
+ * \param last line following the last line of the band
+ */
+static void COPY_BAND(void *ctx, Uint32 first, Uint32 last)
+{
+    MB_LinesCtx *c = (MB_LinesCtx *) ctx;
+    Uint32 i;
+
+    for (i = first; i < last; i++) {
+        MB_memcpy(c->plines_out[i]+c->linoff_out, c->plines_in1[i]+c->linoff_in1, c->bytes_in);
+    }
+}
+
 /**
  * Copies an image data contents into another image
  * This copy works with same size images.
@@ -43,9 +59,7 @@
  */
 MB_errcode MB_Copy(MB_Image *src, MB_Image *dest) {
 
-    PLINE *plines_in, *plines_out;
-    Uint32 linoff_in, linoff_out, bytes_in;
-    Uint32 i;
+    MB_LinesCtx ctx;
     
     /* verification over src and dest to know */
     /* if the copy is really needed */
@@ -73,17 +87,15 @@ MB_errcode MB_Copy(MB_Image *src, MB_Image *dest) {
     }
     
     /* Setting up the pointers */
-    plines_in = &src->PLINES[MB_Y_TOP(src)];
-    plines_out = &dest->PLINES[MB_Y_TOP(dest)];
+    ctx.plines_in1 = &src->PLINES[MB_Y_TOP(src)];
+    ctx.plines_out = &dest->PLINES[MB_Y_TOP(dest)];
     
     /* Setting up offset */
-    linoff_in = MB_LINE_OFFSET(src);
-    linoff_out = MB_LINE_OFFSET(dest);
-    bytes_in = MB_LINE_COUNT(src);
+    ctx.linoff_in1 = MB_LINE_OFFSET(src);
+    ctx.linoff_out = MB_LINE_OFFSET(dest);
+    ctx.bytes_in = MB_LINE_COUNT(src);
     
-    for (i = 0; i < src->height;i++, plines_out++, plines_in++) {
-        MB_memcpy(*plines_out+linoff_out,*plines_in+linoff_in,bytes_in);
-    }
+    MB_RunBands(COPY_BAND, &ctx, src->height, ctx.bytes_in);
     
     return NO_ERR;
 }
@@ -156,7 +168,8 @@ MB_errcode MB_CopyLine(MB_Image *src, MB_Image *dest, Uint32 insrc_pos, Uint32 i
  * as the size of the copy. 
  * The function will compute the actual crop inside the source and destination 
  * images. 
- * Works only with non binary images.
+ * With binary images, the x positions and the width must be multiples of 64
+ * (the copy then works on whole words of pixels).
  * \param src the source image
  * \param x_src the x position in the source image where the copy should begin
  * \param y_src the y position in the source image where the copy should begin
@@ -181,6 +194,12 @@ MB_errcode MB_CropCopy(MB_Image *src, Uint32 x_src, Uint32 y_src,
     /* The two images must have the same */
     /* depth */
     switch (MB_PROBE_PAIR(src, dest)) {
+    case MB_PAIR_1_1:
+        /* binary pixels are only copied by whole words */
+        if ((x_src%64)!=0 || (x_dest%64)!=0 || (w%64)!=0) {
+            return ERR_BAD_VALUE;
+        }
+        break;
     case MB_PAIR_8_8:
     case MB_PAIR_32_32:
         break;
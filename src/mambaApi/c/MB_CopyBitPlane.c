@@ -130,6 +130,13 @@ static INLINE void INSERT_BITPLANE_LINE(PLINE *plines_out, Uint32 linoff_out,
     }
 }
 
+/****************************************/
+/* Band functions                       */
+/****************************************/
+
+MB_BAND_FUNC_2P(INSERT_BITPLANE_BAND, INSERT_BITPLANE_LINE, Uint32)
+MB_BAND_FUNC_2P(EXTRACT_BITPLANE_BAND, EXTRACT_BITPLANE_LINE, Uint32)
+
 /**
  * Inserts the binary image into the bit plane of the grey scale
  * image.
@@ -139,21 +146,18 @@ static INLINE void INSERT_BITPLANE_LINE(PLINE *plines_out, Uint32 linoff_out,
  * \return An error code (NO_ERR if successful)
  */
 static MB_errcode MB_InsertBitPlane1to8(MB_Image *src, MB_Image *dest, Uint32 plane) {
-    Uint32 i;
-    PLINE *plines_in, *plines_out;
-    Uint32 linoff_out, linoff_in, bytes_in;
+    MB_LinesCtx ctx;
         
     /* Setting up line pointers */
-    plines_in = &src->PLINES[MB_Y_TOP(src)];
-    plines_out = &dest->PLINES[MB_Y_TOP(dest)];
-    linoff_in = MB_LINE_OFFSET(src);
-    linoff_out = MB_LINE_OFFSET(dest);
-    bytes_in = MB_LINE_COUNT(src);
+    ctx.plines_in1 = &src->PLINES[MB_Y_TOP(src)];
+    ctx.plines_out = &dest->PLINES[MB_Y_TOP(dest)];
+    ctx.linoff_in1 = MB_LINE_OFFSET(src);
+    ctx.linoff_out = MB_LINE_OFFSET(dest);
+    ctx.bytes_in = MB_LINE_COUNT(src);
+    ctx.param1 = plane;
     
     /* converting the 1-bit values in 8-bit values */
-    for(i=0; i<src->height; i++,plines_in++,plines_out++) {
-        INSERT_BITPLANE_LINE(plines_out, linoff_out, plines_in, linoff_in, bytes_in, plane);
-    }
+    MB_RunBands(INSERT_BITPLANE_BAND, &ctx, src->height, ctx.bytes_in);
     
     return NO_ERR;
 }
@@ -167,21 +171,18 @@ static MB_errcode MB_InsertBitPlane1to8(MB_Image *src, MB_Image *dest, Uint32 pl
  * \return An error code (NO_ERR if successful)
  */
 static MB_errcode MB_ExtractBitPlane8to1(MB_Image *src, MB_Image *dest, Uint32 plane) {    
-    Uint32 i;
-    PLINE *plines_in, *plines_out;
-    Uint32 linoff_out, linoff_in, bytes_in;
+    MB_LinesCtx ctx;
     
     /* Setting up line pointers */
-    plines_in = &src->PLINES[MB_Y_TOP(src)];
-    plines_out = &dest->PLINES[MB_Y_TOP(dest)];
-    linoff_in = MB_LINE_OFFSET(src);
-    linoff_out = MB_LINE_OFFSET(dest);
-    bytes_in = MB_LINE_COUNT(src);
+    ctx.plines_in1 = &src->PLINES[MB_Y_TOP(src)];
+    ctx.plines_out = &dest->PLINES[MB_Y_TOP(dest)];
+    ctx.linoff_in1 = MB_LINE_OFFSET(src);
+    ctx.linoff_out = MB_LINE_OFFSET(dest);
+    ctx.bytes_in = MB_LINE_COUNT(src);
+    ctx.param1 = plane;
     
     /* converting the 8-bit values in 1-bit values */
-    for(i=0; i<src->height; i++,plines_in++,plines_out++) {
-        EXTRACT_BITPLANE_LINE(plines_out, linoff_out, plines_in, linoff_in, bytes_in, plane);
-    }
+    MB_RunBands(EXTRACT_BITPLANE_BAND, &ctx, src->height, ctx.bytes_in);
     
     return NO_ERR;
 }
@@ -84,6 +84,13 @@ static INLINE void INSERT_BYTEPLANE_LINE(PLINE *plines_out, Uint32 linoff_out,
     }
 }
 
+/****************************************/
+/* Band functions                       */
+/****************************************/
+
+MB_BAND_FUNC_2P(INSERT_BYTEPLANE_BAND, INSERT_BYTEPLANE_LINE, Uint32)
+MB_BAND_FUNC_2P(EXTRACT_BYTEPLANE_BAND, EXTRACT_BYTEPLANE_LINE, Uint32)
+
 /**
  * Inserts the grey scale into the byte plane of the 32-bits
  * image.
@@ -93,20 +100,17 @@ static INLINE void INSERT_BYTEPLANE_LINE(PLINE *plines_out, Uint32 linoff_out,
  * \return An error code (NO_ERR if successful)
  */
 static MB_errcode MB_InsertBytePlane8to32(MB_Image *src, MB_Image *dest, Uint32 plane) {
-    Uint32 i;
-    PLINE *plines_in, *plines_out;
-    Uint32 linoff_out, linoff_in, bytes_in;
+    MB_LinesCtx ctx;
         
     /* Setting up line pointers */
-    plines_in = &src->PLINES[MB_Y_TOP(src)];
-    plines_out = &dest->PLINES[MB_Y_TOP(dest)];
-    linoff_in = MB_LINE_OFFSET(src);
-    linoff_out = MB_LINE_OFFSET(dest);
-    bytes_in = MB_LINE_COUNT(src);
+    ctx.plines_in1 = &src->PLINES[MB_Y_TOP(src)];
+    ctx.plines_out = &dest->PLINES[MB_Y_TOP(dest)];
+    ctx.linoff_in1 = MB_LINE_OFFSET(src);
+    ctx.linoff_out = MB_LINE_OFFSET(dest);
+    ctx.bytes_in = MB_LINE_COUNT(src);
+    ctx.param1 = plane;
 
-    for (i = 0; i < src->height; i++, plines_in++, plines_out++) {
-        INSERT_BYTEPLANE_LINE(plines_out, linoff_out, plines_in, linoff_in,bytes_in, plane);
-    }
+    MB_RunBands(INSERT_BYTEPLANE_BAND, &ctx, src->height, ctx.bytes_in);
     
     return NO_ERR;
 }
@@ -120,20 +124,17 @@ static MB_errcode MB_InsertBytePlane8to32(MB_Image *src, MB_Image *dest, Uint32
  * \return An error code (NO_ERR if successful)
  */
 static MB_errcode MB_ExtractBytePlane32to8(MB_Image *src, MB_Image *dest, Uint32 plane) {    
-    Uint32 i;
-    PLINE *plines_in, *plines_out;
-    Uint32 linoff_out, linoff_in, bytes_in;
+    MB_LinesCtx ctx;
 
     /* Setting up line pointers */
-    plines_in = &src->PLINES[MB_Y_TOP(src)];
-    plines_out = &dest->PLINES[MB_Y_TOP(dest)];
-    linoff_in = MB_LINE_OFFSET(src);
-    linoff_out = MB_LINE_OFFSET(dest);
-    bytes_in = MB_LINE_COUNT(src);
+    ctx.plines_in1 = &src->PLINES[MB_Y_TOP(src)];
+    ctx.plines_out = &dest->PLINES[MB_Y_TOP(dest)];
+    ctx.linoff_in1 = MB_LINE_OFFSET(src);
+    ctx.linoff_out = MB_LINE_OFFSET(dest);
+    ctx.bytes_in = MB_LINE_COUNT(src);
+    ctx.param1 = plane;
     
-    for (i = 0; i < src->height; i++, plines_in++, plines_out++) {
-        EXTRACT_BYTEPLANE_LINE(plines_out, linoff_out, plines_in, linoff_in,bytes_in, plane);
-    }
+    MB_RunBands(EXTRACT_BYTEPLANE_BAND, &ctx, src->height, ctx.bytes_in);
     
     return NO_ERR;
 }
@@ -0,0 +1,245 @@
+/**
+ * \file MB_Cpu.c
+ * \date 10-17-2026
+ *
+ */
+
+/*
+ * Copyright (c) <2009>, <Nicolas BEUCHER and ARMINES for the Centre de
+ * Morphologie Mathématique(CMM), common research center to ARMINES and MINES
+ * Paristech>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish,
+ * distribute, sublicense, and/or sell copies of the Software, and to permit
+ * persons to whom the Software is furnished to do so, subject to the following
+ * conditions: The above copyright notice and this permission notice shall be
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright
+ * holders shall not be used in advertising or otherwise to promote the sale,
+ * use or other dealings in this Software without their prior written
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+
+
+/*
+ * This file contains the detection of the SIMD instruction sets supported by
+ * the processor. The image processing functions use it to select, when the
+ * library is running, the fastest version of their computations.
+ */
+
+#include <stdlib.h>
+#include <string.h>
+#if defined(_MSC_VER) && defined(MB_SIMD_X86)
+    #include <intrin.h>
+#endif
+
+/** Features of the processor (MB_CPU_UNKNOWN until detected) */
+static Uint32 cpu_features = MB_CPU_UNKNOWN;
+/** SIMD level used by the library (MB_CPU_UNKNOWN until detected) */
+static Uint32 simd_level = MB_CPU_UNKNOWN;
+
+/****************************************/
+/* Helper functions                     */
+/****************************************/
+
+#ifdef MB_SIMD_X86
+
+/**
+ * Executes the cpuid instruction.
+ * \param leaf the information requested (eax)
+ * \param subleaf the sub-information requested (ecx)
+ * \param regs the eax, ebx, ecx and edx registers returned
+ */
+static void MB_Cpuid(Uint32 leaf, Uint32 subleaf, Uint32 regs[4])
+{
+#if defined(_MSC_VER)
+    __cpuidex((int *) regs, (int) leaf, (int) subleaf);
+#else
+    __asm__ __volatile__ ("cpuid"
+                          : "=a" (regs[0]), "=b" (regs[1]), "=c" (regs[2]), "=d" (regs[3])
+                          : "a" (leaf), "c" (subleaf));
+#endif
+}
+
+/**
+ * Returns the processor states enabled by the operating system (xgetbv).
+ */
+static Uint64 MB_Xgetbv(void)
+{
+#if defined(_MSC_VER)
+    return (Uint64) _xgetbv(0);
+#else
+    Uint32 eax, edx;
+    __asm__ __volatile__ ("xgetbv" : "=a" (eax), "=d" (edx) : "c" (0));
+    return (((Uint64) edx)<<32) | eax;
+#endif
+}
+
+#endif
+
+/**
+ * Detects the SIMD instruction sets supported by the processor and enabled
+ * by the operating system.
+ * \return the features (combination of MB_CPU_xxx values)
+ */
+static Uint32 MB_DetectCpu(void)
+{
+    Uint32 features = 0;
+#ifdef MB_SIMD_X86
+    Uint32 regs[4], max_leaf;
+    Uint64 xcr0 = 0;
+
+    MB_Cpuid(0, 0, regs);
+    max_leaf = regs[0];
+    if (max_leaf<1)
+        return features;
+
+    MB_Cpuid(1, 0, regs);
+    if (regs[3]&(1<<26))
+        features |= MB_CPU_SSE2;
+    if (regs[2]&(1<<19))
+        features |= MB_CPU_SSE41;
+    /* the wide registers must be saved by the operating system (osxsave) */
+    if (regs[2]&(1<<27))
+        xcr0 = MB_Xgetbv();
+
+    if (max_leaf>=7) {
+        MB_Cpuid(7, 0, regs);
+        /* AVX2 needs the XMM and YMM states */
+        if ((regs[1]&(1<<5)) && (xcr0&0x06)==0x06)
+            features |= MB_CPU_AVX2;
+        /* AVX-512 (foundation and byte/word) needs the opmask and ZMM states */
+        if ((regs[1]&(1<<16)) && (regs[1]&(1<<30)) && (xcr0&0xe6)==0xe6)
+            features |= MB_CPU_AVX512;
+    }
+#endif
+    return features;
+}
+
+/**
+ * Reads the MAMBA_SIMD_LEVEL environment variable which limits the SIMD
+ * instruction sets used by the library (none, sse2, sse41, avx2 or avx512).
+ * It allows to compare the different versions of the computations.
+ * \return the maximum SIMD level (MB_SIMD_AVX512 if the variable is not set)
+ */
+static Uint32 MB_SimdLevelLimit(void)
+{
+    const char *names[] = {"none", "sse2", "sse41", "avx2", "avx512"};
+    const char *env;
+    Uint32 i;
+
+    env = getenv("MAMBA_SIMD_LEVEL");
+    if (env!=NULL) {
+        for (i=MB_SIMD_NONE; i<=MB_SIMD_AVX512; i++) {
+            if (strcmp(env, names[i])==0)
+                return i;
+        }
+    }
+    return MB_SIMD_AVX512;
+}
+
+/**
+ * Returns the widest SIMD level allowed by the given processor features.
+ * \param features the processor features (combination of MB_CPU_xxx values)
+ * \return the SIMD level (MB_SIMD_xxx value)
+ */
+static Uint32 MB_WidestLevel(Uint32 features)
+{
+    if (features&MB_CPU_AVX512)
+        return MB_SIMD_AVX512;
+    if (features&MB_CPU_AVX2)
+        return MB_SIMD_AVX2;
+    if (features&MB_CPU_SSE41)
+        return MB_SIMD_SSE41;
+    if (features&MB_CPU_SSE2)
+        return MB_SIMD_SSE2;
+    return MB_SIMD_NONE;
+}
+
+/****************************************/
+/* Main functions                       */
+/****************************************/
+
+/**
+ * Returns the SIMD instruction sets supported by the processor.
+ * \return the features (combination of MB_CPU_xxx values)
+ */
+Uint32 MB_CpuFeatures(void)
+{
+    if (cpu_features==MB_CPU_UNKNOWN)
+        cpu_features = MB_DetectCpu();
+    return cpu_features;
+}
+
+/**
+ * Returns the widest SIMD instruction set used by the image processing
+ * functions. It is initially the widest one supported by the processor,
+ * limited by the MAMBA_SIMD_LEVEL environment variable, and can be changed
+ * with MB_SetKernelLevel.
+ * \return the SIMD level (MB_SIMD_xxx value)
+ */
+Uint32 MB_SimdLevel(void)
+{
+    Uint32 widest, limit;
+
+    if (simd_level==MB_CPU_UNKNOWN) {
+        widest = MB_WidestLevel(MB_CpuFeatures());
+        limit = MB_SimdLevelLimit();
+        simd_level = widest<limit ? widest : limit;
+    }
+    return simd_level;
+}
+
+/**
+ * Returns the SIMD instruction sets supported by the processor and enabled
+ * by the operating system.
+ * \param features the features (combination of MB_CPU_xxx values)
+ * \return An error code (NO_ERR if successful)
+ */
+MB_errcode MB_GetCpuFeatures(Uint32 *features)
+{
+    *features = MB_CpuFeatures();
+    return NO_ERR;
+}
+
+/**
+ * Sets the widest SIMD instruction set used by the image processing
+ * functions. A narrower level than the one supported by the processor can
+ * be used to compare the versions of the computations.
+ * The level must not be changed while a computation is running.
+ * \param level the SIMD level (MB_SIMD_xxx value)
+ * \return An error code (NO_ERR if successful)
+ */
+MB_errcode MB_SetKernelLevel(Uint32 level)
+{
+    if (level>MB_WidestLevel(MB_CpuFeatures())) {
+        return ERR_BAD_VALUE;
+    }
+    simd_level = level;
+    return NO_ERR;
+}
+
+/**
+ * Returns the widest SIMD instruction set used by the image processing
+ * functions.
+ * \param level the SIMD level (MB_SIMD_xxx value)
+ * \return An error code (NO_ERR if successful)
+ */
+MB_errcode MB_GetKernelLevel(Uint32 *level)
+{
+    *level = MB_SimdLevel();
+    return NO_ERR;
+}
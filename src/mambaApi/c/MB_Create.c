@@ -34,7 +34,7 @@
  */
 #include "mambaApi_loc.h"
 
-/* image counter */
+/* image counter (images can be created and destroyed by several threads) */
 Uint32 MB_refcounter = 0;
 
 /** Making sure the image size is multiple of 64 for the width */
@@ -50,28 +50,47 @@ Uint32 MB_refcounter = 0;
  * labels is 2^24 (3 lower bytes of the label image). Therefore, if, in
  * a large image, the number of labels exceeds this value, some basins of
  * the watershed transform will share the same label. You must be aware of
- * this possibility.
+ * this possibility. MB_WatershedLabels32 and MB_BasinsLabels32 use the 32
+ * bits of the label image and do not have this limitation.
+ * The limit, MB_MAX_IMAGE_SIZE, is defined in mambaApi_loc.h.
  */
-/** Image limit size in pixels*/
-#define MB_MAX_IMAGE_SIZE    ((Uint64)4294967296)
 
-/**
- * Creates an image (memory allocation) with the correct size and depth given as
- * argument. The size is deduced from the requested size given in argument. 
- * The size must be a multiple of MB_ROUND_W for width and MB_ROUND_H for height.
- * The size cannot be greater than MB_MAX_IMAGE_SIZE.
- * \param image the created image
- * \param width the width of the created image 
- * \param height the height of the created image 
- * \param depth the depth of the created image 
- * \return An error code (NO_ERR if successful)
+/** Allocation options of the large images (see MB_SetAllocation) */
+static Uint32 alloc_flags = 0;
+/** Size in bytes from which an image is a large image */
+static Uint32 alloc_threshold = 16*1024*1024;
+
+/** Context of the band function clearing the memory of a new image */
+typedef struct {
+    PIX8 *pixarray;
+    Uint32 full_w;
+} MB_ClearCtx;
+
+/*
+ * Sets to 0 the lines first to last-1 of the memory of a new image. The
+ * pages of the lines are thus first touched by the thread computing the
+ * band, and placed on the memory of its NUMA node.
  */
-MB_errcode MB_Create(MB_Image *image, Uint32 width, Uint32 height, Uint32 depth) {
+static void MB_ClearBand(void *vctx, Uint32 first, Uint32 last)
+{
+    MB_ClearCtx *ctx = (MB_ClearCtx *) vctx;
+
+    MB_memset(ctx->pixarray+((Uint64) first)*ctx->full_w, 0, (last-first)*ctx->full_w);
+}
+
+/*
+ * Creates an image, see MB_Create. When clear is false, only the edge lines
+ * and the padding on both sides of the lines are set to 0.
+ */
+static MB_errcode MB_CreateImage(MB_Image *image, Uint32 width, Uint32 height,
+                                 Uint32 depth, Uint32 clear) {
     PLINE *plines = NULL;
     PIX8 *pixarray = NULL;
     Uint32 i;
     Uint32 full_w, full_h;
     Uint64 image_size;
+    Uint32 large;
+    MB_ClearCtx ctx;
     
     /* computation of the corrected size */
     /* w = n*M + r    where 0 <= r < M
@@ -108,7 +127,11 @@ MB_errcode MB_Create(MB_Image *image, Uint32 width, Uint32 height, Uint32 depth)
      * We need aligned memory allocation to be sure that it works correctly with
      * SSE2 instructions enabled. Aligned memory allocation is system dependant.
      */
-    pixarray = (PIX8 *) MB_aligned_malloc(full_w*full_h, 16);
+    large = ((Uint64) full_w)*full_h >= alloc_threshold;
+    if (large && (alloc_flags&MB_ALLOC_HUGEPAGES))
+        pixarray = (PIX8 *) MB_huge_malloc(((Uint64) full_w)*full_h);
+    else
+        pixarray = (PIX8 *) MB_aligned_malloc(full_w*full_h, 16);
 
     if (pixarray == NULL || plines == NULL) {
         /* in case allocation goes wrong */
@@ -118,7 +141,23 @@ MB_errcode MB_Create(MB_Image *image, Uint32 width, Uint32 height, Uint32 depth)
     } 
     
     /* Fills in the MB_Image structure */
-    MB_memset(pixarray, 0, full_w*full_h);
+    if (large && (alloc_flags&MB_ALLOC_FIRSTTOUCH)) {
+        /* the memory is cleared by the row-band threads (even if the */
+        /* pixels could be left undefined) to place it on their nodes */
+        ctx.pixarray = pixarray;
+        ctx.full_w = full_w;
+        MB_RunBands(MB_ClearBand, &ctx, full_h, full_w);
+    } else if (clear) {
+        MB_memset(pixarray, 0, full_w*full_h);
+    } else {
+        /* the pixels are left undefined */
+        MB_memset(pixarray, 0, full_w*Y_TOP);
+        MB_memset(pixarray+full_w*(full_h-Y_BOTTOM), 0, full_w*Y_BOTTOM);
+        for (i = Y_TOP; i < full_h-Y_BOTTOM; i++) {
+            MB_memset(pixarray+i*full_w, 0, X_LEFT);
+            MB_memset(pixarray+(i+1)*full_w-X_RIGHT, 0, X_RIGHT);
+        }
+    }
     image->PLINES = plines;
     image->PIXARRAY = pixarray;
     image->depth = depth;
@@ -129,11 +168,73 @@ MB_errcode MB_Create(MB_Image *image, Uint32 width, Uint32 height, Uint32 depth)
     for (i = 0; i < full_h; i++, pixarray += full_w)
         plines[i] = (PLINE) pixarray;
 
-    MB_refcounter++;
+    MB_atomic_inc(&MB_refcounter);
     
     return NO_ERR;
 }
 
+/**
+ * Creates an image (memory allocation) with the correct size and depth given as
+ * argument. The size is deduced from the requested size given in argument. 
+ * The size must be a multiple of MB_ROUND_W for width and MB_ROUND_H for height.
+ * The size cannot be greater than MB_MAX_IMAGE_SIZE.
+ * \param image the created image
+ * \param width the width of the created image 
+ * \param height the height of the created image 
+ * \param depth the depth of the created image 
+ * \return An error code (NO_ERR if successful)
+ */
+MB_errcode MB_Create(MB_Image *image, Uint32 width, Uint32 height, Uint32 depth) {
+    return MB_CreateImage(image, width, height, depth, 1);
+}
+
+/**
+ * Creates an image like MB_Create without setting its pixels to 0 (the edge
+ * and the padding of the lines are nevertheless set to 0). This saves the
+ * clearing of the memory for the work images whose pixels are all written
+ * before being read.
+ * \param image the created image
+ * \param width the width of the created image 
+ * \param height the height of the created image 
+ * \param depth the depth of the created image 
+ * \return An error code (NO_ERR if successful)
+ */
+MB_errcode MB_CreateUninit(MB_Image *image, Uint32 width, Uint32 height, Uint32 depth) {
+    return MB_CreateImage(image, width, height, depth, 0);
+}
+
+/**
+ * Sets how the memory of the large images is allocated. The options are
+ * given by flags: MB_ALLOC_HUGEPAGES backs the memory with huge pages (Linux
+ * only), MB_ALLOC_FIRSTTOUCH has the memory cleared by the row-band threads
+ * (see MB_SetThreadCount) so that, on a NUMA system, each band is placed on
+ * the node of the thread that touched it first. The options only apply to
+ * the images whose memory (edge included) is at least threshold bytes.
+ * \param flags the allocation options (0 for the default allocation)
+ * \param threshold the size in bytes from which the options apply
+ * \return An error code (NO_ERR if successful)
+ */
+MB_errcode MB_SetAllocation(Uint32 flags, Uint32 threshold) {
+    if (flags & ~(MB_ALLOC_HUGEPAGES|MB_ALLOC_FIRSTTOUCH))
+        return ERR_BAD_VALUE;
+    alloc_flags = flags;
+    alloc_threshold = threshold;
+    return NO_ERR;
+}
+
+/**
+ * Returns the options used to allocate the memory of the large images (see
+ * MB_SetAllocation).
+ * \param flags the allocation options
+ * \param threshold the size in bytes from which the options apply
+ * \return An error code (NO_ERR if successful)
+ */
+MB_errcode MB_GetAllocation(Uint32 *flags, Uint32 *threshold) {
+    *flags = alloc_flags;
+    *threshold = alloc_threshold;
+    return NO_ERR;
+}
+
 /* Fixme?: Some code is duplicated here */
 MB_errcode create_from_numpy(MB_Image *image,
 			     PIX8 *pixel_array, Uint32 array_height, Uint32 array_width,
@@ -156,8 +257,8 @@ MB_errcode create_from_numpy(MB_Image *image,
     }
 
     /* verification over the depth */
-    /* acceptable values are 8 or 32 bits */
-    if (depth != 8 && depth != 32)
+    /* acceptable values are 1, 8 or 32 bits */
+    if (depth != 1 && depth != 8 && depth != 32)
         return ERR_BAD_DEPTH;
    
     /* memory allocation */
@@ -180,11 +281,16 @@ MB_errcode create_from_numpy(MB_Image *image,
     for (i = 0; i < array_height; i++, pixel_array += line_step)
         plines[i] = (PLINE) pixel_array;
     
-    MB_refcounter++;
+    MB_atomic_inc(&MB_refcounter);
     
     return NO_ERR;
 }
 
+MB_errcode MB_Create_from_numpyb(MB_Image *image, PIX8 *pixel_array,
+				 Uint32 array_height, Uint32 array_width, Uint32 width, Uint32 line_step) {
+  return create_from_numpy(image, pixel_array, array_height, array_width, width, line_step, 1);
+}
+
 MB_errcode MB_Create_from_numpy8(MB_Image *image, PIX8 *pixel_array,
 				 Uint32 array_height, Uint32 array_width, Uint32 width, Uint32 line_step) {
   return create_from_numpy(image, pixel_array, array_height, array_width, width, line_step, 8);
@@ -201,6 +307,8 @@ MB_errcode MB_Create_from_numpy32(MB_Image *image, PIX32 *pixel_array,
  * \return An error code (NO_ERR if successful)
  */
 MB_errcode MB_Destroy(MB_Image *image) {
+    Uint32 count;
+
     if (image == NULL)
         return NO_ERR;
 
@@ -208,8 +316,30 @@ MB_errcode MB_Destroy(MB_Image *image) {
     if (image->allocated)
       MB_aligned_free(image->PIXARRAY);
     MB_free(image);
-    if (MB_refcounter > 0)
-        MB_refcounter--;
+    do {
+        count = MB_refcounter;
+        if (count == 0)
+            break;
+    } while (!MB_atomic_cas(&MB_refcounter, count, count-1));
     
     return NO_ERR;
 }
+
+/**
+ * Gives the location of the pixels of an image in memory, so that they can be
+ * shared with other libraries without copy. The lines of the image are
+ * separated by a constant number of bytes.
+ * \param image the image
+ * \param address the address of the first pixel of the image (returned)
+ * \param stride the number of bytes between the beginnings of two lines (returned)
+ * \return An error code (NO_ERR if successful)
+ */
+MB_errcode MB_GetPixelLayout(MB_Image *image, Uint64 *address, Uint32 *stride) {
+    PLINE *plines;
+
+    plines = &image->PLINES[MB_Y_TOP(image)];
+    *address = (Uint64) (uintptr_t) (plines[0] + MB_LINE_OFFSET(image));
+    *stride = (Uint32) (plines[1] - plines[0]);
+
+    return NO_ERR;
+}
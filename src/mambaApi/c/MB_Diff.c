@@ -112,6 +112,13 @@ static INLINE void DIFF_LINE_1_1(PLINE *plines_out, Uint32 linoff_out,
     }
 }
 
+/****************************************/
+/* Band functions                       */
+/****************************************/
+
+MB_BAND_FUNC_3(DIFF_BAND_1_1, DIFF_LINE_1_1)
+MB_BAND_FUNC_3(DIFF_BAND_8_8, DIFF_LINE_8_8)
+MB_BAND_FUNC_3(DIFF_BAND_32_32, DIFF_LINE_32_32)
 
 /**
  * Computes the set difference between two images.
@@ -125,9 +132,7 @@ static INLINE void DIFF_LINE_1_1(PLINE *plines_out, Uint32 linoff_out,
  */
 MB_errcode MB_Diff(MB_Image *src1, MB_Image *src2, MB_Image *dest)
 {
-    Uint32 i;
-    PLINE *plines_in1, *plines_in2, *plines_out;
-    Uint32 linoff_out, linoff_in1, linoff_in2, bytes_in;
+    MB_LinesCtx ctx;
     
     /* verification over image size compatibility */
     if (!MB_CHECK_SIZE_3(src1, src2, dest)) {
@@ -139,33 +144,27 @@ MB_errcode MB_Diff(MB_Image *src1, MB_Image *src2, MB_Image *dest)
     }
 
     /* Setting up line pointers */
-    plines_in1 = &src1->PLINES[MB_Y_TOP(src1)];
-    plines_in2 = &src2->PLINES[MB_Y_TOP(src2)];
-    plines_out = &dest->PLINES[MB_Y_TOP(dest)];
-    linoff_in1 = MB_LINE_OFFSET(src1);
-    linoff_in2 = MB_LINE_OFFSET(src2);
-    linoff_out = MB_LINE_OFFSET(dest);
-    bytes_in = MB_LINE_COUNT(src1);
+    ctx.plines_in1 = &src1->PLINES[MB_Y_TOP(src1)];
+    ctx.plines_in2 = &src2->PLINES[MB_Y_TOP(src2)];
+    ctx.plines_out = &dest->PLINES[MB_Y_TOP(dest)];
+    ctx.linoff_in1 = MB_LINE_OFFSET(src1);
+    ctx.linoff_in2 = MB_LINE_OFFSET(src2);
+    ctx.linoff_out = MB_LINE_OFFSET(dest);
+    ctx.bytes_in = MB_LINE_COUNT(src1);
 
     /* The two source images must have the same depth */
     switch(MB_PROBE_PAIR(src1,src2)) {
 
     case MB_PAIR_1_1:
-        for (i = 0; i < src1->height; i++, plines_in1++, plines_in2++, plines_out++) {
-            DIFF_LINE_1_1(plines_out, linoff_out, plines_in1, linoff_in1, plines_in2, linoff_in2, bytes_in);
-        }
+        MB_RunBands(DIFF_BAND_1_1, &ctx, src1->height, ctx.bytes_in);
         break;
 
     case MB_PAIR_8_8:
-        for (i = 0; i < src1->height; i++, plines_in1++, plines_in2++, plines_out++) {
-            DIFF_LINE_8_8(plines_out, linoff_out, plines_in1, linoff_in1, plines_in2, linoff_in2, bytes_in);
-        }
+        MB_RunBands(DIFF_BAND_8_8, &ctx, src1->height, ctx.bytes_in);
         break;
 
     case MB_PAIR_32_32:
-        for (i = 0; i < src1->height; i++, plines_in1++, plines_in2++, plines_out++) {
-            DIFF_LINE_32_32(plines_out, linoff_out, plines_in1, linoff_in1, plines_in2, linoff_in2, bytes_in);
-        }
+        MB_RunBands(DIFF_BAND_32_32, &ctx, src1->height, ctx.bytes_in);
         break;
 
     default:
@@ -180,7 +180,6 @@ MB_errcode MB_DiffNbb(MB_Image *src, MB_Image *srcdest, Uint32 nbrnum, enum MB_g
     Uint32 linoff_in, linoff_inout;
     Uint32 bytes_in;
     PLINE *plines_in, *plines_inout;
-    TSWITCHEP *fn;
 
     /* error management */
     /* verification over image size compatibility */
@@ -211,10 +210,7 @@ MB_errcode MB_DiffNbb(MB_Image *src, MB_Image *srcdest, Uint32 nbrnum, enum MB_g
     bytes_in = MB_LINE_COUNT(src);
 
     /* Calling the corresponding function */
-    fn = SwitchTo[grid][nbrnum];
-    fn(plines_inout, linoff_inout, plines_in, linoff_in, bytes_in, src->height, 1, BIN_FILL_VALUE(edge));
-    
-    return NO_ERR;
+    return MB_CompNb(plines_inout, linoff_inout, plines_in, linoff_in, bytes_in, src->height, 1, BIN_FILL_VALUE(edge), grid, nbrnum);
 }
 
 
@@ -44,14 +44,40 @@
  * Used to rebuild the pixels of a line with a line directly above or below.
  * No shifting inside the line.
  */
-static INLINE void BLD_LINE(PLINE *plines_germ, PLINE *plines_germ_nbr, Uint32 linoff_germ,
-                            PLINE *plines_mask, Uint32 linoff_mask,
-                            Uint32 bytes_in, Uint64 *volume)
+static INLINE void BLD_LINE_SCALAR(PLINE *plines_germ, PLINE *plines_germ_nbr, Uint32 linoff_germ,
+                                   PLINE *plines_mask, Uint32 linoff_mask,
+                                   Uint32 bytes_in, Uint64 *volume)
+{
+    Uint32 i;
+    Uint64 vol=0;
+    
+    PIX8 a;
+    
+    PLINE germ = (PLINE) (*plines_germ+linoff_germ); /* inout image */
+    PLINE mask = (PLINE) (*plines_mask+linoff_mask);
+    PLINE germ_nbr = (PLINE) (*plines_germ_nbr+linoff_germ); /* inout image shifted */
+    
+    for(i=0;i<bytes_in;i++,germ++,mask++,germ_nbr++) {
+        a = (*germ)<(*germ_nbr) ? (*germ) : (*germ_nbr);
+        a = a>(*mask) ? a : (*mask);
+        *germ = a;
+        vol += a;
+    }
+
+    *volume += vol;
+}
+
+#if defined(MB_SIMD_X86) && !defined(__MINGW32__)
+/**
+ * Same as BLD_LINE_SCALAR using SSE2 instructions.
+ */
+static INLINE MB_TARGET_SSE2 void BLD_LINE_SSE2(PLINE *plines_germ, PLINE *plines_germ_nbr, Uint32 linoff_germ,
+                                                PLINE *plines_mask, Uint32 linoff_mask,
+                                                Uint32 bytes_in, Uint64 *volume)
 {
     Uint32 i;
     Uint64 vol=0;
     
-#if defined(__SSE2__) && !defined(__MINGW32__)
     __m128i a;
     __m128i zero = _mm_setzero_si128();
 
@@ -67,37 +93,49 @@ static INLINE void BLD_LINE(PLINE *plines_germ, PLINE *plines_germ_nbr, Uint32 l
         a = _mm_sad_epu8(a,zero);
         vol += ((Uint16 *) &a)[0]+((Uint16 *) &a)[4];
     }
+
+    *volume += vol;
+}
+#endif
+
+/**
+ * Used to rebuild the pixels of a line when this line is touching the edge.
+ */
+static INLINE void BLD_EDGE_LINE_SCALAR(PLINE *plines_germ, Uint32 linoff_germ,
+                                          PLINE *plines_mask, Uint32 linoff_mask,
+                                          Uint32 bytes_in, Uint64 *volume )
+{
+    Uint32 i;
+    Uint64 vol=0;
+    PIX8 edge_val = (PIX8) GREY_FILL_VALUE(MB_FILLED_EDGE);
     
-#else
     PIX8 a;
-    
+
     PLINE germ = (PLINE) (*plines_germ+linoff_germ); /* inout image */
     PLINE mask = (PLINE) (*plines_mask+linoff_mask);
-    PLINE germ_nbr = (PLINE) (*plines_germ_nbr+linoff_germ); /* inout image shifted */
     
-    for(i=0;i<bytes_in;i++,germ++,mask++,germ_nbr++) {
-        a = (*germ)<(*germ_nbr) ? (*germ) : (*germ_nbr);
+    for(i=0;i<bytes_in;i++,germ++,mask++) {
+        a = (*germ)<(edge_val) ? (*germ) : edge_val;
         a = a>(*mask) ? a : (*mask);
         *germ = a;
         vol += a;
     }
-#endif
-
+    
     *volume += vol;
 }
 
+#if defined(MB_SIMD_X86) && !defined(__MINGW32__)
 /**
- * Used to rebuild the pixels of a line when this line is touching the edge.
+ * Same as BLD_EDGE_LINE_SCALAR using SSE2 instructions.
  */
-static INLINE void BLD_EDGE_LINE(PLINE *plines_germ, Uint32 linoff_germ,
-                                   PLINE *plines_mask, Uint32 linoff_mask,
-                                   Uint32 bytes_in, Uint64 *volume )
+static INLINE MB_TARGET_SSE2 void BLD_EDGE_LINE_SSE2(PLINE *plines_germ, Uint32 linoff_germ,
+                                                       PLINE *plines_mask, Uint32 linoff_mask,
+                                                       Uint32 bytes_in, Uint64 *volume )
 {
     Uint32 i;
     Uint64 vol=0;
     PIX8 edge_val = (PIX8) GREY_FILL_VALUE(MB_FILLED_EDGE);
     
-#if defined(__SSE2__) && !defined(__MINGW32__)
     __m128i a;
 
     __m128i edge = _mm_set1_epi8 ((char) edge_val);
@@ -113,40 +151,62 @@ static INLINE void BLD_EDGE_LINE(PLINE *plines_germ, Uint32 linoff_germ,
         a = _mm_sad_epu8 (a,zero);
         vol += ((Uint16 *) &a)[0]+((Uint16 *) &a)[4];
     }
+
+    *volume += vol;
+}
+#endif
+
+/**
+ * Used to rebuild the pixels of a line using the pixels of an above, below 
+ * but shifted in the left direction. In fact, to emulate this, we do
+ * not look directly into the above pixel but we look into the above to the right
+ * pixel which would have been directly above had the left shifting really
+ * happened.
+ */
+static INLINE void BLD_LINE_LEFT_SCALAR(PLINE *plines_germ, PLINE *plines_germ_nbr, Uint32 linoff_germ,
+                                        PLINE *plines_mask, Uint32 linoff_mask, 
+                                        Uint32 bytes_in, Uint64 *volume )
+{
+    Uint32 i;
+    Uint64 vol=0;
+    PIX8 edge_val = (PIX8) GREY_FILL_VALUE(MB_FILLED_EDGE);
     
-#else
     PIX8 a;
 
-    PLINE germ = (PLINE) (*plines_germ+linoff_germ); /* inout image */
-    PLINE mask = (PLINE) (*plines_mask+linoff_mask);
+    PLINE germ = (PLINE) (*plines_germ+linoff_germ+bytes_in-1);  /* inout image */
+    PLINE mask = (PLINE) (*plines_mask+linoff_mask+bytes_in-1);
+    PLINE germ_nbr = (PLINE) (*plines_germ_nbr+linoff_germ+bytes_in); /* inout image shifted */
     
-    for(i=0;i<bytes_in;i++,germ++,mask++) {
-        a = (*germ)<(edge_val) ? (*germ) : edge_val;
+    /* the first pixel is inside the edge */
+    a = (*germ)<(edge_val) ? (*germ) : edge_val;
+    a = a>(*mask) ? a : (*mask);
+    *germ = a;
+    vol = a;
+    germ--;
+    mask--;
+    germ_nbr--;
+    for(i=0;i<bytes_in-1;i++,germ--,mask--,germ_nbr--) {
+        a = (*germ)<(*germ_nbr) ? (*germ) : (*germ_nbr);
         a = a>(*mask) ? a : (*mask);
         *germ = a;
         vol += a;
     }
-#endif
     
     *volume += vol;
 }
 
+#if defined(MB_SIMD_X86) && !defined(__MINGW32__)
 /**
- * Used to rebuild the pixels of a line using the pixels of an above, below 
- * but shifted in the left direction. In fact, to emulate this, we do
- * not look directly into the above pixel but we look into the above to the right
- * pixel which would have been directly above had the left shifting really
- * happened.
+ * Same as BLD_LINE_LEFT_SCALAR using SSE2 instructions.
  */
-static INLINE void BLD_LINE_LEFT(PLINE *plines_germ, PLINE *plines_germ_nbr, Uint32 linoff_germ,
-                                 PLINE *plines_mask, Uint32 linoff_mask, 
-                                 Uint32 bytes_in, Uint64 *volume ) 
+static INLINE MB_TARGET_SSE2 void BLD_LINE_LEFT_SSE2(PLINE *plines_germ, PLINE *plines_germ_nbr, Uint32 linoff_germ,
+                                                     PLINE *plines_mask, Uint32 linoff_mask, 
+                                                     Uint32 bytes_in, Uint64 *volume )
 {
     Uint32 i;
     Uint64 vol=0;
     PIX8 edge_val = (PIX8) GREY_FILL_VALUE(MB_FILLED_EDGE);
     
-#if defined(__SSE2__) && !defined(__MINGW32__)
     __m128i a,b;
 
      __m128i edge = _mm_set1_epi8 ((char) edge_val);
@@ -167,32 +227,10 @@ static INLINE void BLD_LINE_LEFT(PLINE *plines_germ, PLINE *plines_germ_nbr, Uin
         a = _mm_sad_epu8 (a,zero);
         vol += ((Uint16 *) &a)[0]+((Uint16 *) &a)[4];
     }
-    
-#else
-    PIX8 a;
 
-    PLINE germ = (PLINE) (*plines_germ+linoff_germ+bytes_in-1);  /* inout image */
-    PLINE mask = (PLINE) (*plines_mask+linoff_mask+bytes_in-1);
-    PLINE germ_nbr = (PLINE) (*plines_germ_nbr+linoff_germ+bytes_in); /* inout image shifted */
-    
-    /* the first pixel is inside the edge */
-    a = (*germ)<(edge_val) ? (*germ) : edge_val;
-    a = a>(*mask) ? a : (*mask);
-    *germ = a;
-    vol = a;
-    germ--;
-    mask--;
-    germ_nbr--;
-    for(i=0;i<bytes_in-1;i++,germ--,mask--,germ_nbr--) {
-        a = (*germ)<(*germ_nbr) ? (*germ) : (*germ_nbr);
-        a = a>(*mask) ? a : (*mask);
-        *germ = a;
-        vol += a;
-    }
-#endif
-    
     *volume += vol;
 }
+#endif
 
 /**
  * Used to rebuild the pixels of a line using the pixels of
@@ -237,37 +275,14 @@ static INLINE void BLD_LINE_LEFT_HORZ(PLINE *plines_germ, Uint32 linoff_germ,
  * pixel which would have been directly above had the right shifting really
  * happened.
  */
-static INLINE void BLD_LINE_RIGHT(PLINE *plines_germ, PLINE *plines_germ_nbr, Uint32 linoff_germ,
-                                  PLINE *plines_mask, Uint32 linoff_mask, 
-                                  Uint32 bytes_in, Uint64 *volume ) 
+static INLINE void BLD_LINE_RIGHT_SCALAR(PLINE *plines_germ, PLINE *plines_germ_nbr, Uint32 linoff_germ,
+                                         PLINE *plines_mask, Uint32 linoff_mask, 
+                                         Uint32 bytes_in, Uint64 *volume )
 {
     Uint32 i;
     Uint64 vol=0;
     PIX8 edge_val = (PIX8) GREY_FILL_VALUE(MB_FILLED_EDGE);
     
-#if defined(__SSE2__) && !defined(__MINGW32__)
-    __m128i a,b;
-
-    __m128i edge = _mm_set1_epi8 ((char) edge_val);
-    __m128i zero = _mm_setzero_si128 ();
-    __m128i *germ = (__m128i *) (*plines_germ+linoff_germ);
-    __m128i *mask = (__m128i *) (*plines_mask+linoff_mask);
-    __m128i *germ_nbr = (__m128i *) (*plines_germ_nbr+linoff_germ);
-    
-    for(i=0;i<bytes_in;i+=16,germ++,mask++,germ_nbr++) {
-        b = (*germ_nbr);
-        edge = _mm_srli_si128 (edge, 15); /* >> */
-        a = _mm_slli_si128 (b, 1); /* << */
-        a = _mm_or_si128 (a, edge); /* | */
-        a = _mm_min_epu8(a,(*germ));
-        a = _mm_max_epu8((*mask),a);
-        (*germ) = a;
-        edge = b;
-        a = _mm_sad_epu8 (a,zero);
-        vol += ((Uint16 *) &a)[0]+((Uint16 *) &a)[4];
-    }
-    
-#else
     PIX8 a;
 
     PLINE germ = (PLINE) (*plines_germ+linoff_germ); /* inout image */
@@ -288,11 +303,47 @@ static INLINE void BLD_LINE_RIGHT(PLINE *plines_germ, PLINE *plines_germ_nbr, Ui
         *germ = a;
         vol += a;
     }
-#endif
     
     *volume += vol;
 }
 
+#if defined(MB_SIMD_X86) && !defined(__MINGW32__)
+/**
+ * Same as BLD_LINE_RIGHT_SCALAR using SSE2 instructions.
+ */
+static INLINE MB_TARGET_SSE2 void BLD_LINE_RIGHT_SSE2(PLINE *plines_germ, PLINE *plines_germ_nbr, Uint32 linoff_germ,
+                                                      PLINE *plines_mask, Uint32 linoff_mask, 
+                                                      Uint32 bytes_in, Uint64 *volume )
+{
+    Uint32 i;
+    Uint64 vol=0;
+    PIX8 edge_val = (PIX8) GREY_FILL_VALUE(MB_FILLED_EDGE);
+    
+    __m128i a,b;
+
+    __m128i edge = _mm_set1_epi8 ((char) edge_val);
+    __m128i zero = _mm_setzero_si128 ();
+    __m128i *germ = (__m128i *) (*plines_germ+linoff_germ);
+    __m128i *mask = (__m128i *) (*plines_mask+linoff_mask);
+    __m128i *germ_nbr = (__m128i *) (*plines_germ_nbr+linoff_germ);
+    
+    for(i=0;i<bytes_in;i+=16,germ++,mask++,germ_nbr++) {
+        b = (*germ_nbr);
+        edge = _mm_srli_si128 (edge, 15); /* >> */
+        a = _mm_slli_si128 (b, 1); /* << */
+        a = _mm_or_si128 (a, edge); /* | */
+        a = _mm_min_epu8(a,(*germ));
+        a = _mm_max_epu8((*mask),a);
+        (*germ) = a;
+        edge = b;
+        a = _mm_sad_epu8 (a,zero);
+        vol += ((Uint16 *) &a)[0]+((Uint16 *) &a)[4];
+    }
+
+    *volume += vol;
+}
+#endif
+
 /**
  * Used to rebuild the pixels of a line using the pixels of
  * the same line but shifted in the right direction.
@@ -329,6 +380,300 @@ static INLINE void BLD_LINE_RIGHT_HORZ(PLINE *plines_germ, Uint32 linoff_germ,
     *volume += vol;
 }
 
+/****************************************/
+/* Wide SIMD functions                  */
+/****************************************/
+#if defined(MB_SIMD_X86) && !defined(__MINGW32__)
+
+/**
+ * Same as BLD_LINE_SCALAR using AVX2 instructions.
+ */
+static INLINE MB_TARGET_AVX2 void BLD_LINE_AVX2(PLINE *plines_germ, PLINE *plines_germ_nbr, Uint32 linoff_germ,
+                                                PLINE *plines_mask, Uint32 linoff_mask,
+                                                Uint32 bytes_in, Uint64 *volume)
+{
+    Uint32 i;
+    Uint64 sums[4];
+    __m256i a;
+
+    __m256i vol = _mm256_setzero_si256();
+    PLINE germ = (PLINE) (*plines_germ+linoff_germ); /* inout image */
+    PLINE mask = (PLINE) (*plines_mask+linoff_mask);
+    PLINE germ_nbr = (PLINE) (*plines_germ_nbr+linoff_germ); /* inout image shifted */
+
+    /* lines are only aligned on 16 bytes, unaligned accesses are used */
+    for(i=0;i<bytes_in;i+=32) {
+        a = _mm256_min_epu8(_mm256_loadu_si256((__m256i *) (germ_nbr+i)), _mm256_loadu_si256((__m256i *) (germ+i)));
+        a = _mm256_max_epu8(_mm256_loadu_si256((__m256i *) (mask+i)), a);
+        _mm256_storeu_si256((__m256i *) (germ+i), a);
+        /* computing the volume using the sad instruction with a zero vector */
+        vol = _mm256_add_epi64(vol, _mm256_sad_epu8(a, _mm256_setzero_si256()));
+    }
+
+    _mm256_storeu_si256((__m256i *) sums, vol);
+    *volume += sums[0]+sums[1]+sums[2]+sums[3];
+}
+
+/**
+ * Same as BLD_EDGE_LINE_SCALAR using AVX2 instructions.
+ */
+static INLINE MB_TARGET_AVX2 void BLD_EDGE_LINE_AVX2(PLINE *plines_germ, Uint32 linoff_germ,
+                                                       PLINE *plines_mask, Uint32 linoff_mask,
+                                                       Uint32 bytes_in, Uint64 *volume )
+{
+    Uint32 i;
+    Uint64 sums[4];
+    PIX8 edge_val = (PIX8) GREY_FILL_VALUE(MB_FILLED_EDGE);
+    __m256i a;
+
+    __m256i edge = _mm256_set1_epi8((char) edge_val);
+    __m256i vol = _mm256_setzero_si256();
+    PLINE germ = (PLINE) (*plines_germ+linoff_germ); /* inout image */
+    PLINE mask = (PLINE) (*plines_mask+linoff_mask);
+
+    for(i=0;i<bytes_in;i+=32) {
+        a = _mm256_min_epu8(edge, _mm256_loadu_si256((__m256i *) (germ+i)));
+        a = _mm256_max_epu8(_mm256_loadu_si256((__m256i *) (mask+i)), a);
+        _mm256_storeu_si256((__m256i *) (germ+i), a);
+        vol = _mm256_add_epi64(vol, _mm256_sad_epu8(a, _mm256_setzero_si256()));
+    }
+
+    _mm256_storeu_si256((__m256i *) sums, vol);
+    *volume += sums[0]+sums[1]+sums[2]+sums[3];
+}
+
+/**
+ * Same as BLD_LINE_LEFT_SCALAR using AVX2 instructions.
+ * The shifted pixels are read with unaligned loads. The last 32 bytes,
+ * which need the edge value, are computed by the scalar function.
+ */
+static INLINE MB_TARGET_AVX2 void BLD_LINE_LEFT_AVX2(PLINE *plines_germ, PLINE *plines_germ_nbr, Uint32 linoff_germ,
+                                                     PLINE *plines_mask, Uint32 linoff_mask, 
+                                                     Uint32 bytes_in, Uint64 *volume)
+{
+    Uint32 i;
+    Uint64 sums[4];
+    __m256i a;
+
+    __m256i vol = _mm256_setzero_si256();
+    PLINE germ = (PLINE) (*plines_germ+linoff_germ); /* inout image */
+    PLINE mask = (PLINE) (*plines_mask+linoff_mask);
+    PLINE germ_nbr = (PLINE) (*plines_germ_nbr+linoff_germ); /* inout image shifted */
+
+    /* lines are only aligned on 16 bytes, unaligned accesses are used */
+    for(i=0;i<bytes_in-32;i+=32) {
+        a = _mm256_min_epu8(_mm256_loadu_si256((__m256i *) (germ_nbr+i+1)), _mm256_loadu_si256((__m256i *) (germ+i)));
+        a = _mm256_max_epu8(_mm256_loadu_si256((__m256i *) (mask+i)), a);
+        _mm256_storeu_si256((__m256i *) (germ+i), a);
+        /* computing the volume using the sad instruction with a zero vector */
+        vol = _mm256_add_epi64(vol, _mm256_sad_epu8(a, _mm256_setzero_si256()));
+    }
+    BLD_LINE_LEFT_SCALAR(plines_germ, plines_germ_nbr, linoff_germ+i,
+                         plines_mask, linoff_mask+i, bytes_in-i, volume);
+
+    _mm256_storeu_si256((__m256i *) sums, vol);
+    *volume += sums[0]+sums[1]+sums[2]+sums[3];
+}
+
+/**
+ * Same as BLD_LINE_RIGHT_SCALAR using AVX2 instructions.
+ * The shifted pixels are read with unaligned loads. The first 32 bytes,
+ * which need the edge value, are computed by the scalar function.
+ */
+static INLINE MB_TARGET_AVX2 void BLD_LINE_RIGHT_AVX2(PLINE *plines_germ, PLINE *plines_germ_nbr, Uint32 linoff_germ,
+                                                      PLINE *plines_mask, Uint32 linoff_mask, 
+                                                      Uint32 bytes_in, Uint64 *volume)
+{
+    Uint32 i;
+    Uint64 sums[4];
+    __m256i a;
+
+    __m256i vol = _mm256_setzero_si256();
+    PLINE germ = (PLINE) (*plines_germ+linoff_germ); /* inout image */
+    PLINE mask = (PLINE) (*plines_mask+linoff_mask);
+    PLINE germ_nbr = (PLINE) (*plines_germ_nbr+linoff_germ); /* inout image shifted */
+
+    BLD_LINE_RIGHT_SCALAR(plines_germ, plines_germ_nbr, linoff_germ,
+                          plines_mask, linoff_mask, 32, volume);
+    /* lines are only aligned on 16 bytes, unaligned accesses are used */
+    for(i=32;i<bytes_in;i+=32) {
+        a = _mm256_min_epu8(_mm256_loadu_si256((__m256i *) (germ_nbr+i-1)), _mm256_loadu_si256((__m256i *) (germ+i)));
+        a = _mm256_max_epu8(_mm256_loadu_si256((__m256i *) (mask+i)), a);
+        _mm256_storeu_si256((__m256i *) (germ+i), a);
+        /* computing the volume using the sad instruction with a zero vector */
+        vol = _mm256_add_epi64(vol, _mm256_sad_epu8(a, _mm256_setzero_si256()));
+    }
+
+    _mm256_storeu_si256((__m256i *) sums, vol);
+    *volume += sums[0]+sums[1]+sums[2]+sums[3];
+}
+
+/**
+ * Same as BLD_LINE_SCALAR using AVX-512 instructions.
+ */
+static INLINE MB_TARGET_AVX512 void BLD_LINE_AVX512(PLINE *plines_germ, PLINE *plines_germ_nbr, Uint32 linoff_germ,
+                                                  PLINE *plines_mask, Uint32 linoff_mask,
+                                                  Uint32 bytes_in, Uint64 *volume)
+{
+    Uint32 i;
+    __m512i a;
+
+    __m512i vol = _mm512_setzero_si512();
+    PLINE germ = (PLINE) (*plines_germ+linoff_germ); /* inout image */
+    PLINE mask = (PLINE) (*plines_mask+linoff_mask);
+    PLINE germ_nbr = (PLINE) (*plines_germ_nbr+linoff_germ); /* inout image shifted */
+
+    /* lines are only aligned on 16 bytes, unaligned accesses are used */
+    for(i=0;i<bytes_in;i+=64) {
+        a = _mm512_min_epu8(_mm512_loadu_si512((__m512i *) (germ_nbr+i)), _mm512_loadu_si512((__m512i *) (germ+i)));
+        a = _mm512_max_epu8(_mm512_loadu_si512((__m512i *) (mask+i)), a);
+        _mm512_storeu_si512((__m512i *) (germ+i), a);
+        /* computing the volume using the sad instruction with a zero vector */
+        vol = _mm512_add_epi64(vol, _mm512_sad_epu8(a, _mm512_setzero_si512()));
+    }
+
+    *volume += (Uint64) _mm512_reduce_add_epi64(vol);
+}
+
+/**
+ * Same as BLD_EDGE_LINE_SCALAR using AVX-512 instructions.
+ */
+static INLINE MB_TARGET_AVX512 void BLD_EDGE_LINE_AVX512(PLINE *plines_germ, Uint32 linoff_germ,
+                                                         PLINE *plines_mask, Uint32 linoff_mask,
+                                                         Uint32 bytes_in, Uint64 *volume )
+{
+    Uint32 i;
+    PIX8 edge_val = (PIX8) GREY_FILL_VALUE(MB_FILLED_EDGE);
+    __m512i a;
+
+    __m512i edge = _mm512_set1_epi8((char) edge_val);
+    __m512i vol = _mm512_setzero_si512();
+    PLINE germ = (PLINE) (*plines_germ+linoff_germ); /* inout image */
+    PLINE mask = (PLINE) (*plines_mask+linoff_mask);
+
+    for(i=0;i<bytes_in;i+=64) {
+        a = _mm512_min_epu8(edge, _mm512_loadu_si512((__m512i *) (germ+i)));
+        a = _mm512_max_epu8(_mm512_loadu_si512((__m512i *) (mask+i)), a);
+        _mm512_storeu_si512((__m512i *) (germ+i), a);
+        vol = _mm512_add_epi64(vol, _mm512_sad_epu8(a, _mm512_setzero_si512()));
+    }
+
+    *volume += (Uint64) _mm512_reduce_add_epi64(vol);
+}
+
+/**
+ * Same as BLD_LINE_LEFT_SCALAR using AVX-512 instructions.
+ * The shifted pixels are read with unaligned loads. The last 64 bytes,
+ * which need the edge value, are computed by the scalar function.
+ */
+static INLINE MB_TARGET_AVX512 void BLD_LINE_LEFT_AVX512(PLINE *plines_germ, PLINE *plines_germ_nbr, Uint32 linoff_germ,
+                                                       PLINE *plines_mask, Uint32 linoff_mask, 
+                                                       Uint32 bytes_in, Uint64 *volume)
+{
+    Uint32 i;
+    __m512i a;
+
+    __m512i vol = _mm512_setzero_si512();
+    PLINE germ = (PLINE) (*plines_germ+linoff_germ); /* inout image */
+    PLINE mask = (PLINE) (*plines_mask+linoff_mask);
+    PLINE germ_nbr = (PLINE) (*plines_germ_nbr+linoff_germ); /* inout image shifted */
+
+    /* lines are only aligned on 16 bytes, unaligned accesses are used */
+    for(i=0;i<bytes_in-64;i+=64) {
+        a = _mm512_min_epu8(_mm512_loadu_si512((__m512i *) (germ_nbr+i+1)), _mm512_loadu_si512((__m512i *) (germ+i)));
+        a = _mm512_max_epu8(_mm512_loadu_si512((__m512i *) (mask+i)), a);
+        _mm512_storeu_si512((__m512i *) (germ+i), a);
+        /* computing the volume using the sad instruction with a zero vector */
+        vol = _mm512_add_epi64(vol, _mm512_sad_epu8(a, _mm512_setzero_si512()));
+    }
+    BLD_LINE_LEFT_SCALAR(plines_germ, plines_germ_nbr, linoff_germ+i,
+                         plines_mask, linoff_mask+i, bytes_in-i, volume);
+
+    *volume += (Uint64) _mm512_reduce_add_epi64(vol);
+}
+
+/**
+ * Same as BLD_LINE_RIGHT_SCALAR using AVX-512 instructions.
+ * The shifted pixels are read with unaligned loads. The first 64 bytes,
+ * which need the edge value, are computed by the scalar function.
+ */
+static INLINE MB_TARGET_AVX512 void BLD_LINE_RIGHT_AVX512(PLINE *plines_germ, PLINE *plines_germ_nbr, Uint32 linoff_germ,
+                                                        PLINE *plines_mask, Uint32 linoff_mask, 
+                                                        Uint32 bytes_in, Uint64 *volume)
+{
+    Uint32 i;
+    __m512i a;
+
+    __m512i vol = _mm512_setzero_si512();
+    PLINE germ = (PLINE) (*plines_germ+linoff_germ); /* inout image */
+    PLINE mask = (PLINE) (*plines_mask+linoff_mask);
+    PLINE germ_nbr = (PLINE) (*plines_germ_nbr+linoff_germ); /* inout image shifted */
+
+    BLD_LINE_RIGHT_SCALAR(plines_germ, plines_germ_nbr, linoff_germ,
+                          plines_mask, linoff_mask, 64, volume);
+    /* lines are only aligned on 16 bytes, unaligned accesses are used */
+    for(i=64;i<bytes_in;i+=64) {
+        a = _mm512_min_epu8(_mm512_loadu_si512((__m512i *) (germ_nbr+i-1)), _mm512_loadu_si512((__m512i *) (germ+i)));
+        a = _mm512_max_epu8(_mm512_loadu_si512((__m512i *) (mask+i)), a);
+        _mm512_storeu_si512((__m512i *) (germ+i), a);
+        /* computing the volume using the sad instruction with a zero vector */
+        vol = _mm512_add_epi64(vol, _mm512_sad_epu8(a, _mm512_setzero_si512()));
+    }
+
+    *volume += (Uint64) _mm512_reduce_add_epi64(vol);
+}
+#endif
+
+/****************************************/
+/* SIMD versions                        */
+/****************************************/
+/* The version of each base function used is taken in a table according */
+/* to the SIMD level selected when the library is running */
+
+#ifdef __MINGW32__
+/* The SIMD versions are not used with MinGW */
+#define BLD_LINE_SSE2 BLD_LINE_SCALAR
+#define BLD_EDGE_LINE_SSE2 BLD_EDGE_LINE_SCALAR
+#define BLD_LINE_LEFT_SSE2 BLD_LINE_LEFT_SCALAR
+#define BLD_LINE_RIGHT_SSE2 BLD_LINE_RIGHT_SCALAR
+#define BLD_LINE_AVX2 BLD_LINE_SCALAR
+#define BLD_EDGE_LINE_AVX2 BLD_EDGE_LINE_SCALAR
+#define BLD_LINE_LEFT_AVX2 BLD_LINE_LEFT_SCALAR
+#define BLD_LINE_RIGHT_AVX2 BLD_LINE_RIGHT_SCALAR
+#define BLD_LINE_AVX512 BLD_LINE_SCALAR
+#define BLD_EDGE_LINE_AVX512 BLD_EDGE_LINE_SCALAR
+#define BLD_LINE_LEFT_AVX512 BLD_LINE_LEFT_SCALAR
+#define BLD_LINE_RIGHT_AVX512 BLD_LINE_RIGHT_SCALAR
+#endif
+
+/** Type of the BLD_LINE functions */
+typedef void (*TBLD_LINE)(PLINE *plines_germ, PLINE *plines_germ_nbr, Uint32 linoff_germ, PLINE *plines_mask, Uint32 linoff_mask, Uint32 bytes_in, Uint64 *volume);
+/** Versions of BLD_LINE for each SIMD level */
+static const TBLD_LINE BLD_LINE_FN[MB_SIMD_LEVELS] =
+    MB_SIMD_TABLE(BLD_LINE_SCALAR, BLD_LINE_SSE2, BLD_LINE_SSE2, BLD_LINE_AVX2, BLD_LINE_AVX512);
+#define BLD_LINE MB_SIMD_SELECT(BLD_LINE_FN)
+
+/** Type of the BLD_EDGE_LINE functions */
+typedef void (*TBLD_EDGE_LINE)(PLINE *plines_germ, Uint32 linoff_germ, PLINE *plines_mask, Uint32 linoff_mask, Uint32 bytes_in, Uint64 *volume);
+/** Versions of BLD_EDGE_LINE for each SIMD level */
+static const TBLD_EDGE_LINE BLD_EDGE_LINE_FN[MB_SIMD_LEVELS] =
+    MB_SIMD_TABLE(BLD_EDGE_LINE_SCALAR, BLD_EDGE_LINE_SSE2, BLD_EDGE_LINE_SSE2, BLD_EDGE_LINE_AVX2, BLD_EDGE_LINE_AVX512);
+#define BLD_EDGE_LINE MB_SIMD_SELECT(BLD_EDGE_LINE_FN)
+
+/** Type of the BLD_LINE_LEFT functions */
+typedef void (*TBLD_LINE_LEFT)(PLINE *plines_germ, PLINE *plines_germ_nbr, Uint32 linoff_germ, PLINE *plines_mask, Uint32 linoff_mask, Uint32 bytes_in, Uint64 *volume);
+/** Versions of BLD_LINE_LEFT for each SIMD level */
+static const TBLD_LINE_LEFT BLD_LINE_LEFT_FN[MB_SIMD_LEVELS] =
+    MB_SIMD_TABLE(BLD_LINE_LEFT_SCALAR, BLD_LINE_LEFT_SSE2, BLD_LINE_LEFT_SSE2, BLD_LINE_LEFT_AVX2, BLD_LINE_LEFT_AVX512);
+#define BLD_LINE_LEFT MB_SIMD_SELECT(BLD_LINE_LEFT_FN)
+
+/** Type of the BLD_LINE_RIGHT functions */
+typedef void (*TBLD_LINE_RIGHT)(PLINE *plines_germ, PLINE *plines_germ_nbr, Uint32 linoff_germ, PLINE *plines_mask, Uint32 linoff_mask, Uint32 bytes_in, Uint64 *volume);
+/** Versions of BLD_LINE_RIGHT for each SIMD level */
+static const TBLD_LINE_RIGHT BLD_LINE_RIGHT_FN[MB_SIMD_LEVELS] =
+    MB_SIMD_TABLE(BLD_LINE_RIGHT_SCALAR, BLD_LINE_RIGHT_SSE2, BLD_LINE_RIGHT_SSE2, BLD_LINE_RIGHT_AVX2, BLD_LINE_RIGHT_AVX512);
+#define BLD_LINE_RIGHT MB_SIMD_SELECT(BLD_LINE_RIGHT_FN)
+
 /****************************************/
 /* Direction functions                  */
 /****************************************/
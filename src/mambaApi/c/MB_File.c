@@ -0,0 +1,1109 @@
+/**
+ * \file MB_File.c
+ * \date 10-17-2026
+ *
+ */
+
+
+/*
+ * Copyright (c) <2009>, <Nicolas BEUCHER and ARMINES for the Centre de
+ * Morphologie Mathématique(CMM), common research center to ARMINES and MINES
+ * Paristech>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish,
+ * distribute, sublicense, and/or sell copies of the Software, and to permit
+ * persons to whom the Software is furnished to do so, subject to the following
+ * conditions: The above copyright notice and this permission notice shall be
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright
+ * holders shall not be used in advertising or otherwise to promote the sale,
+ * use or other dealings in this Software without their prior written
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+
+/*
+ * This file contains a reader and a writer for the simple image files produced
+ * by most scanners and cameras: binary PBM files, binary PGM and PPM files
+ * (maximal value of 255 or 65535) and uncompressed greyscale TIFF files (8 or
+ * 16 bits per pixel, stored in strips). The PBM files are read into binary
+ * images and written from them with their packed pixels, without an 8-bit
+ * image in between. The pixels are decoded directly into the lines of the
+ * image, without any intermediate copy of the whole image. The other files are
+ * rejected with ERR_LOAD_DATA and are read with PIL by the Python layer.
+ *
+ * It also contains the reader and the writer of the MBI files, the format of
+ * the library for binary, 8-bit and 32-bit images (see MB_SaveMBI).
+ */
+
+/** Description of the pixels inside a file */
+typedef struct {
+    /** size of the image in the file */
+    Uint32 width;
+    Uint32 height;
+    /** number of bytes per sample (1 or 2) */
+    Uint32 bytes;
+    /** number of samples per pixel (1 for grey, 3 for colour) */
+    Uint32 samples;
+    /** 1 for the packed pixels of a PBM file (1 bit per pixel) */
+    Uint32 packed;
+    /** byte order of the 16-bit samples */
+    Uint32 bigendian;
+    /** number of lines inside a strip */
+    Uint32 rowsperstrip;
+    /** number of strips */
+    Uint32 nbstrips;
+    /** position of the strips in the file (a PNM file has a single strip) */
+    Uint32 *strips;
+    /** size of the file in bytes */
+    Uint64 filesize;
+} MB_FileDesc;
+
+/****************************************/
+/* Byte order                           */
+/****************************************/
+
+/* Reads a 16-bit value in the given byte order */
+static INLINE Uint32 MB_GetU16(PIX8 *p, Uint32 bigendian)
+{
+    return bigendian ? (((Uint32) p[0])<<8)|p[1] : (((Uint32) p[1])<<8)|p[0];
+}
+
+/* Reads a 32-bit value in the given byte order */
+static INLINE Uint32 MB_GetU32(PIX8 *p, Uint32 bigendian)
+{
+    return bigendian ? (MB_GetU16(p, 1)<<16)|MB_GetU16(p+2, 1) :
+                       (MB_GetU16(p+2, 0)<<16)|MB_GetU16(p, 0);
+}
+
+/* Writes a 16-bit value in little endian order */
+static INLINE void MB_PutU16(PIX8 *p, Uint32 value)
+{
+    p[0] = (PIX8) (value&0xFF);
+    p[1] = (PIX8) ((value>>8)&0xFF);
+}
+
+/* Writes a 32-bit value in little endian order */
+static INLINE void MB_PutU32(PIX8 *p, Uint32 value)
+{
+    MB_PutU16(p, value&0xFFFF);
+    MB_PutU16(p+2, value>>16);
+}
+
+/****************************************/
+/* File headers                         */
+/****************************************/
+
+/*
+ * Reads a decimal number in the header of a PNM file, skipping the spaces and
+ * comments before it. Returns 0 if no number is found.
+ */
+static int MB_PnmNumber(FILE *f, Uint32 *value)
+{
+    Uint64 v = 0;
+    Uint32 n = 0;
+    int c;
+
+    c = fgetc(f);
+    for(;;) {
+        while (c==' ' || c=='\t' || c=='\r' || c=='\n')
+            c = fgetc(f);
+        if (c!='#')
+            break;
+        while (c!=EOF && c!='\n')
+            c = fgetc(f);
+    }
+    for(; c>='0' && c<='9'; n++) {
+        v = v*10 + (c-'0');
+        if (v>UINT32_MAX)
+            return 0;
+        c = fgetc(f);
+    }
+    /* a single white space separates the number from what follows */
+    if (n==0 || !(c==' ' || c=='\t' || c=='\r' || c=='\n'))
+        return 0;
+    *value = (Uint32) v;
+    return 1;
+}
+
+/*
+ * Reads the header of a binary PBM (P4), PGM (P5) or PPM (P6) file.
+ */
+static MB_errcode MB_PnmHeader(FILE *f, PIX8 *magic, MB_FileDesc *desc)
+{
+    Uint32 maxval;
+
+    desc->samples = (magic[1]=='6') ? 3 : 1;
+    desc->packed = (magic[1]=='4');
+    if (fseek(f, 2, SEEK_SET)!=0)
+        return ERR_LOAD_DATA;
+    if (!MB_PnmNumber(f, &desc->width) ||
+        !MB_PnmNumber(f, &desc->height))
+        return ERR_LOAD_DATA;
+    /* a PBM file has no maximal value */
+    if (desc->packed)
+        maxval = 255;
+    else if (!MB_PnmNumber(f, &maxval))
+        return ERR_LOAD_DATA;
+    /* other maximal values would require a scaling of the values */
+    if (maxval==255)
+        desc->bytes = 1;
+    else if (maxval==65535 && desc->samples==1)
+        desc->bytes = 2;
+    else
+        return ERR_LOAD_DATA;
+    desc->bigendian = 1;
+    desc->rowsperstrip = desc->height;
+    desc->nbstrips = 1;
+    desc->strips = (Uint32 *) MB_malloc(sizeof(Uint32));
+    if (desc->strips==NULL)
+        return ERR_CANT_ALLOCATE_MEMORY;
+    desc->strips[0] = (Uint32) ftell(f);
+
+    return NO_ERR;
+}
+
+/* Returns 1 if the image of the file is too large for an image of the library */
+static INLINE Uint32 MB_TooLarge(MB_FileDesc *desc)
+{
+    return ((Uint64) desc->width)*desc->height > MB_MAX_IMAGE_SIZE;
+}
+
+/*
+ * Reads the first image file directory of a TIFF file. Only uncompressed
+ * greyscale images (black is zero) with unsigned 8 or 16-bit samples are
+ * accepted.
+ */
+static MB_errcode MB_TiffHeader(FILE *f, PIX8 *magic, MB_FileDesc *desc)
+{
+    PIX8 entry[12], stripentry[12], buf[2];
+    PIX8 *offsets;
+    Uint32 be, nb, i, tag, type, count, value, size;
+    Uint32 compression = 1, photometric = 0, sampleformat = 1, bits = 0;
+    Uint32 stripcount = 0;
+    Uint64 tablesize;
+
+    be = (magic[0]=='M');
+    if (fseek(f, MB_GetU32(magic+4, be), SEEK_SET)!=0 || fread(buf, 1, 2, f)!=2)
+        return ERR_LOAD_DATA;
+    nb = MB_GetU16(buf, be);
+
+    desc->width = 0;
+    desc->height = 0;
+    desc->samples = 1;
+    desc->packed = 0;
+    desc->rowsperstrip = UINT32_MAX;
+    for(i=0; i<nb; i++) {
+        if (fread(entry, 1, 12, f)!=12)
+            return ERR_LOAD_DATA;
+        tag = MB_GetU16(entry, be);
+        type = MB_GetU16(entry+2, be);
+        count = MB_GetU32(entry+4, be);
+        /* value of a single SHORT or LONG */
+        value = (type==3) ? MB_GetU16(entry+8, be) : MB_GetU32(entry+8, be);
+        switch(tag) {
+            case 256: desc->width = value; break;
+            case 257: desc->height = value; break;
+            case 258:
+                if (count!=1)
+                    return ERR_LOAD_DATA;
+                bits = value;
+                break;
+            case 259: compression = value; break;
+            case 262: photometric = value; break;
+            case 273:
+                stripcount = count;
+                MB_memcpy(stripentry, entry, 12);
+                break;
+            case 277: desc->samples = value; break;
+            case 278: desc->rowsperstrip = value; break;
+            case 339: sampleformat = value; break;
+            default: break;
+        }
+    }
+    if (compression!=1 || photometric!=1 || desc->samples!=1 ||
+        sampleformat!=1 || (bits!=8 && bits!=16) || stripcount==0 ||
+        desc->width==0 || desc->height==0 || MB_TooLarge(desc))
+        return ERR_LOAD_DATA;
+
+    desc->bytes = bits/CHARBIT;
+    desc->bigendian = be;
+    if (desc->rowsperstrip==0 || desc->rowsperstrip>desc->height)
+        desc->rowsperstrip = desc->height;
+    desc->nbstrips = (desc->height+desc->rowsperstrip-1)/desc->rowsperstrip;
+    if (stripcount<desc->nbstrips)
+        return ERR_LOAD_DATA;
+
+    /* the offsets of the strips are SHORT or LONG values */
+    type = MB_GetU16(stripentry+2, be);
+    if (type!=3 && type!=4)
+        return ERR_LOAD_DATA;
+    size = (type==3) ? 2 : 4;
+    /* the table of the offsets must be inside the file (the sizes are */
+    /* computed in 64 bits as the number of strips comes from the file) */
+    tablesize = ((Uint64) desc->nbstrips)*size;
+    if (((Uint64) stripcount)*size>4 &&
+        ((Uint64) MB_GetU32(stripentry+8, be))+tablesize>desc->filesize)
+        return ERR_LOAD_DATA;
+    if (((Uint64) desc->nbstrips)*sizeof(Uint32)>0x7FFFFFFF)
+        return ERR_LOAD_DATA;
+    offsets = (PIX8 *) MB_malloc((int) tablesize);
+    desc->strips = (Uint32 *) MB_malloc((int) (desc->nbstrips*sizeof(Uint32)));
+    if (offsets==NULL || desc->strips==NULL) {
+        MB_free(offsets);
+        return ERR_CANT_ALLOCATE_MEMORY;
+    }
+    if (((Uint64) stripcount)*size<=4) {
+        /* the offsets are inside the entry */
+        MB_memcpy(offsets, stripentry+8, (int) tablesize);
+    } else {
+        if (fseek(f, MB_GetU32(stripentry+8, be), SEEK_SET)!=0 ||
+            fread(offsets, size, desc->nbstrips, f)!=desc->nbstrips) {
+            MB_free(offsets);
+            return ERR_LOAD_DATA;
+        }
+    }
+    for(i=0; i<desc->nbstrips; i++) {
+        desc->strips[i] = (size==2) ? MB_GetU16(offsets+2*i, be) :
+                                      MB_GetU32(offsets+4*i, be);
+    }
+    MB_free(offsets);
+
+    return NO_ERR;
+}
+
+/*
+ * Verifies that the image of the file can be loaded in an image of the library
+ * and that all its strips are inside the file.
+ */
+static MB_errcode MB_CheckStrips(MB_FileDesc *desc)
+{
+    Uint64 rowbytes, lines;
+    Uint32 i;
+
+    if (MB_TooLarge(desc))
+        return ERR_LOAD_DATA;
+    if (desc->packed)
+        rowbytes = (((Uint64) desc->width)+7)/CHARBIT;
+    else
+        rowbytes = ((Uint64) desc->width)*desc->samples*desc->bytes;
+    /* a line is read in a buffer allocated by MB_malloc */
+    if (rowbytes>0x7FFFFFFF)
+        return ERR_LOAD_DATA;
+    for (i = 0; i < desc->nbstrips; i++) {
+        lines = desc->height - ((Uint64) i)*desc->rowsperstrip;
+        if (lines>desc->rowsperstrip)
+            lines = desc->rowsperstrip;
+        if (((Uint64) desc->strips[i])+lines*rowbytes>desc->filesize)
+            return ERR_LOAD_DATA;
+    }
+
+    return NO_ERR;
+}
+
+/*
+ * Opens a file and reads its header. The file is closed and NULL is returned
+ * in 'f' if an error occurs.
+ */
+static MB_errcode MB_OpenFile(char *path, FILE **f, MB_FileDesc *desc)
+{
+    PIX8 magic[8];
+    MB_errcode err = ERR_LOAD_DATA;
+    long size;
+
+    desc->strips = NULL;
+    *f = fopen(path, "rb");
+    if (*f==NULL)
+        return ERR_LOAD_DATA;
+
+    /* the size of the file bounds the positions read in the header */
+    if (fseek(*f, 0, SEEK_END)==0 && (size = ftell(*f))>0 &&
+        fseek(*f, 0, SEEK_SET)==0 && fread(magic, 1, 8, *f)==8) {
+        desc->filesize = (Uint64) size;
+        if (magic[0]=='P' && (magic[1]=='4' || magic[1]=='5' || magic[1]=='6')) {
+            err = MB_PnmHeader(*f, magic, desc);
+        } else if ((magic[0]=='I' && magic[1]=='I' && magic[2]==42 && magic[3]==0) ||
+                   (magic[0]=='M' && magic[1]=='M' && magic[2]==0 && magic[3]==42)) {
+            err = MB_TiffHeader(*f, magic, desc);
+        }
+    }
+    if (err==NO_ERR) {
+        if (desc->width==0 || desc->height==0)
+            err = ERR_LOAD_DATA;
+        else
+            err = MB_CheckStrips(desc);
+    }
+    if (err!=NO_ERR) {
+        MB_free(desc->strips);
+        desc->strips = NULL;
+        fclose(*f);
+        *f = NULL;
+    }
+
+    return err;
+}
+
+/* Returns the depth of the image needed to load the file */
+static INLINE Uint32 MB_FileDepth(MB_FileDesc *desc)
+{
+    if (desc->packed)
+        return 1;
+    return (desc->bytes==1) ? 8 : 32;
+}
+
+/****************************************/
+/* MBI files                            */
+/****************************************/
+
+/*
+ * An MBI file holds an image cut in tiles of MB_MBI_TILE x MB_MBI_TILE pixels
+ * (smaller on the right and bottom sides). Each tile is stored with its lines
+ * in the memory layout of the library (bits packed in 32-bit words for the
+ * binary images), in little endian order, and compressed as a LZ4 block.
+ * A tile which does not compress is stored as it is. All the values of the
+ * header are little endian:
+ *   0  magic "MAMBAIMG"
+ *   8  version (1)
+ *   12 width, height and depth of the image
+ *   24 width and height of the tiles (multiples of 64, at most
+ *      MB_MBI_MAX_TILE)
+ *   32 codec (MB_CODEC_NONE or MB_CODEC_LZ4)
+ *   36 position of each tile in the file (64-bit values, row by row), then
+ *      position of the end of the last tile
+ * A part of the image is read by decoding only the tiles covering it.
+ */
+
+/** Magic string of the MBI files */
+#define MB_MBI_MAGIC "MAMBAIMG"
+/** Version of the MBI files written by the library */
+#define MB_MBI_VERSION 1
+/** Size of the MBI header (without the tiles positions) */
+#define MB_MBI_HEADER 36
+/** Size of the tiles written by MB_SaveMBI (multiple of 64) */
+#define MB_MBI_TILE 256
+/** Largest size of the tiles accepted by MB_LoadMBI */
+#define MB_MBI_MAX_TILE 4096
+
+/** Description of an MBI file */
+typedef struct {
+    /** size and depth of the image in the file */
+    Uint32 width;
+    Uint32 height;
+    Uint32 depth;
+    /** size of the tiles */
+    Uint32 tile_w;
+    Uint32 tile_h;
+    /** compression of the tiles */
+    Uint32 codec;
+    /** number of tiles in a row and in a column */
+    Uint32 nbx;
+    Uint32 nby;
+    /** position of the tiles in the file (nbx*nby+1 values) */
+    Uint64 *offsets;
+} MB_MbiDesc;
+
+/* Returns 1 if the processor is big endian */
+static INLINE Uint32 MB_HostBigEndian(void)
+{
+    Uint32 one = 1;
+    return *((PIX8 *) &one)==0;
+}
+
+/*
+ * Converts the 32-bit words of a tile between the little endian order of
+ * the file and the order of the processor (binary and 32-bit images).
+ */
+static void MB_SwapTile(PIX8 *tile, Uint32 size, Uint32 depth)
+{
+    Uint32 i;
+    PIX8 b;
+
+    if (depth==8 || !MB_HostBigEndian())
+        return;
+    for (i = 0; i+3 < size; i+=4) {
+        b = tile[i]; tile[i] = tile[i+3]; tile[i+3] = b;
+        b = tile[i+1]; tile[i+1] = tile[i+2]; tile[i+2] = b;
+    }
+}
+
+/*
+ * Copies n pixels of a binary line, starting at pixel soff of src, into a
+ * binary line starting at pixel doff of dst.
+ */
+static void MB_CopyBits(PIX8 *dst, Uint32 doff, PIX8 *src, Uint32 soff, Uint32 n)
+{
+    Uint32 *pin = (Uint32 *) src;
+    Uint32 *pout = (Uint32 *) dst;
+    Uint32 j, words, bit;
+
+    j = 0;
+    if ((doff%32)==0 && (soff%32)==0) {
+        words = n/32;
+        MB_memcpy(pout+doff/32, pin+soff/32, words*4);
+        j = words*32;
+    }
+    for (; j < n; j++) {
+        bit = (pin[(soff+j)/32]>>((soff+j)%32))&1;
+        if (bit)
+            pout[(doff+j)/32] |= 1u<<((doff+j)%32);
+        else
+            pout[(doff+j)/32] &= ~(1u<<((doff+j)%32));
+    }
+}
+
+/*
+ * Opens an MBI file and reads its header. The file is closed and NULL is
+ * returned in 'f' if an error occurs.
+ */
+static MB_errcode MB_OpenMbi(char *path, FILE **f, MB_MbiDesc *desc)
+{
+    PIX8 header[MB_MBI_HEADER];
+    PIX8 *table = NULL;
+    Uint32 i, nbtiles;
+    Uint64 tablesize, filesize = 0;
+    long size;
+    MB_errcode err = ERR_LOAD_DATA;
+
+    desc->offsets = NULL;
+    *f = fopen(path, "rb");
+    if (*f==NULL)
+        return ERR_LOAD_DATA;
+
+    /* the size of the file bounds the positions read in the header */
+    if (fseek(*f, 0, SEEK_END)==0 && (size = ftell(*f))>0 &&
+        fseek(*f, 0, SEEK_SET)==0)
+        filesize = (Uint64) size;
+    if (filesize>0 &&
+        fread(header, 1, MB_MBI_HEADER, *f)==MB_MBI_HEADER &&
+        memcmp(header, MB_MBI_MAGIC, 8)==0 &&
+        MB_GetU32(header+8, 0)==MB_MBI_VERSION) {
+        desc->width = MB_GetU32(header+12, 0);
+        desc->height = MB_GetU32(header+16, 0);
+        desc->depth = MB_GetU32(header+20, 0);
+        desc->tile_w = MB_GetU32(header+24, 0);
+        desc->tile_h = MB_GetU32(header+28, 0);
+        desc->codec = MB_GetU32(header+32, 0);
+        /* the tiles are at most MB_MBI_MAX_TILE pixels wide and high, and */
+        /* their size is a multiple of 64 */
+        if (desc->width>0 && desc->height>0 &&
+            ((Uint64) desc->width)*desc->height<=MB_MAX_IMAGE_SIZE &&
+            desc->tile_w>0 && desc->tile_w<=MB_MBI_MAX_TILE && (desc->tile_w%64)==0 &&
+            desc->tile_h>0 && desc->tile_h<=MB_MBI_MAX_TILE && (desc->tile_h%64)==0 &&
+            (desc->depth==1 || desc->depth==8 || desc->depth==32) &&
+            (desc->depth!=1 || (desc->width%32)==0) &&
+            desc->codec<=MB_CODEC_LZ4) {
+            desc->nbx = (Uint32) ((((Uint64) desc->width)+desc->tile_w-1)/desc->tile_w);
+            desc->nby = (Uint32) ((((Uint64) desc->height)+desc->tile_h-1)/desc->tile_h);
+            /* the table of the tiles positions must be inside the file */
+            tablesize = (((Uint64) desc->nbx)*desc->nby+1)*8;
+            if (MB_MBI_HEADER+tablesize>filesize || tablesize>0x7FFFFFFF) {
+                nbtiles = 0;
+            } else {
+                nbtiles = desc->nbx*desc->nby;
+                table = (PIX8 *) MB_malloc((int) tablesize);
+                desc->offsets = (Uint64 *) MB_malloc((int) tablesize);
+            }
+            if (nbtiles==0) {
+                err = ERR_LOAD_DATA;
+            } else if (table==NULL || desc->offsets==NULL) {
+                err = ERR_CANT_ALLOCATE_MEMORY;
+            } else if (fread(table, 8, nbtiles+1, *f)==nbtiles+1) {
+                err = NO_ERR;
+                for (i = 0; i <= nbtiles; i++) {
+                    desc->offsets[i] = MB_GetU32(table+8*i, 0) |
+                                       (((Uint64) MB_GetU32(table+8*i+4, 0))<<32);
+                    if ((i>0 && desc->offsets[i]<desc->offsets[i-1]) ||
+                        desc->offsets[i]>filesize)
+                        err = ERR_LOAD_DATA;
+                }
+            }
+        }
+    }
+    MB_free(table);
+    if (err!=NO_ERR) {
+        MB_free(desc->offsets);
+        desc->offsets = NULL;
+        fclose(*f);
+        *f = NULL;
+    }
+
+    return err;
+}
+
+/* Returns 1 if the file is an MBI file */
+static Uint32 MB_IsMbi(char *path)
+{
+    FILE *f;
+    PIX8 magic[8];
+    Uint32 res = 0;
+
+    f = fopen(path, "rb");
+    if (f==NULL)
+        return 0;
+    if (fread(magic, 1, 8, f)==8 && memcmp(magic, MB_MBI_MAGIC, 8)==0)
+        res = 1;
+    fclose(f);
+    return res;
+}
+
+/**
+ * Loads a part of the image stored in an MBI file (see MB_SaveMBI). The part
+ * has the size of the image and its upper left corner is at (x,y) in the
+ * image of the file. Only the tiles of the file covering this part are read
+ * and decoded. The pixels outside the image of the file are set to 0.
+ * \param image the image to fill (with the depth of the image in the file)
+ * \param path the path of the file
+ * \param x the position of the part in the image of the file
+ * \param y the position of the part in the image of the file
+ * \return An error code (NO_ERR if successful)
+ */
+MB_errcode MB_LoadMBI(MB_Image *image, char *path, Uint32 x, Uint32 y) {
+    FILE *f;
+    MB_MbiDesc desc;
+    MB_errcode err;
+    PIX8 *tile = NULL, *packed = NULL;
+    Uint32 tx, ty, tw, th, i, n, rowbytes, x0, x1, y0, y1, pixbits;
+    Uint64 size, csize;
+    PLINE *plines;
+    PLINE p;
+
+    err = MB_OpenMbi(path, &f, &desc);
+    if (err!=NO_ERR)
+        return err;
+    if (image->depth!=desc.depth) {
+        MB_free(desc.offsets);
+        fclose(f);
+        return ERR_BAD_DEPTH;
+    }
+    pixbits = image->depth;
+
+    /* the pixels outside the file are cleared first */
+    plines = &image->PLINES[MB_Y_TOP(image)];
+    if (x>=desc.width || y>=desc.height ||
+        image->width>desc.width-x || image->height>desc.height-y) {
+        for (i = 0; i < image->height; i++)
+            MB_memset(plines[i]+MB_X_LEFT(image), 0, MB_LINE_COUNT(image));
+    }
+
+    /* the tiles are bounded by MB_OpenMbi (64 MB at most) */
+    size = ((Uint64) desc.tile_w)*desc.tile_h*pixbits/CHARBIT;
+    tile = (PIX8 *) MB_malloc((int) size);
+    packed = (PIX8 *) MB_malloc((int) size);
+    if (tile==NULL || packed==NULL)
+        err = ERR_CANT_ALLOCATE_MEMORY;
+
+    /* tiles covering the part inside the file */
+    for (ty = 0; err==NO_ERR && ty < desc.nby; ty++) {
+        y0 = ty*desc.tile_h;
+        th = (desc.height-y0<desc.tile_h) ? desc.height-y0 : desc.tile_h;
+        if (y0+th<=y || y0>=y+image->height)
+            continue;
+        for (tx = 0; err==NO_ERR && tx < desc.nbx; tx++) {
+            x0 = tx*desc.tile_w;
+            tw = (desc.width-x0<desc.tile_w) ? desc.width-x0 : desc.tile_w;
+            if (x0+tw<=x || x0>=x+image->width)
+                continue;
+
+            /* reading and decoding the tile */
+            rowbytes = tw*pixbits/CHARBIT;
+            size = ((Uint64) rowbytes)*th;
+            n = ty*desc.nbx+tx;
+            csize = desc.offsets[n+1]-desc.offsets[n];
+            if (csize>size || fseek(f, (long) desc.offsets[n], SEEK_SET)!=0) {
+                err = ERR_LOAD_DATA;
+            } else if (csize==size) {
+                if (fread(tile, 1, (size_t) size, f)!=size)
+                    err = ERR_LOAD_DATA;
+            } else if (desc.codec!=MB_CODEC_LZ4 ||
+                       fread(packed, 1, (size_t) csize, f)!=csize) {
+                err = ERR_LOAD_DATA;
+            } else {
+                err = MB_Lz4Decompress(packed, (Uint32) csize, tile, (Uint32) size);
+            }
+            if (err!=NO_ERR)
+                break;
+            MB_SwapTile(tile, (Uint32) size, pixbits);
+
+            /* copying the lines of the tile inside the part */
+            x1 = (x0+tw<x+image->width) ? x0+tw : x+image->width;
+            y1 = (y0+th<y+image->height) ? y0+th : y+image->height;
+            for (i = (y0>y ? y0 : y); i < y1; i++) {
+                p = (PLINE) (plines[i-y]+MB_X_LEFT(image));
+                if (pixbits==1) {
+                    MB_CopyBits(p, (x0>x ? x0-x : 0), tile+(i-y0)*rowbytes,
+                                (x0>x ? 0 : x-x0), x1-(x0>x ? x0 : x));
+                } else {
+                    MB_memcpy(p+(x0>x ? x0-x : 0)*(pixbits/CHARBIT),
+                              tile+(i-y0)*rowbytes+(x0>x ? 0 : x-x0)*(pixbits/CHARBIT),
+                              (x1-(x0>x ? x0 : x))*(pixbits/CHARBIT));
+                }
+            }
+        }
+    }
+    MB_free(tile);
+    MB_free(packed);
+    MB_free(desc.offsets);
+    fclose(f);
+
+    return err;
+}
+
+/****************************************/
+/* Reading                              */
+/****************************************/
+
+/*
+ * Converts a line of a PBM file into the words of a binary line of w pixels
+ * (the line of the file is padded with 0 to a whole number of words). In a
+ * PBM file, the black pixels are the 1 bits.
+ */
+static void MB_PbmLine(Uint32 *p, PIX8 *row, Uint32 rowbytes, Uint32 w, Uint32 nwords)
+{
+    Uint32 j;
+
+    for (j = 0; j < rowbytes; j++)
+        row[j] = (PIX8) ~row[j];
+    MB_BitsToWords(p, row, (w+31)/32, 1);
+    /* bits after the last pixel of the file */
+    if ((w%32)!=0)
+        p[w/32] &= (1u<<(w%32))-1;
+    for (j = (w+31)/32; j < nwords; j++)
+        p[j] = 0;
+}
+
+/*
+ * Reads the lines of the file into the image. The pixels outside the file
+ * are set to 0.
+ */
+static MB_errcode MB_ReadLines(FILE *f, MB_FileDesc *desc, MB_Image *image,
+                               float *rgb2l)
+{
+    Uint32 i, j, w, h, rowbytes, pixbytes, size;
+    long offset, pos = -1;
+    PLINE *plines;
+    PLINE p;
+    PIX8 *row, *pin;
+    float v;
+
+    if (desc->packed) {
+        rowbytes = (desc->width+7)/CHARBIT;
+        size = ((desc->width+31)/32)*4;
+    } else {
+        rowbytes = desc->width*desc->samples*desc->bytes;
+        size = rowbytes;
+    }
+    pixbytes = image->depth/CHARBIT;
+    w = (desc->width<image->width) ? desc->width : image->width;
+    h = (desc->height<image->height) ? desc->height : image->height;
+    row = (PIX8 *) MB_malloc(size);
+    if (row==NULL)
+        return ERR_CANT_ALLOCATE_MEMORY;
+    MB_memset(row, 0, size);
+
+    plines = &image->PLINES[MB_Y_TOP(image)];
+    for (i = 0; i < image->height; i++, plines++) {
+        p = (PLINE) (*plines+MB_X_LEFT(image));
+        if (i<h) {
+            offset = (long) desc->strips[i/desc->rowsperstrip] +
+                     (long) (i%desc->rowsperstrip)*rowbytes;
+            if (offset!=pos && fseek(f, offset, SEEK_SET)!=0)
+                break;
+            pos = offset+rowbytes;
+            if (!desc->packed && desc->samples==1 && desc->bytes==1 &&
+                w==desc->width) {
+                /* the pixels are read directly into the line */
+                if (fread(p, 1, rowbytes, f)!=rowbytes)
+                    break;
+            } else {
+                if (fread(row, 1, rowbytes, f)!=rowbytes)
+                    break;
+                if (desc->packed) {
+                    MB_PbmLine((Uint32 *) p, row, rowbytes, w, image->width/32);
+                    continue;
+                } else if (desc->bytes==2) {
+                    for (j = 0, pin = row; j < w; j++, pin+=2)
+                        ((PIX32 *) p)[j] = MB_GetU16(pin, desc->bigendian);
+                } else if (desc->samples==3) {
+                    /* conversion to grey as done by PIL */
+                    for (j = 0, pin = row; j < w; j++, pin+=3) {
+                        v = rgb2l[0]*pin[0] + rgb2l[1]*pin[1] + rgb2l[2]*pin[2] + 0.5f;
+                        p[j] = (v<=0.0f) ? 0 : ((v>=255.0f) ? 255 : (PIX8) v);
+                    }
+                } else {
+                    MB_memcpy(p, row, w);
+                }
+            }
+            MB_memset(p+w*pixbytes, 0, (image->width-w)*pixbytes);
+        } else {
+            MB_memset(p, 0, MB_LINE_COUNT(image));
+        }
+    }
+    MB_free(row);
+
+    return (i<image->height) ? ERR_LOAD_DATA : NO_ERR;
+}
+
+/**
+ * Gives the size of the image stored in a file and the depth of the image
+ * needed to load it (1 for PBM files, 8 for 8-bit samples, 32 for 16-bit
+ * samples, the depth of the saved image for MBI files). Binary PBM, PGM and
+ * PPM files, uncompressed greyscale TIFF files and MBI files are supported.
+ * \param path the path of the file
+ * \param fwidth the width of the image in the file (returned)
+ * \param fheight the height of the image in the file (returned)
+ * \param fdepth the depth of the image needed to load the file (returned)
+ * \return An error code (NO_ERR if successful, ERR_LOAD_DATA if the file
+ * cannot be read by the library)
+ */
+MB_errcode MB_FileInfo(char *path, Uint32 *fwidth, Uint32 *fheight, Uint32 *fdepth) {
+    FILE *f;
+    MB_FileDesc desc;
+    MB_MbiDesc mdesc;
+    MB_errcode err;
+
+    *fwidth = 0;
+    *fheight = 0;
+    *fdepth = 0;
+    if (MB_OpenMbi(path, &f, &mdesc)==NO_ERR) {
+        *fwidth = mdesc.width;
+        *fheight = mdesc.height;
+        *fdepth = mdesc.depth;
+        MB_free(mdesc.offsets);
+        fclose(f);
+        return NO_ERR;
+    }
+    err = MB_OpenFile(path, &f, &desc);
+    if (err!=NO_ERR)
+        return err;
+    *fwidth = desc.width;
+    *fheight = desc.height;
+    *fdepth = MB_FileDepth(&desc);
+    MB_free(desc.strips);
+    fclose(f);
+
+    return NO_ERR;
+}
+
+/**
+ * Loads the image stored in a file (see MB_FileInfo). If the sizes of the
+ * image and of the file differ, the file is cropped or padded with 0.
+ * \param image the image to fill (with the depth given by MB_FileInfo)
+ * \param path the path of the file
+ * \param red the weight of the red component in the grey value (colour files)
+ * \param green the weight of the green component in the grey value
+ * \param blue the weight of the blue component in the grey value
+ * \return An error code (NO_ERR if successful)
+ */
+MB_errcode MB_LoadFile(MB_Image *image, char *path, double red, double green, double blue) {
+    FILE *f;
+    MB_FileDesc desc;
+    MB_errcode err;
+    float rgb2l[3];
+
+    if (MB_IsMbi(path))
+        return MB_LoadMBI(image, path, 0, 0);
+    err = MB_OpenFile(path, &f, &desc);
+    if (err!=NO_ERR)
+        return err;
+
+    if (image->depth != MB_FileDepth(&desc)) {
+        err = ERR_BAD_DEPTH;
+    } else {
+        rgb2l[0] = (float) red;
+        rgb2l[1] = (float) green;
+        rgb2l[2] = (float) blue;
+        err = MB_ReadLines(f, &desc, image, rgb2l);
+    }
+    MB_free(desc.strips);
+    fclose(f);
+
+    return err;
+}
+
+/****************************************/
+/* Writing                              */
+/****************************************/
+
+/*
+ * Writes the lines of an 8-bit or binary image as 8-bit pixels (binary pixels
+ * are written as 0 or 255).
+ */
+static MB_errcode MB_WriteLines(FILE *f, MB_Image *image)
+{
+    Uint32 i, j;
+    PLINE *plines;
+    PLINE p;
+    PIX8 *row;
+    Uint32 *pin;
+
+    row = (PIX8 *) MB_malloc(image->width);
+    if (row==NULL)
+        return ERR_CANT_ALLOCATE_MEMORY;
+
+    plines = &image->PLINES[MB_Y_TOP(image)];
+    for (i = 0; i < image->height; i++, plines++) {
+        p = (PLINE) (*plines+MB_X_LEFT(image));
+        if (image->depth==1) {
+            pin = (Uint32 *) p;
+            for (j = 0; j < image->width; j++)
+                row[j] = ((pin[j/32]>>(j%32))&1) ? 0xFF : 0;
+            p = row;
+        }
+        if (fwrite(p, 1, image->width, f)!=image->width)
+            break;
+    }
+    MB_free(row);
+
+    return (i<image->height) ? ERR_LOAD_DATA : NO_ERR;
+}
+
+/**
+ * Saves an 8-bit or binary image in a binary PGM file (binary pixels are
+ * saved as 0 or 255).
+ * \param image the image to save
+ * \param path the path of the file
+ * \return An error code (NO_ERR if successful)
+ */
+MB_errcode MB_SavePGM(MB_Image *image, char *path) {
+    FILE *f;
+    MB_errcode err;
+
+    if (image->depth!=1 && image->depth!=8)
+        return ERR_BAD_DEPTH;
+
+    f = fopen(path, "wb");
+    if (f==NULL)
+        return ERR_LOAD_DATA;
+    fprintf(f, "P5\n%u %u\n255\n", image->width, image->height);
+    err = MB_WriteLines(f, image);
+    if (fclose(f)!=0 && err==NO_ERR)
+        err = ERR_LOAD_DATA;
+
+    return err;
+}
+
+/**
+ * Saves a binary image in a binary PBM file. The packed pixels of the image
+ * are written directly (the pixels set to 1 are white in the file).
+ * \param image the image to save
+ * \param path the path of the file
+ * \return An error code (NO_ERR if successful)
+ */
+MB_errcode MB_SavePBM(MB_Image *image, char *path) {
+    FILE *f;
+    MB_errcode err = NO_ERR;
+    Uint32 i, j, rowbytes;
+    PLINE *plines;
+    PIX8 *row;
+
+    if (image->depth!=1)
+        return ERR_BAD_DEPTH;
+
+    rowbytes = image->width/CHARBIT;
+    row = (PIX8 *) MB_malloc(rowbytes);
+    if (row==NULL)
+        return ERR_CANT_ALLOCATE_MEMORY;
+    f = fopen(path, "wb");
+    if (f==NULL) {
+        MB_free(row);
+        return ERR_LOAD_DATA;
+    }
+    fprintf(f, "P4\n%u %u\n", image->width, image->height);
+    plines = &image->PLINES[MB_Y_TOP(image)];
+    for (i = 0; i < image->height; i++, plines++) {
+        MB_WordsToBits(row, (Uint32 *) (*plines+MB_X_LEFT(image)), rowbytes/4, 1);
+        /* the black pixels are the 1 bits of the file */
+        for (j = 0; j < rowbytes; j++)
+            row[j] = (PIX8) ~row[j];
+        if (fwrite(row, 1, rowbytes, f)!=rowbytes) {
+            err = ERR_LOAD_DATA;
+            break;
+        }
+    }
+    MB_free(row);
+    if (fclose(f)!=0 && err==NO_ERR)
+        err = ERR_LOAD_DATA;
+
+    return err;
+}
+
+/* Fills an entry of a TIFF image file directory holding a single value */
+static void MB_TiffEntry(PIX8 *entry, Uint32 tag, Uint32 type, Uint32 value)
+{
+    MB_PutU16(entry, tag);
+    MB_PutU16(entry+2, type);
+    MB_PutU32(entry+4, 1);
+    MB_PutU32(entry+8, 0);
+    if (type==3)
+        MB_PutU16(entry+8, value);
+    else
+        MB_PutU32(entry+8, value);
+}
+
+/** Number of entries in the image file directory written by MB_SaveTIFF */
+#define MB_TIFF_ENTRIES 9
+/** Size of the header written by MB_SaveTIFF */
+#define MB_TIFF_HEADER (8 + 2 + MB_TIFF_ENTRIES*12 + 4)
+
+/**
+ * Saves an 8-bit or binary image in an uncompressed greyscale TIFF file
+ * (binary pixels are saved as 0 or 255).
+ * \param image the image to save
+ * \param path the path of the file
+ * \return An error code (NO_ERR if successful)
+ */
+MB_errcode MB_SaveTIFF(MB_Image *image, char *path) {
+    FILE *f;
+    MB_errcode err;
+    PIX8 header[MB_TIFF_HEADER];
+    PIX8 *entry;
+
+    if (image->depth!=1 && image->depth!=8)
+        return ERR_BAD_DEPTH;
+
+    /* little endian header followed by the directory, then the pixels */
+    MB_memset(header, 0, MB_TIFF_HEADER);
+    header[0] = 'I';
+    header[1] = 'I';
+    MB_PutU16(header+2, 42);
+    MB_PutU32(header+4, 8);
+    MB_PutU16(header+8, MB_TIFF_ENTRIES);
+    entry = header+10;
+    MB_TiffEntry(entry, 256, 4, image->width); entry += 12;
+    MB_TiffEntry(entry, 257, 4, image->height); entry += 12;
+    MB_TiffEntry(entry, 258, 3, 8); entry += 12;
+    MB_TiffEntry(entry, 259, 3, 1); entry += 12;
+    MB_TiffEntry(entry, 262, 3, 1); entry += 12;
+    MB_TiffEntry(entry, 273, 4, MB_TIFF_HEADER); entry += 12;
+    MB_TiffEntry(entry, 277, 3, 1); entry += 12;
+    MB_TiffEntry(entry, 278, 4, image->height); entry += 12;
+    MB_TiffEntry(entry, 279, 4, image->width*image->height);
+    /* the offset of the next directory (none) is left to 0 */
+
+    f = fopen(path, "wb");
+    if (f==NULL)
+        return ERR_LOAD_DATA;
+    if (fwrite(header, 1, MB_TIFF_HEADER, f)!=MB_TIFF_HEADER)
+        err = ERR_LOAD_DATA;
+    else
+        err = MB_WriteLines(f, image);
+    if (fclose(f)!=0 && err==NO_ERR)
+        err = ERR_LOAD_DATA;
+
+    return err;
+}
+
+/* Writes a 64-bit value in little endian order */
+static INLINE void MB_PutU64(PIX8 *p, Uint64 value)
+{
+    MB_PutU32(p, (Uint32) (value&0xFFFFFFFF));
+    MB_PutU32(p+4, (Uint32) (value>>32));
+}
+
+/**
+ * Saves an image (binary, 8-bit or 32-bit) in an MBI file. The image is cut
+ * in tiles which are compressed independently, so that a part of the image
+ * can be read without decoding the whole file (see MB_LoadMBI). The binary
+ * images keep their packed layout (8 pixels per byte).
+ * \param image the image to save
+ * \param path the path of the file
+ * \param codec the compression of the tiles (MB_CODEC_NONE or MB_CODEC_LZ4)
+ * \return An error code (NO_ERR if successful)
+ */
+MB_errcode MB_SaveMBI(MB_Image *image, char *path, Uint32 codec) {
+    FILE *f;
+    MB_errcode err = NO_ERR;
+    PIX8 header[MB_MBI_HEADER];
+    PIX8 *table, *tile, *packed;
+    Uint32 nbx, nby, tx, ty, tw, th, i, rowbytes, size, csize;
+    Uint64 pos;
+    PLINE *plines;
+    PIX8 *out;
+
+    if (codec>MB_CODEC_LZ4)
+        return ERR_BAD_VALUE;
+
+    nbx = (image->width+MB_MBI_TILE-1)/MB_MBI_TILE;
+    nby = (image->height+MB_MBI_TILE-1)/MB_MBI_TILE;
+    MB_memset(header, 0, MB_MBI_HEADER);
+    MB_memcpy(header, MB_MBI_MAGIC, 8);
+    MB_PutU32(header+8, MB_MBI_VERSION);
+    MB_PutU32(header+12, image->width);
+    MB_PutU32(header+16, image->height);
+    MB_PutU32(header+20, image->depth);
+    MB_PutU32(header+24, MB_MBI_TILE);
+    MB_PutU32(header+28, MB_MBI_TILE);
+    MB_PutU32(header+32, codec);
+
+    size = MB_MBI_TILE*MB_MBI_TILE*image->depth/CHARBIT;
+    table = (PIX8 *) MB_malloc((nbx*nby+1)*8);
+    tile = (PIX8 *) MB_malloc(size);
+    packed = (PIX8 *) MB_malloc(size);
+    if (table==NULL || tile==NULL || packed==NULL) {
+        MB_free(table);
+        MB_free(tile);
+        MB_free(packed);
+        return ERR_CANT_ALLOCATE_MEMORY;
+    }
+    MB_memset(table, 0, (nbx*nby+1)*8);
+
+    f = fopen(path, "wb");
+    if (f==NULL) {
+        err = ERR_LOAD_DATA;
+    } else if (fwrite(header, 1, MB_MBI_HEADER, f)!=MB_MBI_HEADER ||
+               fwrite(table, 8, nbx*nby+1, f)!=nbx*nby+1) {
+        /* the positions of the tiles are written once known */
+        err = ERR_LOAD_DATA;
+    }
+
+    pos = MB_MBI_HEADER+((Uint64) (nbx*nby+1))*8;
+    plines = &image->PLINES[MB_Y_TOP(image)];
+    for (ty = 0; err==NO_ERR && ty < nby; ty++) {
+        th = (image->height-ty*MB_MBI_TILE<MB_MBI_TILE) ? image->height-ty*MB_MBI_TILE : MB_MBI_TILE;
+        for (tx = 0; err==NO_ERR && tx < nbx; tx++) {
+            tw = (image->width-tx*MB_MBI_TILE<MB_MBI_TILE) ? image->width-tx*MB_MBI_TILE : MB_MBI_TILE;
+            rowbytes = tw*image->depth/CHARBIT;
+            size = rowbytes*th;
+            for (i = 0; i < th; i++) {
+                MB_memcpy(tile+i*rowbytes,
+                          plines[ty*MB_MBI_TILE+i]+MB_X_LEFT(image)+tx*MB_MBI_TILE*image->depth/CHARBIT,
+                          rowbytes);
+            }
+            MB_SwapTile(tile, size, image->depth);
+            /* a tile is kept as it is when it does not compress */
+            csize = (codec==MB_CODEC_LZ4) ? MB_Lz4Compress(tile, size, packed, size-1) : 0;
+            out = (csize>0) ? packed : tile;
+            if (csize==0)
+                csize = size;
+            MB_PutU64(table+8*(ty*nbx+tx), pos);
+            if (fwrite(out, 1, csize, f)!=csize)
+                err = ERR_LOAD_DATA;
+            pos += csize;
+        }
+    }
+    if (err==NO_ERR) {
+        MB_PutU64(table+8*nbx*nby, pos);
+        if (fseek(f, MB_MBI_HEADER, SEEK_SET)!=0 ||
+            fwrite(table, 8, nbx*nby+1, f)!=nbx*nby+1)
+            err = ERR_LOAD_DATA;
+    }
+    if (f!=NULL && fclose(f)!=0 && err==NO_ERR)
+        err = ERR_LOAD_DATA;
+    MB_free(table);
+    MB_free(tile);
+    MB_free(packed);
+
+    return err;
+}
@@ -39,7 +39,7 @@ typedef void (TSWITCHEP) (void *ctx, int x, int y);
 
 /** Structure holding the function contextual information 
  * such as the size of the image processed, the pointer to the pixel lines, 
- * the array of tokens and the current flooding level
+ * the hierarchical queue and the current flooding level
  */
 typedef struct {
     /** The width of the images processed */
@@ -47,12 +47,10 @@ typedef struct {
     /** The height of the images processed */
     Uint32 height;
     
-    /** The memory used to hold the elements of the hierarchical list */
-    MB_Token *TokensArray;
-    /** The hierarchical list entries for watershed segmentation */
-    MB_ListControl HierarchicalList[256];
+    /** The hierarchical queue used for the build (two elements per pixel) */
+    MB_HQueue hq;
     /** The memory to hold the status of each pixel */
-    Uint32 *pix_status;
+    PIX8 *pix_status;
     
     /** pointer to the lines of the mask image */
     PLINE *plines_mask;
@@ -80,93 +78,39 @@ typedef struct {
  ****************************************/
 
 /**
- * Inserts a token in the hierarchical list
- * This function only uses the tokens of the first half (for initialization)
+ * Inserts a pixel in the hierarchical list
+ * This function only uses the elements of the first half (for initialization)
  * \param local_ctx pointer to the structure holding all the information needed 
  * by the algorithm
  * \param x the position in x of the concerned pixel
  * \param y the position in y of the concerned pixel
- * \param bytes number of bytes inside the line
+ * \param value the value determines in which list to insert it
  */
 static INLINE void MB_InsertInHierarchicalList_1(MB_Hierardualbld_Ctx *local_ctx, int x, int y, PIX8 value)
 {
-    int position;
-    int lposition;
-    int lx, ly;
-    
-    /* the token corresponding to the pixel process is */
-    /* updated/created. */
-    position = x + y*local_ctx->width;
-    local_ctx->TokensArray[position].nextx = MB_LIST_END;
-    local_ctx->TokensArray[position].nexty = MB_LIST_END;
-    
-    /* insertion in the hierarchical list */
-    /* the token is inserted after the last value in the list */
-    lx = local_ctx->HierarchicalList[value].lastx;
-    ly = local_ctx->HierarchicalList[value].lasty;
-    lposition = lx+ly*local_ctx->width;
-    if (lposition>=0) {
-        /*There is a last value, the list is not empty*/
-        local_ctx->TokensArray[lposition].nextx = x;
-        local_ctx->TokensArray[lposition].nexty = y;
-        local_ctx->HierarchicalList[value].lastx = x;
-        local_ctx->HierarchicalList[value].lasty = y;
-    }
-    else {
-        /* The list is empty, so we create it.*/
-        local_ctx->HierarchicalList[value].firstx = x;
-        local_ctx->HierarchicalList[value].firsty = y;
-        local_ctx->HierarchicalList[value].lastx = x;
-        local_ctx->HierarchicalList[value].lasty = y;
-    }
+    MB_HQ_Push(&local_ctx->hq, value, x + y*local_ctx->width);
 }
 
 /**
- * Inserts a token in the hierarchical list
- * This function only uses the tokens of the second half (for flooding).
+ * Inserts a pixel in the hierarchical list
+ * This function only uses the elements of the second half (for flooding).
  * The function also changes the status of the pixel to QUEUED.
  * \param local_ctx pointer to the structure holding all the information needed 
  * by the algorithm
  * \param x the position in x of the concerned pixel
  * \param y the position in y of the concerned pixel
- * \param bytes number of bytes inside the line
+ * \param value the value determines in which list to insert it
  */
 static INLINE void MB_InsertInHierarchicalList_2(MB_Hierardualbld_Ctx *local_ctx, int x, int y, PIX8 value)
 {
-    int position;
-    int lposition;
-    int lx, ly;
-    
-    /* the token corresponding to the pixel process is */
-    /* updated/created. */
-    /* the y is increased by local_ctx->height to make sure the second half */
-    /* of the token is used */
-    position = x + (y+local_ctx->height)*local_ctx->width;
-    local_ctx->TokensArray[position].nextx = MB_LIST_END;
-    local_ctx->TokensArray[position].nexty = MB_LIST_END;
+    Uint32 position = x + y*local_ctx->width;
     
-    /* insertion in the hierarchical list */
-    /* the token is inserted after the last value in the list */
-    lx = local_ctx->HierarchicalList[value].lastx;
-    ly = local_ctx->HierarchicalList[value].lasty;
-    lposition = lx+ly*local_ctx->width;
-    if (lposition>=0) {
-        /*There is a last value, the list is not empty*/
-        local_ctx->TokensArray[lposition].nextx = x;
-        local_ctx->TokensArray[lposition].nexty = y+local_ctx->height;
-        local_ctx->HierarchicalList[value].lastx = x;
-        local_ctx->HierarchicalList[value].lasty = y+local_ctx->height;
-    }
-    else {
-        /* The list is empty, so we create it.*/
-        local_ctx->HierarchicalList[value].firstx = x;
-        local_ctx->HierarchicalList[value].firsty = y+local_ctx->height;
-        local_ctx->HierarchicalList[value].lastx = x;
-        local_ctx->HierarchicalList[value].lasty = y+local_ctx->height;
-    }
+    /* the number of pixels is added to the position to make sure the */
+    /* second half of the elements is used */
+    MB_HQ_Push(&local_ctx->hq, value, position + local_ctx->width*local_ctx->height);
     
     /* change the pixel status */
-    local_ctx->pix_status[x+ y*local_ctx->width] = 0x1;
+    local_ctx->pix_status[position] = 0x1;
 }
 
 /**
@@ -179,11 +123,8 @@ static INLINE void MB_HierarchyInit(MB_Hierardualbld_Ctx *local_ctx)
     Uint32 i,j;
     PLINE pvalue, pmask;
     
-    /*All the control are reset */
-    for(i=0;i<256;i++) {
-        local_ctx->HierarchicalList[i].firstx = local_ctx->HierarchicalList[i].lastx = MB_LIST_END;
-        local_ctx->HierarchicalList[i].firsty = local_ctx->HierarchicalList[i].lasty = MB_LIST_END;
-    }
+    /*All the lists are emptied */
+    MB_HQ_Reset(&local_ctx->hq);
      
     /* All the pixels are inserted inside the hierarchical list */
     local_ctx->current_water_level = 0;
@@ -197,7 +138,7 @@ static INLINE void MB_HierarchyInit(MB_Hierardualbld_Ctx *local_ctx)
     }
 
     /* All pixels status are set to 0 (CANDIDATE) */
-    MB_memset(local_ctx->pix_status, 0, local_ctx->width*local_ctx->height*sizeof(Uint32));
+    MB_memset(local_ctx->pix_status, 0, local_ctx->width*local_ctx->height);
     
 }
 
@@ -298,7 +239,7 @@ static void MB_InsertNeighbors_hexagonal(void *ctx, int x, int y)
  ****************************************/
  
 /**
- * Simulates the flooding process using the hierarchical list. Tokens are
+ * Simulates the flooding process using the hierarchical list. Pixels are
  * extracted out of the current water level list and processed. The process consists
  * in inserting in the list all its neighbors that are not already processed.
  * \param local_ctx pointer to the structure holding all the information needed 
@@ -306,17 +247,17 @@ static void MB_InsertNeighbors_hexagonal(void *ctx, int x, int y)
  */
 static INLINE void MB_Flooding(MB_Hierardualbld_Ctx *local_ctx)
 {
-    int fx,fy,pos;
-    Uint32 i;
+    Uint32 i, pos, i_pos, size;
+    
+    size = local_ctx->width*local_ctx->height;
     
     for(i=0; i<256; i++, local_ctx->current_water_level++) {
-        fx = local_ctx->HierarchicalList[local_ctx->current_water_level].firstx;
-        fy = local_ctx->HierarchicalList[local_ctx->current_water_level].firsty;
-        while(fx>=0) {
-            pos = fx+fy*local_ctx->width;
-            local_ctx->InsertNeighbors(local_ctx,fx,fy%(local_ctx->height));
-            fx = local_ctx->TokensArray[pos].nextx;
-            fy = local_ctx->TokensArray[pos].nexty;
+        pos = local_ctx->hq.first[local_ctx->current_water_level];
+        while(pos!=MB_HQ_END) {
+            /* the elements of the second half are the same pixels */
+            i_pos = (pos<size) ? pos : pos-size;
+            local_ctx->InsertNeighbors(local_ctx, i_pos%local_ctx->width, i_pos/local_ctx->width);
+            pos = local_ctx->hq.next[pos];
         }
     }
 }
@@ -362,18 +303,19 @@ MB_errcode MB_HierarDualBld(MB_Image *mask, MB_Image *srcdest, enum MB_grid_t gr
     local_ctx.linoff_mask = MB_LINE_OFFSET(mask);
     local_ctx.bytes = MB_LINE_COUNT(mask);
     
-    /* Allocating the token array */
-    /* We need two token per pixel for this algorithm */
+    /* Allocating the hierarchical queue */
+    /* We need two elements per pixel for this algorithm */
     /* the init will use the first half and the flooding the other */
-    local_ctx.TokensArray = MB_malloc(2*srcdest->width*srcdest->height*sizeof(MB_Token));
-    if(local_ctx.TokensArray==NULL){
+    local_ctx.hq.next = MB_malloc(2*srcdest->width*srcdest->height*sizeof(Uint32));
+    if(local_ctx.hq.next==NULL){
         /* in case allocation goes wrong */
         return ERR_CANT_ALLOCATE_MEMORY;
     }
     /* Allocating the pixel status array */
-    local_ctx.pix_status = MB_malloc(srcdest->width*srcdest->height*sizeof(Uint32));
+    local_ctx.pix_status = MB_malloc(srcdest->width*srcdest->height);
     if(local_ctx.pix_status==NULL){
         /* in case allocation goes wrong */
+        MB_free(local_ctx.hq.next);
         return ERR_CANT_ALLOCATE_MEMORY;
     }
     
@@ -390,8 +332,8 @@ MB_errcode MB_HierarDualBld(MB_Image *mask, MB_Image *srcdest, enum MB_grid_t gr
     /* Actual flooding */
     MB_Flooding(&local_ctx);
     
-    /* freeing the token array */
-    MB_free(local_ctx.TokensArray);
+    /* freeing the hierarchical queue */
+    MB_free(local_ctx.hq.next);
     /* freeing the pixel status array */
     MB_free(local_ctx.pix_status);
     
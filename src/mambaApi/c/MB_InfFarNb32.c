@@ -52,14 +52,10 @@ static INLINE void SHIFT_LINE(PLINE *p_out, Uint32 off_out,
                               PLINE *p_in, Uint32 off_in,
                               PIX32 bytes_in )
 {
-    Uint32 i;
-
     PIX32 *pin = (PIX32 *) (*p_in + off_in);
     PIX32 *pout = (PIX32 *) (*p_out + off_out);
-    
-    for(i=0;i<bytes_in;i+=4,pin++,pout++) {
-        (*pout) = (*pout)<(*pin) ? (*pout) : (*pin);
-    }
+
+    MB_InfLine32(pout, pin, bytes_in/4);
 }
 
 /**
@@ -72,13 +68,9 @@ static INLINE void SHIFT_LINE(PLINE *p_out, Uint32 off_out,
  */
 static INLINE void SHIFT_EDGE_LINE(PLINE *p_out, Uint32 off_out, Uint32 bytes_in, PIX32 fill_val )
 {
-    Uint32 i;
-
     PIX32 *pout = (PIX32 *) (*p_out + off_out);
-    
-    for(i=0;i<bytes_in;i+=4,pout++) {
-        (*pout) = (*pout)<(fill_val) ? (*pout) : (fill_val);
-    }
+
+    MB_InfConst32(pout, fill_val, bytes_in/4);
 }
 
 /**
@@ -96,20 +88,16 @@ static INLINE void SHIFT_LINE_LEFT(PLINE *p_out, Uint32 off_out,
                                    Uint32 bytes_in,
                                    Sint32 count, PIX32 fill_val)
 {
-    Sint32 i;
+    Sint32 nb_pix = (Sint32) (bytes_in/4);
 
-    PIX32 *pin = (PIX32 *) (*p_in + off_in + 4*count);
+    PIX32 *pin = (PIX32 *) (*p_in + off_in);
     PIX32 *pout = (PIX32 *) (*p_out + off_out);
-    
+
     /* count cannot exceed the number of pixel in a line */
-    count = count<((Sint32) (bytes_in/4)) ? count : bytes_in/4;
-    
-    for(i=0; i<((Sint32) bytes_in)-(4*count); i+=4,pin++,pout++) {
-        (*pout) = (*pout)<(*pin) ? (*pout) : (*pin);
-    }
-    for(i=0; i<count; i++,pout++) {
-        (*pout) = (*pout)<(fill_val) ? (*pout) : (fill_val);
-    }
+    count = count<nb_pix ? count : nb_pix;
+
+    MB_InfLine32(pout, pin+count, nb_pix-count);
+    MB_InfConst32(pout+nb_pix-count, fill_val, count);
 }
 
 /**
@@ -127,20 +115,16 @@ static INLINE void SHIFT_LINE_RIGHT(PLINE *p_out, Uint32 off_out,
                                     Uint32 bytes_in, 
                                     Sint32 count, PIX32 fill_val)
 {
-    Sint32 i;
+    Sint32 nb_pix = (Sint32) (bytes_in/4);
+
+    PIX32 *pin = (PIX32 *) (*p_in + off_in);
+    PIX32 *pout = (PIX32 *) (*p_out + off_out);
 
-    PIX32 *pin = (PIX32 *) (*p_in + bytes_in -4*(count+1) + off_in);
-    PIX32 *pout = (PIX32 *) (*p_out + bytes_in -4 + off_out);
-    
     /* count cannot exceed the number of pixel in a line */
-    count = count<((Sint32) (bytes_in/4)) ? count : bytes_in/4;
-    
-    for(i=0;i<((Sint32) bytes_in)-(4*count);i+=4,pin--,pout--) {
-        (*pout) = (*pout)<(*pin) ? (*pout) : (*pin);
-    }
-    for(i=0; i<count; i++,pout--) {
-        (*pout) = (*pout)<(fill_val) ? (*pout) : (fill_val);
-    }
+    count = count<nb_pix ? count : nb_pix;
+
+    MB_InfLine32(pout+count, pin, nb_pix-count);
+    MB_InfConst32(pout, fill_val, count);
 }
 
 /****************************************/
@@ -176,7 +160,6 @@ MB_errcode MB_InfFarNb32(MB_Image *src, MB_Image *srcdest, Uint32 nbrnum, Uint32
     Uint32 bytes_in;
     Uint32 linoff_in, linoff_out;
     PLINE *plines_in, *plines_out;
-    TSWITCHEP *fn;
     Uint32 neighbors_nb, tran_dir;
 
     /* error management */
@@ -221,8 +204,5 @@ MB_errcode MB_InfFarNb32(MB_Image *src, MB_Image *srcdest, Uint32 nbrnum, Uint32
     bytes_in = MB_LINE_COUNT(src);
 
     /* Calling the corresponding function */
-    fn = SwitchTo[grid][tran_dir];
-    fn(plines_out, linoff_out, plines_in, linoff_in, bytes_in, (Sint32) src->height, count, I32_FILL_VALUE(edge));
-
-    return NO_ERR;
+    return MB_ShiftDir(plines_out, linoff_out, plines_in, linoff_in, bytes_in, (Sint32) src->height, count, I32_FILL_VALUE(edge), grid, tran_dir);
 }
@@ -48,13 +48,29 @@
  * \param off_in offset inside the source image line
  * \param bytes_in number of bytes inside the line
  */
-static INLINE void SHIFT_LINE(PLINE *p_out, Uint32 off_out,
-                              PLINE *p_in, Uint32 off_in,
-                              Uint32 bytes_in )
+static INLINE void SHIFT_LINE_SCALAR(PLINE *p_out, Uint32 off_out,
+                                     PLINE *p_in, Uint32 off_in,
+                                     Uint32 bytes_in )
 {
     Uint32 i;
+
+    PLINE pin = (PLINE) (*p_in + off_in);
+    PLINE pinout = (PLINE) (*p_out + off_out);
     
-#ifdef __SSE2__
+    for(i=0;i<bytes_in;i++,pin++,pinout++) {
+        (*pinout) = (*pinout)<(*pin) ? (*pinout) : (*pin);
+    }
+}
+
+#ifdef MB_SIMD_X86
+/**
+ * Same as SHIFT_LINE_SCALAR using SSE2 instructions.
+ */
+static INLINE MB_TARGET_SSE2 void SHIFT_LINE_SSE2(PLINE *p_out, Uint32 off_out,
+                                                  PLINE *p_in, Uint32 off_in,
+                                                  Uint32 bytes_in )
+{
+    Uint32 i;
 
     __m128i *pin = (__m128i*) (*p_in + off_in);
     __m128i *pinout = (__m128i*) (*p_out + off_out);
@@ -63,16 +79,8 @@ static INLINE void SHIFT_LINE(PLINE *p_out, Uint32 off_out,
         (*pinout) = _mm_min_epu8((*pinout),(*pin));
     }
     
-#else
-
-    PLINE pin = (PLINE) (*p_in + off_in);
-    PLINE pinout = (PLINE) (*p_out + off_out);
-    
-    for(i=0;i<bytes_in;i++,pin++,pinout++) {
-        (*pinout) = (*pinout)<(*pin) ? (*pinout) : (*pin);
-    }
-#endif
 }
+#endif
 
 /**
  * Used to fill a complete line with a given value (used to fill voided lines following
@@ -82,12 +90,25 @@ static INLINE void SHIFT_LINE(PLINE *p_out, Uint32 off_out,
  * \param bytes_in number of bytes inside the line
  * \param fill_val the value used to fill the line
  */
-static INLINE void SHIFT_EDGE_LINE(PLINE *p_out, Uint32 off_out, Uint32 bytes_in, Uint32 fill_val )
+static INLINE void SHIFT_EDGE_LINE_SCALAR(PLINE *p_out, Uint32 off_out, Uint32 bytes_in, Uint32 fill_val )
 {
     Uint32 i;
 
-#ifdef __SSE2__
+    PLINE pinout = (PLINE) (*p_out + off_out);
     
+    for(i=0;i<bytes_in;i++,pinout++) {
+        (*pinout) = (*pinout)<(fill_val) ? (*pinout) : (fill_val);
+    }
+}
+
+#ifdef MB_SIMD_X86
+/**
+ * Same as SHIFT_EDGE_LINE_SCALAR using SSE2 instructions.
+ */
+static INLINE MB_TARGET_SSE2 void SHIFT_EDGE_LINE_SSE2(PLINE *p_out, Uint32 off_out, Uint32 bytes_in, Uint32 fill_val )
+{
+    Uint32 i;
+
     __m128i edge = _mm_set1_epi32((int) fill_val);
     __m128i *pinout = (__m128i*) (*p_out + off_out);
     
@@ -95,15 +116,8 @@ static INLINE void SHIFT_EDGE_LINE(PLINE *p_out, Uint32 off_out, Uint32 bytes_in
         (*pinout) = _mm_min_epu8((*pinout),edge);
     }
     
-#else
-
-    PLINE pinout = (PLINE) (*p_out + off_out);
-    
-    for(i=0;i<bytes_in;i++,pinout++) {
-        (*pinout) = (*pinout)<(fill_val) ? (*pinout) : (fill_val);
-    }
-#endif
 }
+#endif
 
 /**
  * Used to displace a complete line in the left direction.
@@ -115,14 +129,40 @@ static INLINE void SHIFT_EDGE_LINE(PLINE *p_out, Uint32 off_out, Uint32 bytes_in
  * \param count the shift amplitude
  * \param fill_val the value used to fill the line
  */
-static INLINE void SHIFT_LINE_LEFT(PLINE *p_out, Uint32 off_out,
-                                   PLINE *p_in, Uint32 off_in,
-                                   Uint32 bytes_in,
-                                   Sint32 count, Uint32 fill_val)
+static INLINE void SHIFT_LINE_LEFT_SCALAR(PLINE *p_out, Uint32 off_out,
+                                          PLINE *p_in, Uint32 off_in,
+                                          Uint32 bytes_in,
+                                          Sint32 count, Uint32 fill_val)
 {
     Uint32 i;
 
-#ifdef __SSE2__
+	PLINE pin, pout;    
+
+    /* count cannot exceed the number of pixels in a line */
+    count = ((Uint32) count)<bytes_in ? count : bytes_in;
+    
+    pin = (PLINE) (*p_in + off_in + count);
+    pout = (PLINE) (*p_out + off_out);
+    
+    for(i=0; i<(bytes_in-((Uint32) count)); i++,pout++,pin++) {
+        (*pout) = (*pout)<(*pin) ? (*pout) : (*pin);
+    }
+    for(i=0; i<((Uint32) count); i++,pout++) {
+        (*pout) = (*pout)<(fill_val) ? (*pout) : (fill_val);
+    }
+
+}
+
+#ifdef MB_SIMD_X86
+/**
+ * Same as SHIFT_LINE_LEFT_SCALAR using SSE2 instructions.
+ */
+static INLINE MB_TARGET_SSE2 void SHIFT_LINE_LEFT_SSE2(PLINE *p_out, Uint32 off_out,
+                                                       PLINE *p_in, Uint32 off_in,
+                                                       Uint32 bytes_in,
+                                                       Sint32 count, Uint32 fill_val)
+{
+    Uint32 i;
 
     Uint32 reg_dec, ins_reg_dec;
     __m128i reg1, reg2;
@@ -223,44 +263,54 @@ static INLINE void SHIFT_LINE_LEFT(PLINE *p_out, Uint32 off_out,
         (*pout) = _mm_min_epu8((*pout),edge);
     }
     
-#else
-	PLINE pin, pout;    
+}
+#endif
+
+/**
+ * Used to displace a complete line in the right direction.
+ * \param p_out pointer on the destination image pixel line
+ * \param off_out offset inside the destination image line
+ * \param p_in pointer on the source image pixel line
+ * \param off_in offset inside the source image line
+ * \param bytes_in number of bytes inside the line
+ * \param count the shift amplitude
+ * \param fill_val the value used to fill the line
+ */
+static INLINE void SHIFT_LINE_RIGHT_SCALAR(PLINE *p_out, Uint32 off_out,
+                                           PLINE *p_in, Uint32 off_in,
+                                           Uint32 bytes_in,
+                                           Sint32 count, Uint32 fill_val)
+{
+    Uint32 i;
+
+	PLINE pin, pout;
 
     /* count cannot exceed the number of pixels in a line */
     count = ((Uint32) count)<bytes_in ? count : bytes_in;
     
-    pin = (PLINE) (*p_in + off_in + count);
-    pout = (PLINE) (*p_out + off_out);
+    pin = (PLINE) (*p_in + bytes_in -1 + off_in - count);
+    pout = (PLINE) (*p_out + bytes_in -1 + off_out);
     
-    for(i=0; i<(bytes_in-((Uint32) count)); i++,pout++,pin++) {
+    for(i=0;i<bytes_in-((Uint32) count);i++,pin--,pout--) {
         (*pout) = (*pout)<(*pin) ? (*pout) : (*pin);
     }
-    for(i=0; i<((Uint32) count); i++,pout++) {
+    for(i=0; i<((Uint32) count); i++,pout--) {
         (*pout) = (*pout)<(fill_val) ? (*pout) : (fill_val);
     }
 
-#endif
 }
 
+#ifdef MB_SIMD_X86
 /**
- * Used to displace a complete line in the right direction.
- * \param p_out pointer on the destination image pixel line
- * \param off_out offset inside the destination image line
- * \param p_in pointer on the source image pixel line
- * \param off_in offset inside the source image line
- * \param bytes_in number of bytes inside the line
- * \param count the shift amplitude
- * \param fill_val the value used to fill the line
+ * Same as SHIFT_LINE_RIGHT_SCALAR using SSE2 instructions.
  */
-static INLINE void SHIFT_LINE_RIGHT(PLINE *p_out, Uint32 off_out,
-                                    PLINE *p_in, Uint32 off_in,
-                                    Uint32 bytes_in,
-                                    Sint32 count, Uint32 fill_val)
+static INLINE MB_TARGET_SSE2 void SHIFT_LINE_RIGHT_SSE2(PLINE *p_out, Uint32 off_out,
+                                                        PLINE *p_in, Uint32 off_in,
+                                                        Uint32 bytes_in,
+                                                        Sint32 count, Uint32 fill_val)
 {
     Uint32 i;
 
-#ifdef __SSE2__
-
     Uint32 reg_dec, ins_reg_dec;
     __m128i reg1, reg2;
 	__m128i edge, *pin, *pout;
@@ -360,24 +410,302 @@ static INLINE void SHIFT_LINE_RIGHT(PLINE *p_out, Uint32 off_out,
         (*pout) = _mm_min_epu8((*pout),edge);
     }
     
-#else
-	PLINE pin, pout;
+}
+#endif
+
+/****************************************/
+/* Wide SIMD functions                  */
+/****************************************/
+#ifdef MB_SIMD_X86
+
+/**
+ * Same as SHIFT_LINE_SCALAR using AVX2 instructions.
+ */
+static INLINE MB_TARGET_AVX2 void SHIFT_LINE_AVX2(PLINE *p_out, Uint32 off_out,
+                                                  PLINE *p_in, Uint32 off_in,
+                                                  Uint32 bytes_in )
+{
+    Uint32 i;
+    __m256i a, b;
+
+    PLINE pin = (PLINE) (*p_in + off_in);
+    PLINE pout = (PLINE) (*p_out + off_out);
+
+    /* lines are only aligned on 16 bytes, unaligned accesses are used */
+    for(i=0;i<bytes_in;i+=32) {
+        a = _mm256_loadu_si256((__m256i *) (pin+i));
+        b = _mm256_loadu_si256((__m256i *) (pout+i));
+        _mm256_storeu_si256((__m256i *) (pout+i), _mm256_min_epu8(b, a));
+    }
+}
+
+/**
+ * Same as SHIFT_EDGE_LINE_SCALAR using AVX2 instructions.
+ */
+static INLINE MB_TARGET_AVX2 void SHIFT_EDGE_LINE_AVX2(PLINE *p_out, Uint32 off_out, Uint32 bytes_in, Uint32 fill_val )
+{
+    Uint32 i;
+    __m256i b;
+
+    __m256i edge = _mm256_set1_epi8((char) fill_val);
+    PLINE pout = (PLINE) (*p_out + off_out);
+
+    for(i=0;i<bytes_in;i+=32) {
+        b = _mm256_loadu_si256((__m256i *) (pout+i));
+        _mm256_storeu_si256((__m256i *) (pout+i), _mm256_min_epu8(b, edge));
+    }
+}
+
+/**
+ * Same as SHIFT_LINE_LEFT_SCALAR using AVX2 instructions.
+ * The shifted pixels are read with unaligned loads, whatever the shift.
+ */
+static INLINE MB_TARGET_AVX2 void SHIFT_LINE_LEFT_AVX2(PLINE *p_out, Uint32 off_out,
+                                                       PLINE *p_in, Uint32 off_in,
+                                                       Uint32 bytes_in,
+                                                       Sint32 count, Uint32 fill_val)
+{
+    Uint32 i, n;
+    __m256i a, b;
+
+    __m256i edge = _mm256_set1_epi8((char) fill_val);
+    PIX8 fill = (PIX8) fill_val;
+    PLINE pin, pout;
 
     /* count cannot exceed the number of pixels in a line */
     count = ((Uint32) count)<bytes_in ? count : bytes_in;
-    
-    pin = (PLINE) (*p_in + bytes_in -1 + off_in - count);
-    pout = (PLINE) (*p_out + bytes_in -1 + off_out);
-    
-    for(i=0;i<bytes_in-((Uint32) count);i++,pin--,pout--) {
-        (*pout) = (*pout)<(*pin) ? (*pout) : (*pin);
+    n = bytes_in-((Uint32) count);
+
+    pin = (PLINE) (*p_in + off_in + count);
+    pout = (PLINE) (*p_out + off_out);
+
+    /* going forward, the pixels are read before being written when the */
+    /* two lines are the same */
+    for(i=0;i+32<=n;i+=32) {
+        a = _mm256_loadu_si256((__m256i *) (pin+i));
+        b = _mm256_loadu_si256((__m256i *) (pout+i));
+        _mm256_storeu_si256((__m256i *) (pout+i), _mm256_min_epu8(b, a));
     }
-    for(i=0; i<((Uint32) count); i++,pout--) {
-        (*pout) = (*pout)<(fill_val) ? (*pout) : (fill_val);
+    for(;i<n;i++) {
+        pout[i] = pout[i]<pin[i] ? pout[i] : pin[i];
+    }
+    /* The created space is filled with the fill value */
+    for(;i+32<=bytes_in;i+=32) {
+        b = _mm256_loadu_si256((__m256i *) (pout+i));
+        _mm256_storeu_si256((__m256i *) (pout+i), _mm256_min_epu8(b, edge));
+    }
+    for(;i<bytes_in;i++) {
+        pout[i] = pout[i]<fill ? pout[i] : fill;
     }
+}
 
-#endif
+/**
+ * Same as SHIFT_LINE_RIGHT_SCALAR using AVX2 instructions.
+ * The shifted pixels are read with unaligned loads, whatever the shift.
+ */
+static INLINE MB_TARGET_AVX2 void SHIFT_LINE_RIGHT_AVX2(PLINE *p_out, Uint32 off_out,
+                                                        PLINE *p_in, Uint32 off_in,
+                                                        Uint32 bytes_in,
+                                                        Sint32 count, Uint32 fill_val)
+{
+    Uint32 i;
+    __m256i a, b;
+
+    __m256i edge = _mm256_set1_epi8((char) fill_val);
+    PIX8 fill = (PIX8) fill_val;
+    PLINE pin, pout;
+
+    /* count cannot exceed the number of pixels in a line */
+    count = ((Uint32) count)<bytes_in ? count : bytes_in;
+
+    pin = (PLINE) (*p_in + off_in - count);
+    pout = (PLINE) (*p_out + off_out);
+
+    /* going backward, the pixels are read before being written when the */
+    /* two lines are the same */
+    for(i=bytes_in;i>=((Uint32) count)+32;) {
+        i -= 32;
+        a = _mm256_loadu_si256((__m256i *) (pin+i));
+        b = _mm256_loadu_si256((__m256i *) (pout+i));
+        _mm256_storeu_si256((__m256i *) (pout+i), _mm256_min_epu8(b, a));
+    }
+    while(i>((Uint32) count)) {
+        i--;
+        pout[i] = pout[i]<pin[i] ? pout[i] : pin[i];
+    }
+    /* The created space is filled with the fill value */
+    while(i>=32) {
+        i -= 32;
+        b = _mm256_loadu_si256((__m256i *) (pout+i));
+        _mm256_storeu_si256((__m256i *) (pout+i), _mm256_min_epu8(b, edge));
+    }
+    while(i>0) {
+        i--;
+        pout[i] = pout[i]<fill ? pout[i] : fill;
+    }
+}
+
+/**
+ * Same as SHIFT_LINE_SCALAR using AVX-512 instructions.
+ */
+static INLINE MB_TARGET_AVX512 void SHIFT_LINE_AVX512(PLINE *p_out, Uint32 off_out,
+                                                    PLINE *p_in, Uint32 off_in,
+                                                    Uint32 bytes_in )
+{
+    Uint32 i;
+    __m512i a, b;
+
+    PLINE pin = (PLINE) (*p_in + off_in);
+    PLINE pout = (PLINE) (*p_out + off_out);
+
+    /* lines are only aligned on 16 bytes, unaligned accesses are used */
+    for(i=0;i<bytes_in;i+=64) {
+        a = _mm512_loadu_si512((__m512i *) (pin+i));
+        b = _mm512_loadu_si512((__m512i *) (pout+i));
+        _mm512_storeu_si512((__m512i *) (pout+i), _mm512_min_epu8(b, a));
+    }
+}
+
+/**
+ * Same as SHIFT_EDGE_LINE_SCALAR using AVX-512 instructions.
+ */
+static INLINE MB_TARGET_AVX512 void SHIFT_EDGE_LINE_AVX512(PLINE *p_out, Uint32 off_out, Uint32 bytes_in, Uint32 fill_val )
+{
+    Uint32 i;
+    __m512i b;
+
+    __m512i edge = _mm512_set1_epi8((char) fill_val);
+    PLINE pout = (PLINE) (*p_out + off_out);
+
+    for(i=0;i<bytes_in;i+=64) {
+        b = _mm512_loadu_si512((__m512i *) (pout+i));
+        _mm512_storeu_si512((__m512i *) (pout+i), _mm512_min_epu8(b, edge));
+    }
+}
+
+/**
+ * Same as SHIFT_LINE_LEFT_SCALAR using AVX-512 instructions.
+ * The shifted pixels are read with unaligned loads, whatever the shift.
+ */
+static INLINE MB_TARGET_AVX512 void SHIFT_LINE_LEFT_AVX512(PLINE *p_out, Uint32 off_out,
+                                                         PLINE *p_in, Uint32 off_in,
+                                                         Uint32 bytes_in,
+                                                         Sint32 count, Uint32 fill_val)
+{
+    Uint32 i, n;
+    __m512i a, b;
+
+    __m512i edge = _mm512_set1_epi8((char) fill_val);
+    PIX8 fill = (PIX8) fill_val;
+    PLINE pin, pout;
+
+    /* count cannot exceed the number of pixels in a line */
+    count = ((Uint32) count)<bytes_in ? count : bytes_in;
+    n = bytes_in-((Uint32) count);
+
+    pin = (PLINE) (*p_in + off_in + count);
+    pout = (PLINE) (*p_out + off_out);
+
+    /* going forward, the pixels are read before being written when the */
+    /* two lines are the same */
+    for(i=0;i+64<=n;i+=64) {
+        a = _mm512_loadu_si512((__m512i *) (pin+i));
+        b = _mm512_loadu_si512((__m512i *) (pout+i));
+        _mm512_storeu_si512((__m512i *) (pout+i), _mm512_min_epu8(b, a));
+    }
+    for(;i<n;i++) {
+        pout[i] = pout[i]<pin[i] ? pout[i] : pin[i];
+    }
+    /* The created space is filled with the fill value */
+    for(;i+64<=bytes_in;i+=64) {
+        b = _mm512_loadu_si512((__m512i *) (pout+i));
+        _mm512_storeu_si512((__m512i *) (pout+i), _mm512_min_epu8(b, edge));
+    }
+    for(;i<bytes_in;i++) {
+        pout[i] = pout[i]<fill ? pout[i] : fill;
+    }
+}
+
+/**
+ * Same as SHIFT_LINE_RIGHT_SCALAR using AVX-512 instructions.
+ * The shifted pixels are read with unaligned loads, whatever the shift.
+ */
+static INLINE MB_TARGET_AVX512 void SHIFT_LINE_RIGHT_AVX512(PLINE *p_out, Uint32 off_out,
+                                                          PLINE *p_in, Uint32 off_in,
+                                                          Uint32 bytes_in,
+                                                          Sint32 count, Uint32 fill_val)
+{
+    Uint32 i;
+    __m512i a, b;
+
+    __m512i edge = _mm512_set1_epi8((char) fill_val);
+    PIX8 fill = (PIX8) fill_val;
+    PLINE pin, pout;
+
+    /* count cannot exceed the number of pixels in a line */
+    count = ((Uint32) count)<bytes_in ? count : bytes_in;
+
+    pin = (PLINE) (*p_in + off_in - count);
+    pout = (PLINE) (*p_out + off_out);
+
+    /* going backward, the pixels are read before being written when the */
+    /* two lines are the same */
+    for(i=bytes_in;i>=((Uint32) count)+64;) {
+        i -= 64;
+        a = _mm512_loadu_si512((__m512i *) (pin+i));
+        b = _mm512_loadu_si512((__m512i *) (pout+i));
+        _mm512_storeu_si512((__m512i *) (pout+i), _mm512_min_epu8(b, a));
+    }
+    while(i>((Uint32) count)) {
+        i--;
+        pout[i] = pout[i]<pin[i] ? pout[i] : pin[i];
+    }
+    /* The created space is filled with the fill value */
+    while(i>=64) {
+        i -= 64;
+        b = _mm512_loadu_si512((__m512i *) (pout+i));
+        _mm512_storeu_si512((__m512i *) (pout+i), _mm512_min_epu8(b, edge));
+    }
+    while(i>0) {
+        i--;
+        pout[i] = pout[i]<fill ? pout[i] : fill;
+    }
 }
+#endif
+
+/****************************************/
+/* SIMD versions                        */
+/****************************************/
+/* The version of each base function used is taken in a table according */
+/* to the SIMD level selected when the library is running */
+
+/** Type of the SHIFT_LINE functions */
+typedef void (*TSHIFT_LINE)(PLINE *p_out, Uint32 off_out, PLINE *p_in, Uint32 off_in, Uint32 bytes_in);
+/** Versions of SHIFT_LINE for each SIMD level */
+static const TSHIFT_LINE SHIFT_LINE_FN[MB_SIMD_LEVELS] =
+    MB_SIMD_TABLE(SHIFT_LINE_SCALAR, SHIFT_LINE_SSE2, SHIFT_LINE_SSE2, SHIFT_LINE_AVX2, SHIFT_LINE_AVX512);
+#define SHIFT_LINE MB_SIMD_SELECT(SHIFT_LINE_FN)
+
+/** Type of the SHIFT_EDGE_LINE functions */
+typedef void (*TSHIFT_EDGE_LINE)(PLINE *p_out, Uint32 off_out, Uint32 bytes_in, Uint32 fill_val);
+/** Versions of SHIFT_EDGE_LINE for each SIMD level */
+static const TSHIFT_EDGE_LINE SHIFT_EDGE_LINE_FN[MB_SIMD_LEVELS] =
+    MB_SIMD_TABLE(SHIFT_EDGE_LINE_SCALAR, SHIFT_EDGE_LINE_SSE2, SHIFT_EDGE_LINE_SSE2, SHIFT_EDGE_LINE_AVX2, SHIFT_EDGE_LINE_AVX512);
+#define SHIFT_EDGE_LINE MB_SIMD_SELECT(SHIFT_EDGE_LINE_FN)
+
+/** Type of the SHIFT_LINE_LEFT functions */
+typedef void (*TSHIFT_LINE_LEFT)(PLINE *p_out, Uint32 off_out, PLINE *p_in, Uint32 off_in, Uint32 bytes_in, Sint32 count, Uint32 fill_val);
+/** Versions of SHIFT_LINE_LEFT for each SIMD level */
+static const TSHIFT_LINE_LEFT SHIFT_LINE_LEFT_FN[MB_SIMD_LEVELS] =
+    MB_SIMD_TABLE(SHIFT_LINE_LEFT_SCALAR, SHIFT_LINE_LEFT_SSE2, SHIFT_LINE_LEFT_SSE2, SHIFT_LINE_LEFT_AVX2, SHIFT_LINE_LEFT_AVX512);
+#define SHIFT_LINE_LEFT MB_SIMD_SELECT(SHIFT_LINE_LEFT_FN)
+
+/** Type of the SHIFT_LINE_RIGHT functions */
+typedef void (*TSHIFT_LINE_RIGHT)(PLINE *p_out, Uint32 off_out, PLINE *p_in, Uint32 off_in, Uint32 bytes_in, Sint32 count, Uint32 fill_val);
+/** Versions of SHIFT_LINE_RIGHT for each SIMD level */
+static const TSHIFT_LINE_RIGHT SHIFT_LINE_RIGHT_FN[MB_SIMD_LEVELS] =
+    MB_SIMD_TABLE(SHIFT_LINE_RIGHT_SCALAR, SHIFT_LINE_RIGHT_SSE2, SHIFT_LINE_RIGHT_SSE2, SHIFT_LINE_RIGHT_AVX2, SHIFT_LINE_RIGHT_AVX512);
+#define SHIFT_LINE_RIGHT MB_SIMD_SELECT(SHIFT_LINE_RIGHT_FN)
 
 /****************************************/
 /* Direction functions                  */
@@ -412,7 +740,6 @@ MB_errcode MB_InfFarNb8(MB_Image *src, MB_Image *srcdest, Uint32 nbrnum, Uint32
     Uint32 bytes_in;
     Uint32 linoff_in, linoff_out;
     PLINE *plines_in, *plines_out;
-    TSWITCHEP *fn;
     Uint32 neighbors_nb, tran_dir;
 
     /* error management */
@@ -457,8 +784,5 @@ MB_errcode MB_InfFarNb8(MB_Image *src, MB_Image *srcdest, Uint32 nbrnum, Uint32
     bytes_in = MB_LINE_COUNT(src);
 
     /* Calling the corresponding function */
-    fn = SwitchTo[grid][tran_dir];
-    fn(plines_out, linoff_out, plines_in, linoff_in, bytes_in, (Sint32) src->height, count, GREY_FILL_VALUE(edge));
-
-    return NO_ERR;
+    return MB_ShiftDir(plines_out, linoff_out, plines_in, linoff_in, bytes_in, (Sint32) src->height, count, GREY_FILL_VALUE(edge), grid, tran_dir);
 }
@@ -214,7 +214,6 @@ MB_errcode MB_InfFarNbb(MB_Image *src, MB_Image *srcdest, Uint32 nbrnum, Uint32
     Uint32 bytes_in;
     Uint32 linoff_in, linoff_out;
     PLINE *plines_in, *plines_out;
-    TSWITCHEP *fn;
     Uint32 neighbors_nb, tran_dir;
 
     /* error management */
@@ -259,8 +258,5 @@ MB_errcode MB_InfFarNbb(MB_Image *src, MB_Image *srcdest, Uint32 nbrnum, Uint32
     bytes_in = MB_LINE_COUNT(src);
 
     /* Calling the corresponding function */
-    fn = SwitchTo[grid][tran_dir];
-    fn(plines_out, linoff_out, plines_in, linoff_in, bytes_in, (Sint32) src->height, count, BIN_FILL_VALUE(edge));
-
-    return NO_ERR;
+    return MB_ShiftDir(plines_out, linoff_out, plines_in, linoff_in, bytes_in, (Sint32) src->height, count, BIN_FILL_VALUE(edge), grid, tran_dir);
 }
@@ -70,7 +70,24 @@ static INLINE void INVERT_LINE8(PLINE *plines_out, Uint32 linoff_out,
 {
     Uint32 i;
 
-#ifdef __SSE2__
+    binaryT *pin = (binaryT *) (*plines_in+linoff_in);
+    binaryT *pout = (binaryT *) (*plines_out+linoff_out);
+
+    for(i=0;i<bytes_in;i+=BYTEPERWORD,pin++,pout++){
+        *pout = ~(*pin);
+    }
+}
+
+#ifdef MB_SIMD_X86
+/**
+ * Same as INVERT_LINE8 using SSE2 instructions.
+ */
+static INLINE MB_TARGET_SSE2 void INVERT_LINE8_SSE2(PLINE *plines_out, Uint32 linoff_out,
+                                                    PLINE *plines_in, Uint32 linoff_in,
+                                                    Uint32 bytes_in)
+{
+    Uint32 i;
+
     __m128i v = _mm_set1_epi8((char) 255);
 
     __m128i *pin = (__m128i *) (*plines_in+linoff_in);
@@ -80,17 +97,49 @@ static INLINE void INVERT_LINE8(PLINE *plines_out, Uint32 linoff_out,
         (*pout) = _mm_sub_epi8(v,(*pin));
     }
     
-#else
+}
 
-    binaryT *pin = (binaryT *) (*plines_in+linoff_in);
-    binaryT *pout = (binaryT *) (*plines_out+linoff_out);
+/**
+ * Same as INVERT_LINE8 using AVX2 instructions.
+ */
+static INLINE MB_TARGET_AVX2 void INVERT_LINE8_AVX2(PLINE *plines_out, Uint32 linoff_out,
+                                                    PLINE *plines_in, Uint32 linoff_in,
+                                                    Uint32 bytes_in)
+{
+    Uint32 i;
 
-    for(i=0;i<bytes_in;i+=BYTEPERWORD,pin++,pout++){
-        *pout = ~(*pin);
+    __m256i v = _mm256_set1_epi8((char) 255);
+
+    __m256i *pin = (__m256i *) (*plines_in+linoff_in);
+    __m256i *pout = (__m256i *) (*plines_out+linoff_out);
+    
+    for(i=0;i<bytes_in;i+=32,pout++,pin++) {
+        _mm256_storeu_si256(pout, _mm256_sub_epi8(v,_mm256_loadu_si256(pin)));
     }
-#endif
+    
 }
 
+/**
+ * Same as INVERT_LINE8 using AVX-512 instructions.
+ */
+static INLINE MB_TARGET_AVX512 void INVERT_LINE8_AVX512(PLINE *plines_out, Uint32 linoff_out,
+                                                      PLINE *plines_in, Uint32 linoff_in,
+                                                      Uint32 bytes_in)
+{
+    Uint32 i;
+
+    __m512i v = _mm512_set1_epi8((char) 255);
+
+    __m512i *pin = (__m512i *) (*plines_in+linoff_in);
+    __m512i *pout = (__m512i *) (*plines_out+linoff_out);
+    
+    for(i=0;i<bytes_in;i+=64,pout++,pin++) {
+        _mm512_storeu_si512(pout, _mm512_sub_epi8(v,_mm512_loadu_si512(pin)));
+    }
+    
+}
+#endif
+
 /**
  * Inverts (two-complement operation) the 32-bits pixels of the source line.
  * \param plines_out pointer on the destination image pixel line
@@ -113,6 +162,23 @@ static INLINE void INVERT_LINE32(PLINE *plines_out, Uint32 linoff_out,
     }
 }
 
+/****************************************/
+/* Band functions                       */
+/****************************************/
+
+MB_BAND_FUNC_2(INVERT_BAND1, INVERT_LINE1)
+MB_BAND_FUNC_2(INVERT_BAND8, INVERT_LINE8)
+MB_BAND_FUNC_2(INVERT_BAND32, INVERT_LINE32)
+#ifdef MB_SIMD_X86
+MB_TARGET_SSE2 MB_BAND_FUNC_2(INVERT_BAND8_SSE2, INVERT_LINE8_SSE2)
+MB_TARGET_AVX2 MB_BAND_FUNC_2(INVERT_BAND8_AVX2, INVERT_LINE8_AVX2)
+MB_TARGET_AVX512 MB_BAND_FUNC_2(INVERT_BAND8_AVX512, INVERT_LINE8_AVX512)
+#endif
+
+/* Versions of the band functions for each SIMD level */
+static MB_BandFn * const INVERT_BANDS8[MB_SIMD_LEVELS] =
+    MB_SIMD_TABLE(INVERT_BAND8, INVERT_BAND8_SSE2, INVERT_BAND8_SSE2, INVERT_BAND8_AVX2, INVERT_BAND8_AVX512);
+
 /**
  * Inverts the pixels values (negation) of the source image.
  * \param src source image
@@ -120,10 +186,7 @@ static INLINE void INVERT_LINE32(PLINE *plines_out, Uint32 linoff_out,
  * \return An error code (NO_ERR if successful)
  */
 MB_errcode MB_Inv(MB_Image *src, MB_Image *dest) {
-    PLINE *plines_in, *plines_out;
-    Uint32 linoff_in, linoff_out;
-    Uint32 bytes_in;
-    Uint32 i;
+    MB_LinesCtx ctx;
     
     /* verification over image size compatibility */
     if (!MB_CHECK_SIZE_2(src, dest)) {
@@ -131,30 +194,24 @@ MB_errcode MB_Inv(MB_Image *src, MB_Image *dest) {
     }
     
     /* Setting up line pointers */
-    plines_in  = &src->PLINES[MB_Y_TOP(src)];
-    plines_out = &dest->PLINES[MB_Y_TOP(dest)];
-    linoff_in = MB_LINE_OFFSET(src);
-    linoff_out = MB_LINE_OFFSET(dest);
-    bytes_in = MB_LINE_COUNT(src);
+    ctx.plines_in1 = &src->PLINES[MB_Y_TOP(src)];
+    ctx.plines_out = &dest->PLINES[MB_Y_TOP(dest)];
+    ctx.linoff_in1 = MB_LINE_OFFSET(src);
+    ctx.linoff_out = MB_LINE_OFFSET(dest);
+    ctx.bytes_in = MB_LINE_COUNT(src);
 
     /* Source and dest must have the same depth */
     switch(MB_PROBE_PAIR(src,dest)) {
     case MB_PAIR_1_1:
-        for (i = 0; i < src->height; i++, plines_in++, plines_out++) {
-            INVERT_LINE1( plines_out, linoff_out, plines_in, linoff_in, bytes_in );
-        }
+        MB_RunBands(INVERT_BAND1, &ctx, src->height, ctx.bytes_in);
         break;
         
     case MB_PAIR_8_8:
-        for (i = 0; i < src->height; i++, plines_in++, plines_out++) {
-            INVERT_LINE8( plines_out, linoff_out, plines_in, linoff_in, bytes_in );
-        }
+        MB_RunBands(MB_SIMD_SELECT(INVERT_BANDS8), &ctx, src->height, ctx.bytes_in);
         break;
 
     case MB_PAIR_32_32:
-        for (i = 0; i < src->height; i++, plines_in++, plines_out++) {
-            INVERT_LINE32( plines_out, linoff_out, plines_in, linoff_in, bytes_in );
-        }
+        MB_RunBands(INVERT_BAND32, &ctx, src->height, ctx.bytes_in);
         break;
 
     default:
@@ -52,21 +52,20 @@
 /* Global variables                     */
 /****************************************/
 
+/** Rank given to the roots which already received their final label */
+#define NUMBERED 0xFF
+
 /**
  * Label structure holding all the information needed to handle
  * labels attribution and creation.
  */
 typedef struct {
-    /** Equivalence between label in an image */
+    /** Parent of each label in the union-find forest (roots are their own parent) */
     PIX32 *EQ;
-    /** Equivalence between corrected label in an image */
-    PIX32 *CEQ;
-    /** The greatest number of label possible according to current image size */
-    Uint32 maxEQ;
+    /** Rank of each root of the union-find forest */
+    PIX8 *RANK;
     /** Current label index (value given to the next label) */
     PIX32 current;
-    /** Current corrected label index (value given to the next label) */
-    PIX32 ccurrent;
 } MB_Label;
 
 /****************************************/
@@ -75,30 +74,37 @@ typedef struct {
 /* The functions described here realise the basic operations */
 /* needed to label pixels */
 
-/* recursive function to find the root label*/
-static PIX32 FIND_ABOVE_LABEL(MB_Label *labels, PIX32 inlabel)
+/* function returning the root label of a label. The path to the root */
+/* is halved on the way (each label visited is linked to its grand parent) */
+static INLINE PIX32 MB_FindLabel(MB_Label *labels, PIX32 inlabel)
 {
-    if (labels->EQ[inlabel]==inlabel) {
-        return inlabel;
-    } else {
-        return FIND_ABOVE_LABEL(labels, labels->EQ[inlabel]);
+    PIX32 *EQ = labels->EQ;
+
+    while (EQ[inlabel]!=inlabel) {
+        EQ[inlabel] = EQ[EQ[inlabel]];
+        inlabel = EQ[inlabel];
     }
+    return inlabel;
 }
 
-/* function returning the corrected label to use.*/
-/* The corrected label have values that follow each other */
-/* along a specific rule to allow lblow and lbhml values */
-/* to exclude some value in the first byte */
-static PIX32 FIND_CORRECT_LABEL(MB_Label *labels, PIX32 inlabel, PIX32 lblow, PIX32 lbhml)
+/* function merging the trees of two labels and returning the root */
+/* of the merged tree. The tree of lowest rank is linked under the */
+/* root of the other */
+static INLINE PIX32 MB_UnionLabels(MB_Label *labels, PIX32 label1, PIX32 label2)
 {
-    inlabel = FIND_ABOVE_LABEL(labels, inlabel);
+    label1 = MB_FindLabel(labels, label1);
+    label2 = MB_FindLabel(labels, label2);
 
-    if (labels->CEQ[inlabel]==0) {
-        labels->CEQ[inlabel] = lblow + (labels->ccurrent%lbhml) + 256*(labels->ccurrent/lbhml);
-        labels->ccurrent++;
+    if (label1==label2)
+        return label1;
+    if (labels->RANK[label1]<labels->RANK[label2]) {
+        labels->EQ[label1] = label2;
+        return label2;
     }
-    
-    return labels->CEQ[inlabel];
+    if (labels->RANK[label1]==labels->RANK[label2])
+        labels->RANK[label1]++;
+    labels->EQ[label2] = label1;
+    return label1;
 }
 
 /**
@@ -142,6 +148,7 @@ static INLINE void EDGE_LINE(PLINE *plines_out, Uint32 linoff_out,
                     VAL(pout) = (labels->current);
                     /* which mark the label as being used */
                     labels->EQ[labels->current] = labels->current;
+                    labels->RANK[labels->current] = 0;
                     labels->current++;
                 }
             }
@@ -200,30 +207,31 @@ static INLINE void HLAB_LINE_ODD(PLINE *plines_out, PLINE *plines_outpre,
                 /* table is updated */
                 switch(neighbor_state) {
                 case 1:
-                    VAL(pout) = FIND_ABOVE_LABEL(labels, LEFT(pout));
+                    VAL(pout) = LEFT(pout);
                     break;
                 case 2:
-                    VAL(pout) = FIND_ABOVE_LABEL(labels, VAL(poutpre));
+                    VAL(pout) = VAL(poutpre);
                     break;
                 case 3:
-                    VAL(pout) = FIND_ABOVE_LABEL(labels, LEFT(pout));
+                    VAL(pout) = LEFT(pout);
                     if (VAL(poutpre) != VAL(pout))
-                        labels->EQ[VAL(pout)] = FIND_ABOVE_LABEL(labels, VAL(poutpre));
+                        VAL(pout) = MB_UnionLabels(labels, VAL(pout), VAL(poutpre));
                     break;
                 case 4:
                 case 6:
-                    VAL(pout) = FIND_ABOVE_LABEL(labels, RIGHT(poutpre));
+                    VAL(pout) = RIGHT(poutpre);
                     break;
                 case 5:
                 case 7:
-                    VAL(pout) = FIND_ABOVE_LABEL(labels, LEFT(pout));
+                    VAL(pout) = LEFT(pout);
                     if (RIGHT(poutpre) != VAL(pout))
-                        labels->EQ[VAL(pout)] = FIND_ABOVE_LABEL(labels, RIGHT(poutpre));
+                        VAL(pout) = MB_UnionLabels(labels, VAL(pout), RIGHT(poutpre));
                     break;
                 default: /* case 0 */
                     VAL(pout) = (labels->current);
                     /* no neighbors labelled we take one */
                     labels->EQ[labels->current] = labels->current;
+                    labels->RANK[labels->current] = 0;
                     labels->current++;
                     break;
                 }
@@ -246,30 +254,31 @@ static INLINE void HLAB_LINE_ODD(PLINE *plines_out, PLINE *plines_outpre,
             /* in the output image (p2).*/
             switch(neighbor_state) {
             case 1:
-                VAL(pout) = FIND_ABOVE_LABEL(labels, LEFT(pout));
+                VAL(pout) = LEFT(pout);
                 break;
             case 2:
-                VAL(pout) = FIND_ABOVE_LABEL(labels, VAL(poutpre));
+                VAL(pout) = VAL(poutpre);
                 break;
             case 3:
-                VAL(pout) = FIND_ABOVE_LABEL(labels, LEFT(pout));
+                VAL(pout) = LEFT(pout);
                 if (VAL(poutpre) != VAL(pout))
-                    labels->EQ[VAL(pout)] = FIND_ABOVE_LABEL(labels, VAL(poutpre));
+                    VAL(pout) = MB_UnionLabels(labels, VAL(pout), VAL(poutpre));
                 break;
             case 4:
             case 6:
-                VAL(pout) = FIND_ABOVE_LABEL(labels, RIGHT(poutpre));
+                VAL(pout) = RIGHT(poutpre);
                 break;
             case 5:
             case 7:
-                VAL(pout) = FIND_ABOVE_LABEL(labels, LEFT(pout));
+                VAL(pout) = LEFT(pout);
                 if (RIGHT(poutpre) != VAL(pout))
-                    labels->EQ[VAL(pout)] = FIND_ABOVE_LABEL(labels, RIGHT(poutpre));
+                    VAL(pout) = MB_UnionLabels(labels, VAL(pout), RIGHT(poutpre));
                 break;
             default: /* case 0 */
                 VAL(pout) = (labels->current);
                 /* no neighbors labelled we take one */
                 labels->EQ[labels->current] = labels->current;
+                labels->RANK[labels->current] = 0;
                 labels->current++;
                 break;
             }
@@ -330,30 +339,31 @@ static INLINE void HLAB_LINE_EVEN(PLINE *plines_out, PLINE *plines_outpre,
                 /* table is updated */
                 switch(neighbor_state) {
                 case 1:
-                    VAL(pout) = FIND_ABOVE_LABEL(labels, LEFT(pout));
+                    VAL(pout) = LEFT(pout);
                     break;
                 case 2:
-                    VAL(pout) = FIND_ABOVE_LABEL(labels, LEFT(poutpre));
+                    VAL(pout) = LEFT(poutpre);
                     break;
                 case 3:
-                    VAL(pout) = FIND_ABOVE_LABEL(labels, LEFT(pout));
+                    VAL(pout) = LEFT(pout);
                     if (LEFT(poutpre) != VAL(pout))
-                        labels->EQ[VAL(pout)] = FIND_ABOVE_LABEL(labels, LEFT(poutpre));
+                        VAL(pout) = MB_UnionLabels(labels, VAL(pout), LEFT(poutpre));
                     break;
                 case 4:
                 case 6:
-                    VAL(pout) = FIND_ABOVE_LABEL(labels, VAL(poutpre));
+                    VAL(pout) = VAL(poutpre);
                     break;
                 case 5:
                 case 7:
-                    VAL(pout) = FIND_ABOVE_LABEL(labels, LEFT(pout));
+                    VAL(pout) = LEFT(pout);
                     if (VAL(poutpre) != VAL(pout))
-                        labels->EQ[VAL(pout)] = FIND_ABOVE_LABEL(labels, VAL(poutpre));
+                        VAL(pout) = MB_UnionLabels(labels, VAL(pout), VAL(poutpre));
                     break;
                 default: /* case 0 */
                     VAL(pout) = (labels->current);
                     /* no neighbors labelled we take one */
                     labels->EQ[labels->current] = labels->current;
+                    labels->RANK[labels->current] = 0;
                     labels->current++;
                     break;
                 }
@@ -417,44 +427,51 @@ static INLINE void QLAB_LINE(PLINE *plines_out, PLINE *plines_outpre,
                 /* table is updated */
                 switch(neighbor_state) {
                 case 1:
-                    VAL(pout) = FIND_ABOVE_LABEL(labels, LEFT(pout));
+                    VAL(pout) = LEFT(pout);
                     break;
                 case 2:
-                    VAL(pout) = FIND_ABOVE_LABEL(labels, LEFT(poutpre));
+                    VAL(pout) = LEFT(poutpre);
                     break;
                 case 3:
-                    VAL(pout) = FIND_ABOVE_LABEL(labels, LEFT(pout));
+                    VAL(pout) = LEFT(pout);
                     if (LEFT(poutpre) != VAL(pout))
-                        labels->EQ[VAL(pout)] = FIND_ABOVE_LABEL(labels, LEFT(poutpre));
+                        VAL(pout) = MB_UnionLabels(labels, VAL(pout), LEFT(poutpre));
                     break;
                 case 4:
                 case 6:
-                    VAL(pout) = FIND_ABOVE_LABEL(labels, VAL(poutpre));
+                    VAL(pout) = VAL(poutpre);
                     break;
                 case 5:
                 case 7:
-                    VAL(pout) = FIND_ABOVE_LABEL(labels, LEFT(pout));
+                    VAL(pout) = LEFT(pout);
                     if (VAL(poutpre) != VAL(pout))
-                        labels->EQ[VAL(pout)] = FIND_ABOVE_LABEL(labels, VAL(poutpre));
+                        VAL(pout) = MB_UnionLabels(labels, VAL(pout), VAL(poutpre));
                     break;
                 case 8:
-                case 10:
                 case 12:
                 case 14:
-                    VAL(pout) = FIND_ABOVE_LABEL(labels, RIGHT(poutpre));
+                    VAL(pout) = RIGHT(poutpre);
+                    break;
+                case 10:
+                    /* the upper left and right neighbors are not connected */
+                    /* through the upper one */
+                    VAL(pout) = RIGHT(poutpre);
+                    if (LEFT(poutpre) != VAL(pout))
+                        VAL(pout) = MB_UnionLabels(labels, VAL(pout), LEFT(poutpre));
                     break;
                 case 9:
                 case 11:
                 case 13:
                 case 15:
-                    VAL(pout) = FIND_ABOVE_LABEL(labels, LEFT(pout));
+                    VAL(pout) = LEFT(pout);
                     if (RIGHT(poutpre) != VAL(pout))
-                        labels->EQ[VAL(pout)] = FIND_ABOVE_LABEL(labels, RIGHT(poutpre));
+                        VAL(pout) = MB_UnionLabels(labels, VAL(pout), RIGHT(poutpre));
                     break;
                 default: /* case 0 */
                     VAL(pout) = (labels->current);
                     /* no neighbors labelled we take one */
                     labels->EQ[labels->current] = labels->current;
+                    labels->RANK[labels->current] = 0;
                     labels->current++;
                     break;
                 }
@@ -479,44 +496,51 @@ static INLINE void QLAB_LINE(PLINE *plines_out, PLINE *plines_outpre,
             /* in the output image (p2).*/
             switch(neighbor_state) {
             case 1:
-                VAL(pout) = FIND_ABOVE_LABEL(labels, LEFT(pout));
+                VAL(pout) = LEFT(pout);
                 break;
             case 2:
-                VAL(pout) = FIND_ABOVE_LABEL(labels, LEFT(poutpre));
+                VAL(pout) = LEFT(poutpre);
                 break;
             case 3:
-                VAL(pout) = FIND_ABOVE_LABEL(labels, LEFT(pout));
+                VAL(pout) = LEFT(pout);
                 if (LEFT(poutpre) != VAL(pout))
-                    labels->EQ[VAL(pout)] = FIND_ABOVE_LABEL(labels, LEFT(poutpre));
+                    VAL(pout) = MB_UnionLabels(labels, VAL(pout), LEFT(poutpre));
                 break;
             case 4:
             case 6:
-                VAL(pout) = FIND_ABOVE_LABEL(labels, VAL(poutpre));
+                VAL(pout) = VAL(poutpre);
                 break;
             case 5:
             case 7:
-                VAL(pout) = FIND_ABOVE_LABEL(labels, LEFT(pout));
+                VAL(pout) = LEFT(pout);
                 if (VAL(poutpre) != VAL(pout))
-                    labels->EQ[VAL(pout)] = FIND_ABOVE_LABEL(labels, VAL(poutpre));
+                    VAL(pout) = MB_UnionLabels(labels, VAL(pout), VAL(poutpre));
                 break;
             case 8:
-            case 10:
             case 12:
             case 14:
-                VAL(pout) = FIND_ABOVE_LABEL(labels, RIGHT(poutpre));
+                VAL(pout) = RIGHT(poutpre);
+                break;
+            case 10:
+                /* the upper left and right neighbors are not connected */
+                /* through the upper one */
+                VAL(pout) = RIGHT(poutpre);
+                if (LEFT(poutpre) != VAL(pout))
+                    VAL(pout) = MB_UnionLabels(labels, VAL(pout), LEFT(poutpre));
                 break;
             case 9:
             case 11:
             case 13:
             case 15:
-                VAL(pout) = FIND_ABOVE_LABEL(labels, LEFT(pout));
+                VAL(pout) = LEFT(pout);
                 if (RIGHT(poutpre) != VAL(pout))
-                    labels->EQ[VAL(pout)] = FIND_ABOVE_LABEL(labels, RIGHT(poutpre));
+                    VAL(pout) = MB_UnionLabels(labels, VAL(pout), RIGHT(poutpre));
                 break;
             default: /* case 0 */
                 VAL(pout) = (labels->current);
                 /* no neighbors labelled we take one */
                 labels->EQ[labels->current] = labels->current;
+                labels->RANK[labels->current] = 0;
                 labels->current++;
                 break;
             }
@@ -608,44 +632,6 @@ static void MB_HLabel(PLINE *plines_out, Uint32 linoff_out,
     }
 }
 
-/****************************************
- * Tidying function                     *
- ****************************************
- * The functions tidy the label
- */
-
-/**
- * Tidies the label.
- * \param plines_out pointer on the destination image lines
- * \param off_out offset inside the destination image lines
- * \param bytes number of bytes inside the line
- * \param nb_lines number of lines inside the image processed
- * \param lblow the lowest value allowed for label on the low byte (must be inferior to lbhigh)
- * \param lbhigh the first high value NOT allowed for label on the low byte (maximum allowed is 256)
- * \param labels the labels arrays and context
- */
-static INLINE void MB_TidyLabel(PLINE *plines_out, Uint32 linoff_out, 
-                                Uint32 bytes, Uint32 nb_lines,
-                                PIX32 lblow, PIX32 lbhigh,
-                                MB_Label *labels)
-{
-    Uint32 u,v;
-    PIX32 *p1;
-    
-    for(u=0; u<nb_lines; u++, plines_out++) {
-        p1 = (PIX32 *) (*plines_out + linoff_out);
-        for(v=0; v<bytes; v+=4, p1++) {
-            if (*p1!=0) {
-                *p1 = FIND_CORRECT_LABEL(labels, *p1, lblow, lbhigh-lblow);
-            }
-        }            
-    }
-}
-
-/************************************************/
-/*High level function and global variables    */
-/************************************************/
-
 /** typedef for the definition of function arguments */
 typedef void (TSWITCHEP) (PLINE *plines_out, Uint32 linoff_out,
               PLINE *plines_in, Uint32 linoff_in,
@@ -663,6 +649,373 @@ static TSWITCHEP *SwitchTo[2] =
      MB_HLabel
 };
 
+/****************************************
+ * Flat zones functions                 *
+ ****************************************
+ * The functions described here label the flat zones of greyscale images
+ */
+
+/**
+ * Gives the range of the neighbors of a pixel inside the previous line.
+ * \param grid the grid used (either square or hexagonal)
+ * \param y the line of the pixel
+ * \param dxmin the horizontal offset of the first neighbor
+ * \param dxmax the horizontal offset of the last neighbor
+ */
+static INLINE void MB_NbRange(enum MB_grid_t grid, Uint32 y, int *dxmin, int *dxmax)
+{
+    if (grid==MB_SQUARE_GRID) {
+        *dxmin = -1;
+        *dxmax = 1;
+    } else if (y%2==1) {
+        *dxmin = 0;
+        *dxmax = 1;
+    } else {
+        *dxmin = -1;
+        *dxmax = 0;
+    }
+}
+
+/**
+ * Defines the function 'name' labelling a line of flat zones of pixels of
+ * type T. A pixel takes the label of its neighbors (the left one and the
+ * previous line pixels dxmin to dxmax around it) of the same value, the
+ * labels of these neighbors being merged, or a new label if none has its
+ * value. poutpre and pinpre are NULL for the first line of a band.
+ */
+#define FZ_LINE(name, T) \
+static void name(PIX32 *pout, PIX32 *poutpre, T *pin, T *pinpre, \
+                 Uint32 width, int dxmin, int dxmax, MB_Label *labels) \
+{ \
+    int x, xn; \
+    PIX32 lab; \
+    \
+    for(x=0; x<(int) width; x++) { \
+        lab = (x>0 && pin[x-1]==pin[x]) ? pout[x-1] : 0; \
+        for(xn=x+dxmin; pinpre!=NULL && xn<=x+dxmax; xn++) { \
+            if (xn>=0 && xn<(int) width && pinpre[xn]==pin[x]) { \
+                if (lab==0) \
+                    lab = poutpre[xn]; \
+                else if (poutpre[xn]!=lab) \
+                    lab = MB_UnionLabels(labels, lab, poutpre[xn]); \
+            } \
+        } \
+        if (lab==0) { \
+            lab = labels->current; \
+            labels->EQ[lab] = lab; \
+            labels->RANK[lab] = 0; \
+            labels->current++; \
+        } \
+        pout[x] = lab; \
+    } \
+}
+
+FZ_LINE(FZ_LINE_8, PIX8)
+FZ_LINE(FZ_LINE_32, PIX32)
+
+/****************************************
+ * Band functions                       *
+ ****************************************
+ * The image is labelled in two phases. In the first one, the bands of
+ * the image are labelled independently (and in parallel), each band
+ * taking its labels in a range of its own. In the second one, the labels
+ * of the pixels on each side of the boundaries between the bands are
+ * merged and the final labels are given.
+ */
+
+/**
+ * Labelling context shared by the bands.
+ */
+typedef struct {
+    /** pointer on the source image first line */
+    PLINE *plines_in;
+    /** offset inside the source image lines */
+    Uint32 linoff_in;
+    /** number of bytes inside the source image lines */
+    Uint32 bytes_in;
+    /** pointer on the destination image first line */
+    PLINE *plines_out;
+    /** offset inside the destination image lines */
+    Uint32 linoff_out;
+    /** number of bytes inside the destination image lines */
+    Uint32 bytes_out;
+    /** width of the images */
+    Uint32 width;
+    /** height of the images */
+    Uint32 height;
+    /** depth of the source image */
+    Uint32 depth;
+    /** grid used (either square or hexagonal) */
+    enum MB_grid_t grid;
+    /** parent of each label in the union-find forest */
+    PIX32 *EQ;
+    /** rank of each root of the union-find forest */
+    PIX8 *RANK;
+    /** number of labels reserved for each line */
+    Uint32 line_cap;
+    /** for the first line of each band, the label following the labels */
+    /** used by the band (0 for the other lines) */
+    PIX32 *band_end;
+} MB_LabelCtx;
+
+/**
+ * Labels the lines first to last-1 independently of the other lines. The
+ * labels of the band start at 1 + first*line_cap.
+ * \param ctx the labelling context
+ * \param first the first line of the band
+ * \param last the line following the last line of the band
+ */
+static void MB_LabelBand(void *ctx, Uint32 first, Uint32 last)
+{
+    MB_LabelCtx *c = (MB_LabelCtx *) ctx;
+    MB_Label labels;
+    PIX32 *pout, *poutpre = NULL;
+    PIX8 *pin, *pinpre = NULL;
+    int dxmin, dxmax;
+    Uint32 i;
+
+    labels.EQ = c->EQ;
+    labels.RANK = c->RANK;
+    labels.current = 1 + first*c->line_cap;
+
+    if (c->depth==1) {
+        /* the background is not labelled */
+        for(i = first; i < last; i++) {
+            MB_memset(c->plines_out[i]+c->linoff_out, 0, c->bytes_out);
+        }
+        SwitchTo[c->grid](c->plines_out+first, c->linoff_out,
+                          c->plines_in+first, c->linoff_in,
+                          c->bytes_in, last-first, &labels);
+    } else {
+        for(i = first; i < last; i++) {
+            pout = (PIX32 *) (c->plines_out[i]+c->linoff_out);
+            pin = c->plines_in[i]+c->linoff_in;
+            MB_NbRange(c->grid, i, &dxmin, &dxmax);
+            if (c->depth==8) {
+                FZ_LINE_8(pout, poutpre, pin, pinpre,
+                          c->width, dxmin, dxmax, &labels);
+            } else {
+                FZ_LINE_32(pout, poutpre, (PIX32 *) pin, (PIX32 *) pinpre,
+                           c->width, dxmin, dxmax, &labels);
+            }
+            poutpre = pout;
+            pinpre = pin;
+        }
+    }
+
+    c->band_end[first] = labels.current;
+}
+
+/**
+ * Tells if two pixels of the source image belong to the same connected
+ * component (binary image) or to the same flat zone (greyscale image).
+ * \param depth the depth of the source image
+ * \param pin1 pointer on the line of the first pixel
+ * \param x1 the position of the first pixel in its line
+ * \param pin2 pointer on the line of the second pixel
+ * \param x2 the position of the second pixel in its line
+ * \return 1 if the pixels are in the same component, 0 otherwise
+ */
+static INLINE int MB_SameZone(Uint32 depth, PIX8 *pin1, Uint32 x1, PIX8 *pin2, Uint32 x2)
+{
+    binaryT bit1, bit2;
+
+    switch(depth) {
+    case 1:
+        bit1 = ((binaryT *) pin1)[x1/(CHARBIT*BYTEPERWORD)]>>(x1%(CHARBIT*BYTEPERWORD));
+        bit2 = ((binaryT *) pin2)[x2/(CHARBIT*BYTEPERWORD)]>>(x2%(CHARBIT*BYTEPERWORD));
+        return (int) (bit1&bit2&1);
+    case 8:
+        return pin1[x1]==pin2[x2];
+    default:
+        return ((PIX32 *) pin1)[x1]==((PIX32 *) pin2)[x2];
+    }
+}
+
+/**
+ * Merges the labels of the first line of a band with the labels of the
+ * last line of the previous band.
+ * \param c the labelling context
+ * \param y the first line of the band
+ */
+static void MB_MergeBand(MB_LabelCtx *c, Uint32 y)
+{
+    MB_Label labels;
+    PIX32 *pout, *poutpre;
+    PIX8 *pin, *pinpre;
+    int x, xn, dxmin, dxmax;
+
+    labels.EQ = c->EQ;
+    labels.RANK = c->RANK;
+
+    pout = (PIX32 *) (c->plines_out[y]+c->linoff_out);
+    poutpre = (PIX32 *) (c->plines_out[y-1]+c->linoff_out);
+    pin = c->plines_in[y]+c->linoff_in;
+    pinpre = c->plines_in[y-1]+c->linoff_in;
+    MB_NbRange(c->grid, y, &dxmin, &dxmax);
+
+    for(x=0; x<(int) c->width; x++) {
+        for(xn=x+dxmin; xn<=x+dxmax; xn++) {
+            if (xn>=0 && xn<(int) c->width &&
+                MB_SameZone(c->depth, pin, x, pinpre, xn)) {
+                MB_UnionLabels(&labels, pout[x], poutpre[xn]);
+            }
+        }
+    }
+}
+
+/**
+ * Gives their final value to the labels. The components are numbered in
+ * the order of their first pixel in the image, which is also the order of
+ * their smallest label, and the numbers are converted into labels values
+ * avoiding the values of the low byte outside of lblow and lbhigh. At the
+ * end, each label holds its final value.
+ * \param c the labelling context
+ * \param lblow the lowest value allowed for label on the low byte
+ * \param lbhml the number of values allowed on the low byte (lbhigh-lblow)
+ * \return the number of components
+ */
+static Uint32 MB_NumberLabels(MB_LabelCtx *c, PIX32 lblow, PIX32 lbhml)
+{
+    MB_Label labels;
+    PIX32 l, root;
+    Uint32 y, count;
+    PIX32 *EQ = c->EQ;
+    PIX8 *RANK = c->RANK;
+
+    labels.EQ = EQ;
+    labels.RANK = RANK;
+
+    /* every label is first linked directly to its root */
+    for(y = 0; y < c->height; y++) {
+        for(l = 1+y*c->line_cap; l < c->band_end[y]; l++) {
+            EQ[l] = MB_FindLabel(&labels, l);
+        }
+    }
+
+    /* then the roots are numbered when their smallest label is met */
+    /* and their value is given to the labels of their tree */
+    count = 0;
+    for(y = 0; y < c->height; y++) {
+        for(l = 1+y*c->line_cap; l < c->band_end[y]; l++) {
+            if (RANK[l]==NUMBERED)
+                continue;
+            root = EQ[l];
+            if (RANK[root]!=NUMBERED) {
+                EQ[root] = lblow + (count%lbhml) + 256*(count/lbhml);
+                RANK[root] = NUMBERED;
+                count++;
+            }
+            EQ[l] = EQ[root];
+        }
+    }
+
+    return count;
+}
+
+/**
+ * Replaces the labels of the lines first to last-1 by their final value.
+ * \param ctx the labelling context
+ * \param first the first line of the band
+ * \param last the line following the last line of the band
+ */
+static void MB_TidyBand(void *ctx, Uint32 first, Uint32 last)
+{
+    MB_LabelCtx *c = (MB_LabelCtx *) ctx;
+    Uint32 i, x;
+    PIX32 *p;
+
+    for(i = first; i < last; i++) {
+        p = (PIX32 *) (c->plines_out[i]+c->linoff_out);
+        for(x = 0; x < c->width; x++) {
+            if (p[x]!=0) {
+                p[x] = c->EQ[p[x]];
+            }
+        }
+    }
+}
+
+/************************************************/
+/*High level function and global variables    */
+/************************************************/
+
+/**
+ * Labels the connected components of a binary image or the flat zones of
+ * a greyscale image.
+ *
+ * \param src the source image
+ * \param dest the 32-bit image where components are labelled
+ * \param lblow the lowest value allowed for label on the low byte (must be inferior to lbhigh)
+ * \param lbhigh the first high value NOT allowed for label on the low byte (maximum allowed is 256)
+ * \param pNbobj the number of components found
+ * \param grid the grid used (either square or hexagonal)
+ * \return An error code (NO_ERR if successful)
+ */
+static MB_errcode MB_LabelImage(MB_Image *src, MB_Image *dest, Uint32 lblow, Uint32 lbhigh, Uint32 *pNbobj, enum MB_grid_t grid)
+{
+    MB_LabelCtx ctx;
+    Uint64 nb_labels;
+    Uint32 y;
+
+    /* Verification over parameter given in entry*/
+    if (lblow>=lbhigh) return ERR_BAD_VALUE;
+    if (lbhigh>256) return ERR_BAD_VALUE;
+
+    /* Initializing the algorithm parameters */
+    /* a pixel takes a new label only when its left neighbor is not in */
+    /* its component, thus at most one binary pixel out of two in a line */
+    ctx.width = src->width;
+    ctx.height = src->height;
+    ctx.depth = src->depth;
+    ctx.grid = grid;
+    ctx.line_cap = (src->depth==1) ? (src->width+1)/2 : src->width;
+    nb_labels = 1 + ((Uint64) src->height)*ctx.line_cap;
+    if (nb_labels*sizeof(PIX32)>0x7FFFFFFF) {
+        return ERR_CANT_ALLOCATE_MEMORY;
+    }
+    ctx.EQ = MB_malloc((int) (nb_labels*sizeof(PIX32)));
+    ctx.RANK = MB_malloc((int) nb_labels);
+    ctx.band_end = MB_malloc(src->height*sizeof(PIX32));
+    if(ctx.EQ==NULL || ctx.RANK==NULL || ctx.band_end==NULL){
+        /* in case allocation goes wrong */
+        MB_free(ctx.EQ);
+        MB_free(ctx.RANK);
+        MB_free(ctx.band_end);
+        return ERR_CANT_ALLOCATE_MEMORY;
+    }
+    MB_memset(ctx.band_end, 0, src->height*sizeof(PIX32));
+    ctx.EQ[0] = 0;
+    ctx.RANK[0] = 0;
+
+    /* setting up pointers */
+    ctx.plines_in = &src->PLINES[MB_Y_TOP(src)];
+    ctx.plines_out = &dest->PLINES[MB_Y_TOP(dest)];
+    ctx.linoff_in  = MB_LINE_OFFSET(src);
+    ctx.linoff_out = MB_LINE_OFFSET(dest);
+    ctx.bytes_in = MB_LINE_COUNT(src);
+    ctx.bytes_out = MB_LINE_COUNT(dest);
+
+    /* labelling the bands */
+    MB_RunBands(MB_LabelBand, &ctx, src->height, ctx.bytes_out);
+
+    /* merging the labels across the boundaries of the bands */
+    for(y = 1; y < src->height; y++) {
+        if (ctx.band_end[y]!=0)
+            MB_MergeBand(&ctx, y);
+    }
+
+    *pNbobj = MB_NumberLabels(&ctx, (PIX32) lblow, (PIX32) (lbhigh-lblow));
+
+    MB_RunBands(MB_TidyBand, &ctx, src->height, ctx.bytes_out);
+
+    /* freeing the labels arrays */
+    MB_free(ctx.EQ);
+    MB_free(ctx.RANK);
+    MB_free(ctx.band_end);
+
+    return NO_ERR;
+}
+
 /**
  * Labeling the object found in src image.
  *
@@ -676,12 +1029,6 @@ static TSWITCHEP *SwitchTo[2] =
  */
 MB_errcode MB_Labelb(MB_Image *src, MB_Image *dest, Uint32 lblow, Uint32 lbhigh, Uint32 *pNbobj, enum MB_grid_t grid) {
 
-    Uint32 linoff_in, linoff_out;
-    Uint32 bytes_in, bytes_out;
-    PLINE *plines_in, *plines_out;
-    MB_Label labels;
-    TSWITCHEP *fn;
-    
     /* verification over image size compatibility */
     if (!MB_CHECK_SIZE_2(src, dest)) {
         return ERR_BAD_SIZE;
@@ -694,48 +1041,37 @@ MB_errcode MB_Labelb(MB_Image *src, MB_Image *dest, Uint32 lblow, Uint32 lbhigh,
     default:
         return ERR_BAD_DEPTH;
     }
-    /* Verification over parameter given in entry*/
-    if (lblow>=lbhigh) return ERR_BAD_VALUE;
-    if (lbhigh>256) return ERR_BAD_VALUE;
-    
-    /* Initializing the algorithm parameters */
-    labels.current = 1;
-    labels.ccurrent = 0;
-    labels.maxEQ = (src->width*src->height)/4;
-    labels.EQ = MB_malloc(labels.maxEQ*sizeof(PIX32));
-    labels.CEQ = MB_malloc(labels.maxEQ*sizeof(PIX32));
-    if(labels.EQ==NULL || labels.CEQ==NULL){
-        /* in case allocation goes wrong */
-        MB_free(labels.EQ);
-        MB_free(labels.CEQ);
-        return ERR_CANT_ALLOCATE_MEMORY;
-    } 
-    MB_memset(labels.EQ, 0, labels.maxEQ*sizeof(PIX32));
-    MB_memset(labels.CEQ, 0, labels.maxEQ*sizeof(PIX32));
-    
-    /* the label image is reset */
-    MB_ConSet(dest, 0);
-    
-    /* setting up pointers */
-    plines_in = &src->PLINES[MB_Y_TOP(src)];
-    plines_out = &dest->PLINES[MB_Y_TOP(dest)];
-    linoff_in  = MB_LINE_OFFSET(src);
-    linoff_out = MB_LINE_OFFSET(dest);
-    bytes_in = MB_LINE_COUNT(src);
-    bytes_out = MB_LINE_COUNT(dest);
-    
-    /* Calling the corresponding function */
-    fn = SwitchTo[grid];
-    fn(plines_out, linoff_out, plines_in, linoff_in, bytes_in, src->height, &labels);
 
-    MB_TidyLabel(plines_out, linoff_out, bytes_out, src->height, (PIX32) lblow, (PIX32) lbhigh, &labels);
-    
-    *pNbobj = (int) (labels.ccurrent);
-    
-    /* freeing the labels arrays */
-    MB_free(labels.EQ);
-    MB_free(labels.CEQ);
-
-    return NO_ERR;
+    return MB_LabelImage(src, dest, lblow, lbhigh, pNbobj, grid);
 }
 
+/**
+ * Labeling the flat zones (connected components of pixels of the same
+ * value) of src image. Every pixel is labelled.
+ *
+ * \param src the greyscale source image (8-bit or 32-bit)
+ * \param dest the 32-bit image where flat zones are labelled
+ * \param lblow the lowest value allowed for label on the low byte (must be inferior to lbhigh)
+ * \param lbhigh the first high value NOT allowed for label on the low byte (maximum allowed is 256)
+ * \param pNbobj the number of flat zones found
+ * \param grid the grid used (either square or hexagonal)
+ * \return An error code (NO_ERR if successful)
+ */
+MB_errcode MB_LabelFlatZones(MB_Image *src, MB_Image *dest, Uint32 lblow, Uint32 lbhigh, Uint32 *pNbobj, enum MB_grid_t grid) {
+
+    /* verification over image size compatibility */
+    if (!MB_CHECK_SIZE_2(src, dest)) {
+        return ERR_BAD_SIZE;
+    }
+    /* Only greyscale and 32-bit images can be processed */
+    /* the output is necessarly a 32-bit image */
+    switch (MB_PROBE_PAIR(src, dest)) {
+    case MB_PAIR_8_32:
+    case MB_PAIR_32_32:
+        break;
+    default:
+        return ERR_BAD_DEPTH;
+    }
+
+    return MB_LabelImage(src, dest, lblow, lbhigh, pNbobj, grid);
+}
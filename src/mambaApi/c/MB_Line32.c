@@ -0,0 +1,576 @@
+/**
+ * \file MB_Line32.c
+ * \date 10-17-2026
+ *
+ */
+
+/*
+ * Copyright (c) <2009>, <Nicolas BEUCHER and ARMINES for the Centre de
+ * Morphologie Mathématique(CMM), common research center to ARMINES and MINES
+ * Paristech>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish,
+ * distribute, sublicense, and/or sell copies of the Software, and to permit
+ * persons to whom the Software is furnished to do so, subject to the following
+ * conditions: The above copyright notice and this permission notice shall be
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright
+ * holders shall not be used in advertising or otherwise to promote the sale,
+ * use or other dealings in this Software without their prior written
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+
+/*
+ * This file contains the line computations shared by the 32-bit neighbor,
+ * vector and build operators. Each computation has a scalar version and
+ * SSE4.1 and AVX2 versions (min_epu32/max_epu32) selected when the library
+ * is running (see MB_Cpu.c).
+ *
+ * The lines are given as pixel pointers and a number of pixels. The source
+ * and destination lines can be the same line shifted by a few pixels (in
+ * place computations), the pixels are then computed in the order that reads
+ * every source pixel before it is modified.
+ */
+
+/****************************************/
+/* Scalar functions                     */
+/****************************************/
+
+/**
+ * Computes the inferior value of two lines (scalar version).
+ * \param pout pointer on the first pixel of the source/destination line
+ * \param pin pointer on the first pixel of the source line
+ * \param nb_pix number of pixels to compute
+ */
+static INLINE void INF_LINE32(PIX32 *pout, PIX32 *pin, Uint32 nb_pix)
+{
+    Uint32 i;
+
+    if (pin<pout) {
+        for(i=nb_pix;i>0;i--) {
+            pout[i-1] = pout[i-1]<pin[i-1] ? pout[i-1] : pin[i-1];
+        }
+    } else {
+        for(i=0;i<nb_pix;i++) {
+            pout[i] = pout[i]<pin[i] ? pout[i] : pin[i];
+        }
+    }
+}
+
+/**
+ * Computes the inferior value of a line and a constant (scalar version).
+ * \param pout pointer on the first pixel of the source/destination line
+ * \param value the constant value
+ * \param nb_pix number of pixels to compute
+ */
+static INLINE void INF_CONST32(PIX32 *pout, PIX32 value, Uint32 nb_pix)
+{
+    Uint32 i;
+
+    for(i=0;i<nb_pix;i++) {
+        pout[i] = pout[i]<value ? pout[i] : value;
+    }
+}
+
+/**
+ * Computes the superior value of two lines (scalar version).
+ * \param pout pointer on the first pixel of the source/destination line
+ * \param pin pointer on the first pixel of the source line
+ * \param nb_pix number of pixels to compute
+ */
+static INLINE void SUP_LINE32(PIX32 *pout, PIX32 *pin, Uint32 nb_pix)
+{
+    Uint32 i;
+
+    if (pin<pout) {
+        for(i=nb_pix;i>0;i--) {
+            pout[i-1] = pout[i-1]>pin[i-1] ? pout[i-1] : pin[i-1];
+        }
+    } else {
+        for(i=0;i<nb_pix;i++) {
+            pout[i] = pout[i]>pin[i] ? pout[i] : pin[i];
+        }
+    }
+}
+
+/**
+ * Computes the superior value of a line and a constant (scalar version).
+ * \param pout pointer on the first pixel of the source/destination line
+ * \param value the constant value
+ * \param nb_pix number of pixels to compute
+ */
+static INLINE void SUP_CONST32(PIX32 *pout, PIX32 value, Uint32 nb_pix)
+{
+    Uint32 i;
+
+    for(i=0;i<nb_pix;i++) {
+        pout[i] = pout[i]>value ? pout[i] : value;
+    }
+}
+
+/**
+ * Computes a build step on a line (the germ is dilated by its neighbor and limited by the mask, scalar version).
+ * \param germ pointer on the first pixel of the germ line (source/destination)
+ * \param nbr pointer on the first pixel of the neighbor line
+ * \param mask pointer on the first pixel of the mask line
+ * \param nb_pix number of pixels to compute
+ * \return the volume of the computed pixels
+ */
+static INLINE Uint64 BLD_LINE32(PIX32 *germ, PIX32 *nbr, PIX32 *mask, Uint32 nb_pix)
+{
+    Uint32 i;
+    Uint64 vol = 0;
+    PIX32 a;
+
+    for(i=0;i<nb_pix;i++) {
+        a = germ[i]>nbr[i] ? germ[i] : nbr[i];
+        a = a<mask[i] ? a : mask[i];
+        germ[i] = a;
+        vol += a;
+    }
+    return vol;
+}
+
+/**
+ * Computes a dual build step on a line (the germ is eroded by its neighbor and limited by the mask, scalar version).
+ * \param germ pointer on the first pixel of the germ line (source/destination)
+ * \param nbr pointer on the first pixel of the neighbor line
+ * \param mask pointer on the first pixel of the mask line
+ * \param nb_pix number of pixels to compute
+ * \return the volume of the computed pixels
+ */
+static INLINE Uint64 DUALBLD_LINE32(PIX32 *germ, PIX32 *nbr, PIX32 *mask, Uint32 nb_pix)
+{
+    Uint32 i;
+    Uint64 vol = 0;
+    PIX32 a;
+
+    for(i=0;i<nb_pix;i++) {
+        a = germ[i]<nbr[i] ? germ[i] : nbr[i];
+        a = a>mask[i] ? a : mask[i];
+        germ[i] = a;
+        vol += a;
+    }
+    return vol;
+}
+
+/****************************************/
+/* SIMD functions                       */
+/****************************************/
+/* Image lines are only aligned on 16 bytes, unaligned accesses are used */
+#ifdef MB_SIMD_X86
+
+/**
+ * Computes the inferior value of two lines (SSE4.1 version).
+ * \param pout pointer on the first pixel of the source/destination line
+ * \param pin pointer on the first pixel of the source line
+ * \param nb_pix number of pixels to compute
+ */
+static MB_TARGET_SSE41 void INF_LINE32_SSE41(PIX32 *pout, PIX32 *pin, Uint32 nb_pix)
+{
+    Uint32 i;
+    __m128i a, b;
+
+    if (pin<pout) {
+        for(i=nb_pix;i>=4;i-=4) {
+            a = _mm_loadu_si128((__m128i *) (pout+i-4));
+            b = _mm_loadu_si128((__m128i *) (pin+i-4));
+            _mm_storeu_si128((__m128i *) (pout+i-4), _mm_min_epu32(a, b));
+        }
+        INF_LINE32(pout, pin, i);
+    } else {
+        for(i=0;i+4<=nb_pix;i+=4) {
+            a = _mm_loadu_si128((__m128i *) (pout+i));
+            b = _mm_loadu_si128((__m128i *) (pin+i));
+            _mm_storeu_si128((__m128i *) (pout+i), _mm_min_epu32(a, b));
+        }
+        INF_LINE32(pout+i, pin+i, nb_pix-i);
+    }
+}
+
+/**
+ * Computes the inferior value of a line and a constant (SSE4.1 version).
+ * \param pout pointer on the first pixel of the source/destination line
+ * \param value the constant value
+ * \param nb_pix number of pixels to compute
+ */
+static MB_TARGET_SSE41 void INF_CONST32_SSE41(PIX32 *pout, PIX32 value, Uint32 nb_pix)
+{
+    Uint32 i;
+    __m128i a;
+    __m128i b = _mm_set1_epi32((int) value);
+
+    for(i=0;i+4<=nb_pix;i+=4) {
+        a = _mm_loadu_si128((__m128i *) (pout+i));
+        _mm_storeu_si128((__m128i *) (pout+i), _mm_min_epu32(a, b));
+    }
+    INF_CONST32(pout+i, value, nb_pix-i);
+}
+
+/**
+ * Computes the superior value of two lines (SSE4.1 version).
+ * \param pout pointer on the first pixel of the source/destination line
+ * \param pin pointer on the first pixel of the source line
+ * \param nb_pix number of pixels to compute
+ */
+static MB_TARGET_SSE41 void SUP_LINE32_SSE41(PIX32 *pout, PIX32 *pin, Uint32 nb_pix)
+{
+    Uint32 i;
+    __m128i a, b;
+
+    if (pin<pout) {
+        for(i=nb_pix;i>=4;i-=4) {
+            a = _mm_loadu_si128((__m128i *) (pout+i-4));
+            b = _mm_loadu_si128((__m128i *) (pin+i-4));
+            _mm_storeu_si128((__m128i *) (pout+i-4), _mm_max_epu32(a, b));
+        }
+        SUP_LINE32(pout, pin, i);
+    } else {
+        for(i=0;i+4<=nb_pix;i+=4) {
+            a = _mm_loadu_si128((__m128i *) (pout+i));
+            b = _mm_loadu_si128((__m128i *) (pin+i));
+            _mm_storeu_si128((__m128i *) (pout+i), _mm_max_epu32(a, b));
+        }
+        SUP_LINE32(pout+i, pin+i, nb_pix-i);
+    }
+}
+
+/**
+ * Computes the superior value of a line and a constant (SSE4.1 version).
+ * \param pout pointer on the first pixel of the source/destination line
+ * \param value the constant value
+ * \param nb_pix number of pixels to compute
+ */
+static MB_TARGET_SSE41 void SUP_CONST32_SSE41(PIX32 *pout, PIX32 value, Uint32 nb_pix)
+{
+    Uint32 i;
+    __m128i a;
+    __m128i b = _mm_set1_epi32((int) value);
+
+    for(i=0;i+4<=nb_pix;i+=4) {
+        a = _mm_loadu_si128((__m128i *) (pout+i));
+        _mm_storeu_si128((__m128i *) (pout+i), _mm_max_epu32(a, b));
+    }
+    SUP_CONST32(pout+i, value, nb_pix-i);
+}
+
+/**
+ * Computes a build step on a line (SSE4.1 version).
+ * \param germ pointer on the first pixel of the germ line (source/destination)
+ * \param nbr pointer on the first pixel of the neighbor line
+ * \param mask pointer on the first pixel of the mask line
+ * \param nb_pix number of pixels to compute
+ * \return the volume of the computed pixels
+ */
+static MB_TARGET_SSE41 Uint64 BLD_LINE32_SSE41(PIX32 *germ, PIX32 *nbr, PIX32 *mask, Uint32 nb_pix)
+{
+    Uint32 i;
+    Uint64 vol[2];
+    __m128i a;
+    __m128i acc = _mm_setzero_si128();
+
+    for(i=0;i+4<=nb_pix;i+=4) {
+        a = _mm_max_epu32(_mm_loadu_si128((__m128i *) (germ+i)), _mm_loadu_si128((__m128i *) (nbr+i)));
+        a = _mm_min_epu32(a, _mm_loadu_si128((__m128i *) (mask+i)));
+        _mm_storeu_si128((__m128i *) (germ+i), a);
+        /* the volume is accumulated on 64-bit lanes */
+        acc = _mm_add_epi64(acc, _mm_cvtepu32_epi64(a));
+        acc = _mm_add_epi64(acc, _mm_cvtepu32_epi64(_mm_srli_si128(a, 8)));
+    }
+    _mm_storeu_si128((__m128i *) vol, acc);
+    return vol[0]+vol[1]+BLD_LINE32(germ+i, nbr+i, mask+i, nb_pix-i);
+}
+
+/**
+ * Computes a dual build step on a line (SSE4.1 version).
+ * \param germ pointer on the first pixel of the germ line (source/destination)
+ * \param nbr pointer on the first pixel of the neighbor line
+ * \param mask pointer on the first pixel of the mask line
+ * \param nb_pix number of pixels to compute
+ * \return the volume of the computed pixels
+ */
+static MB_TARGET_SSE41 Uint64 DUALBLD_LINE32_SSE41(PIX32 *germ, PIX32 *nbr, PIX32 *mask, Uint32 nb_pix)
+{
+    Uint32 i;
+    Uint64 vol[2];
+    __m128i a;
+    __m128i acc = _mm_setzero_si128();
+
+    for(i=0;i+4<=nb_pix;i+=4) {
+        a = _mm_min_epu32(_mm_loadu_si128((__m128i *) (germ+i)), _mm_loadu_si128((__m128i *) (nbr+i)));
+        a = _mm_max_epu32(a, _mm_loadu_si128((__m128i *) (mask+i)));
+        _mm_storeu_si128((__m128i *) (germ+i), a);
+        /* the volume is accumulated on 64-bit lanes */
+        acc = _mm_add_epi64(acc, _mm_cvtepu32_epi64(a));
+        acc = _mm_add_epi64(acc, _mm_cvtepu32_epi64(_mm_srli_si128(a, 8)));
+    }
+    _mm_storeu_si128((__m128i *) vol, acc);
+    return vol[0]+vol[1]+DUALBLD_LINE32(germ+i, nbr+i, mask+i, nb_pix-i);
+}
+
+/**
+ * Computes the inferior value of two lines (AVX2 version).
+ * \param pout pointer on the first pixel of the source/destination line
+ * \param pin pointer on the first pixel of the source line
+ * \param nb_pix number of pixels to compute
+ */
+static MB_TARGET_AVX2 void INF_LINE32_AVX2(PIX32 *pout, PIX32 *pin, Uint32 nb_pix)
+{
+    Uint32 i;
+    __m256i a, b;
+
+    if (pin<pout) {
+        for(i=nb_pix;i>=8;i-=8) {
+            a = _mm256_loadu_si256((__m256i *) (pout+i-8));
+            b = _mm256_loadu_si256((__m256i *) (pin+i-8));
+            _mm256_storeu_si256((__m256i *) (pout+i-8), _mm256_min_epu32(a, b));
+        }
+        INF_LINE32(pout, pin, i);
+    } else {
+        for(i=0;i+8<=nb_pix;i+=8) {
+            a = _mm256_loadu_si256((__m256i *) (pout+i));
+            b = _mm256_loadu_si256((__m256i *) (pin+i));
+            _mm256_storeu_si256((__m256i *) (pout+i), _mm256_min_epu32(a, b));
+        }
+        INF_LINE32(pout+i, pin+i, nb_pix-i);
+    }
+}
+
+/**
+ * Computes the inferior value of a line and a constant (AVX2 version).
+ * \param pout pointer on the first pixel of the source/destination line
+ * \param value the constant value
+ * \param nb_pix number of pixels to compute
+ */
+static MB_TARGET_AVX2 void INF_CONST32_AVX2(PIX32 *pout, PIX32 value, Uint32 nb_pix)
+{
+    Uint32 i;
+    __m256i a;
+    __m256i b = _mm256_set1_epi32((int) value);
+
+    for(i=0;i+8<=nb_pix;i+=8) {
+        a = _mm256_loadu_si256((__m256i *) (pout+i));
+        _mm256_storeu_si256((__m256i *) (pout+i), _mm256_min_epu32(a, b));
+    }
+    INF_CONST32(pout+i, value, nb_pix-i);
+}
+
+/**
+ * Computes the superior value of two lines (AVX2 version).
+ * \param pout pointer on the first pixel of the source/destination line
+ * \param pin pointer on the first pixel of the source line
+ * \param nb_pix number of pixels to compute
+ */
+static MB_TARGET_AVX2 void SUP_LINE32_AVX2(PIX32 *pout, PIX32 *pin, Uint32 nb_pix)
+{
+    Uint32 i;
+    __m256i a, b;
+
+    if (pin<pout) {
+        for(i=nb_pix;i>=8;i-=8) {
+            a = _mm256_loadu_si256((__m256i *) (pout+i-8));
+            b = _mm256_loadu_si256((__m256i *) (pin+i-8));
+            _mm256_storeu_si256((__m256i *) (pout+i-8), _mm256_max_epu32(a, b));
+        }
+        SUP_LINE32(pout, pin, i);
+    } else {
+        for(i=0;i+8<=nb_pix;i+=8) {
+            a = _mm256_loadu_si256((__m256i *) (pout+i));
+            b = _mm256_loadu_si256((__m256i *) (pin+i));
+            _mm256_storeu_si256((__m256i *) (pout+i), _mm256_max_epu32(a, b));
+        }
+        SUP_LINE32(pout+i, pin+i, nb_pix-i);
+    }
+}
+
+/**
+ * Computes the superior value of a line and a constant (AVX2 version).
+ * \param pout pointer on the first pixel of the source/destination line
+ * \param value the constant value
+ * \param nb_pix number of pixels to compute
+ */
+static MB_TARGET_AVX2 void SUP_CONST32_AVX2(PIX32 *pout, PIX32 value, Uint32 nb_pix)
+{
+    Uint32 i;
+    __m256i a;
+    __m256i b = _mm256_set1_epi32((int) value);
+
+    for(i=0;i+8<=nb_pix;i+=8) {
+        a = _mm256_loadu_si256((__m256i *) (pout+i));
+        _mm256_storeu_si256((__m256i *) (pout+i), _mm256_max_epu32(a, b));
+    }
+    SUP_CONST32(pout+i, value, nb_pix-i);
+}
+
+/**
+ * Computes a build step on a line (AVX2 version).
+ * \param germ pointer on the first pixel of the germ line (source/destination)
+ * \param nbr pointer on the first pixel of the neighbor line
+ * \param mask pointer on the first pixel of the mask line
+ * \param nb_pix number of pixels to compute
+ * \return the volume of the computed pixels
+ */
+static MB_TARGET_AVX2 Uint64 BLD_LINE32_AVX2(PIX32 *germ, PIX32 *nbr, PIX32 *mask, Uint32 nb_pix)
+{
+    Uint32 i;
+    Uint64 vol[4];
+    __m256i a;
+    __m256i acc = _mm256_setzero_si256();
+
+    for(i=0;i+8<=nb_pix;i+=8) {
+        a = _mm256_max_epu32(_mm256_loadu_si256((__m256i *) (germ+i)), _mm256_loadu_si256((__m256i *) (nbr+i)));
+        a = _mm256_min_epu32(a, _mm256_loadu_si256((__m256i *) (mask+i)));
+        _mm256_storeu_si256((__m256i *) (germ+i), a);
+        /* the volume is accumulated on 64-bit lanes */
+        acc = _mm256_add_epi64(acc, _mm256_cvtepu32_epi64(_mm256_castsi256_si128(a)));
+        acc = _mm256_add_epi64(acc, _mm256_cvtepu32_epi64(_mm256_extracti128_si256(a, 1)));
+    }
+    _mm256_storeu_si256((__m256i *) vol, acc);
+    return vol[0]+vol[1]+vol[2]+vol[3]+BLD_LINE32(germ+i, nbr+i, mask+i, nb_pix-i);
+}
+
+/**
+ * Computes a dual build step on a line (AVX2 version).
+ * \param germ pointer on the first pixel of the germ line (source/destination)
+ * \param nbr pointer on the first pixel of the neighbor line
+ * \param mask pointer on the first pixel of the mask line
+ * \param nb_pix number of pixels to compute
+ * \return the volume of the computed pixels
+ */
+static MB_TARGET_AVX2 Uint64 DUALBLD_LINE32_AVX2(PIX32 *germ, PIX32 *nbr, PIX32 *mask, Uint32 nb_pix)
+{
+    Uint32 i;
+    Uint64 vol[4];
+    __m256i a;
+    __m256i acc = _mm256_setzero_si256();
+
+    for(i=0;i+8<=nb_pix;i+=8) {
+        a = _mm256_min_epu32(_mm256_loadu_si256((__m256i *) (germ+i)), _mm256_loadu_si256((__m256i *) (nbr+i)));
+        a = _mm256_max_epu32(a, _mm256_loadu_si256((__m256i *) (mask+i)));
+        _mm256_storeu_si256((__m256i *) (germ+i), a);
+        /* the volume is accumulated on 64-bit lanes */
+        acc = _mm256_add_epi64(acc, _mm256_cvtepu32_epi64(_mm256_castsi256_si128(a)));
+        acc = _mm256_add_epi64(acc, _mm256_cvtepu32_epi64(_mm256_extracti128_si256(a, 1)));
+    }
+    _mm256_storeu_si256((__m256i *) vol, acc);
+    return vol[0]+vol[1]+vol[2]+vol[3]+DUALBLD_LINE32(germ+i, nbr+i, mask+i, nb_pix-i);
+}
+
+#endif
+
+/****************************************/
+/* SIMD versions                        */
+/****************************************/
+/* The version of each computation used is taken in a table according to */
+/* the SIMD level selected when the library is running */
+
+/** Type of the line functions */
+typedef void (*TLINE32)(PIX32 *pout, PIX32 *pin, Uint32 nb_pix);
+/** Type of the constant functions */
+typedef void (*TCONST32)(PIX32 *pout, PIX32 value, Uint32 nb_pix);
+/** Type of the build functions */
+typedef Uint64 (*TBLD_LINE32)(PIX32 *germ, PIX32 *nbr, PIX32 *mask, Uint32 nb_pix);
+
+static const TLINE32 INF_LINE32_FN[MB_SIMD_LEVELS] =
+    MB_SIMD_TABLE(INF_LINE32, INF_LINE32, INF_LINE32_SSE41, INF_LINE32_AVX2, INF_LINE32_AVX2);
+static const TCONST32 INF_CONST32_FN[MB_SIMD_LEVELS] =
+    MB_SIMD_TABLE(INF_CONST32, INF_CONST32, INF_CONST32_SSE41, INF_CONST32_AVX2, INF_CONST32_AVX2);
+static const TLINE32 SUP_LINE32_FN[MB_SIMD_LEVELS] =
+    MB_SIMD_TABLE(SUP_LINE32, SUP_LINE32, SUP_LINE32_SSE41, SUP_LINE32_AVX2, SUP_LINE32_AVX2);
+static const TCONST32 SUP_CONST32_FN[MB_SIMD_LEVELS] =
+    MB_SIMD_TABLE(SUP_CONST32, SUP_CONST32, SUP_CONST32_SSE41, SUP_CONST32_AVX2, SUP_CONST32_AVX2);
+static const TBLD_LINE32 BLD_LINE32_FN[MB_SIMD_LEVELS] =
+    MB_SIMD_TABLE(BLD_LINE32, BLD_LINE32, BLD_LINE32_SSE41, BLD_LINE32_AVX2, BLD_LINE32_AVX2);
+static const TBLD_LINE32 DUALBLD_LINE32_FN[MB_SIMD_LEVELS] =
+    MB_SIMD_TABLE(DUALBLD_LINE32, DUALBLD_LINE32, DUALBLD_LINE32_SSE41, DUALBLD_LINE32_AVX2, DUALBLD_LINE32_AVX2);
+
+/****************************************/
+/* Main functions                       */
+/****************************************/
+
+/**
+ * Computes the inferior value of two lines, the result is put in the first
+ * line. The lines can overlap.
+ * \param pout pointer on the first pixel of the source/destination line
+ * \param pin pointer on the first pixel of the source line
+ * \param nb_pix number of pixels to compute
+ */
+void MB_InfLine32(PIX32 *pout, PIX32 *pin, Uint32 nb_pix)
+{
+    MB_SIMD_SELECT(INF_LINE32_FN)(pout, pin, nb_pix);
+}
+
+/**
+ * Computes the inferior value of a line and a constant value.
+ * \param pout pointer on the first pixel of the source/destination line
+ * \param value the constant value
+ * \param nb_pix number of pixels to compute
+ */
+void MB_InfConst32(PIX32 *pout, PIX32 value, Uint32 nb_pix)
+{
+    MB_SIMD_SELECT(INF_CONST32_FN)(pout, value, nb_pix);
+}
+
+/**
+ * Computes the superior value of two lines, the result is put in the first
+ * line. The lines can overlap.
+ * \param pout pointer on the first pixel of the source/destination line
+ * \param pin pointer on the first pixel of the source line
+ * \param nb_pix number of pixels to compute
+ */
+void MB_SupLine32(PIX32 *pout, PIX32 *pin, Uint32 nb_pix)
+{
+    MB_SIMD_SELECT(SUP_LINE32_FN)(pout, pin, nb_pix);
+}
+
+/**
+ * Computes the superior value of a line and a constant value.
+ * \param pout pointer on the first pixel of the source/destination line
+ * \param value the constant value
+ * \param nb_pix number of pixels to compute
+ */
+void MB_SupConst32(PIX32 *pout, PIX32 value, Uint32 nb_pix)
+{
+    MB_SIMD_SELECT(SUP_CONST32_FN)(pout, value, nb_pix);
+}
+
+/**
+ * Computes a build step on a line. The germ line and the neighbor line
+ * must not overlap unless they are the same line.
+ * \param germ pointer on the first pixel of the germ line (source/destination)
+ * \param nbr pointer on the first pixel of the neighbor line
+ * \param mask pointer on the first pixel of the mask line
+ * \param nb_pix number of pixels to compute
+ * \return the volume of the computed pixels
+ */
+Uint64 MB_BldLine32(PIX32 *germ, PIX32 *nbr, PIX32 *mask, Uint32 nb_pix)
+{
+    return MB_SIMD_SELECT(BLD_LINE32_FN)(germ, nbr, mask, nb_pix);
+}
+
+/**
+ * Computes a dual build step on a line. The germ line and the neighbor line
+ * must not overlap unless they are the same line.
+ * \param germ pointer on the first pixel of the germ line (source/destination)
+ * \param nbr pointer on the first pixel of the neighbor line
+ * \param mask pointer on the first pixel of the mask line
+ * \param nb_pix number of pixels to compute
+ * \return the volume of the computed pixels
+ */
+Uint64 MB_DualBldLine32(PIX32 *germ, PIX32 *nbr, PIX32 *mask, Uint32 nb_pix)
+{
+    return MB_SIMD_SELECT(DUALBLD_LINE32_FN)(germ, nbr, mask, nb_pix);
+}
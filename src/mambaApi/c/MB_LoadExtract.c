@@ -108,7 +108,154 @@ MB_errcode MB_Load32(MB_Image *image, PIX8 *indata, Uint32 len) {
 }
 
 /**
- * Loads an image data with data given in argument
+ * Loads a 32-bits image with 16-bits data given in argument. Each 16-bits
+ * value is widened into a 32-bits pixel.
+ * \param image the image to fill
+ * \param indata the data to fill the image with (2 bytes per pixel)
+ * \param len the length of data given
+ * \param bigendian the byte order of the data (0 for little endian, 1 for
+ * big endian)
+ * \return An error code (NO_ERR if successful)
+ */
+MB_errcode MB_Load16(MB_Image *image, PIX8 *indata, Uint32 len, Uint32 bigendian) {
+    Uint32 i, j;
+    PLINE *plines;
+    Uint32 linoff;
+    PIX32 *p;
+    PIX8 *pin;
+    Uint32 lo, hi;
+
+    /* Only 32 bit image can be loaded */
+    if (image->depth!=32) {
+        return ERR_BAD_DEPTH;
+    }
+    /* the data given must be sufficient to fill the image */
+    if (len!=(image->height*image->width*2)) {
+        return ERR_LOAD_DATA;
+    }
+
+    /* position of the low and high bytes of the values */
+    lo = bigendian ? 1 : 0;
+    hi = 1-lo;
+
+    /* Setting up line pointers */
+    /* and offset to avoid edge of the image */
+    plines = &image->PLINES[MB_Y_TOP(image)];
+    linoff = MB_X_LEFT(image);
+
+    /* proceeding line by line */
+    for (i = 0; i < image->height; i++, plines++) {
+        p = (PIX32 *) (*plines+linoff);
+        pin = indata+i*image->width*2;
+        for (j = 0; j < image->width; j++, pin+=2) {
+            p[j] = ((PIX32) pin[hi]<<8) | pin[lo];
+        }
+    }
+
+    return NO_ERR;
+}
+
+/*
+ * The packed binary data hold each line of the image in width/8 bytes, the
+ * first pixel of each byte being in its most significant bit (PBM files,
+ * numpy.packbits) or in its least significant bit. The pixels of a binary
+ * image are stored in 32-bit words, the first pixel being in the least
+ * significant bit of the word, so that a line in the second order is a plain
+ * copy on a little endian processor.
+ */
+
+/* Reverses the order of the bits inside each byte of a word */
+static INLINE Uint32 MB_ReverseBits(Uint32 w)
+{
+    w = ((w>>1)&0x55555555) | ((w&0x55555555)<<1);
+    w = ((w>>2)&0x33333333) | ((w&0x33333333)<<2);
+    w = ((w>>4)&0x0F0F0F0F) | ((w&0x0F0F0F0F)<<4);
+    return w;
+}
+
+/**
+ * Converts packed binary data into the words of a binary line.
+ * \param dst the words of the line
+ * \param src the packed data (4*nwords bytes)
+ * \param nwords the number of words to convert
+ * \param msbfirst 1 if the first pixel is in the most significant bit of
+ * the bytes of src
+ */
+void MB_BitsToWords(Uint32 *dst, const PIX8 *src, Uint32 nwords, Uint32 msbfirst)
+{
+    Uint32 i, w;
+
+    for (i = 0; i < nwords; i++, src+=4) {
+        w = ((Uint32) src[0]) | (((Uint32) src[1])<<8) |
+            (((Uint32) src[2])<<16) | (((Uint32) src[3])<<24);
+        dst[i] = msbfirst ? MB_ReverseBits(w) : w;
+    }
+}
+
+/**
+ * Converts the words of a binary line into packed binary data.
+ * \param dst the packed data (4*nwords bytes)
+ * \param src the words of the line
+ * \param nwords the number of words to convert
+ * \param msbfirst 1 if the first pixel must be put in the most significant
+ * bit of the bytes of dst
+ */
+void MB_WordsToBits(PIX8 *dst, const Uint32 *src, Uint32 nwords, Uint32 msbfirst)
+{
+    Uint32 i, w;
+
+    for (i = 0; i < nwords; i++, dst+=4) {
+        w = msbfirst ? MB_ReverseBits(src[i]) : src[i];
+        dst[0] = (PIX8) (w&0xFF);
+        dst[1] = (PIX8) ((w>>8)&0xFF);
+        dst[2] = (PIX8) ((w>>16)&0xFF);
+        dst[3] = (PIX8) (w>>24);
+    }
+}
+
+/**
+ * Loads a binary image with packed data given in argument (8 pixels per
+ * byte, width/8 bytes per line). No 8-bit image is needed in between.
+ * \param image the image to fill
+ * \param indata the data to fill the image with (packed pixels values)
+ * \param len the length of data given
+ * \param msbfirst 1 if the first pixel is in the most significant bit of
+ * each byte (PBM files, numpy.packbits), 0 if it is in the least significant
+ * bit
+ * \return An error code (NO_ERR if successful)
+ */
+MB_errcode MB_LoadBin(MB_Image *image, PIX8 *indata, Uint32 len, Uint32 msbfirst) {
+    Uint32 i;
+    PLINE *plines;
+    Uint32 linoff, rowbytes;
+
+    /* Only binary image can be loaded */
+    if (image->depth!=1) {
+        return ERR_BAD_DEPTH;
+    }
+    /* the data given must be sufficient to fill the image */
+    rowbytes = image->width/CHARBIT;
+    if (len!=(image->height*rowbytes)) {
+        return ERR_LOAD_DATA;
+    }
+
+    /* Setting up line pointers */
+    /* and offset to avoid edge of the image */
+    plines = &image->PLINES[MB_Y_TOP(image)];
+    linoff = MB_X_LEFT(image);
+
+    /* proceeding line by line */
+    for (i = 0; i < image->height; i++, plines++) {
+        MB_BitsToWords((Uint32 *) (*plines+linoff), indata+i*rowbytes,
+                       rowbytes/4, msbfirst);
+    }
+
+    return NO_ERR;
+}
+
+/**
+ * Loads an image data with data given in argument (the binary images are
+ * loaded with packed data, see MB_LoadBin)
  * \param image the image to fill
  * \param indata the data to fill the image with (complete pixels values)
  * \param len the length of data given
@@ -118,6 +265,9 @@ MB_errcode MB_Load(MB_Image *image, PIX8 *indata, Uint32 len) {
     MB_errcode err = NO_ERR;
     
     switch(image->depth) {
+        case 1:
+            err = MB_LoadBin(image, indata, len, 1);
+            break;
         case 8:
             err = MB_Load8(image, indata, len);
             break;
@@ -208,7 +358,53 @@ MB_errcode MB_Extract32(MB_Image *image, PIX8 **outdata, Uint32 *len) {
 }
 
 /**
- * Reads an image data contents and put it in an array
+ * Reads a binary image data contents and put it in an array of packed
+ * pixels (8 pixels per byte, width/8 bytes per line)
+ * \param image the image to read
+ * \param outdata pointer to the array created (malloc) and filled with the 
+ * pixel data of the image
+ * \param len the length in bytes of data extracted
+ * \param msbfirst 1 to put the first pixel in the most significant bit of
+ * each byte (PBM files, numpy.unpackbits), 0 to put it in the least
+ * significant bit
+ * \return An error code (NO_ERR if successful)
+ */
+MB_errcode MB_ExtractBin(MB_Image *image, PIX8 **outdata, Uint32 *len, Uint32 msbfirst) {
+    Uint32 i;
+    PLINE *plines;
+    Uint32 linoff, rowbytes;
+
+    *len = 0;
+    if (image->depth!=1) {
+        return ERR_BAD_DEPTH;
+    }
+
+    /* allocating the memory */
+    rowbytes = image->width/CHARBIT;
+    *outdata = MB_malloc(image->height*rowbytes);
+    if (*outdata==NULL) {
+        return ERR_CANT_ALLOCATE_MEMORY;
+    }
+
+    /* Setting up line pointers */
+    /* and offset to avoid edge of the image */
+    plines = &image->PLINES[MB_Y_TOP(image)];
+    linoff = MB_X_LEFT(image);
+
+    /* proceeding line by line */
+    for (i = 0; i < image->height; i++, plines++) {
+        MB_WordsToBits(*outdata+i*rowbytes, (Uint32 *) (*plines+linoff),
+                       rowbytes/4, msbfirst);
+    }
+    
+    *len = image->height*rowbytes;
+
+    return NO_ERR;
+}
+
+/**
+ * Reads an image data contents and put it in an array (the binary images
+ * are extracted as packed data, see MB_ExtractBin)
  * \param image the image to read
  * \param outdata pointer to the array created (malloc) and filled with the 
  * pixel data of the image
@@ -219,6 +415,9 @@ MB_errcode MB_Extract(MB_Image *image, PIX8 **outdata, Uint32 *len) {
     MB_errcode err = NO_ERR;
     
     switch(image->depth) {
+        case 1:
+            err = MB_ExtractBin(image, outdata, len, 1);
+            break;
         case 8:
             err = MB_Extract8(image, outdata, len);
             break;
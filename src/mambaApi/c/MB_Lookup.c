@@ -57,6 +57,26 @@ static INLINE void LOOKUP_LINE8(PLINE *plines_out, Uint32 linoff_out,
     }
 }
 
+/****************************************/
+/* Band functions                       */
+/****************************************/
+
+/**
+ * Applies the lookup table to the lines first to last-1.
+ * \param ctx the lines context (the table is given in data)
+ * \param first first line of the band
+ * \param last line following the last line of the band
+ */
+static void LOOKUP_BAND8(void *ctx, Uint32 first, Uint32 last)
+{
+    MB_LinesCtx *c = (MB_LinesCtx *) ctx;
+    Uint32 i;
+
+    for (i = first; i < last; i++) {
+        LOOKUP_LINE8(c->plines_out+i, c->linoff_out, c->plines_in1+i, c->linoff_in1,
+                     c->bytes_in, (Uint32 *) c->data);
+    }
+}
 
 /**
  * Applies the function in the lookup table to the pixels of source image.
@@ -68,9 +88,7 @@ static INLINE void LOOKUP_LINE8(PLINE *plines_out, Uint32 linoff_out,
  */
 MB_errcode MB_Lookup(MB_Image *src, MB_Image *dest, Uint32 *ptab)
 {
-    Uint32 i;
-    PLINE *plines_in, *plines_out;
-    Uint32 linoff_out, linoff_in, bytes_in;
+    MB_LinesCtx ctx;
     
     /* verification over image size compatibility */
     if (!MB_CHECK_SIZE_2(src, dest)) {
@@ -78,20 +96,19 @@ MB_errcode MB_Lookup(MB_Image *src, MB_Image *dest, Uint32 *ptab)
     }
 
     /* Setting up line pointers */
-    plines_in = &src->PLINES[MB_Y_TOP(src)];
-    plines_out = &dest->PLINES[MB_Y_TOP(dest)];
-    linoff_in = MB_LINE_OFFSET(src);
-    linoff_out = MB_LINE_OFFSET(dest);
-    bytes_in = MB_LINE_COUNT(src);
+    ctx.plines_in1 = &src->PLINES[MB_Y_TOP(src)];
+    ctx.plines_out = &dest->PLINES[MB_Y_TOP(dest)];
+    ctx.linoff_in1 = MB_LINE_OFFSET(src);
+    ctx.linoff_out = MB_LINE_OFFSET(dest);
+    ctx.bytes_in = MB_LINE_COUNT(src);
+    ctx.data = ptab;
     
     /* The two images must have 8 bits */
     /* depth */
     switch(MB_PROBE_PAIR( src, dest )) {
 
     case MB_PAIR_8_8:
-        for(i = 0; i < src->height; i++, plines_in++, plines_out++) {
-            LOOKUP_LINE8( plines_out, linoff_out, plines_in, linoff_in, bytes_in, ptab );
-        }
+        MB_RunBands(LOOKUP_BAND8, &ctx, src->height, ctx.bytes_in);
         break;
 
     default:
@@ -0,0 +1,262 @@
+/**
+ * \file MB_Lz4.c
+ * \date 10-17-2026
+ *
+ */
+
+
+/*
+ * Copyright (c) <2009>, <Nicolas BEUCHER and ARMINES for the Centre de
+ * Morphologie Mathématique(CMM), common research center to ARMINES and MINES
+ * Paristech>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish,
+ * distribute, sublicense, and/or sell copies of the Software, and to permit
+ * persons to whom the Software is furnished to do so, subject to the following
+ * conditions: The above copyright notice and this permission notice shall be
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright
+ * holders shall not be used in advertising or otherwise to promote the sale,
+ * use or other dealings in this Software without their prior written
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+
+/*
+ * This file contains a compressor and a decompressor for the LZ4 block format
+ * (see the LZ4 block format description of the lz4 project). The blocks
+ * produced here can be decoded by any LZ4 implementation, and the other way
+ * round. They are used to compress the tiles of the image files written by
+ * MB_SaveMBI.
+ *
+ * A block is a list of sequences. Each sequence holds literals (bytes copied
+ * as they are) followed by a match (a copy of previous bytes given by an
+ * offset and a length). The last sequence only holds literals.
+ */
+
+/** Number of bits of the hash of 4 bytes used to find the matches */
+#define MB_LZ4_HASH_LOG 14
+/** Minimal length of a match */
+#define MB_LZ4_MINMATCH 4
+/** The last match must start at least 12 bytes before the end of the block */
+#define MB_LZ4_MFLIMIT 12
+/** The last 5 bytes of a block are always literals */
+#define MB_LZ4_LASTLITERALS 5
+/** Maximal offset of a match */
+#define MB_LZ4_MAXOFFSET 65535
+
+/* Reads 4 bytes (unaligned) */
+static INLINE Uint32 MB_Lz4Read32(const PIX8 *p)
+{
+    Uint32 v;
+    MB_memcpy(&v, p, 4);
+    return v;
+}
+
+/* Hash of 4 bytes */
+static INLINE Uint32 MB_Lz4Hash(Uint32 v)
+{
+    return (v*2654435761U) >> (32-MB_LZ4_HASH_LOG);
+}
+
+/*
+ * Writes a length in the extra bytes following a token (the first 15 being
+ * held by the token). Returns the position after the bytes or NULL if they
+ * do not fit before the end of the block.
+ */
+static PIX8 *MB_Lz4PutLength(PIX8 *op, PIX8 *oend, Uint32 len)
+{
+    for (; len>=255; len-=255) {
+        if (op>=oend)
+            return NULL;
+        *op++ = 255;
+    }
+    if (op>=oend)
+        return NULL;
+    *op++ = (PIX8) len;
+    return op;
+}
+
+/*
+ * Writes a sequence made of the literals lit to lit+nlit-1 followed by a match
+ * of length mlen at the given offset (no match if mlen is 0). Returns the
+ * position after the sequence or NULL if it does not fit in the block.
+ */
+static PIX8 *MB_Lz4PutSequence(PIX8 *op, PIX8 *oend, const PIX8 *lit, Uint32 nlit,
+                               Uint32 offset, Uint32 mlen)
+{
+    PIX8 *token;
+    Uint32 ml;
+
+    if (op>=oend)
+        return NULL;
+    token = op++;
+    *token = (PIX8) ((nlit<15 ? nlit : 15)<<4);
+    if (nlit>=15) {
+        op = MB_Lz4PutLength(op, oend, nlit-15);
+        if (op==NULL)
+            return NULL;
+    }
+    if ((Uint32) (oend-op)<nlit)
+        return NULL;
+    MB_memcpy(op, lit, nlit);
+    op += nlit;
+    if (mlen==0)
+        return op;
+
+    if (oend-op<2)
+        return NULL;
+    *op++ = (PIX8) (offset&0xFF);
+    *op++ = (PIX8) (offset>>8);
+    ml = mlen-MB_LZ4_MINMATCH;
+    *token |= (PIX8) (ml<15 ? ml : 15);
+    if (ml>=15)
+        op = MB_Lz4PutLength(op, oend, ml-15);
+    return op;
+}
+
+/**
+ * Compresses a buffer into a LZ4 block.
+ * \param src the buffer to compress
+ * \param len the size of the buffer
+ * \param dst the buffer receiving the block
+ * \param cap the size of the buffer receiving the block
+ * \return the size of the block, or 0 if it does not fit in cap bytes (the
+ * data should then be stored uncompressed)
+ */
+Uint32 MB_Lz4Compress(const PIX8 *src, Uint32 len, PIX8 *dst, Uint32 cap)
+{
+    Uint32 *table;
+    Uint32 ip, anchor, ref, h, mlen, mlimit;
+    PIX8 *op = dst;
+    PIX8 *oend = dst+cap;
+
+    table = (Uint32 *) MB_malloc((1<<MB_LZ4_HASH_LOG)*sizeof(Uint32));
+    if (table==NULL)
+        return 0;
+    MB_memset(table, 0, (1<<MB_LZ4_HASH_LOG)*sizeof(Uint32));
+
+    ip = 0;
+    anchor = 0;
+    if (len>MB_LZ4_MFLIMIT) {
+        mlimit = len-MB_LZ4_LASTLITERALS;
+        /* position 0 is in the table from the start */
+        ip = 1;
+        while (ip<=len-MB_LZ4_MFLIMIT) {
+            h = MB_Lz4Hash(MB_Lz4Read32(src+ip));
+            ref = table[h];
+            table[h] = ip;
+            if (ip-ref>MB_LZ4_MAXOFFSET ||
+                MB_Lz4Read32(src+ref)!=MB_Lz4Read32(src+ip)) {
+                ip++;
+                continue;
+            }
+            /* extending the match forward, then backward over the literals */
+            mlen = MB_LZ4_MINMATCH;
+            while (ip+mlen<mlimit && src[ref+mlen]==src[ip+mlen])
+                mlen++;
+            while (ip>anchor && ref>0 && src[ip-1]==src[ref-1]) {
+                ip--;
+                ref--;
+                mlen++;
+            }
+            op = MB_Lz4PutSequence(op, oend, src+anchor, ip-anchor, ip-ref, mlen);
+            if (op==NULL)
+                break;
+            ip += mlen;
+            anchor = ip;
+            if (ip<=len-MB_LZ4_MFLIMIT)
+                table[MB_Lz4Hash(MB_Lz4Read32(src+ip-2))] = ip-2;
+        }
+    }
+    if (op!=NULL)
+        op = MB_Lz4PutSequence(op, oend, src+anchor, len-anchor, 0, 0);
+    MB_free(table);
+
+    return (op==NULL) ? 0 : (Uint32) (op-dst);
+}
+
+/**
+ * Decompresses a LZ4 block. The block is checked so that a corrupted block
+ * cannot write outside the destination buffer.
+ * \param src the block
+ * \param len the size of the block
+ * \param dst the buffer receiving the decompressed data
+ * \param size the size of the decompressed data
+ * \return An error code (NO_ERR if successful, ERR_LOAD_DATA if the block is
+ * corrupted or does not give size bytes)
+ */
+MB_errcode MB_Lz4Decompress(const PIX8 *src, Uint32 len, PIX8 *dst, Uint32 size)
+{
+    const PIX8 *ip = src;
+    const PIX8 *iend = src+len;
+    PIX8 *op = dst;
+    PIX8 *oend = dst+size;
+    const PIX8 *ref;
+    Uint32 token, n, offset;
+    PIX8 b;
+
+    while (ip<iend) {
+        token = *ip++;
+        /* literals */
+        n = token>>4;
+        if (n==15) {
+            do {
+                if (ip>=iend)
+                    return ERR_LOAD_DATA;
+                b = *ip++;
+                n += b;
+            } while (b==255);
+        }
+        if ((Uint32) (iend-ip)<n || (Uint32) (oend-op)<n)
+            return ERR_LOAD_DATA;
+        MB_memcpy(op, ip, n);
+        ip += n;
+        op += n;
+        if (ip==iend)
+            break;
+
+        /* match */
+        if (iend-ip<2)
+            return ERR_LOAD_DATA;
+        offset = ip[0] | (((Uint32) ip[1])<<8);
+        ip += 2;
+        if (offset==0 || offset>(Uint32) (op-dst))
+            return ERR_LOAD_DATA;
+        n = token&15;
+        if (n==15) {
+            do {
+                if (ip>=iend)
+                    return ERR_LOAD_DATA;
+                b = *ip++;
+                n += b;
+            } while (b==255);
+        }
+        n += MB_LZ4_MINMATCH;
+        if ((Uint32) (oend-op)<n)
+            return ERR_LOAD_DATA;
+        /* the match can overlap the bytes it produces */
+        ref = op-offset;
+        if (offset>=n) {
+            MB_memcpy(op, ref, n);
+            op += n;
+        } else {
+            for (; n>0; n--)
+                *op++ = *ref++;
+        }
+    }
+
+    return (op==oend) ? NO_ERR : ERR_LOAD_DATA;
+}
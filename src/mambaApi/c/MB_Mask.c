@@ -98,6 +98,13 @@
     }
 }
 
+/****************************************/
+/* Band functions                       */
+/****************************************/
+
+MB_BAND_FUNC_2PP(MASK_BAND8, MASK_LINE8, PIX8)
+MB_BAND_FUNC_2PP(MASK_BAND32, MASK_LINE32, PIX32)
+
 /**
  * Converts a binary image in a grey scale image (8-bits) or in a 32-bits image
  * using value maskf to replace 0 and maskt to replace 1.
@@ -108,9 +115,7 @@
  * \return An error code (NO_ERR if successful)
  */
 MB_errcode MB_Mask(MB_Image *src, MB_Image *dest, Uint32 maskf, Uint32 maskt) {
-    Uint32 i;
-    PLINE *plines_in, *plines_out;
-    Uint32 linoff_out, linoff_in, bytes_in;
+    MB_LinesCtx ctx;
     
     /* verification over image size compatibility */
     if (!MB_CHECK_SIZE_2(src, dest)) {
@@ -118,25 +123,23 @@ MB_errcode MB_Mask(MB_Image *src, MB_Image *dest, Uint32 maskf, Uint32 maskt) {
     }
     
     /* Setting up line pointers */
-    plines_in = &src->PLINES[MB_Y_TOP(src)];
-    plines_out = &dest->PLINES[MB_Y_TOP(dest)];
-    linoff_in = MB_X_LEFT(src);
-    linoff_out = MB_X_LEFT(dest);
-    bytes_in = MB_LINE_COUNT(src);
+    ctx.plines_in1 = &src->PLINES[MB_Y_TOP(src)];
+    ctx.plines_out = &dest->PLINES[MB_Y_TOP(dest)];
+    ctx.linoff_in1 = MB_X_LEFT(src);
+    ctx.linoff_out = MB_X_LEFT(dest);
+    ctx.bytes_in = MB_LINE_COUNT(src);
+    ctx.param1 = maskf;
+    ctx.param2 = maskt;
 
     /* verification to ensure depth coherency with function purpose */
     switch(MB_PROBE_PAIR(src, dest)) {
         case MB_PAIR_1_8:
             /* converting the 1-bit values in 8-bit values */
-            for(i=0;i<src->height;i++,plines_in++,plines_out++) {
-                MASK_LINE8(plines_out, linoff_out, plines_in, linoff_in, bytes_in, (PIX8) maskf, (PIX8) maskt);
-            }
+            MB_RunBands(MASK_BAND8, &ctx, src->height, ctx.bytes_in);
             break;
         case MB_PAIR_1_32:
             /* converting the 1-bit values in 32-bit values */
-            for(i=0;i<src->height;i++,plines_in++,plines_out++) {
-                MASK_LINE32(plines_out, linoff_out, plines_in, linoff_in, bytes_in, (PIX32) maskf, (PIX32) maskt);
-            }
+            MB_RunBands(MASK_BAND32, &ctx, src->height, ctx.bytes_in);
             break;
         default:
             return ERR_BAD_DEPTH;
@@ -250,6 +250,18 @@ static INLINE void MUL_LINE_8_32_32(PLINE *plines_out, Uint32 linoff_out,
     }
 }
 
+/****************************************/
+/* Band functions                       */
+/****************************************/
+
+MB_BAND_FUNC_3(MUL_BAND_1_8_8, MUL_LINE_1_8_8)
+MB_BAND_FUNC_3(MUL_BAND_1_8_32, MUL_LINE_1_8_32)
+MB_BAND_FUNC_3(MUL_BAND_8_8_8, MUL_LINE_8_8_8)
+MB_BAND_FUNC_3(MUL_BAND_8_8_32, MUL_LINE_8_8_32)
+MB_BAND_FUNC_3(MUL_BAND_32_32_32, MUL_LINE_32_32_32)
+MB_BAND_FUNC_3(MUL_BAND_1_32_32, MUL_LINE_1_32_32)
+MB_BAND_FUNC_3(MUL_BAND_8_32_32, MUL_LINE_8_32_32)
+
 /**
  * Multiplies the pixels of two images and puts the result in the third image.
  * Depending on the format of the target image, the result may be saturated or not.
@@ -269,9 +281,7 @@ static INLINE void MUL_LINE_8_32_32(PLINE *plines_out, Uint32 linoff_out,
  */
 MB_errcode MB_Mul(MB_Image *src1, MB_Image *src2, MB_Image *dest) {
 
-    PLINE *plines_in1, *plines_in2, *plines_out;
-    Uint32 linoff_in1, linoff_in2, linoff_out, bytes_in;
-    Uint32 i;
+    MB_LinesCtx ctx;
     
     /* verification over image size compatibility */
     if (!MB_CHECK_SIZE_3(src1, src2, dest)) {
@@ -289,15 +299,15 @@ MB_errcode MB_Mul(MB_Image *src1, MB_Image *src2, MB_Image *dest) {
         return ERR_BAD_DEPTH;
 
     /* Setting up the pointers */
-    plines_in1 = &src1->PLINES[MB_Y_TOP(src1)];
-    plines_in2 = &src2->PLINES[MB_Y_TOP(src2)];
-    plines_out = &dest->PLINES[MB_Y_TOP(dest)];
+    ctx.plines_in1 = &src1->PLINES[MB_Y_TOP(src1)];
+    ctx.plines_in2 = &src2->PLINES[MB_Y_TOP(src2)];
+    ctx.plines_out = &dest->PLINES[MB_Y_TOP(dest)];
     
     /* Setting up offset */
-    linoff_in1 = MB_LINE_OFFSET(src1);
-    linoff_in2 = MB_LINE_OFFSET(src2);
-    linoff_out = MB_LINE_OFFSET(dest);
-    bytes_in = MB_LINE_COUNT(src1);
+    ctx.linoff_in1 = MB_LINE_OFFSET(src1);
+    ctx.linoff_in2 = MB_LINE_OFFSET(src2);
+    ctx.linoff_out = MB_LINE_OFFSET(dest);
+    ctx.bytes_in = MB_LINE_COUNT(src1);
     
     /* Evaluating the addition case : 
      * 9 case can happen depending of the two input images depth
@@ -314,50 +324,36 @@ MB_errcode MB_Mul(MB_Image *src1, MB_Image *src2, MB_Image *dest) {
     /* binary + 8 bits images */
     case MB_PAIR_1_8:
         if (dest->depth == 8) {
-            for (i = 0; i < src1->height;i++, plines_out++, plines_in1++, plines_in2++) {    
-                MUL_LINE_1_8_8(plines_out, linoff_out, plines_in1, linoff_in1, plines_in2, linoff_in2, bytes_in);
-            }
+            MB_RunBands(MUL_BAND_1_8_8, &ctx, src1->height, ctx.bytes_in);
         }
         if (dest->depth == 32) {
-            for (i = 0; i < src1->height;i++, plines_out++, plines_in1++, plines_in2++) {
-                MUL_LINE_1_8_32(plines_out, linoff_out, plines_in1, linoff_in1, plines_in2, linoff_in2, bytes_in);
-            }
+            MB_RunBands(MUL_BAND_1_8_32, &ctx, src1->height, ctx.bytes_in);
         }
         break;
 
     /* two 8 bits images */
     case MB_PAIR_8_8:
         if(dest->depth == 8) {
-            for (i = 0; i < src1->height;i++, plines_out++, plines_in1++, plines_in2++) {
-                MUL_LINE_8_8_8(plines_out, linoff_out, plines_in1, linoff_in1, plines_in2, linoff_in2, bytes_in);
-            }
+            MB_RunBands(MUL_BAND_8_8_8, &ctx, src1->height, ctx.bytes_in);
         }
         if(dest->depth == 32) {
-            for (i = 0; i < src1->height;i++, plines_out++, plines_in1++, plines_in2++) {
-                MUL_LINE_8_8_32(plines_out, linoff_out, plines_in1, linoff_in1, plines_in2, linoff_in2, bytes_in);
-            }
+            MB_RunBands(MUL_BAND_8_8_32, &ctx, src1->height, ctx.bytes_in);
         }
         break;
 
     /* two 32 bits images */
     case MB_PAIR_32_32:
-        for (i = 0; i < src1->height;i++, plines_out++, plines_in1++, plines_in2++) {
-            MUL_LINE_32_32_32(plines_out, linoff_out, plines_in1, linoff_in1, plines_in2, linoff_in2, bytes_in);
-        }
+        MB_RunBands(MUL_BAND_32_32_32, &ctx, src1->height, ctx.bytes_in);
         break;
 
     /* binary image + 32 bits image */
     case MB_PAIR_1_32:
-        for (i = 0; i < src1->height;i++, plines_out++, plines_in1++, plines_in2++) {
-            MUL_LINE_1_32_32(plines_out, linoff_out, plines_in1, linoff_in1, plines_in2, linoff_in2, bytes_in);
-        }
+        MB_RunBands(MUL_BAND_1_32_32, &ctx, src1->height, ctx.bytes_in);
         break;
 
     /*8 bits image + 32 bits image*/
     case MB_PAIR_8_32:
-        for (i = 0; i < src1->height;i++, plines_out++, plines_in1++, plines_in2++) {
-            MUL_LINE_8_32_32(plines_out, linoff_out, plines_in1, linoff_in1, plines_in2, linoff_in2, bytes_in);
-        }
+        MB_RunBands(MUL_BAND_8_32_32, &ctx, src1->height, ctx.bytes_in);
         break;
 
     /* Other cases are impossible and provoke an error */
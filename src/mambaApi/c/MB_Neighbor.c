@@ -586,3 +586,207 @@ static TSWITCHEP *SwitchTo[2][9] =
      MB_Stub
   }
 };
+
+/************************************************/
+/* Band computation                             */
+/************************************************/
+
+/* The neighbor functions above compute the whole image in a single pass.
+ * To split the image in bands computed in parallel, each neighbor is also
+ * described line by line : the line of the source image read by a line of
+ * the destination image and the base function used for the even and odd
+ * lines.
+ */
+
+/** line is computed with COMP_LINE */
+#define NB_LINE 0
+/** line is computed with COMP_LINE_LEFT */
+#define NB_LEFT 1
+/** line is computed with COMP_LINE_RIGHT */
+#define NB_RIGHT 2
+/** line is not computed */
+#define NB_NONE 3
+
+/** Line description of a neighbor */
+typedef struct {
+    /** vertical offset of the line read in the source image */
+    Sint32 dy;
+    /** base function used for even and odd lines */
+    Uint32 op[2];
+} TNBLINE;
+
+/**
+ * array giving the line description for a given neighbor with
+ * regards to the grid in use (hexagonal or square).
+ */
+static const TNBLINE NbLine[2][9] =
+{
+  { /* square neighbors */
+     { 0, {NB_LINE, NB_LINE}},
+     {-1, {NB_LINE, NB_LINE}},
+     {-1, {NB_LEFT, NB_LEFT}},
+     { 0, {NB_LEFT, NB_LEFT}},
+     { 1, {NB_LEFT, NB_LEFT}},
+     { 1, {NB_LINE, NB_LINE}},
+     { 1, {NB_RIGHT, NB_RIGHT}},
+     { 0, {NB_RIGHT, NB_RIGHT}},
+     {-1, {NB_RIGHT, NB_RIGHT}}
+  },
+  { /* hexagonal neighbors */
+     { 0, {NB_LINE, NB_LINE}},
+     {-1, {NB_LINE, NB_LEFT}},
+     { 0, {NB_LEFT, NB_LEFT}},
+     { 1, {NB_LINE, NB_LEFT}},
+     { 1, {NB_RIGHT, NB_LINE}},
+     { 0, {NB_RIGHT, NB_RIGHT}},
+     {-1, {NB_RIGHT, NB_LINE}},
+     { 0, {NB_NONE, NB_NONE}},
+     { 0, {NB_NONE, NB_NONE}}
+  }
+};
+
+/** Context given to the neighbor band function */
+typedef struct {
+    /** pointer on the destination image lines */
+    PLINE *plines_inout;
+    /** offset inside the destination image lines */
+    Uint32 linoff_inout;
+    /** pointer on the source image lines */
+    PLINE *plines_in;
+    /** offset inside the source image lines */
+    Uint32 linoff_in;
+    /** saved lines of the source image (NULL if not computed in place) */
+    PLINE *halo;
+    /** number of bytes inside the line */
+    Uint32 bytes_in;
+    /** number of lines in the image processed */
+    Uint32 nb_lines;
+    /** line description of the neighbor */
+    const TNBLINE *nb;
+    /** the value used to fill the edge */
+    EDGE_TYPE edge_val;
+} TNBCTX;
+
+/**
+ * Computes the lines first to last-1 of the destination image.
+ * When the image is computed in place, the lines are computed in the same
+ * order than the neighbor functions and the lines of the other bands are
+ * read in the halo.
+ * \param ctx the neighbor context
+ * \param first the first line of the band
+ * \param last the line following the last line of the band
+ */
+static void MB_CompNbBand(void *ctx, Uint32 first, Uint32 last)
+{
+    TNBCTX *c = (TNBCTX *) ctx;
+    PLINE *p_in, *p_inout;
+    Sint32 i, j, step, end;
+
+    if (c->nb->dy<0) {
+        /* bottom up */
+        i = (Sint32) last-1;
+        end = (Sint32) first-1;
+        step = -1;
+    } else {
+        i = (Sint32) first;
+        end = (Sint32) last;
+        step = 1;
+    }
+
+    for(; i!=end; i+=step) {
+        p_inout = &c->plines_inout[i];
+        j = i + c->nb->dy;
+        if (j<0 || j>=(Sint32) c->nb_lines) {
+            COMP_EDGE_LINE(p_inout,c->linoff_inout,c->bytes_in,c->edge_val);
+            continue;
+        }
+        if (c->halo!=NULL && (j<(Sint32) first || j>=(Sint32) last)) {
+            p_in = &c->halo[j];
+        } else {
+            p_in = &c->plines_in[j];
+        }
+        switch(c->nb->op[i%2]) {
+        case NB_LINE:
+            COMP_LINE(p_inout,c->linoff_inout,p_in,c->linoff_in,c->bytes_in);
+            break;
+        case NB_LEFT:
+            COMP_LINE_LEFT(p_inout,c->linoff_inout,p_in,c->linoff_in,c->bytes_in,c->edge_val);
+            break;
+        case NB_RIGHT:
+            COMP_LINE_RIGHT(p_inout,c->linoff_inout,p_in,c->linoff_in,c->bytes_in,c->edge_val);
+            break;
+        default:
+            break;
+        }
+    }
+}
+
+/**
+ * Computes the result with a given neighbor. The image is split in bands
+ * computed in parallel when worth it, otherwise the neighbor function is
+ * directly called.
+ * \param plines_inout pointer on the destination image lines
+ * \param linoff_inout offset inside the destination image lines
+ * \param plines_in pointer on the source image that is shifted pixel lines
+ * \param linoff_in offset inside the source image lines
+ * \param bytes_in number of bytes inside the line
+ * \param nb_lines number of lines in the image processed
+ * \param count the number of times the operation is repeated
+ * \param edge_val the value used to fill the edge
+ * \param grid the grid used (either square or hexagonal)
+ * \param nbrnum the neighbor index
+ *
+ * \return An error code (NO_ERR if successful)
+ */
+static MB_errcode MB_CompNb(PLINE *plines_inout, Uint32 linoff_inout,
+                            PLINE *plines_in, Uint32 linoff_in,
+                            Uint32 bytes_in, Uint32 nb_lines,
+                            Uint32 count, EDGE_TYPE edge_val,
+                            enum MB_grid_t grid, Uint32 nbrnum)
+{
+    TNBCTX ctx;
+    MB_Halo halo;
+    MB_errcode err;
+    Uint32 nb_bands;
+
+    nb_bands = MB_BandCount(nb_lines, bytes_in);
+    if (nb_bands<=1) {
+        SwitchTo[grid][nbrnum](plines_inout, linoff_inout, plines_in, linoff_in,
+                               bytes_in, nb_lines, count, edge_val);
+        return NO_ERR;
+    }
+
+    ctx.plines_inout = plines_inout;
+    ctx.linoff_inout = linoff_inout;
+    ctx.plines_in = plines_in;
+    ctx.linoff_in = linoff_in;
+    ctx.halo = NULL;
+    ctx.bytes_in = bytes_in;
+    ctx.nb_lines = nb_lines;
+    ctx.nb = &NbLine[grid][nbrnum];
+    ctx.edge_val = edge_val;
+
+    /* neighbor 0 is never repeated */
+    if (nbrnum==0)
+        count = 1;
+
+    if (plines_in==plines_inout && ctx.nb->dy!=0) {
+        /* in place computation, the lines read by a band in the */
+        /* other bands are saved before each pass */
+        err = MB_CreateHalo(&halo, nb_lines, nb_bands, ctx.nb->dy, linoff_in+bytes_in);
+        if (err!=NO_ERR)
+            return err;
+        ctx.halo = halo.plines;
+        while(count-- > 0) {
+            MB_UpdateHalo(&halo, plines_in);
+            MB_RunBandsN(MB_CompNbBand, &ctx, nb_lines, nb_bands);
+        }
+        MB_DestroyHalo(&halo);
+    } else {
+        while(count-- > 0) {
+            MB_RunBandsN(MB_CompNbBand, &ctx, nb_lines, nb_bands);
+        }
+    }
+
+    return NO_ERR;
+}
@@ -57,6 +57,12 @@ static INLINE void OR_LINE(PLINE *plines_out, Uint32 linoff_out,
     }
 }
 
+/****************************************/
+/* Band functions                       */
+/****************************************/
+
+MB_BAND_FUNC_3(OR_BAND, OR_LINE)
+
 /**
  * Applies a bitwise OR on the pixels of two images.
  * All the images must have the same depth for correct work.
@@ -66,9 +72,7 @@ static INLINE void OR_LINE(PLINE *plines_out, Uint32 linoff_out,
  * \return An error code (NO_ERR if successful)
  */
 MB_errcode MB_Or(MB_Image *src1, MB_Image *src2, MB_Image *dest) {
-    Uint32 i;
-    PLINE *plines_in1, *plines_in2, *plines_out;
-    Uint32 linoff_out, linoff_in1, linoff_in2, bytes_in;
+    MB_LinesCtx ctx;
     
     /* verification over image size compatibility */
     if (!MB_CHECK_SIZE_3(src1, src2, dest)) {
@@ -76,13 +80,13 @@ MB_errcode MB_Or(MB_Image *src1, MB_Image *src2, MB_Image *dest) {
     }
 
     /* Setting up line pointers */
-    plines_in1 = &src1->PLINES[MB_Y_TOP(src1)];
-    plines_in2 = &src2->PLINES[MB_Y_TOP(src2)];
-    plines_out = &dest->PLINES[MB_Y_TOP(dest)];
-    linoff_in1 = MB_LINE_OFFSET(src1);
-    linoff_in2 = MB_LINE_OFFSET(src2);
-    linoff_out = MB_LINE_OFFSET(dest);
-    bytes_in = MB_LINE_COUNT(src1);
+    ctx.plines_in1 = &src1->PLINES[MB_Y_TOP(src1)];
+    ctx.plines_in2 = &src2->PLINES[MB_Y_TOP(src2)];
+    ctx.plines_out = &dest->PLINES[MB_Y_TOP(dest)];
+    ctx.linoff_in1 = MB_LINE_OFFSET(src1);
+    ctx.linoff_in2 = MB_LINE_OFFSET(src2);
+    ctx.linoff_out = MB_LINE_OFFSET(dest);
+    ctx.bytes_in = MB_LINE_COUNT(src1);
 
     if(dest->depth != src1->depth)
         return ERR_BAD_DEPTH;
@@ -98,9 +102,7 @@ MB_errcode MB_Or(MB_Image *src1, MB_Image *src2, MB_Image *dest) {
         return ERR_BAD_DEPTH;
     }
 
-    for (i = 0; i < src1->height; i++, plines_in1++, plines_in2++, plines_out++) {
-        OR_LINE(plines_out,linoff_out,plines_in1,linoff_in1,plines_in2,linoff_in2,bytes_in);
-    }
+    MB_RunBands(OR_BAND, &ctx, src1->height, ctx.bytes_in);
 
     return NO_ERR;
 }
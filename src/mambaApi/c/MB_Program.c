@@ -0,0 +1,245 @@
+/**
+ * \file MB_Program.c
+ * \date 10-17-2026
+ *
+ */
+
+/*
+ * Copyright (c) <2009>, <Nicolas BEUCHER and ARMINES for the Centre de
+ * Morphologie Mathématique(CMM), common research center to ARMINES and MINES
+ * Paristech>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish,
+ * distribute, sublicense, and/or sell copies of the Software, and to permit
+ * persons to whom the Software is furnished to do so, subject to the following
+ * conditions: The above copyright notice and this permission notice shall be
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright
+ * holders shall not be used in advertising or otherwise to promote the sale,
+ * use or other dealings in this Software without their prior written
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+
+/*
+ * This file contains the computation of a program, a sequence of operators
+ * computed in one call to the library. The program is an array of words: the
+ * code of each operation (see enum MB_opcode_t) is followed by its operands,
+ * first the indexes of its images in the array of images, then its values.
+ */
+
+/** Number of image operands and of value operands of each operation */
+static const Uint32 op_operands[MB_OP_COUNT][2] = {
+    {2, 0}, /* MB_OP_COPY */
+    {3, 0}, /* MB_OP_AND */
+    {3, 0}, /* MB_OP_OR */
+    {3, 0}, /* MB_OP_XOR */
+    {3, 0}, /* MB_OP_INF */
+    {3, 0}, /* MB_OP_SUP */
+    {3, 0}, /* MB_OP_ADD */
+    {3, 0}, /* MB_OP_SUB */
+    {3, 0}, /* MB_OP_DIFF */
+    {2, 0}, /* MB_OP_INV */
+    {1, 1}, /* MB_OP_CONSET */
+    {2, 4}, /* MB_OP_INFNB */
+    {2, 4}, /* MB_OP_SUPNB */
+    {2, 4}, /* MB_OP_INFFARNB */
+    {2, 4}, /* MB_OP_SUPFARNB */
+    {2, 3}, /* MB_OP_INFVECTOR */
+    {2, 3}  /* MB_OP_SUPVECTOR */
+};
+
+/** Maximum number of image operands of an operation */
+#define MAX_IMAGE_OPERANDS 3
+
+/****************************************/
+/* Helper functions                     */
+/****************************************/
+
+/**
+ * Verifies that a program is correctly formed before computing it: the
+ * operation codes must exist, the operands must not be missing and the
+ * image indexes must be inside the array of images.
+ * \param nb_images number of images
+ * \param program the program
+ * \param len number of words in the program
+ * \return An error code (NO_ERR if the program is correct)
+ */
+static MB_errcode MB_CheckProgram(Uint32 nb_images, Uint32 *program, Uint32 len)
+{
+    Uint32 pc, i, opcode;
+
+    pc = 0;
+    while (pc<len) {
+        opcode = program[pc];
+        if (opcode>=MB_OP_COUNT) {
+            return ERR_BAD_PARAMETER;
+        }
+        if (len-pc-1 < op_operands[opcode][0]+op_operands[opcode][1]) {
+            return ERR_BAD_PARAMETER;
+        }
+        for (i=0; i<op_operands[opcode][0]; i++) {
+            if (program[pc+1+i]>=nb_images) {
+                return ERR_BAD_PARAMETER;
+            }
+        }
+        pc += 1+op_operands[opcode][0]+op_operands[opcode][1];
+    }
+    return NO_ERR;
+}
+
+/**
+ * Computes one operation of a program.
+ * \param opcode the operation code
+ * \param im the image operands
+ * \param val the value operands
+ * \return An error code (NO_ERR if successful)
+ */
+static MB_errcode MB_RunOperation(Uint32 opcode, MB_Image **im, Uint32 *val)
+{
+    enum MB_grid_t grid;
+    enum MB_edgemode_t edge;
+
+    switch (opcode) {
+    case MB_OP_COPY:
+        return MB_Copy(im[0], im[1]);
+    case MB_OP_AND:
+        return MB_And(im[0], im[1], im[2]);
+    case MB_OP_OR:
+        return MB_Or(im[0], im[1], im[2]);
+    case MB_OP_XOR:
+        return MB_Xor(im[0], im[1], im[2]);
+    case MB_OP_INF:
+        return MB_Inf(im[0], im[1], im[2]);
+    case MB_OP_SUP:
+        return MB_Sup(im[0], im[1], im[2]);
+    case MB_OP_ADD:
+        return MB_Add(im[0], im[1], im[2]);
+    case MB_OP_SUB:
+        return MB_Sub(im[0], im[1], im[2]);
+    case MB_OP_DIFF:
+        return MB_Diff(im[0], im[1], im[2]);
+    case MB_OP_INV:
+        return MB_Inv(im[0], im[1]);
+    case MB_OP_CONSET:
+        return MB_ConSet(im[0], val[0]);
+    case MB_OP_INFVECTOR:
+    case MB_OP_SUPVECTOR:
+        if (val[2]>MB_FILLED_EDGE) {
+            return ERR_BAD_PARAMETER;
+        }
+        edge = (enum MB_edgemode_t) val[2];
+        switch (im[0]->depth) {
+        case 1:
+            return opcode==MB_OP_INFVECTOR ?
+                   MB_InfVectorb(im[0], im[1], (Sint32) val[0], (Sint32) val[1], edge) :
+                   MB_SupVectorb(im[0], im[1], (Sint32) val[0], (Sint32) val[1], edge);
+        case 8:
+            return opcode==MB_OP_INFVECTOR ?
+                   MB_InfVector8(im[0], im[1], (Sint32) val[0], (Sint32) val[1], edge) :
+                   MB_SupVector8(im[0], im[1], (Sint32) val[0], (Sint32) val[1], edge);
+        case 32:
+            return opcode==MB_OP_INFVECTOR ?
+                   MB_InfVector32(im[0], im[1], (Sint32) val[0], (Sint32) val[1], edge) :
+                   MB_SupVector32(im[0], im[1], (Sint32) val[0], (Sint32) val[1], edge);
+        default:
+            return ERR_BAD_DEPTH;
+        }
+    default:
+        /* neighbor operations */
+        if (val[2]>MB_HEXAGONAL_GRID || val[3]>MB_FILLED_EDGE) {
+            return ERR_BAD_PARAMETER;
+        }
+        grid = (enum MB_grid_t) val[2];
+        edge = (enum MB_edgemode_t) val[3];
+        switch (im[0]->depth) {
+        case 1:
+            switch (opcode) {
+            case MB_OP_INFNB:
+                return MB_InfNbb(im[0], im[1], val[0], val[1], grid, edge);
+            case MB_OP_SUPNB:
+                return MB_SupNbb(im[0], im[1], val[0], val[1], grid, edge);
+            case MB_OP_INFFARNB:
+                return MB_InfFarNbb(im[0], im[1], val[0], val[1], grid, edge);
+            default:
+                return MB_SupFarNbb(im[0], im[1], val[0], val[1], grid, edge);
+            }
+        case 8:
+            switch (opcode) {
+            case MB_OP_INFNB:
+                return MB_InfNb8(im[0], im[1], val[0], val[1], grid, edge);
+            case MB_OP_SUPNB:
+                return MB_SupNb8(im[0], im[1], val[0], val[1], grid, edge);
+            case MB_OP_INFFARNB:
+                return MB_InfFarNb8(im[0], im[1], val[0], val[1], grid, edge);
+            default:
+                return MB_SupFarNb8(im[0], im[1], val[0], val[1], grid, edge);
+            }
+        case 32:
+            switch (opcode) {
+            case MB_OP_INFNB:
+                return MB_InfNb32(im[0], im[1], val[0], val[1], grid, edge);
+            case MB_OP_SUPNB:
+                return MB_SupNb32(im[0], im[1], val[0], val[1], grid, edge);
+            case MB_OP_INFFARNB:
+                return MB_InfFarNb32(im[0], im[1], val[0], val[1], grid, edge);
+            default:
+                return MB_SupFarNb32(im[0], im[1], val[0], val[1], grid, edge);
+            }
+        default:
+            return ERR_BAD_DEPTH;
+        }
+    }
+}
+
+/****************************************/
+/* Main function                        */
+/****************************************/
+
+/**
+ * Computes a program, a sequence of operators, in one call. The program is
+ * verified before being computed; the computation stops at the first
+ * operator returning an error.
+ * \param images the images used by the program
+ * \param nb_images number of images
+ * \param program the operation codes and their operands
+ * \param len number of words in the program
+ * \return An error code (NO_ERR if successful)
+ */
+MB_errcode MB_RunProgram(MB_Image **images, Uint32 nb_images, Uint32 *program, Uint32 len)
+{
+    MB_errcode err;
+    MB_Image *im[MAX_IMAGE_OPERANDS];
+    Uint32 pc, i, opcode;
+
+    err = MB_CheckProgram(nb_images, program, len);
+    if (err!=NO_ERR) {
+        return err;
+    }
+
+    pc = 0;
+    while (pc<len) {
+        opcode = program[pc++];
+        for (i=0; i<op_operands[opcode][0]; i++) {
+            im[i] = images[program[pc++]];
+        }
+        err = MB_RunOperation(opcode, im, &program[pc]);
+        if (err!=NO_ERR) {
+            return err;
+        }
+        pc += op_operands[opcode][1];
+    }
+    return NO_ERR;
+}
@@ -579,3 +579,221 @@ static TSWITCHEP *SwitchTo[2][9] =
      MB_Stub
   }
 };
+
+/************************************************/
+/* Band computation                             */
+/************************************************/
+
+/* The direction functions above compute the whole image in a single pass.
+ * To split the image in bands computed in parallel, each direction is also
+ * described line by line : the line of the source image read by a line of
+ * the destination image and the base function used to shift it.
+ */
+
+/** line is computed with SHIFT_LINE */
+#define SH_LINE 0
+/** line is computed with SHIFT_LINE_LEFT */
+#define SH_LEFT 1
+/** line is computed with SHIFT_LINE_RIGHT */
+#define SH_RIGHT 2
+/** line is not computed */
+#define SH_NONE 3
+
+/** Line description of a direction */
+typedef struct {
+    /** vertical direction of the line read in the source image */
+    Sint32 sy;
+    /** base function used */
+    Uint32 op;
+    /** lines (in the computation order) shifted by the larger half amplitude */
+    /** in the hexagonal grid */
+    Uint32 wlarge;
+} TSHLINE;
+
+/**
+ * array giving the line description for a given direction with
+ * regard to the grid in use (hexagonal or square).
+ */
+static const TSHLINE ShLine[2][9] =
+{
+  { /* square directions */
+     { 0, SH_LINE, 0},
+     { 1, SH_LINE, 0},
+     { 1, SH_RIGHT, 0},
+     { 0, SH_RIGHT, 0},
+     {-1, SH_RIGHT, 0},
+     {-1, SH_LINE, 0},
+     {-1, SH_LEFT, 0},
+     { 0, SH_LEFT, 0},
+     { 1, SH_LEFT, 0}
+  },
+  { /* hexagonal directions */
+     { 0, SH_LINE, 0},
+     { 1, SH_RIGHT, 0},
+     { 0, SH_RIGHT, 0},
+     {-1, SH_RIGHT, 1},
+     {-1, SH_LEFT, 0},
+     { 0, SH_LEFT, 0},
+     { 1, SH_LEFT, 1},
+     { 0, SH_NONE, 0},
+     { 0, SH_NONE, 0}
+  }
+};
+
+/** Context given to the direction band function */
+typedef struct {
+    /** pointer on the destination image lines */
+    PLINE *plines_out;
+    /** offset inside the destination image lines */
+    Uint32 linoff_out;
+    /** pointer on the source image lines */
+    PLINE *plines_in;
+    /** offset inside the source image lines */
+    Uint32 linoff_in;
+    /** saved lines of the source image (NULL if not computed in place) */
+    PLINE *halo;
+    /** number of bytes inside the line */
+    Uint32 bytes_in;
+    /** number of lines in the image processed */
+    Sint32 nb_lines;
+    /** vertical displacement of the line read in the source image */
+    Sint32 dy;
+    /** horizontal shift amplitude (depends on the line computation order) */
+    Sint32 wcount[2];
+    /** line description of the direction */
+    const TSHLINE *dir;
+    /** the value used to fill the edge */
+    EDGE_TYPE edge_val;
+} TSHCTX;
+
+/**
+ * Computes the lines first to last-1 of the destination image.
+ * When the image is computed in place, the lines are computed in the same
+ * order than the direction functions and the lines of the other bands are
+ * read in the halo.
+ * \param ctx the direction context
+ * \param first the first line of the band
+ * \param last the line following the last line of the band
+ */
+static void MB_ShiftBand(void *ctx, Uint32 first, Uint32 last)
+{
+    TSHCTX *c = (TSHCTX *) ctx;
+    PLINE *p_in, *p_out;
+    Sint32 i, j, step, end, w;
+
+    if (c->dy<0) {
+        /* bottom up */
+        i = (Sint32) last-1;
+        end = (Sint32) first-1;
+        step = -1;
+    } else {
+        i = (Sint32) first;
+        end = (Sint32) last;
+        step = 1;
+    }
+
+    for(; i!=end; i+=step) {
+        p_out = &c->plines_out[i];
+        j = i + c->dy;
+        if (j<0 || j>=c->nb_lines) {
+            SHIFT_EDGE_LINE(p_out,c->linoff_out,c->bytes_in,c->edge_val);
+            continue;
+        }
+        if (c->halo!=NULL && (j<(Sint32) first || j>=(Sint32) last)) {
+            p_in = &c->halo[j];
+        } else {
+            p_in = &c->plines_in[j];
+        }
+        /* the index of the line in the computation order of the direction */
+        /* functions gives its horizontal shift */
+        w = c->dy<0 ? c->wcount[(c->nb_lines-1-i)%2] : c->wcount[i%2];
+        switch(c->dir->op) {
+        case SH_LINE:
+            SHIFT_LINE(p_out,c->linoff_out,p_in,c->linoff_in,c->bytes_in);
+            break;
+        case SH_LEFT:
+            SHIFT_LINE_LEFT(p_out,c->linoff_out,p_in,c->linoff_in,c->bytes_in,w,c->edge_val);
+            break;
+        case SH_RIGHT:
+            SHIFT_LINE_RIGHT(p_out,c->linoff_out,p_in,c->linoff_in,c->bytes_in,w,c->edge_val);
+            break;
+        default:
+            break;
+        }
+    }
+}
+
+/**
+ * Moves and computes the image in a given direction. The image is split in
+ * bands computed in parallel when worth it, otherwise the direction function
+ * is directly called.
+ * \param plines_out pointer on the destination image lines
+ * \param linoff_out offset inside the destination image lines
+ * \param plines_in pointer on the source image that is shifted pixel lines
+ * \param linoff_in offset inside the source image lines
+ * \param bytes_in number of bytes inside the line
+ * \param nb_lines number of lines in the image processed
+ * \param count the shift amplitude
+ * \param edge_val the value used to fill the edge
+ * \param grid the grid used (either square or hexagonal)
+ * \param dirnum the direction index
+ *
+ * \return An error code (NO_ERR if successful)
+ */
+static MB_errcode MB_ShiftDir(PLINE *plines_out, Uint32 linoff_out,
+                              PLINE *plines_in, Uint32 linoff_in,
+                              Uint32 bytes_in, Sint32 nb_lines,
+                              Sint32 count, EDGE_TYPE edge_val,
+                              enum MB_grid_t grid, Uint32 dirnum)
+{
+    TSHCTX ctx;
+    MB_Halo halo;
+    MB_errcode err;
+    Uint32 nb_bands;
+    Sint32 hcount;
+
+    nb_bands = MB_BandCount((Uint32) nb_lines, bytes_in);
+    if (nb_bands<=1) {
+        SwitchTo[grid][dirnum](plines_out, linoff_out, plines_in, linoff_in,
+                               bytes_in, nb_lines, count, edge_val);
+        return NO_ERR;
+    }
+
+    /* hcount cannot exceed the number of lines */
+    hcount = count>nb_lines ? nb_lines : count;
+
+    ctx.plines_out = plines_out;
+    ctx.linoff_out = linoff_out;
+    ctx.plines_in = plines_in;
+    ctx.linoff_in = linoff_in;
+    ctx.halo = NULL;
+    ctx.bytes_in = bytes_in;
+    ctx.nb_lines = nb_lines;
+    ctx.dir = &ShLine[grid][dirnum];
+    ctx.dy = ctx.dir->sy*hcount;
+    ctx.edge_val = edge_val;
+    if (grid==MB_HEXAGONAL_GRID && ctx.dy!=0) {
+        /* wcount depends on odd and even lines */
+        ctx.wcount[ctx.dir->wlarge] = (hcount%2)==1 ? hcount/2 + 1 : hcount/2;
+        ctx.wcount[1-ctx.dir->wlarge] = hcount/2;
+    } else {
+        ctx.wcount[0] = count;
+        ctx.wcount[1] = count;
+    }
+
+    if (plines_in==plines_out && ctx.dy!=0) {
+        /* in place computation, the lines read by a band in the */
+        /* other bands are saved before the computation */
+        err = MB_CreateHalo(&halo, (Uint32) nb_lines, nb_bands, ctx.dy, linoff_in+bytes_in);
+        if (err!=NO_ERR)
+            return err;
+        ctx.halo = halo.plines;
+        MB_UpdateHalo(&halo, plines_in);
+        MB_RunBandsN(MB_ShiftBand, &ctx, (Uint32) nb_lines, nb_bands);
+        MB_DestroyHalo(&halo);
+    } else {
+        MB_RunBandsN(MB_ShiftBand, &ctx, (Uint32) nb_lines, nb_bands);
+    }
+
+    return NO_ERR;
+}
@@ -85,19 +85,17 @@ static INLINE void SHIFT_LINE_LEFT(PLINE *p_out, Uint32 off_out,
                                    Uint32 bytes_in,
                                    Sint32 count, PIX32 fill_val)
 {
-    Sint32 i;
+    Sint32 i, nb_pix = (Sint32) (bytes_in/4);
 
-    PIX32 *pin = (PIX32 *) (*p_in + off_in + 4*count);
+    PIX32 *pin = (PIX32 *) (*p_in + off_in);
     PIX32 *pout = (PIX32 *) (*p_out + off_out);
-    
+
     /* count cannot exceed the number of pixel in a line */
-    count = count<((Sint32) (bytes_in/4)) ? count : bytes_in/4;
-    
-    for(i=0; i<((Sint32) bytes_in)-(4*count); i+=4,pin++,pout++) {
-        (*pout) = (*pin);
-    }
-    for(i=0; i<count; i++,pout++) {
-        (*pout) = (fill_val);
+    count = count<nb_pix ? count : nb_pix;
+
+    MB_memcpy(pout, pin+count, 4*(nb_pix-count));
+    for(i=nb_pix-count; i<nb_pix; i++) {
+        pout[i] = fill_val;
     }
 }
 
@@ -116,19 +114,17 @@ static INLINE void SHIFT_LINE_RIGHT(PLINE *p_out, Uint32 off_out,
                                     Uint32 bytes_in, 
                                     Sint32 count, PIX32 fill_val)
 {
-    Sint32 i;
+    Sint32 i, nb_pix = (Sint32) (bytes_in/4);
+
+    PIX32 *pin = (PIX32 *) (*p_in + off_in);
+    PIX32 *pout = (PIX32 *) (*p_out + off_out);
 
-    PIX32 *pin = (PIX32 *) (*p_in + bytes_in -4*(count+1) + off_in);
-    PIX32 *pout = (PIX32 *) (*p_out + bytes_in -4 + off_out);
-    
     /* count cannot exceed the number of pixel in a line */
-    count = count<((Sint32) (bytes_in/4)) ? count : bytes_in/4;
-    
-    for(i=0;i<((Sint32) bytes_in)-(4*count);i+=4,pin--,pout--) {
-        (*pout) = (*pin);
-    }
-    for(i=0; i<count; i++,pout--) {
-        (*pout) = (fill_val);
+    count = count<nb_pix ? count : nb_pix;
+
+    MB_memcpy(pout+count, pin, 4*(nb_pix-count));
+    for(i=0; i<count; i++) {
+        pout[i] = fill_val;
     }
 }
 
@@ -164,7 +160,6 @@ MB_errcode MB_Shift32(MB_Image *src, MB_Image *dest, Uint32 dirnum, Uint32 count
     Uint32 linoff_in, linoff_out;
     Uint32 bytes_in;
     PLINE *plines_in, *plines_out;
-    TSWITCHEP *fn;
 
     /* error management */
     /* verification over image size compatibility */
@@ -201,10 +196,7 @@ MB_errcode MB_Shift32(MB_Image *src, MB_Image *dest, Uint32 dirnum, Uint32 count
     bytes_in = MB_LINE_COUNT(src);
 
     /* Calling the corresponding function */
-    fn = SwitchTo[grid][dirnum];
-    fn(plines_out, linoff_out, plines_in, linoff_in, bytes_in, (Sint32) src->height, count, (PIX32) long_filler_pix);
-    
-    return NO_ERR;
+    return MB_ShiftDir(plines_out, linoff_out, plines_in, linoff_in, bytes_in, (Sint32) src->height, count, (PIX32) long_filler_pix, grid, dirnum);
 }
 
 
@@ -158,7 +158,6 @@ MB_errcode MB_Shift8(MB_Image *src, MB_Image *dest, Uint32 dirnum, Uint32 count,
     Uint32 linoff_in, linoff_out;
     Uint32 bytes_in;
     PLINE *plines_in, *plines_out;
-    TSWITCHEP *fn;
 
     /* error management */
     /* verification over image size compatibility */
@@ -195,10 +194,7 @@ MB_errcode MB_Shift8(MB_Image *src, MB_Image *dest, Uint32 dirnum, Uint32 count,
     bytes_in = MB_LINE_COUNT(src);
 
     /* Calling the corresponding function */
-    fn = SwitchTo[grid][dirnum];
-    fn(plines_out, linoff_out, plines_in, linoff_in, bytes_in, (Sint32) src->height, count, (Uint32) long_filler_pix);
-    
-    return NO_ERR;
+    return MB_ShiftDir(plines_out, linoff_out, plines_in, linoff_in, bytes_in, (Sint32) src->height, count, (Uint32) long_filler_pix, grid, dirnum);
 }
 
 
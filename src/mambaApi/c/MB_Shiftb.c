@@ -201,7 +201,6 @@ MB_errcode MB_Shiftb(MB_Image *src, MB_Image *dest, Uint32 dirnum, Uint32 count,
     binaryT fill_val;
     Uint32 linoff_in, linoff_out;
     PLINE *plines_in, *plines_out;
-    TSWITCHEP *fn;
 
     /* error management */
     /* verification over image size compatibility */
@@ -248,8 +247,5 @@ MB_errcode MB_Shiftb(MB_Image *src, MB_Image *dest, Uint32 dirnum, Uint32 count,
     fill_val = *((binaryT *) &long_filler[0]);
 
     /* Calling the corresponding function */
-    fn = SwitchTo[grid][dirnum];
-    fn(plines_out, linoff_out, plines_in, linoff_in, bytes_in, (Sint32) src->height, count, fill_val);
-
-    return NO_ERR;
+    return MB_ShiftDir(plines_out, linoff_out, plines_in, linoff_in, bytes_in, (Sint32) src->height, count, fill_val, grid, dirnum);
 }
@@ -76,9 +76,27 @@ static INLINE void SUP_LINE(PLINE *plines_out, Uint32 linoff_out,
                             Uint32 bytes_in)
 {
     Uint32 i;
-    
-#ifdef __SSE2__
-    
+
+    PLINE pin1 = (PLINE) (*plines_in1+linoff_in1);
+    PLINE pin2 = (PLINE) (*plines_in2+linoff_in2);
+    PLINE pout = (PLINE) (*plines_out+linoff_out);
+
+    for(i=0;i<bytes_in;i++,pin1++,pin2++,pout++){
+        *pout = (*pin1)>(*pin2) ? (*pin1) : (*pin2);
+    }
+}
+
+#ifdef MB_SIMD_X86
+/**
+ * Same as SUP_LINE using SSE2 instructions.
+ */
+static INLINE MB_TARGET_SSE2 void SUP_LINE_SSE2(PLINE *plines_out, Uint32 linoff_out,
+                                                PLINE *plines_in1, Uint32 linoff_in1,
+                                                PLINE *plines_in2, Uint32 linoff_in2,
+                                                Uint32 bytes_in)
+{
+    Uint32 i;
+
     __m128i *pin1 = (__m128i*) (*plines_in1+linoff_in1);
     __m128i *pin2 = (__m128i*) (*plines_in2+linoff_in2);
     __m128i *pout = (__m128i*) (*plines_out+linoff_out);
@@ -87,18 +105,156 @@ static INLINE void SUP_LINE(PLINE *plines_out, Uint32 linoff_out,
         (*pout) = _mm_max_epu8((*pin2),(*pin1));
     }
     
-#else
+}
+#endif
+
+/****************************************/
+/* Wide SIMD functions                  */
+/****************************************/
+#ifdef MB_SIMD_X86
+
+/**
+ * Determines the superior value on 8-bits pixels using AVX2.
+ * \param plines_out pointer on the destination image pixel line
+ * \param linoff_out offset inside the destination image line
+ * \param plines_in1 pointer on the source image 1 pixel line
+ * \param linoff_in1 offset inside the source image 1 line
+ * \param plines_in2 pointer on the source image 2 pixel line
+ * \param linoff_in2 offset inside the source image 2 line
+ * \param bytes_in number of bytes inside the line
+ */
+static INLINE MB_TARGET_AVX2 void SUP_LINE_AVX2(PLINE *plines_out, Uint32 linoff_out,
+                                                PLINE *plines_in1, Uint32 linoff_in1,
+                                                PLINE *plines_in2, Uint32 linoff_in2,
+                                                Uint32 bytes_in)
+{
+    Uint32 i;
+    __m256i a, b;
 
     PLINE pin1 = (PLINE) (*plines_in1+linoff_in1);
     PLINE pin2 = (PLINE) (*plines_in2+linoff_in2);
     PLINE pout = (PLINE) (*plines_out+linoff_out);
 
-    for(i=0;i<bytes_in;i++,pin1++,pin2++,pout++){
-        *pout = (*pin1)>(*pin2) ? (*pin1) : (*pin2);
+    /* lines are only aligned on 16 bytes, unaligned accesses are used */
+    for(i=0;i<bytes_in;i+=32) {
+        a = _mm256_loadu_si256((__m256i *) (pin1+i));
+        b = _mm256_loadu_si256((__m256i *) (pin2+i));
+        _mm256_storeu_si256((__m256i *) (pout+i), _mm256_max_epu8(a, b));
     }
-#endif
 }
 
+/**
+ * Determines the superior value on 8-bits pixels using AVX-512.
+ * \param plines_out pointer on the destination image pixel line
+ * \param linoff_out offset inside the destination image line
+ * \param plines_in1 pointer on the source image 1 pixel line
+ * \param linoff_in1 offset inside the source image 1 line
+ * \param plines_in2 pointer on the source image 2 pixel line
+ * \param linoff_in2 offset inside the source image 2 line
+ * \param bytes_in number of bytes inside the line
+ */
+static INLINE MB_TARGET_AVX512 void SUP_LINE_AVX512(PLINE *plines_out, Uint32 linoff_out,
+                                                    PLINE *plines_in1, Uint32 linoff_in1,
+                                                    PLINE *plines_in2, Uint32 linoff_in2,
+                                                    Uint32 bytes_in)
+{
+    Uint32 i;
+    __m512i a, b;
+
+    PLINE pin1 = (PLINE) (*plines_in1+linoff_in1);
+    PLINE pin2 = (PLINE) (*plines_in2+linoff_in2);
+    PLINE pout = (PLINE) (*plines_out+linoff_out);
+
+    /* lines are only aligned on 16 bytes, unaligned accesses are used */
+    for(i=0;i<bytes_in;i+=64) {
+        a = _mm512_loadu_si512((__m512i *) (pin1+i));
+        b = _mm512_loadu_si512((__m512i *) (pin2+i));
+        _mm512_storeu_si512((__m512i *) (pout+i), _mm512_max_epu8(a, b));
+    }
+}
+
+/**
+ * Determines the superior value on 32-bits pixels using AVX2.
+ * \param plines_out pointer on the destination image pixel line
+ * \param linoff_out offset inside the destination image line
+ * \param plines_in1 pointer on the source image 1 pixel line
+ * \param linoff_in1 offset inside the source image 1 line
+ * \param plines_in2 pointer on the source image 2 pixel line
+ * \param linoff_in2 offset inside the source image 2 line
+ * \param bytes_in number of bytes inside the line
+ */
+static INLINE MB_TARGET_AVX2 void SUP_LINE32_AVX2(PLINE *plines_out, Uint32 linoff_out,
+                                                  PLINE *plines_in1, Uint32 linoff_in1,
+                                                  PLINE *plines_in2, Uint32 linoff_in2,
+                                                  Uint32 bytes_in)
+{
+    Uint32 i;
+    __m256i a, b;
+
+    PLINE pin1 = (PLINE) (*plines_in1+linoff_in1);
+    PLINE pin2 = (PLINE) (*plines_in2+linoff_in2);
+    PLINE pout = (PLINE) (*plines_out+linoff_out);
+
+    /* lines are only aligned on 16 bytes, unaligned accesses are used */
+    for(i=0;i<bytes_in;i+=32) {
+        a = _mm256_loadu_si256((__m256i *) (pin1+i));
+        b = _mm256_loadu_si256((__m256i *) (pin2+i));
+        _mm256_storeu_si256((__m256i *) (pout+i), _mm256_max_epu32(a, b));
+    }
+}
+
+/**
+ * Determines the superior value on 32-bits pixels using AVX-512.
+ * \param plines_out pointer on the destination image pixel line
+ * \param linoff_out offset inside the destination image line
+ * \param plines_in1 pointer on the source image 1 pixel line
+ * \param linoff_in1 offset inside the source image 1 line
+ * \param plines_in2 pointer on the source image 2 pixel line
+ * \param linoff_in2 offset inside the source image 2 line
+ * \param bytes_in number of bytes inside the line
+ */
+static INLINE MB_TARGET_AVX512 void SUP_LINE32_AVX512(PLINE *plines_out, Uint32 linoff_out,
+                                                      PLINE *plines_in1, Uint32 linoff_in1,
+                                                      PLINE *plines_in2, Uint32 linoff_in2,
+                                                      Uint32 bytes_in)
+{
+    Uint32 i;
+    __m512i a, b;
+
+    PLINE pin1 = (PLINE) (*plines_in1+linoff_in1);
+    PLINE pin2 = (PLINE) (*plines_in2+linoff_in2);
+    PLINE pout = (PLINE) (*plines_out+linoff_out);
+
+    /* lines are only aligned on 16 bytes, unaligned accesses are used */
+    for(i=0;i<bytes_in;i+=64) {
+        a = _mm512_loadu_si512((__m512i *) (pin1+i));
+        b = _mm512_loadu_si512((__m512i *) (pin2+i));
+        _mm512_storeu_si512((__m512i *) (pout+i), _mm512_max_epu32(a, b));
+    }
+}
+
+#endif
+
+/****************************************/
+/* Band functions                       */
+/****************************************/
+
+MB_BAND_FUNC_3(SUP_BAND, SUP_LINE)
+MB_BAND_FUNC_3(SUP_BAND32, SUP_LINE32)
+#ifdef MB_SIMD_X86
+MB_TARGET_SSE2 MB_BAND_FUNC_3(SUP_BAND_SSE2, SUP_LINE_SSE2)
+MB_TARGET_AVX2 MB_BAND_FUNC_3(SUP_BAND_AVX2, SUP_LINE_AVX2)
+MB_TARGET_AVX512 MB_BAND_FUNC_3(SUP_BAND_AVX512, SUP_LINE_AVX512)
+MB_TARGET_AVX2 MB_BAND_FUNC_3(SUP_BAND32_AVX2, SUP_LINE32_AVX2)
+MB_TARGET_AVX512 MB_BAND_FUNC_3(SUP_BAND32_AVX512, SUP_LINE32_AVX512)
+#endif
+
+/* Versions of the band functions for each SIMD level */
+static MB_BandFn * const SUP_BANDS[MB_SIMD_LEVELS] =
+    MB_SIMD_TABLE(SUP_BAND, SUP_BAND_SSE2, SUP_BAND_SSE2, SUP_BAND_AVX2, SUP_BAND_AVX512);
+static MB_BandFn * const SUP_BANDS32[MB_SIMD_LEVELS] =
+    MB_SIMD_TABLE(SUP_BAND32, SUP_BAND32, SUP_BAND32, SUP_BAND32_AVX2, SUP_BAND32_AVX512);
+
 /**
  * Determines the superior value between the pixels of two images.
  * The result is put in the corresponding pixel position in the destination image.
@@ -109,9 +265,7 @@ static INLINE void SUP_LINE(PLINE *plines_out, Uint32 linoff_out,
  */
 MB_errcode MB_Sup(MB_Image *src1, MB_Image *src2, MB_Image *dest)
 {
-    Uint32 i;
-    PLINE *plines_in1, *plines_in2, *plines_out;
-    Uint32 linoff_out, linoff_in1, linoff_in2, bytes_in;
+    MB_LinesCtx ctx;
     
     /* verification over image size compatibility */
     if (!MB_CHECK_SIZE_3(src1, src2, dest)) {
@@ -119,13 +273,13 @@ MB_errcode MB_Sup(MB_Image *src1, MB_Image *src2, MB_Image *dest)
     }
 
     /* Setting up line pointers */
-    plines_in1 = &src1->PLINES[MB_Y_TOP(src1)];
-    plines_in2 = &src2->PLINES[MB_Y_TOP(src2)];
-    plines_out = &dest->PLINES[MB_Y_TOP(dest)];
-    linoff_in1 = MB_LINE_OFFSET(src1);
-    linoff_in2 = MB_LINE_OFFSET(src2);
-    linoff_out = MB_LINE_OFFSET(dest);
-    bytes_in = MB_LINE_COUNT(src1);
+    ctx.plines_in1 = &src1->PLINES[MB_Y_TOP(src1)];
+    ctx.plines_in2 = &src2->PLINES[MB_Y_TOP(src2)];
+    ctx.plines_out = &dest->PLINES[MB_Y_TOP(dest)];
+    ctx.linoff_in1 = MB_LINE_OFFSET(src1);
+    ctx.linoff_in2 = MB_LINE_OFFSET(src2);
+    ctx.linoff_out = MB_LINE_OFFSET(dest);
+    ctx.bytes_in = MB_LINE_COUNT(src1);
 
     /* destination image should have the depth that source image */
     if(dest->depth != src1->depth)
@@ -140,15 +294,11 @@ MB_errcode MB_Sup(MB_Image *src1, MB_Image *src2, MB_Image *dest)
         break;
     
     case MB_PAIR_8_8:
-        for(i = 0; i < src1->height; i++, plines_out++, plines_in1++, plines_in2++) {
-            SUP_LINE(plines_out,linoff_out,plines_in1,linoff_in1,plines_in2,linoff_in2,bytes_in);
-        }
+        MB_RunBands(MB_SIMD_SELECT(SUP_BANDS), &ctx, src1->height, ctx.bytes_in);
         break;
 
     case MB_PAIR_32_32:
-        for(i = 0; i < src1->height; i++, plines_out++, plines_in1++, plines_in2++) {
-            SUP_LINE32(plines_out,linoff_out,plines_in1,linoff_in1,plines_in2,linoff_in2,bytes_in);
-        }
+        MB_RunBands(MB_SIMD_SELECT(SUP_BANDS32), &ctx, src1->height, ctx.bytes_in);
         break;
 
     default:
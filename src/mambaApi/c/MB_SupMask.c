@@ -237,6 +237,16 @@ static INLINE void SUPMASK_LINE_1_1(PLINE *plines_out, Uint32 linoff_out,
     }
 }
 
+/****************************************/
+/* Band functions                       */
+/****************************************/
+
+MB_BAND_FUNC_3(STRICT_SUPMASK_BAND_1_1, STRICT_SUPMASK_LINE_1_1)
+MB_BAND_FUNC_3(SUPMASK_BAND_1_1, SUPMASK_LINE_1_1)
+MB_BAND_FUNC_3(STRICT_SUPMASK_BAND_8_8, STRICT_SUPMASK_LINE_8_8)
+MB_BAND_FUNC_3(SUPMASK_BAND_8_8, SUPMASK_LINE_8_8)
+MB_BAND_FUNC_3(STRICT_SUPMASK_BAND_32_32, STRICT_SUPMASK_LINE_32_32)
+MB_BAND_FUNC_3(SUPMASK_BAND_32_32, SUPMASK_LINE_32_32)
 
 /**
  * Computes a binary image where pixels are set to 1 when the pixels of
@@ -249,9 +259,7 @@ static INLINE void SUPMASK_LINE_1_1(PLINE *plines_out, Uint32 linoff_out,
  */
 MB_errcode MB_SupMask(MB_Image *src1, MB_Image *src2, MB_Image *dest, Uint32 strict)
 {
-    Uint32 i;
-    PLINE *plines_in1, *plines_in2, *plines_out;
-    Uint32 linoff_out, linoff_in1, linoff_in2, bytes_in;
+    MB_LinesCtx ctx;
     
     /* verification over image size compatibility */
     if (!MB_CHECK_SIZE_3(src1, src2, dest)) {
@@ -259,15 +267,15 @@ MB_errcode MB_SupMask(MB_Image *src1, MB_Image *src2, MB_Image *dest, Uint32 str
     }
 
     /* Setting up line pointers */
-    plines_in1 = &src1->PLINES[MB_Y_TOP(src1)];
-    plines_in2 = &src2->PLINES[MB_Y_TOP(src2)];
-    plines_out = &dest->PLINES[MB_Y_TOP(dest)];
-    linoff_in1 = MB_LINE_OFFSET(src1);
-    linoff_in2 = MB_LINE_OFFSET(src2);
-    linoff_out = MB_LINE_OFFSET(dest);
+    ctx.plines_in1 = &src1->PLINES[MB_Y_TOP(src1)];
+    ctx.plines_in2 = &src2->PLINES[MB_Y_TOP(src2)];
+    ctx.plines_out = &dest->PLINES[MB_Y_TOP(dest)];
+    ctx.linoff_in1 = MB_LINE_OFFSET(src1);
+    ctx.linoff_in2 = MB_LINE_OFFSET(src2);
+    ctx.linoff_out = MB_LINE_OFFSET(dest);
     /* for this function the number of bytes is the number of */
     /* the binary image */
-    bytes_in = MB_LINE_COUNT(dest);
+    ctx.bytes_in = MB_LINE_COUNT(dest);
 
     /* dest image must be binary */
     if(dest->depth!=1)
@@ -278,37 +286,25 @@ MB_errcode MB_SupMask(MB_Image *src1, MB_Image *src2, MB_Image *dest, Uint32 str
 
     case MB_PAIR_1_1:
         if (strict) {
-            for (i = 0; i < src1->height; i++, plines_in1++, plines_in2++, plines_out++) {
-                STRICT_SUPMASK_LINE_1_1(plines_out, linoff_out, plines_in1, linoff_in1, plines_in2, linoff_in2, bytes_in);
-            }
+            MB_RunBands(STRICT_SUPMASK_BAND_1_1, &ctx, src1->height, ctx.bytes_in);
         } else {
-            for (i = 0; i < src1->height; i++, plines_in1++, plines_in2++, plines_out++) {
-                SUPMASK_LINE_1_1(plines_out, linoff_out, plines_in1, linoff_in1, plines_in2, linoff_in2, bytes_in);
-            }
+            MB_RunBands(SUPMASK_BAND_1_1, &ctx, src1->height, ctx.bytes_in);
         }
         break;
 
     case MB_PAIR_8_8:
         if (strict) {
-            for (i = 0; i < src1->height; i++, plines_in1++, plines_in2++, plines_out++) {
-                STRICT_SUPMASK_LINE_8_8(plines_out, linoff_out, plines_in1, linoff_in1, plines_in2, linoff_in2, bytes_in);
-            }
+            MB_RunBands(STRICT_SUPMASK_BAND_8_8, &ctx, src1->height, ctx.bytes_in);
         } else {
-            for (i = 0; i < src1->height; i++, plines_in1++, plines_in2++, plines_out++) {
-                SUPMASK_LINE_8_8(plines_out, linoff_out, plines_in1, linoff_in1, plines_in2, linoff_in2, bytes_in);
-            }
+            MB_RunBands(SUPMASK_BAND_8_8, &ctx, src1->height, ctx.bytes_in);
         }
         break;
 
     case MB_PAIR_32_32:
         if (strict) {
-            for (i = 0; i < src1->height; i++, plines_in1++, plines_in2++, plines_out++) {
-                STRICT_SUPMASK_LINE_32_32(plines_out, linoff_out, plines_in1, linoff_in1, plines_in2, linoff_in2, bytes_in);
-            }
+            MB_RunBands(STRICT_SUPMASK_BAND_32_32, &ctx, src1->height, ctx.bytes_in);
         } else {
-            for (i = 0; i < src1->height; i++, plines_in1++, plines_in2++, plines_out++) {
-                SUPMASK_LINE_32_32(plines_out, linoff_out, plines_in1, linoff_in1, plines_in2, linoff_in2, bytes_in);
-            }
+            MB_RunBands(SUPMASK_BAND_32_32, &ctx, src1->height, ctx.bytes_in);
         }
         break;
 
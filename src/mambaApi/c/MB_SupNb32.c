@@ -58,14 +58,10 @@
 static INLINE void COMP_LINE(PLINE *p_inout, Uint32 off_inout,
                              PLINE *p_in, Uint32 off_in, Uint32 bytes_in )
 {
-    Uint32 i;
-
     PIX32 *pin = (PIX32 *) (*p_in + off_in);
     PIX32 *pinout = (PIX32 *) (*p_inout + off_inout);
-    
-    for(i=0;i<bytes_in;i+=4,pin++,pinout++) {
-        (*pinout) = (*pinout)>(*pin) ? (*pinout) : (*pin);
-    }
+
+    MB_SupLine32(pinout, pin, bytes_in/4);
 }
 
 /** 
@@ -81,13 +77,9 @@ static INLINE void COMP_LINE(PLINE *p_inout, Uint32 off_inout,
 static INLINE void COMP_EDGE_LINE(PLINE *p_inout, Uint32 off_inout,
                                     Uint32 bytes_in, PIX32 edge_val )
 {
-    Uint32 i;
-
     PIX32 *pinout = (PIX32 *) (*p_inout + off_inout);
-    
-    for(i=0;i<bytes_in;i+=4,pinout++) {
-        (*pinout) = (*pinout)>(edge_val) ? (*pinout) : (edge_val);
-    }
+
+    MB_SupConst32(pinout, edge_val, bytes_in/4);
 }
 
 /**
@@ -106,16 +98,13 @@ static INLINE void COMP_LINE_LEFT(PLINE *p_inout, Uint32 off_inout,
                                   PLINE *p_in, Uint32 off_in,
                                   Uint32 bytes_in, PIX32 edge_val )
 {
-    Uint32 i;
+    Uint32 nb_pix = bytes_in/4;
 
     PIX32 *pin = (PIX32 *) (*p_in + off_in);
     PIX32 *pinout = (PIX32 *) (*p_inout + off_inout);
-    
-    pin++;
-    for(i=0;i<bytes_in-4;i+=4,pin++,pinout++) {
-        (*pinout) = (*pinout)>(*pin) ? (*pinout) : (*pin);
-    }
-    (*pinout) = (*pinout)>(edge_val) ? (*pinout) : (edge_val);
+
+    MB_SupLine32(pinout, pin+1, nb_pix-1);
+    MB_SupConst32(pinout+nb_pix-1, edge_val, 1);
 }
 
 /**
@@ -134,16 +123,13 @@ static INLINE void COMP_LINE_RIGHT(PLINE *p_inout, Uint32 off_inout,
                                    PLINE *p_in, Uint32 off_in,
                                    Uint32 bytes_in, PIX32 edge_val )
 {
-    Uint32 i;
+    Uint32 nb_pix = bytes_in/4;
 
-    PIX32 *pin = (PIX32 *) (*p_in + bytes_in -4 + off_in);
-    PIX32 *pinout = (PIX32 *) (*p_inout + bytes_in -4 + off_inout);
-    
-    pin--;
-    for(i=0;i<bytes_in-4;i+=4,pin--,pinout--) {
-        (*pinout) = (*pinout)>(*pin) ? (*pinout) : (*pin);
-    }
-    (*pinout) = (*pinout)>(edge_val) ? (*pinout) : (edge_val);
+    PIX32 *pin = (PIX32 *) (*p_in + off_in);
+    PIX32 *pinout = (PIX32 *) (*p_inout + off_inout);
+
+    MB_SupLine32(pinout+1, pin, nb_pix-1);
+    MB_SupConst32(pinout, edge_val, 1);
 }
 
 /****************************************
@@ -179,7 +165,6 @@ MB_errcode MB_SupNb32(MB_Image *src, MB_Image *srcdest, Uint32 nbrnum, Uint32 co
     Uint32 linoff_in, linoff_inout;
     Uint32 bytes_in;
     PLINE *plines_in, *plines_inout;
-    TSWITCHEP *fn;
 
     /* error management */
     /* verification over image size compatibility */
@@ -221,10 +206,7 @@ MB_errcode MB_SupNb32(MB_Image *src, MB_Image *srcdest, Uint32 nbrnum, Uint32 co
     bytes_in = MB_LINE_COUNT(src);
 
     /* Calling the corresponding function */
-    fn = SwitchTo[grid][nbrnum];
-    fn(plines_inout, linoff_inout, plines_in, linoff_in, bytes_in, src->height, count, I32_FILL_VALUE(edge));
-    
-    return NO_ERR;
+    return MB_CompNb(plines_inout, linoff_inout, plines_in, linoff_in, bytes_in, src->height, count, I32_FILL_VALUE(edge), grid, nbrnum);
 }
 
 
@@ -55,12 +55,27 @@
  * \param off_in offset inside the source image line
  * \param bytes_in number of bytes inside the line
  */
-static INLINE void COMP_LINE(PLINE *p_inout, Uint32 off_inout,
-                             PLINE *p_in, Uint32 off_in, Uint32 bytes_in )
+static INLINE void COMP_LINE_SCALAR(PLINE *p_inout, Uint32 off_inout,
+                                    PLINE *p_in, Uint32 off_in, Uint32 bytes_in )
 {
     Uint32 i;
+
+    PLINE pin = (PLINE) (*p_in + off_in);
+    PLINE pinout = (PLINE) (*p_inout + off_inout);
     
-#ifdef __SSE2__
+    for(i=0;i<bytes_in;i++,pin++,pinout++) {
+        (*pinout) = (*pinout)>(*pin) ? (*pinout) : (*pin);
+    }
+}
+
+#ifdef MB_SIMD_X86
+/**
+ * Same as COMP_LINE_SCALAR using SSE2 instructions.
+ */
+static INLINE MB_TARGET_SSE2 void COMP_LINE_SSE2(PLINE *p_inout, Uint32 off_inout,
+                                                 PLINE *p_in, Uint32 off_in, Uint32 bytes_in )
+{
+    Uint32 i;
 
     __m128i *pin = (__m128i*) (*p_in + off_in);
     __m128i *pinout = (__m128i*) (*p_inout + off_inout);
@@ -69,16 +84,8 @@ static INLINE void COMP_LINE(PLINE *p_inout, Uint32 off_inout,
         (*pinout) = _mm_max_epu8((*pinout),(*pin));
     }
     
-#else
-
-    PLINE pin = (PLINE) (*p_in + off_in);
-    PLINE pinout = (PLINE) (*p_inout + off_inout);
-    
-    for(i=0;i<bytes_in;i++,pin++,pinout++) {
-        (*pinout) = (*pinout)>(*pin) ? (*pinout) : (*pin);
-    }
-#endif
 }
+#endif
 
 /** 
  * Computes a whole line from inout source image with a predefined
@@ -90,13 +97,27 @@ static INLINE void COMP_LINE(PLINE *p_inout, Uint32 off_inout,
  * \param bytes_in number of bytes inside the line
  * \param edge_val the value representing the outside edge
  */
-static INLINE void COMP_EDGE_LINE(PLINE *p_inout, Uint32 off_inout,
-                                    Uint32 bytes_in, Uint32 edge_val )
+static INLINE void COMP_EDGE_LINE_SCALAR(PLINE *p_inout, Uint32 off_inout,
+                                           Uint32 bytes_in, Uint32 edge_val )
 {
     Uint32 i;
 
-#ifdef __SSE2__
+    PLINE pinout = (PLINE) (*p_inout + off_inout);
     
+    for(i=0;i<bytes_in;i++,pinout++) {
+        (*pinout) = (*pinout)>(edge_val) ? (*pinout) : (edge_val);
+    }
+}
+
+#ifdef MB_SIMD_X86
+/**
+ * Same as COMP_EDGE_LINE_SCALAR using SSE2 instructions.
+ */
+static INLINE MB_TARGET_SSE2 void COMP_EDGE_LINE_SSE2(PLINE *p_inout, Uint32 off_inout,
+                                                        Uint32 bytes_in, Uint32 edge_val )
+{
+    Uint32 i;
+
     __m128i edge = _mm_set1_epi32((int) edge_val);
     __m128i *pinout = (__m128i*) (*p_inout + off_inout);
     
@@ -104,15 +125,8 @@ static INLINE void COMP_EDGE_LINE(PLINE *p_inout, Uint32 off_inout,
         (*pinout) = _mm_max_epu8((*pinout),edge);
     }
     
-#else
-
-    PLINE pinout = (PLINE) (*p_inout + off_inout);
-    
-    for(i=0;i<bytes_in;i++,pinout++) {
-        (*pinout) = (*pinout)>(edge_val) ? (*pinout) : (edge_val);
-    }
-#endif
 }
+#endif
 
 /**
  * Computes two whole lines from inout and in source images.
@@ -126,13 +140,33 @@ static INLINE void COMP_EDGE_LINE(PLINE *p_inout, Uint32 off_inout,
  * \param bytes_in number of bytes inside the line
  * \param edge_val the value representing the outside edge
  */
-static INLINE void COMP_LINE_LEFT(PLINE *p_inout, Uint32 off_inout,
-                                  PLINE *p_in, Uint32 off_in,
-                                  Uint32 bytes_in, Uint32 edge_val )
+static INLINE void COMP_LINE_LEFT_SCALAR(PLINE *p_inout, Uint32 off_inout,
+                                         PLINE *p_in, Uint32 off_in,
+                                         Uint32 bytes_in, Uint32 edge_val )
+{
+    Uint32 i;
+
+    PLINE pin = (PLINE) (*p_in + off_in);
+    PLINE pinout = (PLINE) (*p_inout + off_inout);
+    
+    pin++;
+    for(i=0;i<bytes_in-1;i++,pin++,pinout++) {
+        (*pinout) = (*pinout)>(*pin) ? (*pinout) : (*pin);
+    }
+    (*pinout) = (*pinout)>(edge_val) ? (*pinout) : (edge_val);
+
+}
+
+#ifdef MB_SIMD_X86
+/**
+ * Same as COMP_LINE_LEFT_SCALAR using SSE2 instructions.
+ */
+static INLINE MB_TARGET_SSE2 void COMP_LINE_LEFT_SSE2(PLINE *p_inout, Uint32 off_inout,
+                                                      PLINE *p_in, Uint32 off_in,
+                                                      Uint32 bytes_in, Uint32 edge_val )
 {
     Uint32 i;
     
-#ifdef __SSE2__
     __m128i a,b;
 
     __m128i edge = _mm_set1_epi32((int) edge_val);
@@ -148,19 +182,8 @@ static INLINE void COMP_LINE_LEFT(PLINE *p_inout, Uint32 off_inout,
         (*pinout) = _mm_max_epu8((*pinout),b);
     }
     
-#else
-
-    PLINE pin = (PLINE) (*p_in + off_in);
-    PLINE pinout = (PLINE) (*p_inout + off_inout);
-    
-    pin++;
-    for(i=0;i<bytes_in-1;i++,pin++,pinout++) {
-        (*pinout) = (*pinout)>(*pin) ? (*pinout) : (*pin);
-    }
-    (*pinout) = (*pinout)>(edge_val) ? (*pinout) : (edge_val);
-
-#endif
 }
+#endif
 
 /**
  * Computes two whole lines from inout and in source images.
@@ -174,13 +197,33 @@ static INLINE void COMP_LINE_LEFT(PLINE *p_inout, Uint32 off_inout,
  * \param bytes_in number of bytes inside the line
  * \param edge_val the value representing the outside edge
  */
-static INLINE void COMP_LINE_RIGHT(PLINE *p_inout, Uint32 off_inout,
-                                   PLINE *p_in, Uint32 off_in,
-                                   Uint32 bytes_in, Uint32 edge_val )
+static INLINE void COMP_LINE_RIGHT_SCALAR(PLINE *p_inout, Uint32 off_inout,
+                                          PLINE *p_in, Uint32 off_in,
+                                          Uint32 bytes_in, Uint32 edge_val )
+{
+    Uint32 i;
+
+    PLINE pin = (PLINE) (*p_in + bytes_in -1 + off_in);
+    PLINE pinout = (PLINE) (*p_inout + bytes_in -1 + off_inout);
+    
+    pin--;
+    for(i=0;i<bytes_in-1;i++,pin--,pinout--) {
+        (*pinout) = (*pinout)>(*pin) ? (*pinout) : (*pin);
+    }
+    (*pinout) = (*pinout)>(edge_val) ? (*pinout) : (edge_val);
+    
+}
+
+#ifdef MB_SIMD_X86
+/**
+ * Same as COMP_LINE_RIGHT_SCALAR using SSE2 instructions.
+ */
+static INLINE MB_TARGET_SSE2 void COMP_LINE_RIGHT_SSE2(PLINE *p_inout, Uint32 off_inout,
+                                                       PLINE *p_in, Uint32 off_in,
+                                                       Uint32 bytes_in, Uint32 edge_val )
 {
     Uint32 i;
     
-#ifdef __SSE2__
     __m128i a,b;
 
     __m128i edge = _mm_set1_epi32((int) edge_val);
@@ -195,20 +238,225 @@ static INLINE void COMP_LINE_RIGHT(PLINE *p_inout, Uint32 off_inout,
         edge = a;
         (*pinout) = _mm_max_epu8((*pinout),b);
     }
-#else
+}
+#endif
 
-    PLINE pin = (PLINE) (*p_in + bytes_in -1 + off_in);
-    PLINE pinout = (PLINE) (*p_inout + bytes_in -1 + off_inout);
-    
-    pin--;
-    for(i=0;i<bytes_in-1;i++,pin--,pinout--) {
-        (*pinout) = (*pinout)>(*pin) ? (*pinout) : (*pin);
+/****************************************/
+/* Wide SIMD functions                  */
+/****************************************/
+#ifdef MB_SIMD_X86
+
+/**
+ * Same as COMP_LINE_SCALAR using AVX2 instructions.
+ */
+static INLINE MB_TARGET_AVX2 void COMP_LINE_AVX2(PLINE *p_inout, Uint32 off_inout,
+                                                 PLINE *p_in, Uint32 off_in, Uint32 bytes_in )
+{
+    Uint32 i;
+    __m256i a, b;
+
+    PLINE pin = (PLINE) (*p_in + off_in);
+    PLINE pinout = (PLINE) (*p_inout + off_inout);
+
+    /* lines are only aligned on 16 bytes, unaligned accesses are used */
+    for(i=0;i<bytes_in;i+=32) {
+        a = _mm256_loadu_si256((__m256i *) (pin+i));
+        b = _mm256_loadu_si256((__m256i *) (pinout+i));
+        _mm256_storeu_si256((__m256i *) (pinout+i), _mm256_max_epu8(b, a));
     }
-    (*pinout) = (*pinout)>(edge_val) ? (*pinout) : (edge_val);
-    
-#endif
 }
 
+/**
+ * Same as COMP_EDGE_LINE_SCALAR using AVX2 instructions.
+ */
+static INLINE MB_TARGET_AVX2 void COMP_EDGE_LINE_AVX2(PLINE *p_inout, Uint32 off_inout,
+                                                        Uint32 bytes_in, Uint32 edge_val )
+{
+    Uint32 i;
+    __m256i b;
+
+    __m256i edge = _mm256_set1_epi8((char) edge_val);
+    PLINE pinout = (PLINE) (*p_inout + off_inout);
+
+    for(i=0;i<bytes_in;i+=32) {
+        b = _mm256_loadu_si256((__m256i *) (pinout+i));
+        _mm256_storeu_si256((__m256i *) (pinout+i), _mm256_max_epu8(b, edge));
+    }
+}
+
+/**
+ * Same as COMP_LINE_LEFT_SCALAR using AVX2 instructions.
+ * The shifted pixels are read with unaligned loads. The last 32 bytes,
+ * which need the edge value, are computed by the scalar function.
+ */
+static INLINE MB_TARGET_AVX2 void COMP_LINE_LEFT_AVX2(PLINE *p_inout, Uint32 off_inout,
+                                                      PLINE *p_in, Uint32 off_in,
+                                                      Uint32 bytes_in, Uint32 edge_val )
+{
+    Uint32 i;
+    __m256i a, b;
+
+    PLINE pin = (PLINE) (*p_in + off_in);
+    PLINE pinout = (PLINE) (*p_inout + off_inout);
+
+    /* going forward, the pixels are read before being written when the */
+    /* two lines are the same */
+    for(i=0;i<bytes_in-32;i+=32) {
+        a = _mm256_loadu_si256((__m256i *) (pin+i+1));
+        b = _mm256_loadu_si256((__m256i *) (pinout+i));
+        _mm256_storeu_si256((__m256i *) (pinout+i), _mm256_max_epu8(b, a));
+    }
+    COMP_LINE_LEFT_SCALAR(p_inout, off_inout+i, p_in, off_in+i, bytes_in-i, edge_val);
+}
+
+/**
+ * Same as COMP_LINE_RIGHT_SCALAR using AVX2 instructions.
+ * The shifted pixels are read with unaligned loads. The first 32 bytes,
+ * which need the edge value, are computed by the scalar function.
+ */
+static INLINE MB_TARGET_AVX2 void COMP_LINE_RIGHT_AVX2(PLINE *p_inout, Uint32 off_inout,
+                                                       PLINE *p_in, Uint32 off_in,
+                                                       Uint32 bytes_in, Uint32 edge_val )
+{
+    Uint32 i;
+    __m256i a, b;
+
+    PLINE pin = (PLINE) (*p_in + off_in);
+    PLINE pinout = (PLINE) (*p_inout + off_inout);
+
+    /* going backward, the pixels are read before being written when the */
+    /* two lines are the same */
+    for(i=bytes_in-32;i>0;i-=32) {
+        a = _mm256_loadu_si256((__m256i *) (pin+i-1));
+        b = _mm256_loadu_si256((__m256i *) (pinout+i));
+        _mm256_storeu_si256((__m256i *) (pinout+i), _mm256_max_epu8(b, a));
+    }
+    COMP_LINE_RIGHT_SCALAR(p_inout, off_inout, p_in, off_in, 32, edge_val);
+}
+
+/**
+ * Same as COMP_LINE_SCALAR using AVX-512 instructions.
+ */
+static INLINE MB_TARGET_AVX512 void COMP_LINE_AVX512(PLINE *p_inout, Uint32 off_inout,
+                                                   PLINE *p_in, Uint32 off_in, Uint32 bytes_in )
+{
+    Uint32 i;
+    __m512i a, b;
+
+    PLINE pin = (PLINE) (*p_in + off_in);
+    PLINE pinout = (PLINE) (*p_inout + off_inout);
+
+    /* lines are only aligned on 16 bytes, unaligned accesses are used */
+    for(i=0;i<bytes_in;i+=64) {
+        a = _mm512_loadu_si512((__m512i *) (pin+i));
+        b = _mm512_loadu_si512((__m512i *) (pinout+i));
+        _mm512_storeu_si512((__m512i *) (pinout+i), _mm512_max_epu8(b, a));
+    }
+}
+
+/**
+ * Same as COMP_EDGE_LINE_SCALAR using AVX-512 instructions.
+ */
+static INLINE MB_TARGET_AVX512 void COMP_EDGE_LINE_AVX512(PLINE *p_inout, Uint32 off_inout,
+                                                          Uint32 bytes_in, Uint32 edge_val )
+{
+    Uint32 i;
+    __m512i b;
+
+    __m512i edge = _mm512_set1_epi8((char) edge_val);
+    PLINE pinout = (PLINE) (*p_inout + off_inout);
+
+    for(i=0;i<bytes_in;i+=64) {
+        b = _mm512_loadu_si512((__m512i *) (pinout+i));
+        _mm512_storeu_si512((__m512i *) (pinout+i), _mm512_max_epu8(b, edge));
+    }
+}
+
+/**
+ * Same as COMP_LINE_LEFT_SCALAR using AVX-512 instructions.
+ * The shifted pixels are read with unaligned loads. The last 64 bytes,
+ * which need the edge value, are computed by the scalar function.
+ */
+static INLINE MB_TARGET_AVX512 void COMP_LINE_LEFT_AVX512(PLINE *p_inout, Uint32 off_inout,
+                                                        PLINE *p_in, Uint32 off_in,
+                                                        Uint32 bytes_in, Uint32 edge_val )
+{
+    Uint32 i;
+    __m512i a, b;
+
+    PLINE pin = (PLINE) (*p_in + off_in);
+    PLINE pinout = (PLINE) (*p_inout + off_inout);
+
+    /* going forward, the pixels are read before being written when the */
+    /* two lines are the same */
+    for(i=0;i<bytes_in-64;i+=64) {
+        a = _mm512_loadu_si512((__m512i *) (pin+i+1));
+        b = _mm512_loadu_si512((__m512i *) (pinout+i));
+        _mm512_storeu_si512((__m512i *) (pinout+i), _mm512_max_epu8(b, a));
+    }
+    COMP_LINE_LEFT_SCALAR(p_inout, off_inout+i, p_in, off_in+i, bytes_in-i, edge_val);
+}
+
+/**
+ * Same as COMP_LINE_RIGHT_SCALAR using AVX-512 instructions.
+ * The shifted pixels are read with unaligned loads. The first 64 bytes,
+ * which need the edge value, are computed by the scalar function.
+ */
+static INLINE MB_TARGET_AVX512 void COMP_LINE_RIGHT_AVX512(PLINE *p_inout, Uint32 off_inout,
+                                                         PLINE *p_in, Uint32 off_in,
+                                                         Uint32 bytes_in, Uint32 edge_val )
+{
+    Uint32 i;
+    __m512i a, b;
+
+    PLINE pin = (PLINE) (*p_in + off_in);
+    PLINE pinout = (PLINE) (*p_inout + off_inout);
+
+    /* going backward, the pixels are read before being written when the */
+    /* two lines are the same */
+    for(i=bytes_in-64;i>0;i-=64) {
+        a = _mm512_loadu_si512((__m512i *) (pin+i-1));
+        b = _mm512_loadu_si512((__m512i *) (pinout+i));
+        _mm512_storeu_si512((__m512i *) (pinout+i), _mm512_max_epu8(b, a));
+    }
+    COMP_LINE_RIGHT_SCALAR(p_inout, off_inout, p_in, off_in, 64, edge_val);
+}
+#endif
+
+/****************************************/
+/* SIMD versions                        */
+/****************************************/
+/* The version of each base function used is taken in a table according */
+/* to the SIMD level selected when the library is running */
+
+/** Type of the COMP_LINE functions */
+typedef void (*TCOMP_LINE)(PLINE *p_inout, Uint32 off_inout, PLINE *p_in, Uint32 off_in, Uint32 bytes_in);
+/** Versions of COMP_LINE for each SIMD level */
+static const TCOMP_LINE COMP_LINE_FN[MB_SIMD_LEVELS] =
+    MB_SIMD_TABLE(COMP_LINE_SCALAR, COMP_LINE_SSE2, COMP_LINE_SSE2, COMP_LINE_AVX2, COMP_LINE_AVX512);
+#define COMP_LINE MB_SIMD_SELECT(COMP_LINE_FN)
+
+/** Type of the COMP_EDGE_LINE functions */
+typedef void (*TCOMP_EDGE_LINE)(PLINE *p_inout, Uint32 off_inout, Uint32 bytes_in, Uint32 edge_val);
+/** Versions of COMP_EDGE_LINE for each SIMD level */
+static const TCOMP_EDGE_LINE COMP_EDGE_LINE_FN[MB_SIMD_LEVELS] =
+    MB_SIMD_TABLE(COMP_EDGE_LINE_SCALAR, COMP_EDGE_LINE_SSE2, COMP_EDGE_LINE_SSE2, COMP_EDGE_LINE_AVX2, COMP_EDGE_LINE_AVX512);
+#define COMP_EDGE_LINE MB_SIMD_SELECT(COMP_EDGE_LINE_FN)
+
+/** Type of the COMP_LINE_LEFT functions */
+typedef void (*TCOMP_LINE_LEFT)(PLINE *p_inout, Uint32 off_inout, PLINE *p_in, Uint32 off_in, Uint32 bytes_in, Uint32 edge_val);
+/** Versions of COMP_LINE_LEFT for each SIMD level */
+static const TCOMP_LINE_LEFT COMP_LINE_LEFT_FN[MB_SIMD_LEVELS] =
+    MB_SIMD_TABLE(COMP_LINE_LEFT_SCALAR, COMP_LINE_LEFT_SSE2, COMP_LINE_LEFT_SSE2, COMP_LINE_LEFT_AVX2, COMP_LINE_LEFT_AVX512);
+#define COMP_LINE_LEFT MB_SIMD_SELECT(COMP_LINE_LEFT_FN)
+
+/** Type of the COMP_LINE_RIGHT functions */
+typedef void (*TCOMP_LINE_RIGHT)(PLINE *p_inout, Uint32 off_inout, PLINE *p_in, Uint32 off_in, Uint32 bytes_in, Uint32 edge_val);
+/** Versions of COMP_LINE_RIGHT for each SIMD level */
+static const TCOMP_LINE_RIGHT COMP_LINE_RIGHT_FN[MB_SIMD_LEVELS] =
+    MB_SIMD_TABLE(COMP_LINE_RIGHT_SCALAR, COMP_LINE_RIGHT_SSE2, COMP_LINE_RIGHT_SSE2, COMP_LINE_RIGHT_AVX2, COMP_LINE_RIGHT_AVX512);
+#define COMP_LINE_RIGHT MB_SIMD_SELECT(COMP_LINE_RIGHT_FN)
+
 /****************************************
  * Neighbor functions                   *
  ****************************************
@@ -242,7 +490,6 @@ MB_errcode MB_SupNb8(MB_Image *src, MB_Image *srcdest, Uint32 nbrnum, Uint32 cou
     Uint32 linoff_in, linoff_inout;
     Uint32 bytes_in;
     PLINE *plines_in, *plines_inout;
-    TSWITCHEP *fn;
 
     /* error management */
     /* verification over image size compatibility */
@@ -284,9 +531,6 @@ MB_errcode MB_SupNb8(MB_Image *src, MB_Image *srcdest, Uint32 nbrnum, Uint32 cou
     bytes_in = MB_LINE_COUNT(src);
 
     /* Calling the corresponding function */
-    fn = SwitchTo[grid][nbrnum];
-    fn(plines_inout, linoff_inout, plines_in, linoff_in, bytes_in, src->height, count, GREY_FILL_VALUE(edge));
-    
-    return NO_ERR;
+    return MB_CompNb(plines_inout, linoff_inout, plines_in, linoff_in, bytes_in, src->height, count, GREY_FILL_VALUE(edge), grid, nbrnum);
 }
 
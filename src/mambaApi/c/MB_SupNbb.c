@@ -188,7 +188,6 @@ MB_errcode MB_SupNbb(MB_Image *src, MB_Image *srcdest, Uint32 nbrnum, Uint32 cou
     Uint32 linoff_in, linoff_inout;
     Uint32 bytes_in;
     PLINE *plines_in, *plines_inout;
-    TSWITCHEP *fn;
 
     /* error management */
     /* verification over image size compatibility */
@@ -230,10 +229,7 @@ MB_errcode MB_SupNbb(MB_Image *src, MB_Image *srcdest, Uint32 nbrnum, Uint32 cou
     bytes_in = MB_LINE_COUNT(src);
 
     /* Calling the corresponding function */
-    fn = SwitchTo[grid][nbrnum];
-    fn(plines_inout, linoff_inout, plines_in, linoff_in, bytes_in, src->height, count, BIN_FILL_VALUE(edge));
-    
-    return NO_ERR;
+    return MB_CompNb(plines_inout, linoff_inout, plines_in, linoff_in, bytes_in, src->height, count, BIN_FILL_VALUE(edge), grid, nbrnum);
 }
 
 
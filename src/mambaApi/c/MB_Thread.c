@@ -0,0 +1,494 @@
+/**
+ * \file MB_Thread.c
+ * \date 10-17-2026
+ *
+ */
+
+/*
+ * Copyright (c) <2009>, <Nicolas BEUCHER and ARMINES for the Centre de
+ * Morphologie Mathématique(CMM), common research center to ARMINES and MINES
+ * Paristech>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish,
+ * distribute, sublicense, and/or sell copies of the Software, and to permit
+ * persons to whom the Software is furnished to do so, subject to the following
+ * conditions: The above copyright notice and this permission notice shall be
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright
+ * holders shall not be used in advertising or otherwise to promote the sale,
+ * use or other dealings in this Software without their prior written
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+
+/*
+ * This file contains the row-band scheduler used by the image processing
+ * functions to spread their work over several cores.
+ *
+ * An image is cut into horizontal bands of consecutive lines. The bands are
+ * computed by a pool of persistent worker threads and by the calling thread
+ * itself. Every band is computed with the same line functions than the serial
+ * path so that the results are identical whatever the number of threads.
+ *
+ * Functions reading neighbor lines (the neighbor operators) can work in place:
+ * a band must then read the lines owned by the other bands before they are
+ * modified. These lines are saved before the computation in a halo.
+ *
+ * Only one function can use the pool at a time. When the pool is already busy
+ * (the library is called from several threads) the bands are computed serially
+ * by the calling thread. A process created by fork starts with an empty pool.
+ */
+
+#if defined(_WIN32) || defined(__WIN32__)
+    #include <windows.h>
+    #include <process.h>
+    typedef SRWLOCK MB_mutex_t;
+    typedef CONDITION_VARIABLE MB_cond_t;
+    typedef HANDLE MB_thread_t;
+    #define MB_MUTEX_INITIALIZER SRWLOCK_INIT
+    #define MB_COND_INITIALIZER CONDITION_VARIABLE_INIT
+    #define MB_mutex_lock(m) AcquireSRWLockExclusive(m)
+    #define MB_mutex_trylock(m) (TryAcquireSRWLockExclusive(m) ? 0 : 1)
+    #define MB_mutex_unlock(m) ReleaseSRWLockExclusive(m)
+    #define MB_cond_wait(c, m) SleepConditionVariableSRW(c, m, INFINITE, 0)
+    #define MB_cond_signal(c) WakeConditionVariable(c)
+    #define MB_cond_broadcast(c) WakeAllConditionVariable(c)
+#else
+    #include <pthread.h>
+    #include <unistd.h>
+    typedef pthread_mutex_t MB_mutex_t;
+    typedef pthread_cond_t MB_cond_t;
+    typedef pthread_t MB_thread_t;
+    #define MB_MUTEX_INITIALIZER PTHREAD_MUTEX_INITIALIZER
+    #define MB_COND_INITIALIZER PTHREAD_COND_INITIALIZER
+    #define MB_mutex_lock(m) pthread_mutex_lock(m)
+    #define MB_mutex_trylock(m) pthread_mutex_trylock(m)
+    #define MB_mutex_unlock(m) pthread_mutex_unlock(m)
+    #define MB_cond_wait(c, m) pthread_cond_wait(c, m)
+    #define MB_cond_signal(c) pthread_cond_signal(c)
+    #define MB_cond_broadcast(c) pthread_cond_broadcast(c)
+#endif
+
+/** Maximum number of threads that can be used by the library */
+#define MB_MAX_THREADS 256
+/** Minimum amount of bytes worth dispatching to a worker thread */
+#define MB_BAND_MIN_BYTES 65536
+
+/****************************************/
+/* Pool state                           */
+/****************************************/
+
+/** The worker pool shared by all the functions of the library */
+static struct {
+    /** protects the job description and counters below */
+    MB_mutex_t lock;
+    /** held by the thread dispatching a job (or reconfiguring the pool) */
+    MB_mutex_t busy;
+    /** signaled when a new job is available (or when workers must quit) */
+    MB_cond_t start;
+    /** signaled when the last band of a job is finished */
+    MB_cond_t done;
+    /** number of threads computing the bands (including the caller) */
+    Uint32 nb_threads;
+    /** number of worker threads actually running */
+    Uint32 nb_workers;
+    /** worker threads handles */
+    MB_thread_t workers[MB_MAX_THREADS];
+    /** job counter, incremented each time a job is posted */
+    Uint32 generation;
+    /** set when the workers must terminate */
+    Uint32 quit;
+    /** the band function of the current job */
+    MB_BandFn *fn;
+    /** the context given to the band function */
+    void *ctx;
+    /** number of lines in the current job */
+    Uint32 nb_lines;
+    /** number of bands in the current job */
+    Uint32 nb_bands;
+    /** next band to be computed */
+    Uint32 next_band;
+    /** number of bands not yet finished */
+    Uint32 pending;
+} pool = {
+    MB_MUTEX_INITIALIZER, MB_MUTEX_INITIALIZER,
+    MB_COND_INITIALIZER, MB_COND_INITIALIZER,
+    1, 0
+};
+
+/****************************************/
+/* Helper functions                     */
+/****************************************/
+
+/**
+ * Computes all the remaining bands of the current job. Must be called with
+ * the pool lock held, returns with the lock held.
+ */
+static void MB_ComputeBands(void)
+{
+    Uint32 band, first, last;
+    MB_BandFn *fn;
+    void *ctx;
+
+    while (pool.next_band<pool.nb_bands) {
+        band = pool.next_band++;
+        fn = pool.fn;
+        ctx = pool.ctx;
+        first = MB_BandStart(band, pool.nb_bands, pool.nb_lines);
+        last = MB_BandStart(band+1, pool.nb_bands, pool.nb_lines);
+        MB_mutex_unlock(&pool.lock);
+        fn(ctx, first, last);
+        MB_mutex_lock(&pool.lock);
+        pool.pending--;
+        if (pool.pending==0)
+            MB_cond_broadcast(&pool.done);
+    }
+}
+
+/**
+ * Worker thread main loop.
+ * \param arg unused
+ */
+#if defined(_WIN32) || defined(__WIN32__)
+static unsigned __stdcall MB_Worker(void *arg)
+#else
+static void *MB_Worker(void *arg)
+#endif
+{
+    Uint32 seen;
+
+    MB_mutex_lock(&pool.lock);
+    seen = pool.generation;
+    for(;;) {
+        while (seen==pool.generation && !pool.quit)
+            MB_cond_wait(&pool.start, &pool.lock);
+        if (pool.quit)
+            break;
+        seen = pool.generation;
+        MB_ComputeBands();
+    }
+    MB_mutex_unlock(&pool.lock);
+
+    return 0;
+}
+
+/**
+ * Stops and joins all the worker threads. Must be called with the busy lock
+ * held.
+ */
+static void MB_StopWorkers(void)
+{
+    Uint32 i;
+
+    MB_mutex_lock(&pool.lock);
+    pool.quit = 1;
+    MB_cond_broadcast(&pool.start);
+    MB_mutex_unlock(&pool.lock);
+
+    for (i=0; i<pool.nb_workers; i++) {
+#if defined(_WIN32) || defined(__WIN32__)
+        WaitForSingleObject(pool.workers[i], INFINITE);
+        CloseHandle(pool.workers[i]);
+#else
+        pthread_join(pool.workers[i], NULL);
+#endif
+    }
+    pool.nb_workers = 0;
+    pool.quit = 0;
+}
+
+/**
+ * Returns the number of processors available on the system.
+ */
+static Uint32 MB_ProcessorCount(void)
+{
+#if defined(_WIN32) || defined(__WIN32__)
+    SYSTEM_INFO info;
+    GetSystemInfo(&info);
+    return (Uint32) info.dwNumberOfProcessors;
+#else
+    long n = sysconf(_SC_NPROCESSORS_ONLN);
+    return (n>0) ? (Uint32) n : 1;
+#endif
+}
+
+#if !defined(_WIN32) && !defined(__WIN32__)
+/**
+ * Resets the pool in the child process created by fork. Only the thread
+ * calling fork is duplicated, so the child computes the bands serially until
+ * it sets its own number of threads.
+ */
+static void MB_ForkChild(void)
+{
+    pthread_mutex_init(&pool.lock, NULL);
+    pthread_mutex_init(&pool.busy, NULL);
+    pthread_cond_init(&pool.start, NULL);
+    pthread_cond_init(&pool.done, NULL);
+    pool.nb_workers = 0;
+    pool.nb_threads = 1;
+    pool.quit = 0;
+}
+#endif
+
+/****************************************/
+/* Band execution                       */
+/****************************************/
+
+/**
+ * Returns the first line of a band. Bands always start on an even line so that
+ * the line parity used by the hexagonal grid computations is preserved.
+ * \param band the band index
+ * \param nb_bands the number of bands
+ * \param nb_lines the number of lines to split
+ * \return the index of the first line of the band
+ */
+Uint32 MB_BandStart(Uint32 band, Uint32 nb_bands, Uint32 nb_lines)
+{
+    if (band>=nb_bands)
+        return nb_lines;
+    return (Uint32) ((((Uint64) (nb_lines/2))*band)/nb_bands)*2;
+}
+
+/**
+ * Returns the number of bands in which an image is split. The number of bands
+ * is limited by the number of threads, the amount of work and the number of
+ * line pairs.
+ * \param nb_lines the number of lines to compute
+ * \param bytes_in the number of bytes inside a line
+ * \return the number of bands
+ */
+Uint32 MB_BandCount(Uint32 nb_lines, Uint32 bytes_in)
+{
+    Uint32 nb_bands;
+    Uint64 size;
+
+    nb_bands = pool.nb_threads;
+    size = ((Uint64) nb_lines)*bytes_in;
+    if (size/MB_BAND_MIN_BYTES < nb_bands)
+        nb_bands = (Uint32) (size/MB_BAND_MIN_BYTES);
+    if (nb_lines/2 < nb_bands)
+        nb_bands = nb_lines/2;
+
+    return nb_bands;
+}
+
+/**
+ * Computes the band function over all the lines of an image split in a given
+ * number of bands (see MB_BandStart). The bands are computed in parallel by
+ * the worker threads. When the pool is busy, the whole image is computed in a
+ * single band by the calling thread.
+ * \param fn the band function
+ * \param ctx the context given to the band function
+ * \param nb_lines the number of lines to compute
+ * \param nb_bands the number of bands
+ */
+void MB_RunBandsN(MB_BandFn *fn, void *ctx, Uint32 nb_lines, Uint32 nb_bands)
+{
+    if (nb_bands<=1 || MB_mutex_trylock(&pool.busy)!=0) {
+        /* serial computation */
+        fn(ctx, 0, nb_lines);
+        return;
+    }
+    if (pool.nb_workers==0) {
+        /* the pool was emptied in the meantime */
+        MB_mutex_unlock(&pool.busy);
+        fn(ctx, 0, nb_lines);
+        return;
+    }
+
+    /* posting the job */
+    MB_mutex_lock(&pool.lock);
+    pool.fn = fn;
+    pool.ctx = ctx;
+    pool.nb_lines = nb_lines;
+    pool.nb_bands = nb_bands;
+    pool.next_band = 0;
+    pool.pending = nb_bands;
+    pool.generation++;
+    MB_cond_broadcast(&pool.start);
+
+    /* the calling thread takes its share of the work */
+    MB_ComputeBands();
+    while (pool.pending>0)
+        MB_cond_wait(&pool.done, &pool.lock);
+    MB_mutex_unlock(&pool.lock);
+
+    MB_mutex_unlock(&pool.busy);
+}
+
+/**
+ * Computes the band function over all the lines of an image. The lines are
+ * split in horizontal bands which are computed in parallel by the worker
+ * threads. Small images are computed in a single band by the calling thread.
+ * \param fn the band function
+ * \param ctx the context given to the band function
+ * \param nb_lines the number of lines to compute
+ * \param bytes_in the number of bytes inside a line
+ */
+void MB_RunBands(MB_BandFn *fn, void *ctx, Uint32 nb_lines, Uint32 bytes_in)
+{
+    MB_RunBandsN(fn, ctx, nb_lines, MB_BandCount(nb_lines, bytes_in));
+}
+
+/****************************************/
+/* Band halos                           */
+/****************************************/
+
+/**
+ * Prepares the copies of the lines that each band reads outside of its own
+ * lines when an image is computed in place. Band b, made of lines first to
+ * last-1, reads the lines first+dy to last+dy-1.
+ * \param halo the halo to create
+ * \param nb_lines the number of lines of the image
+ * \param nb_bands the number of bands (see MB_BandStart)
+ * \param dy the vertical displacement between a line and the line it reads
+ * \param line_size the number of bytes to save in each line
+ * \return An error code (NO_ERR if successful)
+ */
+MB_errcode MB_CreateHalo(MB_Halo *halo, Uint32 nb_lines, Uint32 nb_bands, Sint32 dy, Uint32 line_size)
+{
+    Uint32 band, nb_saved, stride;
+    Sint64 first, last, j, jmin, jmax;
+    PIX8 *pixarray;
+
+    halo->nb_lines = nb_lines;
+    halo->line_size = line_size;
+    halo->pixarray = NULL;
+    halo->plines = (PLINE *) MB_malloc(nb_lines*sizeof(PLINE));
+    if (halo->plines==NULL)
+        return ERR_CANT_ALLOCATE_MEMORY;
+    MB_memset(halo->plines, 0, nb_lines*sizeof(PLINE));
+
+    /* marking the lines read outside of each band */
+    nb_saved = 0;
+    for (band=0; band<nb_bands; band++) {
+        first = MB_BandStart(band, nb_bands, nb_lines);
+        last = MB_BandStart(band+1, nb_bands, nb_lines);
+        jmin = first+dy<0 ? 0 : first+dy;
+        jmax = last+dy>(Sint64) nb_lines ? (Sint64) nb_lines : last+dy;
+        for (j=jmin; j<jmax; j++) {
+            if ((j<first || j>=last) && halo->plines[j]==NULL) {
+                /* temporary mark, replaced below by the copy address */
+                halo->plines[j] = (PLINE) halo;
+                nb_saved++;
+            }
+        }
+    }
+
+    /* saved lines are kept aligned for the SSE2 instructions */
+    stride = (line_size+15)&~15;
+    if (nb_saved>0) {
+        halo->pixarray = (PIX8 *) MB_aligned_malloc(nb_saved*stride, 16);
+        if (halo->pixarray==NULL) {
+            MB_free(halo->plines);
+            return ERR_CANT_ALLOCATE_MEMORY;
+        }
+    }
+    pixarray = halo->pixarray;
+    for (j=0; j<nb_lines; j++) {
+        if (halo->plines[j]!=NULL) {
+            halo->plines[j] = (PLINE) pixarray;
+            pixarray += stride;
+        }
+    }
+
+    return NO_ERR;
+}
+
+/**
+ * Saves the lines of an image needed by the halo.
+ * \param halo the halo
+ * \param plines pointer on the image first line
+ */
+void MB_UpdateHalo(MB_Halo *halo, PLINE *plines)
+{
+    Uint32 j;
+
+    for (j=0; j<halo->nb_lines; j++) {
+        if (halo->plines[j]!=NULL)
+            MB_memcpy(halo->plines[j], plines[j], halo->line_size);
+    }
+}
+
+/**
+ * Frees the memory used by a halo.
+ * \param halo the halo
+ */
+void MB_DestroyHalo(MB_Halo *halo)
+{
+    MB_aligned_free(halo->pixarray);
+    MB_free(halo->plines);
+}
+
+/****************************************/
+/* Main functions                       */
+/****************************************/
+
+/**
+ * Sets the number of threads used to compute the image processing functions.
+ * The calling thread is always one of them so n-1 worker threads are started.
+ * \param nb_threads the number of threads (0 means one per processor)
+ * \return An error code (NO_ERR if successful)
+ */
+MB_errcode MB_SetThreadCount(Uint32 nb_threads)
+{
+#if !defined(_WIN32) && !defined(__WIN32__)
+    static int fork_handler = 0;
+#endif
+    Uint32 i;
+    int err;
+
+    if (nb_threads==0)
+        nb_threads = MB_ProcessorCount();
+    if (nb_threads>MB_MAX_THREADS)
+        return ERR_BAD_VALUE;
+
+    MB_mutex_lock(&pool.busy);
+#if !defined(_WIN32) && !defined(__WIN32__)
+    if (!fork_handler) {
+        pthread_atfork(NULL, NULL, MB_ForkChild);
+        fork_handler = 1;
+    }
+#endif
+    MB_StopWorkers();
+    for (i=0; i<nb_threads-1; i++) {
+#if defined(_WIN32) || defined(__WIN32__)
+        pool.workers[i] = (HANDLE) _beginthreadex(NULL, 0, MB_Worker, NULL, 0, NULL);
+        err = (pool.workers[i]==0);
+#else
+        err = pthread_create(&pool.workers[i], NULL, MB_Worker, NULL);
+#endif
+        if (err)
+            break;
+        pool.nb_workers++;
+    }
+    pool.nb_threads = pool.nb_workers+1;
+    MB_mutex_unlock(&pool.busy);
+
+    if (pool.nb_threads!=nb_threads)
+        return ERR_CANT_ALLOCATE_MEMORY;
+    return NO_ERR;
+}
+
+/**
+ * Returns the number of threads used to compute the image processing functions.
+ * \param nb_threads the number of threads (returned)
+ * \return An error code (NO_ERR if successful)
+ */
+MB_errcode MB_GetThreadCount(Uint32 *nb_threads)
+{
+    *nb_threads = pool.nb_threads;
+    return NO_ERR;
+}
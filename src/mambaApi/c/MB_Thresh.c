@@ -111,6 +111,13 @@ static INLINE void THRESH_LINE_32_1(PLINE *plines_out, Uint32 linoff_out,
     }
 }
 
+/****************************************/
+/* Band functions                       */
+/****************************************/
+
+MB_BAND_FUNC_2PP(THRESH_BAND_8_1, THRESH_LINE_8_1, PIX8)
+MB_BAND_FUNC_2PP(THRESH_BAND_32_1, THRESH_LINE_32_1, PIX32)
+
 /**
  * Fills a binary image according to the following rules :
  * if pixel value lower than low or higher than high the binary pixel
@@ -123,9 +130,7 @@ static INLINE void THRESH_LINE_32_1(PLINE *plines_out, Uint32 linoff_out,
  */
 MB_errcode MB_Thresh(MB_Image *src, MB_Image *dest, Uint32 low, Uint32 high)
 {
-    Uint32 i;
-    PLINE *plines_in, *plines_out;
-    Uint32 linoff_out, linoff_in, bytes_in;
+    MB_LinesCtx ctx;
     
     /* verification over image size compatibility */
     if (!MB_CHECK_SIZE_2(src, dest)) {
@@ -138,27 +143,25 @@ MB_errcode MB_Thresh(MB_Image *src, MB_Image *dest, Uint32 low, Uint32 high)
     }
     
     /* Setting up line pointers */
-    plines_in = &src->PLINES[MB_Y_TOP(src)];
-    plines_out = &dest->PLINES[MB_Y_TOP(dest)];
-    linoff_in = MB_LINE_OFFSET(src);
-    linoff_out = MB_LINE_OFFSET(dest);
+    ctx.plines_in1 = &src->PLINES[MB_Y_TOP(src)];
+    ctx.plines_out = &dest->PLINES[MB_Y_TOP(dest)];
+    ctx.linoff_in1 = MB_LINE_OFFSET(src);
+    ctx.linoff_out = MB_LINE_OFFSET(dest);
     /* for this function the number of bytes is the number of */
     /* the binary image */
-    bytes_in = MB_LINE_COUNT(dest);
+    ctx.bytes_in = MB_LINE_COUNT(dest);
+    ctx.param1 = low;
+    ctx.param2 = high;
 
     /* The dest image is a binary */
     switch(MB_PROBE_PAIR(src,dest)) {
 
     case MB_PAIR_8_1:
-        for (i = 0; i < src->height; i++, plines_in++, plines_out++) {
-            THRESH_LINE_8_1(plines_out, linoff_out, plines_in, linoff_in, bytes_in, (PIX8) low, (PIX8) high);
-        }
+        MB_RunBands(THRESH_BAND_8_1, &ctx, src->height, ctx.bytes_in);
         break;
 
     case MB_PAIR_32_1:
-        for (i = 0; i < src->height; i++, plines_in++, plines_out++) {
-            THRESH_LINE_32_1(plines_out, linoff_out, plines_in, linoff_in, bytes_in, (PIX32) low, (PIX32) high);
-        }
+        MB_RunBands(THRESH_BAND_32_1, &ctx, src->height, ctx.bytes_in);
         break;
 
     default:
@@ -56,11 +56,11 @@
 #define IS_PIXEL(pixel, status) (((*pixel)&0xFF000000)==status)
 
 /** typedef for the definition of neighbor function arguments */
-typedef MB_Token (TSWITCHEP) (void *ctx, int x, int y);
+typedef void (TSWITCHEP) (void *ctx, int x, int y);
 
 /** Structure holding the function contextual information 
  * such as the size of the processed image, the pointer to the pixel lines,
- * the array of tokens and the current flooding level
+ * the hierarchical queue and the current flooding level
  */
 typedef struct {
     /** The width of the processed images */
@@ -68,16 +68,17 @@ typedef struct {
     /** The height of the processed images */
     Uint32 height;
     
-    /** The memory used to hold the elements of the hierarchical list */
-    MB_Token *TokensArray;
-    /** The hierarchical list entries for watershed segmentation */
-    MB_ListControl HierarchicalList[256];
+    /** The hierarchical queue for watershed segmentation */
+    MB_HQueue hq;
     /**
-     * List of pixels that will be inserted into the hierarchical list if the
-     * the parent pixel (their neighbor which is currently processed) is
-     * tagged 
+     * Pixels (positions in x and y) that will be inserted into the
+     * hierarchical list if the parent pixel (their neighbor which is
+     * currently processed) is tagged 
      */
-    MB_ListControl toreinsertList;
+    int toreinsertx[8];
+    int toreinserty[8];
+    /** Number of pixels to reinsert */
+    Uint32 nb_toreinsert;
     
     /** pointer to the lines of the marker image */
     PLINE *plines_marker;
@@ -87,8 +88,6 @@ typedef struct {
     PLINE *plines_src;
     /** offset in the source image lines */
     Uint32 linoff_src;
-    /** size in byte of the marker image lines */
-    Uint32 bytes_marker;
     
     /** Variable indicating which level in the hierarchical list
      * the "water" has attained. Only this level and above can be filled with new
@@ -105,7 +104,7 @@ typedef struct {
  ****************************************/
 
 /**
- * Inserts a token in the hierarchical list
+ * Inserts a pixel in the hierarchical list
  * \param local_ctx pointer to the structure holding all the information needed 
  * by the algorithm
  * \param x the position in x of the concerned pixel
@@ -114,39 +113,13 @@ typedef struct {
  */
 static INLINE void MB_InsertInHierarchicalList(MB_Watershed_Ctx *local_ctx, int x, int y, PIX8 value)
 {
-    int position;
     PIX32 *p;
-    int lx, ly;
-    
-    /* the token corresponding to the pixel process is */
-    /* updated/created. */
-    position = x + y*local_ctx->width;
-    local_ctx->TokensArray[position].nextx = MB_LIST_END;
-    local_ctx->TokensArray[position].nexty = MB_LIST_END;
     
     /* insertion in the hierarchical list */
     /* the value is normed as we do not want to process */
     /* already flooded level */
     value = (value < (local_ctx->current_water_level)) ? (local_ctx->current_water_level) : value;
-    
-    /* the token is inserted after the last value in the list */
-    lx = local_ctx->HierarchicalList[value].lastx;
-    ly = local_ctx->HierarchicalList[value].lasty;
-    position = lx+ly*local_ctx->width;
-    if (position>=0) {
-        /*There is a last value, the list is not empty*/
-        local_ctx->TokensArray[position].nextx = x;
-        local_ctx->TokensArray[position].nexty = y;
-        local_ctx->HierarchicalList[value].lastx = x;
-        local_ctx->HierarchicalList[value].lasty = y;
-    }
-    else {
-        /* The list is empty, so we create it.*/
-        local_ctx->HierarchicalList[value].firstx = x;
-        local_ctx->HierarchicalList[value].firsty = y;
-        local_ctx->HierarchicalList[value].lastx = x;
-        local_ctx->HierarchicalList[value].lasty = y;
-    }
+    MB_HQ_Push(&local_ctx->hq, value, x + y*local_ctx->width);
     
     /* The marker image is updated with the tag value in the pixel position */
     p = (PIX32 *) (local_ctx->plines_marker[y] + local_ctx->linoff_marker + x*4);
@@ -163,19 +136,16 @@ static INLINE void MB_HierarchyInit(MB_Watershed_Ctx *local_ctx)
     Uint32 i,j;
     PIX32 *p;
     
-    /*All the control are reset */
-    for(i=0;i<256;i++) {
-        local_ctx->HierarchicalList[i].firstx = local_ctx->HierarchicalList[i].lastx = MB_LIST_END;
-        local_ctx->HierarchicalList[i].firsty = local_ctx->HierarchicalList[i].lasty = MB_LIST_END;
-    }
+    /*All the lists are emptied */
+    MB_HQ_Reset(&local_ctx->hq);
      
     /* The first marker are inserted inside the hierarchical list */
     local_ctx->current_water_level = 0;
     for(i=0; i<local_ctx->height; i++) {
-        for(j=0; j<local_ctx->bytes_marker; j+=4) {
-            p = (PIX32 *) (local_ctx->plines_marker[i] + local_ctx->linoff_marker + j);
+        p = (PIX32 *) (local_ctx->plines_marker[i] + local_ctx->linoff_marker);
+        for(j=0; j<local_ctx->width; j++, p++) {
             if (READ_LABEL(p)!=0) {
-                MB_InsertInHierarchicalList(local_ctx,j/4,i,0);
+                MB_InsertInHierarchicalList(local_ctx,j,i,0);
             } else {
                 *p = CANDIDATE;
             }
@@ -194,8 +164,7 @@ static INLINE void MB_HierarchyInit(MB_Watershed_Ctx *local_ctx)
  */
 static INLINE void MB_ClearReinsertList(MB_Watershed_Ctx *local_ctx)
 {
-    local_ctx->toreinsertList.firstx = local_ctx->toreinsertList.lastx = MB_LIST_END;
-    local_ctx->toreinsertList.firsty = local_ctx->toreinsertList.lasty = MB_LIST_END;
+    local_ctx->nb_toreinsert = 0;
 }
 
 /**
@@ -207,33 +176,9 @@ static INLINE void MB_ClearReinsertList(MB_Watershed_Ctx *local_ctx)
  */
 static INLINE void MB_InsertInReinsertList(MB_Watershed_Ctx *local_ctx, int x, int y)
 {
-    int position;
-    int lx, ly;
-    
-    /* the token corresponding to the pixel process is */
-    /* updated/created. */
-    position = x + y*local_ctx->width;
-    local_ctx->TokensArray[position].nextx = MB_LIST_END;
-    local_ctx->TokensArray[position].nexty = MB_LIST_END;
-    
-    /* the token is inserted after the last value in the list */
-    lx = local_ctx->toreinsertList.lastx;
-    ly = local_ctx->toreinsertList.lasty;
-    position = lx+ly*local_ctx->width;
-    if (position>=0) {
-        /*There is a last value, the list is not empty*/
-        local_ctx->TokensArray[position].nextx = x;
-        local_ctx->TokensArray[position].nexty = y;
-        local_ctx->toreinsertList.lastx = x;
-        local_ctx->toreinsertList.lasty = y;
-    }
-    else {
-        /* The list is empty, so we create it.*/
-        local_ctx->toreinsertList.firstx = x;
-        local_ctx->toreinsertList.firsty = y;
-        local_ctx->toreinsertList.lastx = x;
-        local_ctx->toreinsertList.lasty = y;
-    }
+    local_ctx->toreinsertx[local_ctx->nb_toreinsert] = x;
+    local_ctx->toreinserty[local_ctx->nb_toreinsert] = y;
+    local_ctx->nb_toreinsert++;
 }
 
 /**
@@ -244,22 +189,16 @@ static INLINE void MB_InsertInReinsertList(MB_Watershed_Ctx *local_ctx, int x, i
  */
 static INLINE void MB_ReinsertFromList(MB_Watershed_Ctx *local_ctx)
 {
-    int x,y,pos;
-    MB_Token next_token;
+    Uint32 i;
+    int x,y;
     PIX8 value;
 
-    x = local_ctx->toreinsertList.firstx;
-    y = local_ctx->toreinsertList.firsty;
-    while(x>=0) {
-        /* The next token is evaluated first since reinsertion will destroy the info */
-        pos = x+y*local_ctx->width;
-        next_token = local_ctx->TokensArray[pos];
+    for(i=0; i<local_ctx->nb_toreinsert; i++) {
+        x = local_ctx->toreinsertx[i];
+        y = local_ctx->toreinserty[i];
         /* the pixel is inserted into the hierarchical list */
         value = *(local_ctx->plines_src[y] + local_ctx->linoff_src + x);
         MB_InsertInHierarchicalList(local_ctx, x, y, value);
-        /* the next pixel is extracted */
-        x = next_token.nextx;
-        y = next_token.nexty;
     }
 }
 
@@ -288,14 +227,12 @@ const int hxNbDir[2][7][2] = {
  * by the algorithm
  * \param x the x position of the pixel processed
  * \param y the x position of the pixel processed
- *
- * \return the function return the next token (pixel) that must be process
  */
-static MB_Token MB_InsertNeighbors_square(void *ctx, int x, int y)
+static void MB_InsertNeighbors_square(void *ctx, int x, int y)
 {
     Uint32 neighbor;
     PIX32 *p, *pix, tag;
-    int nbx,nby,pos;
+    int nbx,nby;
     MB_Watershed_Ctx *local_ctx = (MB_Watershed_Ctx *) ctx;
     
     /* the tag value is the value of the marker image in x,y */
@@ -350,10 +287,6 @@ static MB_Token MB_InsertNeighbors_square(void *ctx, int x, int y)
     if( !IS_PIXEL(pix, WTS_LAB) ) {
         MB_ReinsertFromList(local_ctx);
     }
-
-    /* what is the next token to process */
-    pos = x+y*local_ctx->width;
-    return local_ctx->TokensArray[pos];
 }
 
 /**
@@ -366,11 +299,11 @@ static MB_Token MB_InsertNeighbors_square(void *ctx, int x, int y)
  * \param x the x position of the pixel processed
  * \param y the x position of the pixel processed
  */
-static MB_Token MB_InsertNeighbors_hexagonal(void *ctx, int x, int y)
+static void MB_InsertNeighbors_hexagonal(void *ctx, int x, int y)
 {
     Uint32 neighbor;
     PIX32 *p, *pix, tag;
-    int nbx,nby,pos;
+    int nbx,nby;
     MB_Watershed_Ctx *local_ctx = (MB_Watershed_Ctx *) ctx;
     
     /* the tag value is the value of the marker image in x,y */
@@ -425,10 +358,6 @@ static MB_Token MB_InsertNeighbors_hexagonal(void *ctx, int x, int y)
     if( !IS_PIXEL(pix, WTS_LAB) ) {
         MB_ReinsertFromList(local_ctx);
     }
-
-    /* what is the next token to process */
-    pos = x+y*local_ctx->width;
-    return local_ctx->TokensArray[pos];
 }
 
 /****************************************
@@ -436,7 +365,7 @@ static MB_Token MB_InsertNeighbors_hexagonal(void *ctx, int x, int y)
  ****************************************/
  
 /**
- * Simulates the flooding process using the hierarchical list. Tokens are
+ * Simulates the flooding process using the hierarchical list. Pixels are
  * extracted out of the current water level list and processed. The process consists
  * in inserting in the list all its neighbors that are not already processed.
  * \param local_ctx pointer to the structure holding all the information needed 
@@ -445,17 +374,13 @@ static MB_Token MB_InsertNeighbors_hexagonal(void *ctx, int x, int y)
  */
 static INLINE void MB_Flooding(MB_Watershed_Ctx *local_ctx, Uint32 max_level)
 {
-    Uint32 i;
-    int fx,fy;
-    MB_Token next_token;
+    Uint32 i, pos;
     
     for(i=0; i<max_level; i++, local_ctx->current_water_level++) {
-        fx = local_ctx->HierarchicalList[local_ctx->current_water_level].firstx;
-        fy = local_ctx->HierarchicalList[local_ctx->current_water_level].firsty;
-        while(fx>=0) {
-            next_token = local_ctx->InsertNeighbors(local_ctx,fx,fy);
-            fx = next_token.nextx;
-            fy = next_token.nexty;
+        pos = local_ctx->hq.first[local_ctx->current_water_level];
+        while(pos!=MB_HQ_END) {
+            local_ctx->InsertNeighbors(local_ctx, pos%local_ctx->width, pos/local_ctx->width);
+            pos = local_ctx->hq.next[pos];
         }
     }
 }
@@ -474,8 +399,8 @@ static INLINE void MB_ControlPass(MB_Watershed_Ctx *local_ctx)
     
     /* All the pixels are checked */
     for(i=0; i<local_ctx->height; i++) {
-        for(j=0; j<local_ctx->bytes_marker; j+=4) {
-            p = (PIX32 *) (local_ctx->plines_marker[i] + local_ctx->linoff_marker + j);
+        p = (PIX32 *) (local_ctx->plines_marker[i] + local_ctx->linoff_marker);
+        for(j=0; j<local_ctx->width; j++, p++) {
             switch ((*p)&0xFF000000) {
             case CANDIDATE:
                 /* Untagged pixel */
@@ -541,11 +466,10 @@ MB_errcode MB_Watershed(MB_Image *src, MB_Image *marker, Uint32 max_level, enum
     local_ctx.plines_marker = &marker->PLINES[MB_Y_TOP(marker)];
     local_ctx.linoff_src  = MB_LINE_OFFSET(src);
     local_ctx.linoff_marker = MB_LINE_OFFSET(marker);
-    local_ctx.bytes_marker = MB_LINE_COUNT(marker);
     
-    /* Allocating the token array */
-    local_ctx.TokensArray = MB_malloc(src->width*src->height*sizeof(MB_Token));
-    if(local_ctx.TokensArray==NULL){
+    /* Allocating the hierarchical queue (one element per pixel) */
+    local_ctx.hq.next = MB_malloc(src->width*src->height*sizeof(Uint32));
+    if(local_ctx.hq.next==NULL){
         /* in case allocation goes wrong */
         return ERR_CANT_ALLOCATE_MEMORY;
     } 
@@ -567,8 +491,8 @@ MB_errcode MB_Watershed(MB_Image *src, MB_Image *marker, Uint32 max_level, enum
     if (max_level==256) 
         MB_ControlPass(&local_ctx);
     
-    /* freeing the token array */
-    MB_free(local_ctx.TokensArray);
+    /* freeing the hierarchical queue */
+    MB_free(local_ctx.hq.next);
     
     return NO_ERR;
 }
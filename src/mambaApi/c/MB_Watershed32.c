@@ -0,0 +1,614 @@
+/**
+ * \file MB_Watershed32.c
+ * \date 10-17-2026
+ *
+ */
+
+
+/*
+ * Copyright (c) <2009>, <Nicolas BEUCHER and ARMINES for the Centre de
+ * Morphologie Mathématique(CMM), common research center to ARMINES and MINES
+ * Paristech>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish,
+ * distribute, sublicense, and/or sell copies of the Software, and to permit
+ * persons to whom the Software is furnished to do so, subject to the following
+ * conditions: The above copyright notice and this permission notice shall be
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright
+ * holders shall not be used in advertising or otherwise to promote the sale,
+ * use or other dealings in this Software without their prior written
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+
+/*
+ * This file contains the watershed segmentation (MB_Watershed32) and the
+ * catchment basins segmentation (MB_Basins32) of the 32-bit images. They
+ * flood the image exactly as MB_Watershed and MB_Basins do with the 8-bit
+ * images, but the hierarchical list holds one entry per distinct value of
+ * the image instead of one entry per possible value.
+ *
+ * MB_WatershedLabels32 and MB_BasinsLabels32 perform the same floodings of
+ * 8-bit or 32-bit images with labels using the 32 bits of the marker image
+ * (the other functions keep the last byte for the watershed line and thus
+ * are limited to 2^24 labels).
+ *
+ * The values of the image are first replaced by their rank among the
+ * distinct values (the pixels are sorted by a radix sort, the passes over the
+ * bytes which are equal in all the pixels being skipped). The flooding then
+ * goes through the ranks in increasing order. Thus the computation time only
+ * depends on the number of pixels and not on the range of the values.
+ *
+ * The labels of the marker image are copied into a buffer surrounded by a
+ * border of one pixel. The status of the pixels is not stored with the labels
+ * (as in MB_Watershed.c) but in a separate array of the same layout holding
+ * one byte per pixel. The border status is QUEUED, so that the neighbors of a
+ * pixel are always inside the buffers and the border is never flooded. The
+ * status of the neighbors is read in this array, which is 4 times smaller
+ * than the labels, and the label of a neighbor is only read when it is
+ * already labelled. The basins flooding does not use the status: the
+ * candidates are the pixels whose label is still 0 (the border has a non
+ * zero label).
+ */
+
+/* The status of the pixels (in the status array) */
+/** Candidates : pixels not yet introduced in the HQ */
+#define CANDIDATE 0
+/** Queued : pixels in the HQ not yet sorted out */
+#define QUEUED 1
+/** RG_Labelled : pixels that were processed and do not belong to the watershed */
+#define RG_LAB 2
+/** WTS_Labelled : pixels that were processed and do belong to the watershed */
+#define WTS_LAB 3
+
+/* When the basins flooding is over, the pixels left in the hierarchical list
+ * are tagged as follows (the status of the other pixels is not used) */
+/** Pending : pixels labelled but not processed */
+#define PENDING 2
+/** Markers not processed */
+#define MARKER 3
+
+/** Label part of a marker value (labels limited to 24 bits) */
+#define LABEL_MASK 0x00FFFFFF
+/** Status byte of the watershed line in the 24-bit labels results */
+#define WTS_BYTE 0xFF000000
+
+/** Value used to specify the end of a list of positions */
+#define MB_POS_END 0xFFFFFFFF
+/** Label of the border (never flooded by the basins) */
+#define BORDER_LABEL 0xFFFFFFFF
+
+/** Context of the segmentation */
+typedef struct {
+    /** size of the images */
+    Uint32 width;
+    Uint32 height;
+    /** number of values in a line of the buffers (border included) */
+    Uint32 stride;
+    /** the labels of the marker with their border */
+    Uint32 *marker;
+    /** the status of the pixels with their border */
+    PIX8 *status;
+    /** the bits of the marker values holding the labels */
+    Uint32 label_mask;
+    /** the rank of the value of each pixel in the source image */
+    Uint32 *level;
+    /** the next position in the list of each queued pixel */
+    Uint32 *next;
+    /** first and last positions of the list of each level */
+    Uint32 *first;
+    Uint32 *last;
+    /** number of distinct values in the source image */
+    Uint32 nb_levels;
+    /** number of levels flooded (levels under max_level) */
+    Uint32 nb_flooded;
+    /** the level reached by the water */
+    Uint32 current_level;
+    /** offsets of the neighbors in the buffers for the even and odd lines */
+    int offsets[2][8];
+    /** number of neighbors */
+    Uint32 nb;
+    /** 1 if the neighbors depend on the line (hexagonal grid) */
+    Uint32 hexagonal;
+} MB_Watershed32_Ctx;
+
+/****************************************/
+/* Levels                               */
+/****************************************/
+
+/*
+ * Sorts the 'n' positions of 'pos' according to the values of 'key' with a
+ * radix sort (8 bits per pass). 'tmp' is a work array of 'n' positions.
+ * Returns the array holding the sorted positions ('pos' or 'tmp').
+ */
+static Uint32 *MB_SortPositions(Uint32 *key, Uint32 *pos, Uint32 *tmp, Uint32 n)
+{
+    Uint32 count[4][256];
+    Uint32 i, b, sum, c, shift;
+    Uint32 *swap;
+
+    /* the histograms of the four bytes are computed in a single pass */
+    MB_memset(count, 0, sizeof(count));
+    for (i = 0; i < n; i++) {
+        c = key[pos[i]];
+        count[0][c&0xff]++;
+        count[1][(c>>8)&0xff]++;
+        count[2][(c>>16)&0xff]++;
+        count[3][c>>24]++;
+    }
+
+    for (b = 0, shift = 0; b < 4; b++, shift += 8) {
+        /* the byte is the same in all the pixels, nothing to sort */
+        if (count[b][(key[pos[0]]>>shift)&0xff]==n)
+            continue;
+        for (i = 0, sum = 0; i < 256; i++) {
+            c = count[b][i];
+            count[b][i] = sum;
+            sum += c;
+        }
+        for (i = 0; i < n; i++)
+            tmp[count[b][(key[pos[i]]>>shift)&0xff]++] = pos[i];
+        swap = pos;
+        pos = tmp;
+        tmp = swap;
+    }
+
+    return pos;
+}
+
+/*
+ * Replaces the values of the level buffer by their rank among the distinct
+ * values of the image. Returns 0 if the memory is lacking.
+ */
+static int MB_RankLevels(MB_Watershed32_Ctx *ctx, Uint32 max_level)
+{
+    Uint32 *pos, *sorted;
+    Uint32 n, x, y, i, v, prev, rank, full;
+
+    n = ctx->width*ctx->height;
+    pos = (Uint32 *) MB_malloc(n*sizeof(Uint32));
+    if (pos==NULL)
+        return 0;
+    for (y = 0, i = 0; y < ctx->height; y++) {
+        for (x = 0; x < ctx->width; x++)
+            pos[i++] = (y+1)*ctx->stride + x+1;
+    }
+
+    /* the next buffer is not used yet and serves as work array */
+    sorted = MB_SortPositions(ctx->level, pos, ctx->next, n);
+
+    /* the maximum of the image is the last value */
+    full = (max_level==0xFFFFFFFF) || (max_level>ctx->level[sorted[n-1]]);
+    rank = 0;
+    prev = ctx->level[sorted[0]];
+    ctx->nb_flooded = 0;
+    for (i = 0; i < n; i++) {
+        v = ctx->level[sorted[i]];
+        if (v!=prev) {
+            rank++;
+            prev = v;
+        }
+        if (v<max_level)
+            ctx->nb_flooded = rank+1;
+        ctx->level[sorted[i]] = rank;
+    }
+    ctx->nb_levels = rank+1;
+    if (full)
+        ctx->nb_flooded = ctx->nb_levels;
+
+    MB_free(pos);
+    return 1;
+}
+
+/****************************************/
+/* Hierarchical list                    */
+/****************************************/
+
+/*
+ * Inserts the pixel at position 'p' in the list of its level (or in the
+ * list of the current level if its level is already flooded).
+ */
+static INLINE void MB_InsertLevel(MB_Watershed32_Ctx *ctx, Uint32 p, Uint32 level)
+{
+    level = (level<ctx->current_level) ? ctx->current_level : level;
+    ctx->next[p] = MB_POS_END;
+    if (ctx->last[level]!=MB_POS_END)
+        ctx->next[ctx->last[level]] = p;
+    else
+        ctx->first[level] = p;
+    ctx->last[level] = p;
+}
+
+/*
+ * Inserts the markers in the list of the first level and tags them as
+ * queued. The other pixels are candidates.
+ */
+static void MB_InitLevels(MB_Watershed32_Ctx *ctx)
+{
+    Uint32 x, y, p;
+
+    MB_memset(ctx->first, 0xFF, ctx->nb_levels*sizeof(Uint32));
+    MB_memset(ctx->last, 0xFF, ctx->nb_levels*sizeof(Uint32));
+    ctx->current_level = 0;
+    for (y = 0; y < ctx->height; y++) {
+        p = (y+1)*ctx->stride + 1;
+        for (x = 0; x < ctx->width; x++, p++) {
+            ctx->marker[p] &= ctx->label_mask;
+            if (ctx->marker[p]!=0) {
+                MB_InsertLevel(ctx, p, 0);
+                ctx->status[p] = QUEUED;
+            }
+        }
+    }
+}
+
+/****************************************/
+/* Flooding                             */
+/****************************************/
+
+/*
+ * Processes a pixel of the watershed flooding. The pixel takes the label of
+ * its processed neighbors or belongs to the watershed line if they have
+ * different labels. In the first case, its candidate neighbors are queued.
+ */
+static INLINE void MB_FloodWatershed(MB_Watershed32_Ctx *ctx, Uint32 p)
+{
+    Uint32 *M = ctx->marker;
+    PIX8 *S = ctx->status;
+    Uint32 candidates[8];
+    Uint32 k, q, label, status, ncand;
+    int *off;
+
+    off = ctx->offsets[ctx->hexagonal ? ((p/ctx->stride-1)&1) : 0];
+    label = M[p];
+    status = RG_LAB;
+    ncand = 0;
+    for (k = 0; k < ctx->nb; k++) {
+        q = p+off[k];
+        switch (S[q]) {
+        case CANDIDATE:
+            candidates[ncand++] = q;
+            break;
+        case RG_LAB:
+            if (label==0)
+                label = M[q];
+            else if (label!=M[q])
+                status = WTS_LAB;
+            break;
+        default:
+            break;
+        }
+    }
+    M[p] = label;
+    S[p] = status;
+
+    if (status==RG_LAB) {
+        for (k = 0; k < ncand; k++) {
+            q = candidates[k];
+            MB_InsertLevel(ctx, q, ctx->level[q]);
+            S[q] = QUEUED;
+        }
+    }
+}
+
+/*
+ * Processes a pixel of the basins flooding. Its candidate neighbors take its
+ * label and are queued.
+ */
+static INLINE void MB_FloodBasins(MB_Watershed32_Ctx *ctx, Uint32 p)
+{
+    Uint32 *M = ctx->marker;
+    Uint32 k, q, label;
+    int *off;
+
+    off = ctx->offsets[ctx->hexagonal ? ((p/ctx->stride-1)&1) : 0];
+    label = M[p];
+    for (k = 0; k < ctx->nb; k++) {
+        q = p+off[k];
+        if (M[q]==0) {
+            MB_InsertLevel(ctx, q, ctx->level[q]);
+            M[q] = label;
+        }
+    }
+}
+
+/*
+ * Floods the levels under max_level, the pixels of each level being processed
+ * in their order of insertion. Returns 0 if the memory is lacking.
+ */
+static int MB_Flood(MB_Watershed32_Ctx *ctx, Uint32 watershed)
+{
+    Uint32 p, l;
+
+    /* the hierarchical list has one entry per distinct value */
+    ctx->first = (Uint32 *) MB_malloc(ctx->nb_levels*sizeof(Uint32));
+    ctx->last = (Uint32 *) MB_malloc(ctx->nb_levels*sizeof(Uint32));
+    if (ctx->first==NULL || ctx->last==NULL) {
+        MB_free(ctx->first);
+        MB_free(ctx->last);
+        return 0;
+    }
+
+    MB_InitLevels(ctx);
+    for (; ctx->current_level < ctx->nb_flooded; ctx->current_level++) {
+        p = ctx->first[ctx->current_level];
+        while (p!=MB_POS_END) {
+            if (watershed)
+                MB_FloodWatershed(ctx, p);
+            else
+                MB_FloodBasins(ctx, p);
+            p = ctx->next[p];
+        }
+    }
+
+    /* basins : the pixels left in the list were not processed, those of */
+    /* the first level are markers (nothing was flooded) */
+    if (!watershed) {
+        for (l = ctx->current_level; l < ctx->nb_levels; l++) {
+            for (p = ctx->first[l]; p!=MB_POS_END; p = ctx->next[p])
+                ctx->status[p] = (l==0) ? MARKER : PENDING;
+        }
+    }
+
+    MB_free(ctx->first);
+    MB_free(ctx->last);
+    return 1;
+}
+
+/************************************************/
+/*High level function                           */
+/************************************************/
+
+/*
+ * Writes the line y of the result into the marker image. With the 24-bit
+ * labels ('labels32' is 0), the last byte holds the status as in MB_Watershed
+ * and MB_Basins. With the 32-bit labels, the pixels which are not labelled
+ * (watershed line, pixels not reached) are set to 0. The markers which were
+ * not processed (basins) are left untouched.
+ */
+static INLINE void MB_WriteLine(MB_Watershed32_Ctx *ctx, Uint32 *pout, Uint32 y,
+                                Uint32 watershed, Uint32 labels32)
+{
+    Uint32 x, p;
+
+    p = (y+1)*ctx->stride + 1;
+    for (x = 0; x < ctx->width; x++, p++, pout++) {
+        if (watershed) {
+            switch (ctx->status[p]) {
+            case CANDIDATE:
+                *pout = labels32 ? 0 : 0x01000000;
+                break;
+            case QUEUED:
+                *pout = labels32 ? ctx->marker[p] : (ctx->marker[p] | 0x02000000);
+                break;
+            case RG_LAB:
+                *pout = ctx->marker[p];
+                break;
+            default:
+                *pout = labels32 ? 0 : (ctx->marker[p] | WTS_BYTE);
+                break;
+            }
+        } else {
+            switch (ctx->status[p]) {
+            case PENDING:
+                *pout = labels32 ? ctx->marker[p] : (ctx->marker[p] | 0x01000000);
+                break;
+            case MARKER:
+                break;
+            default:
+                /* other pixels, the candidates have the label 0 */
+                if (labels32 || ctx->marker[p]!=0)
+                    *pout = ctx->marker[p];
+                else
+                    *pout = 0x01000000;
+                break;
+            }
+        }
+    }
+}
+
+/*
+ * Segments the 8-bit or 32-bit image src using the marker image (watershed
+ * line if watershed is 1, catchment basins only otherwise). The labels use
+ * the 32 bits of the marker image if labels32 is 1 and the 24 first bits
+ * otherwise.
+ */
+static MB_errcode MB_Segment32(MB_Image *src, MB_Image *marker, Uint32 max_level,
+                               enum MB_grid_t grid, Uint32 watershed, Uint32 labels32)
+{
+    MB_Watershed32_Ctx ctx;
+    PLINE *plines_src, *plines_marker;
+    Uint32 *pin;
+    PIX8 *pin8;
+    Uint32 x, y, i, p, size;
+    MB_errcode err = NO_ERR;
+
+    /* verification over depth and size */
+    if (!MB_CHECK_SIZE_2(src, marker)) {
+        return ERR_BAD_SIZE;
+    }
+
+    /* the marker image is 32-bit, the source image is 32-bit */
+    /* (or 8-bit with the 32-bit labels) */
+    switch (MB_PROBE_PAIR(src, marker)) {
+    case MB_PAIR_32_32:
+        break;
+    case MB_PAIR_8_32:
+        if (labels32)
+            break;
+        return ERR_BAD_DEPTH;
+    default:
+        return ERR_BAD_DEPTH;
+    }
+
+    ctx.width = src->width;
+    ctx.height = src->height;
+    ctx.stride = ctx.width+2;
+    ctx.label_mask = labels32 ? 0xFFFFFFFF : LABEL_MASK;
+    ctx.hexagonal = (grid!=MB_SQUARE_GRID);
+    ctx.nb = ctx.hexagonal ? 6 : 8;
+    for (i = 1; i <= ctx.nb; i++) {
+        for (p = 0; p < 2; p++) {
+            ctx.offsets[p][i-1] = ctx.hexagonal ?
+                hxNbDir[p][i][0] + hxNbDir[p][i][1]*((int) ctx.stride) :
+                sqNbDir[i][0] + sqNbDir[i][1]*((int) ctx.stride);
+        }
+    }
+
+    /* allocating the buffers */
+    size = ctx.stride*(ctx.height+2);
+    ctx.marker = (Uint32 *) MB_malloc(size*sizeof(Uint32));
+    ctx.level = (Uint32 *) MB_malloc(size*sizeof(Uint32));
+    ctx.next = (Uint32 *) MB_malloc(size*sizeof(Uint32));
+    ctx.status = (PIX8 *) MB_malloc(size);
+    if (ctx.marker==NULL || ctx.level==NULL || ctx.next==NULL || ctx.status==NULL) {
+        MB_free(ctx.marker);
+        MB_free(ctx.level);
+        MB_free(ctx.next);
+        MB_free(ctx.status);
+        return ERR_CANT_ALLOCATE_MEMORY;
+    }
+
+    /* all the pixels are candidates but the border which is never flooded */
+    MB_memset(ctx.status, CANDIDATE, size);
+    for (i = 0; i < ctx.stride; i++) {
+        ctx.status[i] = QUEUED;
+        ctx.status[(ctx.height+1)*ctx.stride+i] = QUEUED;
+        ctx.marker[i] = BORDER_LABEL;
+        ctx.marker[(ctx.height+1)*ctx.stride+i] = BORDER_LABEL;
+    }
+
+    /* reading the images */
+    plines_src = &src->PLINES[MB_Y_TOP(src)];
+    plines_marker = &marker->PLINES[MB_Y_TOP(marker)];
+    for (y = 0; y < ctx.height; y++) {
+        p = (y+1)*ctx.stride;
+        ctx.status[p] = QUEUED;
+        ctx.status[p+ctx.stride-1] = QUEUED;
+        ctx.marker[p] = ctx.marker[p+ctx.stride-1] = BORDER_LABEL;
+        if (src->depth==8) {
+            pin8 = (PIX8 *) (plines_src[y] + MB_LINE_OFFSET(src));
+            for (x = 0; x < ctx.width; x++)
+                ctx.level[p+1+x] = pin8[x];
+        } else {
+            pin = (Uint32 *) (plines_src[y] + MB_LINE_OFFSET(src));
+            MB_memcpy(ctx.level+p+1, pin, ctx.width*sizeof(Uint32));
+        }
+        pin = (Uint32 *) (plines_marker[y] + MB_LINE_OFFSET(marker));
+        MB_memcpy(ctx.marker+p+1, pin, ctx.width*sizeof(Uint32));
+    }
+
+    /* actual flooding of the ranked levels */
+    if (MB_RankLevels(&ctx, max_level) && MB_Flood(&ctx, watershed)) {
+        /* writing the result, the pixels not reached when all the levels */
+        /* were flooded are surrounded by the watershed line and belong to it */
+        for (y = 0; y < ctx.height; y++) {
+            if (watershed && ctx.nb_flooded==ctx.nb_levels) {
+                p = (y+1)*ctx.stride + 1;
+                for (x = 0; x < ctx.width; x++) {
+                    if (ctx.status[p+x]==CANDIDATE)
+                        ctx.status[p+x] = WTS_LAB;
+                }
+            }
+            pin = (Uint32 *) (plines_marker[y] + MB_LINE_OFFSET(marker));
+            MB_WriteLine(&ctx, pin, y, watershed, labels32);
+        }
+    } else {
+        err = ERR_CANT_ALLOCATE_MEMORY;
+    }
+
+    MB_free(ctx.marker);
+    MB_free(ctx.level);
+    MB_free(ctx.next);
+    MB_free(ctx.status);
+
+    return err;
+}
+
+/**
+ * Performs a watershed segmentation of the 32-bit image using the marker
+ * image as a starting point for the flooding. The function is the equivalent
+ * of MB_Watershed for 32-bit images: the result is coded in the same way into
+ * the 32-bit marker image (label in the three first bytes, 255 in the last
+ * byte for the pixels of the watershed line).
+ *
+ * The hierarchical list holds one entry per distinct value of the image, thus
+ * the computation time does not depend on the range of the values.
+ *
+ * \param src the 32-bit image to segment
+ * \param marker the marker image in which the result of segmentation will be put
+ * \param max_level the water floods the values strictly below this level
+ * (0xFFFFFFFF or a level above the maximum of src floods the whole image)
+ * \param grid the grid used (either square or hexagonal)
+ * \return An error code (NO_ERR if successful)
+ */
+MB_errcode MB_Watershed32(MB_Image *src, MB_Image *marker, Uint32 max_level, enum MB_grid_t grid) {
+    return MB_Segment32(src, marker, max_level, grid, 1, 0);
+}
+
+/**
+ * Performs a watershed segmentation of the 32-bit image using the marker
+ * image as a starting point for the flooding and returns the catchment basins
+ * only. The function is the equivalent of MB_Basins for 32-bit images.
+ *
+ * \param src the 32-bit image to segment
+ * \param marker the marker image in which the result of segmentation will be put
+ * \param max_level the water floods the values strictly below this level
+ * (0xFFFFFFFF or a level above the maximum of src floods the whole image)
+ * \param grid the grid used (either square or hexagonal)
+ * \return An error code (NO_ERR if successful)
+ */
+MB_errcode MB_Basins32(MB_Image *src, MB_Image *marker, Uint32 max_level, enum MB_grid_t grid) {
+    return MB_Segment32(src, marker, max_level, grid, 0, 0);
+}
+
+/**
+ * Performs a watershed segmentation of the 8-bit or 32-bit image using the
+ * marker image as a starting point for the flooding. The labels of the marker
+ * image use its 32 bits, thus the number of labels is not limited to 2^24.
+ * As there is no room left for the watershed line, the pixels of the line
+ * are set to 0 in the result (as are the pixels not reached by the water
+ * when the flooding is limited by max_level). The other pixels take the
+ * label of their catchment basin.
+ *
+ * \param src the 8-bit or 32-bit image to segment
+ * \param marker the marker image in which the result of segmentation will be put
+ * \param max_level the water floods the values strictly below this level
+ * (0xFFFFFFFF or a level above the maximum of src floods the whole image)
+ * \param grid the grid used (either square or hexagonal)
+ * \return An error code (NO_ERR if successful)
+ */
+MB_errcode MB_WatershedLabels32(MB_Image *src, MB_Image *marker, Uint32 max_level, enum MB_grid_t grid) {
+    return MB_Segment32(src, marker, max_level, grid, 1, 1);
+}
+
+/**
+ * Performs a watershed segmentation of the 8-bit or 32-bit image using the
+ * marker image as a starting point for the flooding and returns the catchment
+ * basins only. The labels of the marker image use its 32 bits, thus the number
+ * of labels is not limited to 2^24. The pixels not reached by the water are
+ * set to 0 in the result.
+ *
+ * \param src the 8-bit or 32-bit image to segment
+ * \param marker the marker image in which the result of segmentation will be put
+ * \param max_level the water floods the values strictly below this level
+ * (0xFFFFFFFF or a level above the maximum of src floods the whole image)
+ * \param grid the grid used (either square or hexagonal)
+ * \return An error code (NO_ERR if successful)
+ */
+MB_errcode MB_BasinsLabels32(MB_Image *src, MB_Image *marker, Uint32 max_level, enum MB_grid_t grid) {
+    return MB_Segment32(src, marker, max_level, grid, 0, 1);
+}
@@ -43,6 +43,7 @@
  * the library, The global header is meant for the outside world.
  */
 #include "mambaApi.h"
+#include "mambaHQueue.h"
 
 /* standard headers */
 #include <stdio.h>
@@ -51,10 +52,23 @@
 #include <stdint.h>
 #include <malloc.h>
 
-/* if SSE2 is available use it ! it's faster*/
-#ifdef __SSE2__
-#include <xmmintrin.h>
-#include <emmintrin.h>
+/* the SIMD instruction sets (SSE2, SSE4.1, AVX2, AVX-512) are compiled */
+/* function by function and only used when the processor supports them */
+#if (defined(__GNUC__) || defined(__clang__)) && (defined(__x86_64__) || defined(__i386__))
+    #define MB_SIMD_X86
+    #define MB_TARGET_SSE2 __attribute__((target("sse2")))
+    #define MB_TARGET_SSE41 __attribute__((target("sse4.1")))
+    #define MB_TARGET_AVX2 __attribute__((target("avx2")))
+    #define MB_TARGET_AVX512 __attribute__((target("avx512f,avx512bw")))
+#elif defined(_MSC_VER) && (defined(_M_X64) || defined(_M_IX86))
+    #define MB_SIMD_X86
+    #define MB_TARGET_SSE2
+    #define MB_TARGET_SSE41
+    #define MB_TARGET_AVX2
+    #define MB_TARGET_AVX512
+#endif
+#ifdef MB_SIMD_X86
+#include <immintrin.h>
 #endif
 
 /****************************************/
@@ -89,9 +103,6 @@
 #define BYTEPERWORD sizeof(binaryT)
 /**@endcond*/
 
-/** Value used to specify the end of a hierarchical list */
-#define MB_LIST_END -1
-
 /****************************************/
 /* Macros                               */
 /****************************************/
@@ -112,32 +123,167 @@
 /* Structures and Typedef               */
 /****************************************/
 
-/** 
- * Token used in hierarchical list.
- * A token gives its next (by position nextx, nexty in image) 
- * token in the list (-1 if the list ends).
+/**
+ * Context given to the band functions computing images line by line.
+ * It holds the line pointers of the images (up to two sources and one
+ * destination) and the parameters of the line function.
  */
 typedef struct {
-    /** next token (x) */
-    int nextx;
-    /** next token (y) */
-    int nexty;
-} MB_Token;
-
-/** 
- * List control structure that gives you the index
- * of the first and last elements of list.
+    /** pointer on the destination image first line */
+    PLINE *plines_out;
+    /** offset inside the destination image lines */
+    Uint32 linoff_out;
+    /** pointer on the source image 1 first line */
+    PLINE *plines_in1;
+    /** offset inside the source image 1 lines */
+    Uint32 linoff_in1;
+    /** pointer on the source image 2 first line */
+    PLINE *plines_in2;
+    /** offset inside the source image 2 lines */
+    Uint32 linoff_in2;
+    /** number of bytes inside the lines */
+    Uint32 bytes_in;
+    /** first parameter of the line function */
+    Uint32 param1;
+    /** second parameter of the line function */
+    Uint32 param2;
+    /** additional data for the line function (tables, ...) */
+    void *data;
+} MB_LinesCtx;
+
+/**
+ * Band function type. A band function computes the lines first to last-1
+ * of an image using the context ctx.
+ */
+typedef void (MB_BandFn) (void *ctx, Uint32 first, Uint32 last);
+
+/****************************************/
+/* Band functions                       */
+/****************************************/
+
+/** Defines the band function 'band' applying the line function 'line'
+ * to one destination and two source images */
+#define MB_BAND_FUNC_3(band, line) \
+static void band(void *ctx, Uint32 first, Uint32 last) \
+{ \
+    MB_LinesCtx *c = (MB_LinesCtx *) ctx; \
+    Uint32 i; \
+    for (i = first; i < last; i++) { \
+        line(c->plines_out+i, c->linoff_out, c->plines_in1+i, c->linoff_in1, \
+             c->plines_in2+i, c->linoff_in2, c->bytes_in); \
+    } \
+}
+
+/** Defines the band function 'band' applying the line function 'line'
+ * to one destination and one source images */
+#define MB_BAND_FUNC_2(band, line) \
+static void band(void *ctx, Uint32 first, Uint32 last) \
+{ \
+    MB_LinesCtx *c = (MB_LinesCtx *) ctx; \
+    Uint32 i; \
+    for (i = first; i < last; i++) { \
+        line(c->plines_out+i, c->linoff_out, c->plines_in1+i, c->linoff_in1, \
+             c->bytes_in); \
+    } \
+}
+
+/** Defines the band function 'band' applying the line function 'line'
+ * to one destination and one source images with one parameter of type T */
+#define MB_BAND_FUNC_2P(band, line, T) \
+static void band(void *ctx, Uint32 first, Uint32 last) \
+{ \
+    MB_LinesCtx *c = (MB_LinesCtx *) ctx; \
+    Uint32 i; \
+    for (i = first; i < last; i++) { \
+        line(c->plines_out+i, c->linoff_out, c->plines_in1+i, c->linoff_in1, \
+             c->bytes_in, (T) c->param1); \
+    } \
+}
+
+/** Defines the band function 'band' applying the line function 'line'
+ * to one destination and one source images with two parameters of type T */
+#define MB_BAND_FUNC_2PP(band, line, T) \
+static void band(void *ctx, Uint32 first, Uint32 last) \
+{ \
+    MB_LinesCtx *c = (MB_LinesCtx *) ctx; \
+    Uint32 i; \
+    for (i = first; i < last; i++) { \
+        line(c->plines_out+i, c->linoff_out, c->plines_in1+i, c->linoff_in1, \
+             c->bytes_in, (T) c->param1, (T) c->param2); \
+    } \
+}
+
+/**
+ * Copies of the lines read by the bands of an image outside of their own
+ * lines when the image is computed in place.
  */
 typedef struct {
-    /** first token of the list (x) */
-    int firstx;
-    /** first token of the list (y) */
-    int firsty;
-    /** last token of the list (x) */
-    int lastx;
-    /** last token of the list (y) */
-    int lasty;
-} MB_ListControl;
+    /** saved lines (NULL for lines which are not saved) */
+    PLINE *plines;
+    /** memory holding the saved lines */
+    PIX8 *pixarray;
+    /** number of lines of the image */
+    Uint32 nb_lines;
+    /** number of bytes saved in each line */
+    Uint32 line_size;
+} MB_Halo;
+
+/* Band execution (see MB_Thread.c) */
+Uint32 MB_BandStart(Uint32 band, Uint32 nb_bands, Uint32 nb_lines);
+Uint32 MB_BandCount(Uint32 nb_lines, Uint32 bytes_in);
+void MB_RunBandsN(MB_BandFn *fn, void *ctx, Uint32 nb_lines, Uint32 nb_bands);
+void MB_RunBands(MB_BandFn *fn, void *ctx, Uint32 nb_lines, Uint32 bytes_in);
+MB_errcode MB_CreateHalo(MB_Halo *halo, Uint32 nb_lines, Uint32 nb_bands, Sint32 dy, Uint32 line_size);
+void MB_UpdateHalo(MB_Halo *halo, PLINE *plines);
+void MB_DestroyHalo(MB_Halo *halo);
+
+/* LZ4 blocks (see MB_Lz4.c) */
+Uint32 MB_Lz4Compress(const PIX8 *src, Uint32 len, PIX8 *dst, Uint32 cap);
+MB_errcode MB_Lz4Decompress(const PIX8 *src, Uint32 len, PIX8 *dst, Uint32 size);
+
+/* Packed binary lines (see MB_LoadExtract.c) */
+void MB_BitsToWords(Uint32 *dst, const PIX8 *src, Uint32 nwords, Uint32 msbfirst);
+void MB_WordsToBits(PIX8 *dst, const Uint32 *src, Uint32 nwords, Uint32 msbfirst);
+
+/****************************************/
+/* SIMD dispatch                        */
+/****************************************/
+
+/* Processor features not yet detected (see MB_Cpu.c) */
+#define MB_CPU_UNKNOWN  0x80000000
+
+/* Number of SIMD levels (MB_SIMD_NONE to MB_SIMD_AVX512) */
+#define MB_SIMD_LEVELS  5
+
+Uint32 MB_CpuFeatures(void);
+Uint32 MB_SimdLevel(void);
+
+/**
+ * Initializer of a table holding one version of a function for each SIMD
+ * level. Without x86 processor only the scalar version is compiled and
+ * used for all the levels.
+ */
+#ifdef MB_SIMD_X86
+#define MB_SIMD_TABLE(none, sse2, sse41, avx2, avx512) \
+    {none, sse2, sse41, avx2, avx512}
+#else
+#define MB_SIMD_TABLE(none, sse2, sse41, avx2, avx512) \
+    {none, none, none, none, none}
+#endif
+
+/**
+ * Returns the version of a function taken in the table 'table' for the
+ * SIMD level currently used.
+ */
+#define MB_SIMD_SELECT(table) ((table)[MB_SimdLevel()])
+
+/* 32-bit line computations (see MB_Line32.c) */
+void MB_InfLine32(PIX32 *pout, PIX32 *pin, Uint32 nb_pix);
+void MB_SupLine32(PIX32 *pout, PIX32 *pin, Uint32 nb_pix);
+void MB_InfConst32(PIX32 *pout, PIX32 value, Uint32 nb_pix);
+void MB_SupConst32(PIX32 *pout, PIX32 value, Uint32 nb_pix);
+Uint64 MB_BldLine32(PIX32 *germ, PIX32 *nbr, PIX32 *mask, Uint32 nb_pix);
+Uint64 MB_DualBldLine32(PIX32 *germ, PIX32 *nbr, PIX32 *mask, Uint32 nb_pix);
 
 /****************************************/
 /* Neighbors access                     */
@@ -157,12 +303,42 @@ extern const int hxNbDir[2][7][2];
 /** Volume arrays*/
 extern const Uint64 MB_VolumePerByte[256];
 
+/****************************************/
+/* Atomic operations                    */
+/****************************************/
+
+/*
+ * The library can be called from several threads at the same time. The
+ * counters shared by all the calls are modified with these operations.
+ */
+#ifdef _MSC_VER
+#include <intrin.h>
+/** Atomically increments the 32-bit value pointed by p */
+#define MB_atomic_inc(p) _InterlockedIncrement((volatile long *) (p))
+/** Atomically replaces *p by newval if it is equal to oldval (true if done) */
+#define MB_atomic_cas(p, oldval, newval) \
+    (_InterlockedCompareExchange((volatile long *) (p), (long) (newval), (long) (oldval))==(long) (oldval))
+#else
+/** Atomically increments the 32-bit value pointed by p */
+#define MB_atomic_inc(p) __sync_add_and_fetch((p), 1)
+/** Atomically replaces *p by newval if it is equal to oldval (true if done) */
+#define MB_atomic_cas(p, oldval, newval) \
+    __sync_bool_compare_and_swap((p), (oldval), (newval))
+#endif
+
 /****************************************/
 /* Internal memory management           */
 /****************************************/
 
+/** Image limit size in pixels (see MB_Create.c) */
+#define MB_MAX_IMAGE_SIZE    ((Uint64)4294967296)
+
+/** Size of the huge pages used for the large images (see MB_SetAllocation) */
+#define MB_HUGE_PAGE_SIZE (2*1024*1024)
+
 void *MB_malloc(int size);
 void *MB_aligned_malloc(int size, int alignment);
+void *MB_huge_malloc(Uint64 size);
 void MB_free(void *ptr);
 void MB_aligned_free(void *ptr);
 
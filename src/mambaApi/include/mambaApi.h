@@ -52,6 +52,27 @@ extern "C" {
 /* Defines                              */
 /****************************************/
 
+/* Processor features (see MB_GetCpuFeatures) */
+#define MB_CPU_SSE2     0x1
+#define MB_CPU_SSE41    0x2
+#define MB_CPU_AVX2     0x4
+#define MB_CPU_AVX512   0x8
+
+/* SIMD levels, from the narrowest to the widest (see MB_SetKernelLevel) */
+#define MB_SIMD_NONE    0
+#define MB_SIMD_SSE2    1
+#define MB_SIMD_SSE41   2
+#define MB_SIMD_AVX2    3
+#define MB_SIMD_AVX512  4
+
+/* Compression of the tiles of the MBI files (see MB_SaveMBI) */
+#define MB_CODEC_NONE   0
+#define MB_CODEC_LZ4    1
+
+/* Allocation options of the large images (see MB_SetAllocation) */
+#define MB_ALLOC_HUGEPAGES   0x1
+#define MB_ALLOC_FIRSTTOUCH  0x2
+
 /****************************************/
 /* Macros                               */
 /****************************************/
@@ -60,6 +81,49 @@ extern "C" {
 /* Structures and Typedef               */
 /****************************************/
 
+/** Operations of a program computed by MB_RunProgram. The operands of each
+ * operation follow its code in the program: first the images (indexes in
+ * the array of images), then the values.
+ */
+enum MB_opcode_t {
+    /** copy: src, dest */
+    MB_OP_COPY = 0,
+    /** logical and: src1, src2, dest */
+    MB_OP_AND,
+    /** logical or: src1, src2, dest */
+    MB_OP_OR,
+    /** logical xor: src1, src2, dest */
+    MB_OP_XOR,
+    /** inferior: src1, src2, dest */
+    MB_OP_INF,
+    /** superior: src1, src2, dest */
+    MB_OP_SUP,
+    /** addition: src1, src2, dest */
+    MB_OP_ADD,
+    /** subtraction: src1, src2, dest */
+    MB_OP_SUB,
+    /** difference: src1, src2, dest */
+    MB_OP_DIFF,
+    /** inversion: src, dest */
+    MB_OP_INV,
+    /** constant value: dest, value */
+    MB_OP_CONSET,
+    /** neighbor inferior: src, srcdest, nbrnum, count, grid, edge */
+    MB_OP_INFNB,
+    /** neighbor superior: src, srcdest, nbrnum, count, grid, edge */
+    MB_OP_SUPNB,
+    /** far neighbor inferior: src, srcdest, nbrnum, count, grid, edge */
+    MB_OP_INFFARNB,
+    /** far neighbor superior: src, srcdest, nbrnum, count, grid, edge */
+    MB_OP_SUPFARNB,
+    /** vector inferior: src, srcdest, dx, dy, edge */
+    MB_OP_INFVECTOR,
+    /** vector superior: src, srcdest, dx, dy, edge */
+    MB_OP_SUPVECTOR,
+    /** number of operations (not an operation) */
+    MB_OP_COUNT
+};
+
 /****************************************/
 /* Global variables                     */
 /****************************************/
@@ -73,16 +137,32 @@ extern Uint32 MB_refcounter;
 
 /* Creation : memory allocation */
 MB_errcode MB_Create(MB_Image *image, Uint32 width, Uint32 height, Uint32 depth);
+MB_errcode MB_CreateUninit(MB_Image *image, Uint32 width, Uint32 height, Uint32 depth);
+MB_errcode MB_Create_from_numpyb(MB_Image *image, PIX8 *pixel_array,
+				 Uint32 array_height, Uint32 array_width, Uint32 width, Uint32 line_step);
   MB_errcode MB_Create_from_numpy8(MB_Image *image, PIX8 *pixel_array,
 				   Uint32 array_height, Uint32 array_width, Uint32 width, Uint32 line_step);
 MB_errcode MB_Create_from_numpy32(MB_Image *image, PIX32 *pixel_array,
 				  Uint32 array_height, Uint32 array_width, Uint32 width, Uint32 line_step);
 /* destruction */
 MB_errcode MB_Destroy(MB_Image *image);
+/* location of the pixels in memory */
+MB_errcode MB_GetPixelLayout(MB_Image *image, Uint64 *address, Uint32 *stride);
 /* loading pixel data in a created image */
 MB_errcode MB_Load(MB_Image *image, PIX8 *indata, Uint32 len);
+MB_errcode MB_Load16(MB_Image *image, PIX8 *indata, Uint32 len, Uint32 bigendian);
+MB_errcode MB_LoadBin(MB_Image *image, PIX8 *indata, Uint32 len, Uint32 msbfirst);
 /* extracting pixel data from an image */
 MB_errcode MB_Extract(MB_Image *image, PIX8 **outdata, Uint32 *len);
+MB_errcode MB_ExtractBin(MB_Image *image, PIX8 **outdata, Uint32 *len, Uint32 msbfirst);
+/* reading and writing simple image files */
+MB_errcode MB_FileInfo(char *path, Uint32 *fwidth, Uint32 *fheight, Uint32 *fdepth);
+MB_errcode MB_LoadFile(MB_Image *image, char *path, double red, double green, double blue);
+MB_errcode MB_SavePGM(MB_Image *image, char *path);
+MB_errcode MB_SaveTIFF(MB_Image *image, char *path);
+MB_errcode MB_SavePBM(MB_Image *image, char *path);
+MB_errcode MB_SaveMBI(MB_Image *image, char *path, Uint32 codec);
+MB_errcode MB_LoadMBI(MB_Image *image, char *path, Uint32 x, Uint32 y);
 /* converting an image format into another */
 MB_errcode MB_Convert(MB_Image *src, MB_Image *dest);
 /* copying an image into another one */
@@ -97,6 +177,20 @@ MB_errcode MB_CropCopy(MB_Image *src, Uint32 x_src, Uint32 y_src,
 MB_errcode MB_PutPixel(MB_Image *dest, Uint32 pixVal, Uint32 x, Uint32 y);
 MB_errcode MB_GetPixel(MB_Image *src, Uint32 *pixVal, Uint32 x, Uint32 y);
 
+/* Multithreading control */
+MB_errcode MB_SetThreadCount(Uint32 nb_threads);
+MB_errcode MB_GetThreadCount(Uint32 *nb_threads);
+MB_errcode MB_SetAllocation(Uint32 flags, Uint32 threshold);
+MB_errcode MB_GetAllocation(Uint32 *flags, Uint32 *threshold);
+
+/* SIMD instruction sets */
+MB_errcode MB_GetCpuFeatures(Uint32 *features);
+MB_errcode MB_SetKernelLevel(Uint32 level);
+MB_errcode MB_GetKernelLevel(Uint32 *level);
+
+/* Computing a sequence of operators in one call */
+MB_errcode MB_RunProgram(MB_Image **images, Uint32 nb_images, Uint32 *program, Uint32 len);
+
 /****************************************/
 /* Image Processing Functions           */
 /****************************************/
@@ -192,6 +286,9 @@ MB_errcode MB_DualBldNb8(MB_Image *mask, MB_Image *srcdest, Uint32 dirnum, Uint6
 MB_errcode MB_DualBldNb32(MB_Image *mask, MB_Image *srcdest, Uint32 dirnum, Uint64 *pVolume, enum MB_grid_t grid);
 /* Dual Build by hierarchical algorithm */
 MB_errcode MB_HierarDualBld(MB_Image *mask, MB_Image *srcdest, enum MB_grid_t grid);
+/* Build and dual build by the hybrid algorithm (any depth) */
+MB_errcode MB_Build(MB_Image *mask, MB_Image *srcdest, enum MB_grid_t grid);
+MB_errcode MB_DualBuild(MB_Image *mask, MB_Image *srcdest, enum MB_grid_t grid);
 /* Mask function to convert binary images to grey scale image*/
 MB_errcode MB_Mask(MB_Image *src, MB_Image *dest, Uint32 maskf, Uint32 maskt);
 /* pixel range in an image */
@@ -206,11 +303,19 @@ MB_errcode MB_CopyBytePlane(MB_Image *src, MB_Image *dest, Uint32 plane);
 MB_errcode MB_BinHitOrMiss(MB_Image *src, MB_Image *dest, Uint32 es0, Uint32 es1, enum MB_grid_t grid);
 /* labeling binary images */
 MB_errcode MB_Labelb(MB_Image *src, MB_Image *dest, Uint32 lblow, Uint32 lbhigh, Uint32 *pNbobj, enum MB_grid_t grid);
+/* labeling the flat zones of greyscale and 32-bit images */
+MB_errcode MB_LabelFlatZones(MB_Image *src, MB_Image *dest, Uint32 lblow, Uint32 lbhigh, Uint32 *pNbobj, enum MB_grid_t grid);
 /* Compute the set edge distance distance */
 MB_errcode MB_Distanceb(MB_Image *src, MB_Image *dest, enum MB_grid_t grid, enum MB_edgemode_t edge);
 /* Watershed segmentation (watershed line and basins)*/
 MB_errcode MB_Watershed(MB_Image *src, MB_Image *marker, Uint32 max_level, enum MB_grid_t grid);
 MB_errcode MB_Basins(MB_Image *src, MB_Image *marker, Uint32 max_level, enum MB_grid_t grid);
+/* Watershed segmentation of the 32-bit images (watershed line and basins)*/
+MB_errcode MB_Watershed32(MB_Image *src, MB_Image *marker, Uint32 max_level, enum MB_grid_t grid);
+MB_errcode MB_Basins32(MB_Image *src, MB_Image *marker, Uint32 max_level, enum MB_grid_t grid);
+/* Watershed segmentation with labels on 32 bits (watershed line and basins)*/
+MB_errcode MB_WatershedLabels32(MB_Image *src, MB_Image *marker, Uint32 max_level, enum MB_grid_t grid);
+MB_errcode MB_BasinsLabels32(MB_Image *src, MB_Image *marker, Uint32 max_level, enum MB_grid_t grid);
 /* Including frame computing */
 MB_errcode MB_Frame(MB_Image *src, Uint32 thresval, Uint32 *ulx, Uint32 *uly, Uint32 *brx, Uint32 *bry);
 
@@ -5,6 +5,12 @@ transformations and algorithms.
 
 This module also contains image display functionalities and other user-friendly
 features.
+
+The functions computing images release the Python interpreter lock, so that
+several threads can process different images at the same time. An image
+written by a function (output image, or image used both as input and output)
+must not be used by another thread during the call, whereas images which are
+only read can be shared. The display must only be used from the main thread.
 """
 
 from __future__ import division
@@ -15,6 +21,7 @@ from .mambaDisplay import getDisplayer
 from .mambaError import raiseExceptionOnError, raiseWarning
 
 import os.path
+import sys
 
 try:
     import numpy as np
@@ -80,6 +87,10 @@ FILLED = _edge(mambaCore.MB_FILLED_EDGE)
 
 _image_index = 1
 _always_show = False
+# Padded arrays of the images created by imageMb.fromArray, reused once the
+# images are destroyed (at most _ARRAY_POOL_SIZE arrays are kept per size)
+_array_pool = {}
+_ARRAY_POOL_SIZE = 4
 
 ###############################################################################
 # Public functions are functions dealing with grid, counter and such
@@ -187,9 +198,144 @@ def getShowImages():
 def getImageCounter():
     """
     Returns the number of images actually defined and allocated in the Mamba
-    library. This function may be useful for debugging purposes.
+    library (the images kept in the pool of images are not counted, see
+    setImagePoolSize). This function may be useful for debugging purposes.
+    """
+    return mambaCore.cvar.MB_refcounter - mbUtls.poolStats()['images']
+
+def setImagePoolSize(size):
+    """
+    Sets to 'size' (in bytes) the size of the pool of images. The memory of
+    the destroyed images is kept in the pool and reused by the following
+    images of the same size and depth, so that the work images created by the
+    operators at every call are not allocated again. When the pool is full,
+    the least recently destroyed images are freed. A size of 0 disables the
+    pool and frees its images. By default, the size is 256 MB.
+    """
+    mbUtls.setPoolSize(size)
+
+def getImagePoolStats(reset=False):
+    """
+    Returns a dictionary describing the pool of images: the number of image
+    creations served by the pool ('hits') or allocated by the library
+    ('misses'), the number of images and bytes held in the pool ('images' and
+    'bytes') and its size ('size'). The counters of hits and misses are set to
+    0 when 'reset' is True.
+    """
+    return mbUtls.poolStats(reset)
+
+def setThreadCount(n):
+    """
+    Sets to 'n' the number of threads used by the Mamba library to compute
+    the pixel-wise and neighbor operators. Images are split in horizontal
+    bands processed concurrently. If 'n' is 0, one thread per processor is
+    used. By default, computations are not threaded (n = 1).
+    
+    The threads are used by one computation at a time. When the library is
+    called from several Python threads, the other computations are done
+    without splitting the images.
+    """
+    err = mambaCore.MB_SetThreadCount(n)
+    raiseExceptionOnError(err)
+
+def getThreadCount():
+    """
+    Returns the number of threads used by the Mamba library to compute the
+    pixel-wise and neighbor operators.
+    """
+    err, n = mambaCore.MB_GetThreadCount()
+    raiseExceptionOnError(err)
+    return n
+
+def setImageAllocation(hugePages=False, firstTouch=False, threshold=16*1024*1024):
+    """
+    Sets how the memory of the large images is allocated, that is the images
+    whose memory (edge included) is at least 'threshold' bytes (16 MB by
+    default).
+    
+    If 'hugePages' is True, the memory is backed by huge pages of 2 MB (on
+    Linux, with the transparent huge pages of the kernel), which reduces the
+    TLB misses when a large image is scanned.
+    
+    If 'firstTouch' is True, the memory of a new image is cleared by the
+    threads computing the horizontal bands (see setThreadCount). On a NUMA
+    system, each band is then placed on the memory node of the thread that
+    touched it first. The image is cleared even if it is created with
+    uninitialized=True.
+    
+    Both options are disabled by default. They only apply to the images
+    created afterwards (the images kept in the pool of images are reused as
+    they were allocated, see setImagePoolSize).
+    """
+    flags = 0
+    if hugePages:
+        flags |= mambaCore.MB_ALLOC_HUGEPAGES
+    if firstTouch:
+        flags |= mambaCore.MB_ALLOC_FIRSTTOUCH
+    err = mambaCore.MB_SetAllocation(flags, threshold)
+    raiseExceptionOnError(err)
+
+def getImageAllocation():
+    """
+    Returns a dictionary describing how the memory of the large images is
+    allocated ('hugePages', 'firstTouch' and 'threshold', see
+    setImageAllocation).
     """
-    return mambaCore.cvar.MB_refcounter
+    err, flags, threshold = mambaCore.MB_GetAllocation()
+    raiseExceptionOnError(err)
+    return {'hugePages': (flags & mambaCore.MB_ALLOC_HUGEPAGES)!=0,
+            'firstTouch': (flags & mambaCore.MB_ALLOC_FIRSTTOUCH)!=0,
+            'threshold': threshold}
+
+# SIMD instruction sets, from the narrowest to the widest
+_kernelLevels = [
+    ('none', mambaCore.MB_SIMD_NONE, 0),
+    ('sse2', mambaCore.MB_SIMD_SSE2, mambaCore.MB_CPU_SSE2),
+    ('sse41', mambaCore.MB_SIMD_SSE41, mambaCore.MB_CPU_SSE41),
+    ('avx2', mambaCore.MB_SIMD_AVX2, mambaCore.MB_CPU_AVX2),
+    ('avx512', mambaCore.MB_SIMD_AVX512, mambaCore.MB_CPU_AVX512),
+]
+
+def getCpuFeatures():
+    """
+    Returns the list of the SIMD instruction sets supported by the processor
+    and usable by the Mamba library (among 'sse2', 'sse41', 'avx2' and
+    'avx512').
+    """
+    err, features = mambaCore.MB_GetCpuFeatures()
+    raiseExceptionOnError(err)
+    return [name for (name, level, flag) in _kernelLevels if features & flag]
+
+def setKernelLevel(level):
+    """
+    Sets the widest SIMD instruction set used by the Mamba library to compute
+    the operators. 'level' is one of 'none' (no SIMD instructions), 'sse2',
+    'sse41', 'avx2' or 'avx512', or 'auto' to use the widest instruction set
+    supported by the processor (the default). A level which is not supported
+    by the processor raises an exception.
+
+    The level can also be limited when the library is loaded with the
+    MAMBA_SIMD_LEVEL environment variable.
+    """
+    if level == 'auto':
+        level = (['none'] + getCpuFeatures())[-1]
+    for (name, value, flag) in _kernelLevels:
+        if name == level:
+            err = mambaCore.MB_SetKernelLevel(value)
+            raiseExceptionOnError(err)
+            return
+    raiseExceptionOnError(mambaCore.ERR_BAD_VALUE)
+
+def getKernelLevel():
+    """
+    Returns the widest SIMD instruction set used by the Mamba library to
+    compute the operators ('none', 'sse2', 'sse41', 'avx2' or 'avx512').
+    """
+    err, level = mambaCore.MB_GetKernelLevel()
+    raiseExceptionOnError(err)
+    for (name, value, flag) in _kernelLevels:
+        if value == level:
+            return name
 
 ###############################################################################
 #  Color palettes
@@ -232,6 +378,17 @@ for _i in range (8):
 #  Classes
 
 class NumpyWrapper(object):
+    """
+    Numpy array holding the pixels of an image in the memory layout of the
+    library (lines rounded and framed by the edge). An image created on the
+    wrapper (imageMb(wrapper)) computes directly in the array.
+
+    The array is allocated by numpy unless an existing 'buffer' (any object
+    supporting the buffer protocol, such as a shared memory block) of at least
+    bufferSize(height, width, depth) bytes is given. The array then starts at
+    byte 'offset' of the buffer. 'line_step' can set a number of bytes between
+    the lines larger than the one of the library.
+    """
 
     MB_ROUND_WIDTH = 64 # px
     MB_ROUND_HEIGHT = 2 # px
@@ -243,7 +400,7 @@ class NumpyWrapper(object):
     
     MB_MAX_IMAGE_SIZE = 4294967296 # px
 
-    def __init__(self, height, width, depth):
+    def __init__(self, height, width, depth, buffer=None, offset=0, line_step=None):
 
         self.height = height
         self.width = width
@@ -252,8 +409,6 @@ class NumpyWrapper(object):
         if np is None:
             raise NameError("Could not import Numpy")
 
-        print("height, width = ({}, {}) depth {}".format(height, width, depth))
-    
         # computation of the corrected size
         # w = n*M + r    where 0 <= r < M
         # ((w + M-1)//M)*M = (( (n+1)*M + r-1 )//M)*M
@@ -262,16 +417,14 @@ class NumpyWrapper(object):
         self.adjusted_width = ((width + self.MB_ROUND_WIDTH-1) // self.MB_ROUND_WIDTH) * self.MB_ROUND_WIDTH
         self.adjusted_height = ((height + self.MB_ROUND_HEIGHT-1) // self.MB_ROUND_HEIGHT) * self.MB_ROUND_HEIGHT
 
-        print("adjusted height, width = ({}, {})".format(self.adjusted_height, self.adjusted_width))
-        
         # verification over the image size
         image_size = self.adjusted_width * self.adjusted_height
         if not (self.adjusted_width > 0 and self.adjusted_height > 0 and image_size <= self.MB_MAX_IMAGE_SIZE):
             raise NameError('Bad image dimensions')
 
         # verification over the depth
-        # acceptable values are 8, or 32 bits
-        if depth not in (8, 32):
+        # acceptable values are 1, 8, or 32 bits
+        if depth not in (1, 8, 32):
             raise NameError('Bad depth')
     
         # full height in pixel with edge
@@ -281,19 +434,35 @@ class NumpyWrapper(object):
         # full_w = (with*depth + 8-1)/8 + 2 * 16
         # ensure with*depth multiple of 8 + 32
         self.line_step = (self.adjusted_width*depth + self.CHARBIT-1)//self.CHARBIT + self.X_LEFT + self.X_RIGHT
-        pixel_byte_size = depth//self.CHARBIT
+        if line_step is not None:
+            if line_step<self.line_step:
+                raise NameError('Bad line step')
+            self.line_step = line_step
+        # binary pixels are packed in bytes
+        pixel_byte_size = max(depth//self.CHARBIT, 1)
         self.full_width = self.line_step//pixel_byte_size
         self.x_offset = self.X_LEFT//pixel_byte_size
 
-        print("offset y, x = ({}, {})".format(self.Y_TOP, self.x_offset))
-        print("full height, width = ({}, {})".format(self.full_height, self.full_width))
-
-        if depth == 8:
-            dtype = np.uint8
-        elif depth == 32:
+        if depth == 32:
             dtype = np.uint32
+        else:
+            dtype = np.uint8
 
-        self.array = np.zeros((self.full_height, self.full_width), dtype=dtype)
+        if buffer is None:
+            self.array = np.zeros((self.full_height, self.full_width), dtype=dtype)
+        else:
+            self.array = np.ndarray((self.full_height, self.full_width), dtype=dtype, buffer=buffer, offset=offset)
+
+    @classmethod
+    def bufferSize(cls, height, width, depth):
+        """
+        Returns the size in bytes of the array holding an image of size
+        'width'x'height' and depth 'depth'.
+        """
+        adjusted_width = ((width + cls.MB_ROUND_WIDTH-1) // cls.MB_ROUND_WIDTH) * cls.MB_ROUND_WIDTH
+        adjusted_height = ((height + cls.MB_ROUND_HEIGHT-1) // cls.MB_ROUND_HEIGHT) * cls.MB_ROUND_HEIGHT
+        line_step = (adjusted_width*depth + cls.CHARBIT-1)//cls.CHARBIT + cls.X_LEFT + cls.X_RIGHT
+        return (adjusted_height + cls.Y_TOP + cls.Y_BOTTOM)*line_step
 
     @property
     def view(self):
@@ -302,6 +471,39 @@ class NumpyWrapper(object):
     def clone(self):
         return self.__class__(self.height, self.width, self.depth)
 
+def _adoptArray(arr, depth):
+    """
+    Returns a NumpyWrapper sharing the memory of array 'arr' (see
+    imageMb.fromArray), or None if the memory layout of the array does not
+    fit the library.
+    """
+    (height, width) = arr.shape
+    itemsize = arr.dtype.itemsize
+    if depth!=8 and depth!=32:
+        return None
+    if not arr.dtype.isnative or arr.strides[1]!=itemsize or not arr.flags.writeable:
+        return None
+    if width%NumpyWrapper.MB_ROUND_WIDTH!=0 or height%NumpyWrapper.MB_ROUND_HEIGHT!=0:
+        return None
+    line_step = arr.strides[0]
+    address = arr.__array_interface__['data'][0]
+    if line_step<width*itemsize+NumpyWrapper.X_LEFT+NumpyWrapper.X_RIGHT:
+        return None
+    if line_step%16!=0 or address%16!=0:
+        return None
+    # the contiguous array owning the memory must hold the edge
+    base = arr
+    while isinstance(base.base, np.ndarray):
+        base = base.base
+    if not base.flags.c_contiguous:
+        return None
+    low = base.__array_interface__['data'][0]
+    start = address - NumpyWrapper.Y_TOP*line_step - NumpyWrapper.X_LEFT
+    end = start + (height+NumpyWrapper.Y_TOP+NumpyWrapper.Y_BOTTOM)*line_step
+    if start<low or end>low+base.nbytes:
+        return None
+    return NumpyWrapper(height, width, depth, buffer=base, offset=start-low, line_step=line_step)
+
 class imageMb(object):
     """
     Defines the imageMb class and its methods.
@@ -334,12 +536,18 @@ class imageMb(object):
         the RGB filter that will be used to convert a color image into a greyscale 
         image by adding the rgbfilter=<your_filter> to the argument of the
         constructor.
+        
+        The created image is black, unless uninitialized=True is given to the
+        constructor: the pixels are then left undefined, which saves the time
+        of clearing them when all the pixels of the image are written before
+        being read (for instance, a work image receiving a copy).
         """
         global _image_index
         
         # List of all the parameters that must be retrieved from the arguments
         rgbfilter = None
         displayer = None
+        uninitialized = False
         
         # First we look into the dictionnary to see if they were specified
         # specifically by the user
@@ -347,23 +555,29 @@ class imageMb(object):
             rgbfilter = kwargs["rgbfilter"]
         if "displayer" in kwargs:
             displayer = kwargs["displayer"]
+        if "uninitialized" in kwargs:
+            uninitialized = kwargs["uninitialized"]
+        clear = not uninitialized
             
         # We analyze the arguments given to the constructor
         if len(args)==0:
             # First case : no argument was given
             # -> imageMb()
-            self.mbIm = mbUtls.create(256, 256, 8)
+            self.mbIm = mbUtls.create(256, 256, 8, clear)
             self.name = "Image "+str(_image_index)
             _image_index = _image_index + 1
         elif len(args)==1:
             # Second case : the user gives only one argument
             if isinstance(args[0], imageMb):
                 # -> imageMb(im)
-                self.mbIm = mbUtls.create(args[0].mbIm.width, args[0].mbIm.height, args[0].mbIm.depth)
+                self.mbIm = mbUtls.create(args[0].mbIm.width, args[0].mbIm.height, args[0].mbIm.depth, clear)
                 self.name = "Image "+str(_image_index)
                 _image_index = _image_index + 1
             elif isinstance(args[0], NumpyWrapper):
+                # -> imageMb(wrapper)
+                # the wrapper is kept as long as the image uses its array
                 self.mbIm = mbUtls.create_from_numpy(args[0])
+                self.wrapper = args[0]
                 self.name = "Image "+str(_image_index)
                 _image_index = _image_index + 1
             elif isinstance(args[0], str):
@@ -372,39 +586,30 @@ class imageMb(object):
                 self.name = os.path.split(args[0])[1]
             else:
                 # -> imageMb(depth)
-                self.mbIm = mbUtls.create(256, 256, args[0])
+                self.mbIm = mbUtls.create(256, 256, args[0], clear)
                 self.name = "Image "+str(_image_index)
                 _image_index = _image_index + 1
         elif len(args)==2:
             # Third case : two arguments
             if isinstance(args[0], imageMb):
                 # -> imageMb(im, depth)
-                self.mbIm = mbUtls.create(args[0].mbIm.width, args[0].mbIm.height, args[1])
+                self.mbIm = mbUtls.create(args[0].mbIm.width, args[0].mbIm.height, args[1], clear)
                 self.name = "Image "+str(_image_index)
                 _image_index = _image_index + 1
             elif isinstance(args[0], str):
                 # -> imageMb(path, depth)
                 next_mbIm = mbUtls.load(args[0], rgb2l=rgbfilter)
-                if args[1]==1:
-                    self.mbIm = mbUtls.create(next_mbIm.width,next_mbIm.height,1)
-                    err = mambaCore.MB_Convert(next_mbIm, self.mbIm)
-                    raiseExceptionOnError(err)
-                elif args[1]==8:
-                    self.mbIm = next_mbIm
-                else:
-                    self.mbIm = mbUtls.create(next_mbIm.width,next_mbIm.height,32)
-                    err = mambaCore.MB_CopyBytePlane(next_mbIm, self.mbIm, 0)
-                    raiseExceptionOnError(err)
+                self.mbIm = mbUtls.fitDepth(next_mbIm, args[1])
                 self.name = os.path.split(args[0])[1]
             else:
                 # -> imageMb(width, height)
-                self.mbIm = mbUtls.create(args[0], args[1], 8)
+                self.mbIm = mbUtls.create(args[0], args[1], 8, clear)
                 self.name = "Image "+str(_image_index)
                 _image_index = _image_index + 1
         else:
             # Last case: at least 3 arguments are given
             # -> imageMb(width, height, depth)
-            self.mbIm = mbUtls.create(args[0], args[1], args[2])
+            self.mbIm = mbUtls.create(args[0], args[1], args[2], clear)
             self.name = "Image "+str(_image_index)
             _image_index = _image_index + 1
         
@@ -423,8 +628,34 @@ class imageMb(object):
     def __del__(self):
         if hasattr(self, "displayId") and self.displayId != '':
             self.gd.destroyWindow(self.displayId)
+        # the C core image, when used by no other image, is given to the
+        # pool of images (see setImagePoolSize)
+        if hasattr(self, "_mbIm") and mbUtls.release(self._mbIm):
+            if getattr(self, "_pooled", False):
+                # the array of the image can be reused by fromArray
+                key = (self.wrapper.height, self.wrapper.width, self.wrapper.depth)
+                pool = _array_pool.setdefault(key, [])
+                if len(pool)<_ARRAY_POOL_SIZE:
+                    pool.append(self.wrapper)
         del self
     
+    @property
+    def mbIm(self):
+        """
+        The C core image of the image. The imageMb objects sharing the same
+        C core image are counted, the image being released (see
+        setImagePoolSize) when the last of them is destroyed or given another
+        C core image.
+        """
+        return self._mbIm
+    
+    @mbIm.setter
+    def mbIm(self, mbIm):
+        mbUtls.own(mbIm)
+        if hasattr(self, "_mbIm"):
+            mbUtls.release(self._mbIm)
+        self._mbIm = mbIm
+    
     def getSize(self):
         """
         Returns the size (a tuple width and height) of the image.
@@ -436,6 +667,40 @@ class imageMb(object):
         Returns the depth of the image.
         """
         return self.mbIm.depth
+
+    @property
+    def __array_interface__(self):
+        """
+        Numpy array interface sharing the pixels of the image without copy:
+        numpy.asarray(im) returns an array of shape (height, width) whose
+        elements are the pixels of the image (the edge and the padding of the
+        lines are skipped). 8-bit and 32-bit images give uint8 and uint32
+        arrays.
+        
+        The pixels of binary images are packed, 8 pixels per byte with the
+        first pixel in the least significant bit. The array has the shape
+        (height, width//8) and numpy.unpackbits(array, axis=1, bitorder='little')
+        unpacks it.
+        
+        The display is not updated when the array is modified (see
+        updateDisplay). The array keeps the image alive.
+        """
+        err, address, stride = mambaCore.MB_GetPixelLayout(self.mbIm)
+        raiseExceptionOnError(err)
+        (width, height) = self.getSize()
+        if self.mbIm.depth==32:
+            typestr = '<u4' if sys.byteorder=='little' else '>u4'
+            itemsize = 4
+        else:
+            typestr = '|u1'
+            itemsize = 1
+            if self.mbIm.depth==1:
+                width = width//8
+        return {'version': 3,
+                'shape': (height, width),
+                'typestr': typestr,
+                'data': (address, False),
+                'strides': (stride, itemsize)}
         
     def setName(self, name):
         """
@@ -482,25 +747,37 @@ class imageMb(object):
         PIL documentation for details).
         """
         next_mbIm = mbUtls.load(path, size=(self.mbIm.width,self.mbIm.height), rgb2l=rgbfilter)
-        if self.mbIm.depth==1:
-            err = mambaCore.MB_Convert(next_mbIm, self.mbIm)
-            raiseExceptionOnError(err)
-        elif self.mbIm.depth==8:
-            err = mambaCore.MB_Copy(next_mbIm, self.mbIm)
-            raiseExceptionOnError(err)
-        else:
-            err = mambaCore.MB_CopyBytePlane(next_mbIm, self.mbIm, 0)
-            raiseExceptionOnError(err)
+        next_mbIm = mbUtls.fitDepth(next_mbIm, self.mbIm.depth)
+        err = mambaCore.MB_Copy(next_mbIm, self.mbIm)
+        raiseExceptionOnError(err)
         self.setName(os.path.split(path)[1])
         if self.displayId != '':
             self.gd.reconnectWindow(self.displayId, self)
         
+    def loadRegion(self, path, x, y):
+        """
+        Loads into the image the part of the image saved in the MBI file
+        'path' whose upper left corner is at ('x','y'). The part has the size
+        of the image and only the tiles of the file covering it are decoded.
+        The pixels outside the saved image are set to 0. The image must have
+        the depth of the saved image.
+        """
+        err = mambaCore.MB_LoadMBI(self.mbIm, path, x, y)
+        raiseExceptionOnError(err)
+        self.setName(os.path.split(path)[1])
+        self.updateDisplay()
+        
     def save(self, path):
         """
         Saves the image at the corresponding 'path' using PIL library.
         The format is automatically deduced by PIL from the image name extension.
+        Binary and 8-bit images are saved directly by the library in PGM and
+        TIFF files (extensions .pgm, .tif and .tiff), binary images in PBM
+        files (extension .pbm) with their packed pixels. Images of any depth are
+        saved by the library in MBI files (extension .mbi), compressed by tiles
+        so that a part of the image can be loaded quickly (see loadRegion).
         Note that, if the image comes with a palette, the image is saved with
-        this palette.        
+        this palette (except in MBI files).
         """
         mbUtls.save(self.mbIm, path, self.palette)
         
@@ -508,9 +785,14 @@ class imageMb(object):
         """
         Fills the image with the raw string 'data'. The length of data must
         fit the image size and depth.
-        This method only works on 8 and 32-bit images.
+        The data of a binary image hold 8 pixels per byte, the first pixel in
+        the most significant bit (as given by numpy.packbits or found in PBM
+        files), and are loaded without any 8-bit image in between.
         """
-        assert(len(data)==self.mbIm.width*self.mbIm.height*(self.mbIm.depth//8))
+        if self.mbIm.depth==1:
+            assert(len(data)==(self.mbIm.width*self.mbIm.height)//8)
+        else:
+            assert(len(data)==self.mbIm.width*self.mbIm.height*(self.mbIm.depth//8))
         err = mambaCore.MB_Load(self.mbIm,data,len(data))
         raiseExceptionOnError(err)
         self.updateDisplay()
@@ -518,12 +800,116 @@ class imageMb(object):
     def extractRaw(self):
         """
         Extracts and returns the image raw string data.
-        This method only works on 8 and 32-bit images.
+        The data of a binary image hold 8 pixels per byte, the first pixel in
+        the most significant bit (see loadRaw).
         """
         err,data = mambaCore.MB_Extract(self.mbIm)
         raiseExceptionOnError(err)
         return data
         
+    @classmethod
+    def fromMemmap(cls, path, width, height, depth, mode='r+'):
+        """
+        Creates an image whose pixels are held in the file 'path' mapped in
+        memory. The file contains the pixels in the memory layout of the
+        library, lines padding and edge lines included (see NumpyWrapper): its
+        size is NumpyWrapper.bufferSize(height, width, depth) bytes. Such a file
+        is written by saveMemmap.
+        
+        The file is not read when the image is created, the pages of the file
+        are loaded by the system when the computations access them.
+        
+        'mode' is one of the numpy.memmap modes: 'r+' (default) writes the
+        modifications of the image in the file, 'c' keeps them in memory only
+        and 'w+' creates (or overwrites) the file with an empty image. Read-only
+        mappings are not allowed as the library can write in any image.
+        """
+        if np is None:
+            raise NameError("Could not import Numpy")
+        if mode not in ('r+', 'c', 'w+'):
+            raise ValueError("Incorrect memory map mode: %s" % (mode))
+        size = NumpyWrapper.bufferSize(height, width, depth)
+        if mode!='w+' and os.path.getsize(path)!=size:
+            raiseExceptionOnError(mambaCore.ERR_BAD_SIZE)
+        data = np.memmap(path, dtype=np.uint8, mode=mode, shape=(size,))
+        im = cls(NumpyWrapper(height, width, depth, buffer=data))
+        im.name = os.path.split(path)[1]
+        im._memmap = data
+        return im
+        
+    def saveMemmap(self, path):
+        """
+        Saves the image in the file 'path' in the memory layout of the library,
+        so that the file can be mapped in memory by imageMb.fromMemmap.
+        """
+        (width, height) = self.getSize()
+        im = imageMb.fromMemmap(path, width, height, self.getDepth(), mode='w+')
+        err = mambaCore.MB_Copy(self.mbIm, im.mbIm)
+        raiseExceptionOnError(err)
+        im._memmap.flush()
+        del(im)
+        
+    @classmethod
+    def fromArray(cls, arr, copy='auto'):
+        """
+        Creates an image holding the pixels of the 2D numpy array 'arr' (the
+        first index is the line, the second the column).
+        
+        uint8 arrays give 8-bit images, uint16 and uint32 arrays give 32-bit
+        images and bool arrays give binary images.
+        
+        When 'copy' is 'auto' (default), the image uses the memory of 'arr'
+        without copy whenever possible: the array must be a view, inside a
+        larger contiguous array, leaving around it the edge and the padding of
+        the lines of the library (a line before and after, 16 bytes before and
+        after each line), with lines aligned on 16 bytes, a width multiple of
+        64 and an even height. This is the case of the 'view' of a NumpyWrapper
+        or of an array allocated with such margins. Otherwise, the pixels are
+        copied in a padded array which is reused by the following calls once
+        the image is destroyed. 'copy' set to True always copies the pixels,
+        set to False it raises a ValueError if the pixels cannot be shared.
+        """
+        if np is None:
+            raise NameError("Could not import Numpy")
+        arr = np.asarray(arr)
+        if arr.ndim!=2:
+            raise ValueError("Expecting a 2D array")
+        if arr.dtype.kind=='b':
+            depth = 1
+        elif arr.dtype.kind=='u' and arr.dtype.itemsize==1:
+            depth = 8
+        elif arr.dtype.kind=='u' and arr.dtype.itemsize in (2, 4):
+            depth = 32
+        else:
+            raise ValueError("Unsupported array type: %s" % (arr.dtype))
+        (height, width) = arr.shape
+        
+        if copy!=True:
+            wrapper = _adoptArray(arr, depth)
+            if wrapper is not None:
+                return cls(wrapper)
+            if copy==False:
+                raise ValueError("The array memory cannot be used by an image")
+        
+        pool = _array_pool.get((height, width, depth))
+        if pool:
+            wrapper = pool.pop()
+        else:
+            wrapper = NumpyWrapper(height, width, depth)
+        if depth==1:
+            arr = np.packbits(arr, axis=1, bitorder='little')
+        # lines of the image without the edge
+        nb = (wrapper.line_step - wrapper.X_LEFT - wrapper.X_RIGHT)//wrapper.array.itemsize
+        lines = wrapper.array[wrapper.Y_TOP:wrapper.Y_TOP+wrapper.adjusted_height,
+                              wrapper.x_offset:wrapper.x_offset+nb]
+        lines[:height, :arr.shape[1]] = arr
+        # the padding of a reused array is cleared
+        lines[:height, arr.shape[1]:] = 0
+        lines[height:, :] = 0
+        im = cls(wrapper)
+        im._pooled = True
+        return im
+        
     def fill(self, v):
         """
         Completely fills the image with a given value 'v'.
@@ -550,7 +936,6 @@ class imageMb(object):
         err = mambaCore.MB_Convert(self.mbIm, next_mbIm)
         raiseExceptionOnError(err)
 
-        del self.mbIm
         self.mbIm = next_mbIm
         if self.displayId != '':
             self.gd.reconnectWindow(self.displayId, self)
@@ -634,6 +1019,124 @@ class imageMb(object):
         raiseExceptionOnError(err)
         return value
         
+class batch(object):
+    """
+    A batch records a sequence of operators and computes it in a single call
+    to the Mamba library. The Python overhead of each operator (argument
+    conversion, error checking) is paid once for the whole sequence, which
+    speeds up the composed operators working on small images.
+
+    The operators are recorded with the methods of the batch, which take the
+    same arguments as the corresponding functions of the mamba module. The
+    sequence is computed by method run (it can be computed several times).
+    The images used in the batch must stay alive until it is run.
+
+    Example:
+        b = batch()
+        b.copy(imIn, imOut)
+        b.infFarNeighbor(imOut, imOut, 1, 4, grid=HEXAGONAL)
+        b.logic(imOut, imIn, imOut, "sup")
+        b.run()
+    """
+
+    _logicOps = {
+        "and": mambaCore.MB_OP_AND,
+        "or": mambaCore.MB_OP_OR,
+        "xor": mambaCore.MB_OP_XOR,
+        "inf": mambaCore.MB_OP_INF,
+        "sup": mambaCore.MB_OP_SUP,
+    }
+
+    def __init__(self):
+        self.images = []
+        self.program = []
+        self.outputs = []
+
+    def _slot(self, im):
+        # index of the image in the batch, the image is added if needed
+        for i, bim in enumerate(self.images):
+            if bim is im:
+                return i
+        self.images.append(im)
+        return len(self.images)-1
+
+    def _add(self, opcode, images, values, out):
+        self.program.append(opcode)
+        self.program.extend([self._slot(im) for im in images])
+        self.program.extend(values)
+        if out not in self.outputs:
+            self.outputs.append(out)
+
+    def copy(self, imIn, imOut):
+        """Records a copy of 'imIn' into 'imOut' (see function copy)."""
+        self._add(mambaCore.MB_OP_COPY, [imIn, imOut], [], imOut)
+
+    def logic(self, imIn1, imIn2, imOut, log):
+        """Records a logic operation (see function logic)."""
+        self._add(self._logicOps[log], [imIn1, imIn2, imOut], [], imOut)
+
+    def add(self, imIn1, imIn2, imOut):
+        """Records an addition (see function add)."""
+        self._add(mambaCore.MB_OP_ADD, [imIn1, imIn2, imOut], [], imOut)
+
+    def sub(self, imIn1, imIn2, imOut):
+        """Records a subtraction (see function sub)."""
+        self._add(mambaCore.MB_OP_SUB, [imIn1, imIn2, imOut], [], imOut)
+
+    def diff(self, imIn1, imIn2, imOut):
+        """Records a set difference (see function diff)."""
+        self._add(mambaCore.MB_OP_DIFF, [imIn1, imIn2, imOut], [], imOut)
+
+    def negate(self, imIn, imOut):
+        """Records a negation (see function negate)."""
+        self._add(mambaCore.MB_OP_INV, [imIn, imOut], [], imOut)
+
+    def fill(self, imOut, value):
+        """Records the filling of 'imOut' with 'value' (see imageMb.fill)."""
+        self._add(mambaCore.MB_OP_CONSET, [imOut], [value], imOut)
+
+    def infNeighbor(self, imIn, imInout, nb, count, grid=DEFAULT_GRID, edge=FILLED):
+        """Records a neighbor minimum (see function infNeighbor)."""
+        self._add(mambaCore.MB_OP_INFNB, [imIn, imInout],
+                  [nb, count, grid.id, edge.id], imInout)
+
+    def supNeighbor(self, imIn, imInout, nb, count, grid=DEFAULT_GRID, edge=EMPTY):
+        """Records a neighbor maximum (see function supNeighbor)."""
+        self._add(mambaCore.MB_OP_SUPNB, [imIn, imInout],
+                  [nb, count, grid.id, edge.id], imInout)
+
+    def infFarNeighbor(self, imIn, imInout, nb, amp, grid=DEFAULT_GRID, edge=FILLED):
+        """Records a far neighbor minimum (see function infFarNeighbor)."""
+        self._add(mambaCore.MB_OP_INFFARNB, [imIn, imInout],
+                  [nb, amp, grid.id, edge.id], imInout)
+
+    def supFarNeighbor(self, imIn, imInout, nb, amp, grid=DEFAULT_GRID, edge=EMPTY):
+        """Records a far neighbor maximum (see function supFarNeighbor)."""
+        self._add(mambaCore.MB_OP_SUPFARNB, [imIn, imInout],
+                  [nb, amp, grid.id, edge.id], imInout)
+
+    def infVector(self, imIn, imInout, vector, edge=FILLED):
+        """Records a vector minimum (see function infVector)."""
+        (dx, dy) = vector
+        self._add(mambaCore.MB_OP_INFVECTOR, [imIn, imInout],
+                  [dx, dy, edge.id], imInout)
+
+    def supVector(self, imIn, imInout, vector, edge=EMPTY):
+        """Records a vector maximum (see function supVector)."""
+        (dx, dy) = vector
+        self._add(mambaCore.MB_OP_SUPVECTOR, [imIn, imInout],
+                  [dx, dy, edge.id], imInout)
+
+    def run(self):
+        """
+        Computes the recorded operators. An exception is raised when the
+        computation of an operator fails, the following ones are not computed.
+        """
+        err = mambaCore.MB_RunProgram([im.mbIm for im in self.images], self.program)
+        raiseExceptionOnError(err)
+        for im in self.outputs:
+            im.updateDisplay()
+
 ###############################################################################
 #  Computation functions
 
@@ -667,8 +1170,9 @@ def cropCopy(imIn, posIn, imOut, posOut, size):
     controlled by 'size' (tuple w,h). The actual size will be computed
     so as not to exceed the images border.
 
-    The images must be of the same depth but can have different sizes. Only non
-    binary images are accepted (8-bit or 32-bit).
+    The images must be of the same depth but can have different sizes. With
+    binary images, the x positions and the width of the copy must be multiples
+    of 64.
     """
     err = mambaCore.MB_CropCopy(imIn.mbIm, posIn[0], posIn[1],
                                 imOut.mbIm, posOut[0], posOut[1],
@@ -1286,12 +1790,19 @@ def label(imIn, imOut, lblow=1, lbhigh=256, grid=DEFAULT_GRID):
     The labelling will be performed according to the 'grid' (HEXAGONAL is 
     6-Neighbors and SQUARE is 8-Neighbors).
     
+    If 'imIn' is a greyscale or 32-bit image, its flat zones (connected
+    components of pixels with the same value) are labelled. All the pixels
+    then receive a label and the number of flat zones is returned.
+    
     'lblow' and 'lbhigh' are used to restrain the possible values in the
     lower byte of 'imOut' pixel values. these values (and all their multiples of 
     256) are then reserved for another use (see Mamba User Manual for further details).
     """
 
-    err, nbobj = mambaCore.MB_Labelb(imIn.mbIm,imOut.mbIm, lblow, lbhigh, grid.id)
+    if imIn.getDepth()==1:
+        err, nbobj = mambaCore.MB_Labelb(imIn.mbIm,imOut.mbIm, lblow, lbhigh, grid.id)
+    else:
+        err, nbobj = mambaCore.MB_LabelFlatZones(imIn.mbIm,imOut.mbIm, lblow, lbhigh, grid.id)
     raiseExceptionOnError(err)
     imOut.updateDisplay()
     return nbobj
@@ -1338,13 +1849,15 @@ def computeDistance(imIn, imOut, grid=DEFAULT_GRID, edge=EMPTY):
     raiseExceptionOnError(err)
     imOut.updateDisplay()
     
-def watershedSegment(imIn, imMarker, grid=DEFAULT_GRID, max_level=256):
+def watershedSegment(imIn, imMarker, grid=DEFAULT_GRID, max_level=-1, labels32=False):
     """
-    Segments greyscale image 'imIn' using the watershed algorithm. 'imMarker' is
-    used both as the marker image (the wells from which the flooding proceeds) 
-    and as the output image. It is a 32-bit image. 'max_level' can be used to 
-    limit the flooding process to a specific level (useful if you want to survey
-    the flooding level by level).
+    Segments greyscale or 32-bit image 'imIn' using the watershed algorithm.
+    'imMarker' is used both as the marker image (the wells from which the
+    flooding proceeds) and as the output image. It is a 32-bit image.
+    'max_level' can be used to limit the flooding process to a specific level
+    (useful if you want to survey the flooding level by level): only the values
+    below 'max_level' are flooded. If 'max_level' is negative the whole image
+    is flooded.
     
     'grid' will change the number of neighbors considered by the algorithm 
     (HEXAGONAL is 6-Neighbors and SQUARE is 8-Neighbors).
@@ -1353,19 +1866,39 @@ def watershedSegment(imIn, imMarker, grid=DEFAULT_GRID, max_level=256):
     the actual segmentation (each region has a specific label according to the
     original marker). The last plane represents the actual watershed line
     (pixels set to 255).
+    
+    If 'labels32' is True, the labels of 'imMarker' use its 32 bits (more than
+    2^24 labels can be used). The pixels of the watershed line are then set
+    to 0 in the result.
+    
+    The 32-bit images are flooded directly (no slicing of their values), the
+    computation time does not depend on the range of the values.
     """
     
-    err = mambaCore.MB_Watershed(imIn.mbIm, imMarker.mbIm, max_level, grid.id)
+    if labels32:
+        if max_level<0 or max_level>0xffffffff:
+            max_level = 0xffffffff
+        err = mambaCore.MB_WatershedLabels32(imIn.mbIm, imMarker.mbIm, max_level, grid.id)
+    elif imIn.getDepth()==32:
+        if max_level<0 or max_level>0xffffffff:
+            max_level = 0xffffffff
+        err = mambaCore.MB_Watershed32(imIn.mbIm, imMarker.mbIm, max_level, grid.id)
+    else:
+        if max_level<0:
+            max_level = 256
+        err = mambaCore.MB_Watershed(imIn.mbIm, imMarker.mbIm, max_level, grid.id)
     raiseExceptionOnError(err)
     imMarker.updateDisplay()
     
-def basinSegment(imIn, imMarker, grid=DEFAULT_GRID, max_level=256):
+def basinSegment(imIn, imMarker, grid=DEFAULT_GRID, max_level=-1, labels32=False):
     """
-    Segments greyscale image 'imIn' using the watershed algorithm. 'imMarker' is
-    used both as the marker image (the wells from which the flooding proceeds) 
-    and as the output image. It is a 32-bit image. 'max_level' can be used to 
-    limit the flooding process to a specific level (useful if you want to survey
-    the flooding level by level).
+    Segments greyscale or 32-bit image 'imIn' using the watershed algorithm.
+    'imMarker' is used both as the marker image (the wells from which the
+    flooding proceeds) and as the output image. It is a 32-bit image.
+    'max_level' can be used to limit the flooding process to a specific level
+    (useful if you want to survey the flooding level by level): only the values
+    below 'max_level' are flooded. If 'max_level' is negative the whole image
+    is flooded.
     
     'grid' will change the number of neighbors considered by the algorithm 
     (HEXAGONAL is 6-Neighbors and SQUARE is 8-Neighbors).
@@ -1375,9 +1908,23 @@ def basinSegment(imIn, imMarker, grid=DEFAULT_GRID, max_level=256):
     original marker). This function only return catchment basins (no watershed 
     line) and is faster than watershedSegment if you are not interested in the 
     watershed line.
+    
+    If 'labels32' is True, the labels of 'imMarker' use its 32 bits (more than
+    2^24 labels can be used).
     """
     
-    err = mambaCore.MB_Basins(imIn.mbIm, imMarker.mbIm, max_level, grid.id)
+    if labels32:
+        if max_level<0 or max_level>0xffffffff:
+            max_level = 0xffffffff
+        err = mambaCore.MB_BasinsLabels32(imIn.mbIm, imMarker.mbIm, max_level, grid.id)
+    elif imIn.getDepth()==32:
+        if max_level<0 or max_level>0xffffffff:
+            max_level = 0xffffffff
+        err = mambaCore.MB_Basins32(imIn.mbIm, imMarker.mbIm, max_level, grid.id)
+    else:
+        if max_level<0:
+            max_level = 256
+        err = mambaCore.MB_Basins(imIn.mbIm, imMarker.mbIm, max_level, grid.id)
     raiseExceptionOnError(err)
     imMarker.updateDisplay()
     
@@ -1414,6 +1961,49 @@ def hierarDualBuild(imMask, imInout, grid=DEFAULT_GRID):
     err = mambaCore.MB_HierarDualBld(imMask.mbIm, imInout.mbIm, grid.id)
     raiseExceptionOnError(err)
     imInout.updateDisplay()
+    
+def hybridBuild(imMask, imInout, grid=DEFAULT_GRID):
+    """
+    Builds image 'imInout' using 'imMask' as a mask. This function works with
+    images of any depth (both images must have the same depth) and uses the
+    hybrid algorithm (raster scans followed by a FIFO queue) to compute the
+    result.
+    
+    'grid' will set the number of neighbors considered by the algorithm 
+    (HEXAGONAL is 6-Neighbors and SQUARE is 8-Neighbors).
+    
+    The result is identical to the one of the build function of mambaComposed
+    (which uses this function by default) but its computation time does not
+    depend on the length of the geodesic paths inside the mask.
+    
+    The computation uses two work buffers of the size of the images, with one
+    byte per pixel for the binary and 8-bit images (8 times the memory of a
+    binary image) and 4 bytes per pixel for the 32-bit images. Images of more
+    than 2^32 pixels (border included) raise an allocation error.
+    """
+    
+    err = mambaCore.MB_Build(imMask.mbIm, imInout.mbIm, grid.id)
+    raiseExceptionOnError(err)
+    imInout.updateDisplay()
+    
+def hybridDualBuild(imMask, imInout, grid=DEFAULT_GRID):
+    """
+    Builds (dual build) image 'imInout' using 'imMask' as a mask. This function
+    works with images of any depth (both images must have the same depth) and
+    uses the hybrid algorithm (raster scans followed by a FIFO queue) to
+    compute the result.
+    
+    'grid' will set the number of neighbors considered by the algorithm 
+    (HEXAGONAL is 6-Neighbors and SQUARE is 8-Neighbors).
+    
+    The result is identical to the one of the dualBuild function of
+    mambaComposed (which uses this function by default). The memory used is
+    the same as in hybridBuild.
+    """
+    
+    err = mambaCore.MB_DualBuild(imMask.mbIm, imInout.mbIm, grid.id)
+    raiseExceptionOnError(err)
+    imInout.updateDisplay()
 
 def extractFrame(imIn, threshold):
     """
@@ -1425,3 +2015,19 @@ def extractFrame(imIn, threshold):
     err, x1, y1, x2, y2 = mambaCore.MB_Frame(imIn.mbIm, threshold)
     raiseExceptionOnError(err)
     return (x1, y1, x2, y2)
+
+###############################################################################
+#  Computations on many images with a pool of processes
+
+from . import mambaParallel as parallel
+
+###############################################################################
+#  Loading and saving images on background threads
+
+def __getattr__(name):
+    # mamba.io is not put in the namespace of the module, so that "from mamba
+    # import *" does not hide the io module of the standard library
+    if name=="io":
+        from . import mambaIO
+        return mambaIO
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
@@ -20,3 +20,4 @@ from .miscellaneous import *
 from .hierarchies import *
 from .partitions import *
 from .extrema import *
+from .tiling import *
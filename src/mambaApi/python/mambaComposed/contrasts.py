@@ -17,7 +17,7 @@ def gradient(imIn, imOut, n=1, se=mC.DEFAULT_SE):
     (DEFAULT_SE by default).
     """
     
-    imWrk = mamba.imageMb(imIn)
+    imWrk = mamba.imageMb(imIn, uninitialized=True)
     mC.erode(imIn, imWrk, n, se=se)
     mC.dilate(imIn, imOut, n, se=se)
     mamba.sub(imOut, imWrk, imOut)
@@ -52,7 +52,7 @@ def whiteTopHat(imIn, imOut, n, se=mC.DEFAULT_SE):
     The structuring element used is defined by 'se' ('DEFAULT_SE' by default).
     """
     
-    imWrk = mamba.imageMb(imIn)
+    imWrk = mamba.imageMb(imIn, uninitialized=True)
     mC.open(imIn, imWrk, n, se=se)
     mamba.sub(imIn, imWrk, imOut)
 
@@ -64,7 +64,7 @@ def blackTopHat(imIn, imOut, n, se=mC.DEFAULT_SE):
     The structuring element used is defined by 'se' ('DEFAULT_SE' by default).
     """
     
-    imWrk = mamba.imageMb(imIn)
+    imWrk = mamba.imageMb(imIn, uninitialized=True)
     mC.close(imIn, imWrk, n, se=se)
     mamba.sub(imWrk, imIn, imOut)
 
@@ -76,7 +76,7 @@ def supWhiteTopHat(imIn, imOut, n, grid=mamba.DEFAULT_GRID):
     in at least one direction of 'grid' is smaller than 'n'.
     """
     
-    imWrk = mamba.imageMb(imIn)
+    imWrk = mamba.imageMb(imIn, uninitialized=True)
     mC.supOpen(imIn, imWrk, n, grid=grid)
     mamba.sub(imIn, imWrk, imOut)
 
@@ -88,7 +88,7 @@ def supBlackTopHat(imIn, imOut, n, grid=mamba.DEFAULT_GRID):
     in at least one direction of 'grid' is smaller than 'n'.
     """
     
-    imWrk = mamba.imageMb(imIn)
+    imWrk = mamba.imageMb(imIn, uninitialized=True)
     mC.infClose(imIn, imWrk, n, grid=grid)
     mamba.sub(imWrk, imIn, imOut)
         
@@ -101,7 +101,7 @@ def regularisedGradient(imIn, imOut, n, grid=mamba.DEFAULT_GRID):
     This operation is only valid for omnidirectional structuring elements.
     """
     
-    imWrk = mamba.imageMb(imIn)
+    imWrk = mamba.imageMb(imIn, uninitialized=True)
     se = mC.structuringElement(mamba.getDirections(grid), grid)
     gradient(imIn, imWrk, n, se=se)
     whiteTopHat(imWrk, imWrk, n, se=se)
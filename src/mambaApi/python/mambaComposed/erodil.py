@@ -185,7 +185,7 @@ def dilate(imIn, imOut, n=1, se=DEFAULT_SE, edge=mamba.EMPTY):
     use is at position 0 even if this point does not belong to it.
     """
     
-    imWrk = mamba.imageMb(imIn)
+    imWrk = mamba.imageMb(imIn, uninitialized=True)
     mamba.copy(imIn, imOut)
     dirs = se.getDirections(withoutZero=True)
     for i in range(n):
@@ -232,7 +232,7 @@ def erode(imIn, imOut, n=1, se=DEFAULT_SE, edge=mamba.FILLED):
     use is at position 0 even if this point does not belong to it.
     """
     
-    imWrk = mamba.imageMb(imIn)
+    imWrk = mamba.imageMb(imIn, uninitialized=True)
     mamba.copy(imIn, imOut)
     dirs = se.getDirections(withoutZero=True)
     for i in range(n):
@@ -36,9 +36,19 @@ def largeLinearErode(imIn, imOut, dir, size, grid=mamba.DEFAULT_GRID, edge=mamba
     an enhanced shift operator).
     """
     
-    mamba.copy(imIn, imOut)
+    b = mamba.batch()
+    _largeLinearErode(b, imIn, imOut, dir, size, grid, edge)
+    b.run()
+
+def _largeLinearErode(b, imIn, imOut, dir, size, grid, edge):
+    """
+    Records the operators of largeLinearErode in batch 'b' (for internal use
+    only).
+    """
+    
+    b.copy(imIn, imOut)
     for i in _sizeSplit(size):
-        mamba.infFarNeighbor(imOut, imOut, dir, i, grid=grid, edge=edge)
+        b.infFarNeighbor(imOut, imOut, dir, i, grid=grid, edge=edge)
 
 def largeLinearDilate(imIn, imOut, dir, size, grid=mamba.DEFAULT_GRID, edge=mamba.EMPTY):
     """
@@ -47,9 +57,19 @@ def largeLinearDilate(imIn, imOut, dir, size, grid=mamba.DEFAULT_GRID, edge=mamb
     an enhanced shift operator).
     """
     
-    mamba.copy(imIn, imOut)
+    b = mamba.batch()
+    _largeLinearDilate(b, imIn, imOut, dir, size, grid, edge)
+    b.run()
+
+def _largeLinearDilate(b, imIn, imOut, dir, size, grid, edge):
+    """
+    Records the operators of largeLinearDilate in batch 'b' (for internal use
+    only).
+    """
+    
+    b.copy(imIn, imOut)
     for i in _sizeSplit(size):
-        mamba.supFarNeighbor(imOut, imOut, dir, i, grid=grid, edge=edge)
+        b.supFarNeighbor(imOut, imOut, dir, i, grid=grid, edge=edge)
 
 # Operations with large hexagons
 def largeHexagonalErode(imIn, imOut, size, edge=mamba.FILLED):
@@ -62,28 +82,30 @@ def largeHexagonalErode(imIn, imOut, size, edge=mamba.FILLED):
     This operator is quite complex to avoid edge effects.
     """
     
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
+    imWrk1 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk2 = mamba.imageMb(imIn, uninitialized=True)
     sizemax = min(imIn.getSize())//2
     # if size larger than sizemax, the operation must be iterated to prevent edge effects.
     n = size
-    mamba.copy(imIn, imOut)
+    b = mamba.batch()
+    b.copy(imIn, imOut)
     while n > 0:
         s = min(n, sizemax)
-        largeLinearErode(imOut, imWrk1, 6, s, grid=mamba.HEXAGONAL, edge=edge)
-        largeLinearErode(imWrk1, imWrk1, 4, s, grid=mamba.HEXAGONAL, edge=edge)
-        largeLinearErode(imOut, imWrk2, 4, s, grid=mamba.HEXAGONAL, edge=edge)
-        largeLinearErode(imWrk2, imWrk2, 6, s, grid=mamba.HEXAGONAL, edge=edge)
-        mamba.logic(imWrk1, imWrk2, imWrk1, "inf")
-        largeLinearErode(imWrk1, imWrk2, 2, s, grid=mamba.HEXAGONAL, edge=edge)
-        largeLinearErode(imOut, imWrk1, 1, s, grid=mamba.HEXAGONAL, edge=edge)
-        largeLinearErode(imWrk1, imWrk1, 3, s, grid=mamba.HEXAGONAL, edge=edge)
-        largeLinearErode(imOut, imOut, 3, s, grid=mamba.HEXAGONAL, edge=edge)
-        largeLinearErode(imOut, imOut, 1, s, grid=mamba.HEXAGONAL, edge=edge)
-        mamba.logic(imWrk1, imOut, imWrk1, "inf")
-        largeLinearErode(imWrk1, imOut, 5, s, grid=mamba.HEXAGONAL, edge=edge)
-        mamba.logic(imOut, imWrk2, imOut, "inf")
+        _largeLinearErode(b, imOut, imWrk1, 6, s, mamba.HEXAGONAL, edge)
+        _largeLinearErode(b, imWrk1, imWrk1, 4, s, mamba.HEXAGONAL, edge)
+        _largeLinearErode(b, imOut, imWrk2, 4, s, mamba.HEXAGONAL, edge)
+        _largeLinearErode(b, imWrk2, imWrk2, 6, s, mamba.HEXAGONAL, edge)
+        b.logic(imWrk1, imWrk2, imWrk1, "inf")
+        _largeLinearErode(b, imWrk1, imWrk2, 2, s, mamba.HEXAGONAL, edge)
+        _largeLinearErode(b, imOut, imWrk1, 1, s, mamba.HEXAGONAL, edge)
+        _largeLinearErode(b, imWrk1, imWrk1, 3, s, mamba.HEXAGONAL, edge)
+        _largeLinearErode(b, imOut, imOut, 3, s, mamba.HEXAGONAL, edge)
+        _largeLinearErode(b, imOut, imOut, 1, s, mamba.HEXAGONAL, edge)
+        b.logic(imWrk1, imOut, imWrk1, "inf")
+        _largeLinearErode(b, imWrk1, imOut, 5, s, mamba.HEXAGONAL, edge)
+        b.logic(imOut, imWrk2, imOut, "inf")
         n = n - s
+    b.run()
         
 def largeHexagonalDilate(imIn, imOut, size, edge=mamba.EMPTY):
     """
@@ -95,28 +117,30 @@ def largeHexagonalDilate(imIn, imOut, size, edge=mamba.EMPTY):
     This operator is quite complex to avoid edge effects.
     """
     
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
+    imWrk1 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk2 = mamba.imageMb(imIn, uninitialized=True)
     sizemax = min(imIn.getSize())//2
     # if size larger than sizemax, the operation must be iterated to prevent edge effects.
     n = size
-    mamba.copy(imIn, imOut)
+    b = mamba.batch()
+    b.copy(imIn, imOut)
     while n >  0:
         s = min(n, sizemax)
-        largeLinearDilate(imOut, imWrk1, 6, s, grid=mamba.HEXAGONAL, edge=edge)
-        largeLinearDilate(imWrk1, imWrk1, 4, s, grid=mamba.HEXAGONAL, edge=edge)
-        largeLinearDilate(imOut, imWrk2, 4, s, grid=mamba.HEXAGONAL, edge=edge)
-        largeLinearDilate(imWrk2, imWrk2, 6, s, grid=mamba.HEXAGONAL, edge=edge)
-        mamba.logic(imWrk1, imWrk2, imWrk1, "sup")
-        largeLinearDilate(imWrk1, imWrk2, 2, s, grid=mamba.HEXAGONAL, edge=edge)
-        largeLinearDilate(imOut, imWrk1, 1, s, grid=mamba.HEXAGONAL, edge=edge)
-        largeLinearDilate(imWrk1, imWrk1, 3, s, grid=mamba.HEXAGONAL, edge=edge)
-        largeLinearDilate(imOut, imOut, 3, s, grid=mamba.HEXAGONAL, edge=edge)
-        largeLinearDilate(imOut, imOut, 1, s, grid=mamba.HEXAGONAL, edge=edge)
-        mamba.logic(imWrk1, imOut, imWrk1, "sup")
-        largeLinearDilate(imWrk1, imOut, 5, s, grid=mamba.HEXAGONAL, edge=edge)
-        mamba.logic(imOut, imWrk2, imOut, "sup")
+        _largeLinearDilate(b, imOut, imWrk1, 6, s, mamba.HEXAGONAL, edge)
+        _largeLinearDilate(b, imWrk1, imWrk1, 4, s, mamba.HEXAGONAL, edge)
+        _largeLinearDilate(b, imOut, imWrk2, 4, s, mamba.HEXAGONAL, edge)
+        _largeLinearDilate(b, imWrk2, imWrk2, 6, s, mamba.HEXAGONAL, edge)
+        b.logic(imWrk1, imWrk2, imWrk1, "sup")
+        _largeLinearDilate(b, imWrk1, imWrk2, 2, s, mamba.HEXAGONAL, edge)
+        _largeLinearDilate(b, imOut, imWrk1, 1, s, mamba.HEXAGONAL, edge)
+        _largeLinearDilate(b, imWrk1, imWrk1, 3, s, mamba.HEXAGONAL, edge)
+        _largeLinearDilate(b, imOut, imOut, 3, s, mamba.HEXAGONAL, edge)
+        _largeLinearDilate(b, imOut, imOut, 1, s, mamba.HEXAGONAL, edge)
+        b.logic(imWrk1, imOut, imWrk1, "sup")
+        _largeLinearDilate(b, imWrk1, imOut, 5, s, mamba.HEXAGONAL, edge)
+        b.logic(imOut, imWrk2, imOut, "sup")
         n = n - s
+    b.run()
     
 # Operations with large squares    
 def largeSquareErode(imIn, imOut, size, edge=mamba.FILLED):
@@ -127,10 +151,12 @@ def largeSquareErode(imIn, imOut, size, edge=mamba.FILLED):
     No edge effects are likely to happen with a square structuring element.
     """
     
-    largeLinearErode(imIn, imOut, 1, size, grid=mamba.SQUARE, edge=edge)
-    largeLinearErode(imOut, imOut, 3, size, grid=mamba.SQUARE, edge=edge)
-    largeLinearErode(imOut, imOut, 5, size, grid=mamba.SQUARE, edge=edge)
-    largeLinearErode(imOut, imOut, 7, size, grid=mamba.SQUARE, edge=edge)
+    b = mamba.batch()
+    _largeLinearErode(b, imIn, imOut, 1, size, mamba.SQUARE, edge)
+    _largeLinearErode(b, imOut, imOut, 3, size, mamba.SQUARE, edge)
+    _largeLinearErode(b, imOut, imOut, 5, size, mamba.SQUARE, edge)
+    _largeLinearErode(b, imOut, imOut, 7, size, mamba.SQUARE, edge)
+    b.run()
 
 def largeSquareDilate(imIn, imOut, size, edge=mamba.EMPTY):
     """
@@ -140,10 +166,12 @@ def largeSquareDilate(imIn, imOut, size, edge=mamba.EMPTY):
     No edge effects are likely to happen with a square structuring element.
     """
     
-    largeLinearDilate(imIn, imOut, 1, size, grid=mamba.SQUARE, edge=edge)
-    largeLinearDilate(imOut, imOut, 3, size, grid=mamba.SQUARE, edge=edge)
-    largeLinearDilate(imOut, imOut, 5, size, grid=mamba.SQUARE, edge=edge)
-    largeLinearDilate(imOut, imOut, 7, size, grid=mamba.SQUARE, edge=edge)
+    b = mamba.batch()
+    _largeLinearDilate(b, imIn, imOut, 1, size, mamba.SQUARE, edge)
+    _largeLinearDilate(b, imOut, imOut, 3, size, mamba.SQUARE, edge)
+    _largeLinearDilate(b, imOut, imOut, 5, size, mamba.SQUARE, edge)
+    _largeLinearDilate(b, imOut, imOut, 7, size, mamba.SQUARE, edge)
+    b.run()
 
 # operations with large dodecagons
 def _sparseConjugateHexagonErode(imIn, imOut, size, edge=mamba.FILLED):
@@ -154,8 +182,8 @@ def _sparseConjugateHexagonErode(imIn, imOut, size, edge=mamba.FILLED):
     internal use only).
     """
 
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
+    imWrk1 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk2 = mamba.imageMb(imIn, uninitialized=True)
     mamba.copy(imIn, imOut)
     val = mamba.computeMaxRange(imIn)[1]*int(edge==mamba.FILLED)
     for i in _sizeSplit(size):
@@ -181,8 +209,8 @@ def _sparseConjugateHexagonDilate(imIn, imOut, size, edge=mamba.EMPTY):
     internal use only).
     """   
 
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
+    imWrk1 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk2 = mamba.imageMb(imIn, uninitialized=True)
     mamba.copy(imIn, imOut)
     val = mamba.computeMaxRange(imIn)[1]*int(edge!=mamba.EMPTY)
     for i in _sizeSplit(size):
@@ -235,7 +263,7 @@ def _sparseDiamondDilate(imIn, imOut, size, edge=mamba.EMPTY):
     is not completely filled. It is for internal use only.
     """
 
-    imWrk = mamba.imageMb(imIn)
+    imWrk = mamba.imageMb(imIn, uninitialized=True)
     mamba.copy(imIn, imOut)
     for i in _sizeSplit(size):
         mamba.copy(imOut, imWrk)
@@ -250,7 +278,7 @@ def _sparseDiamondErode(imIn, imOut, size, edge=mamba.FILLED):
     is not completely filled. It is for internal use only.
     """
 
-    imWrk = mamba.imageMb(imIn)
+    imWrk = mamba.imageMb(imIn, uninitialized=True)
     mamba.copy(imIn, imOut)
     for i in _sizeSplit(size):
         mamba.copy(imOut, imWrk)
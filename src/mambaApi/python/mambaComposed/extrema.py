@@ -100,7 +100,7 @@ def maxPartialBuild(imIn, imMask, imOut, grid=mamba.DEFAULT_GRID):
     'imIn' and 'imOut' must be different and greyscale images.
     """
     
-    imWrk = mamba.imageMb(imIn, 1)
+    imWrk = mamba.imageMb(imIn, 1, uninitialized=True)
     mC.maxima(imIn, imWrk, 1, grid=grid)
     mamba.logic(imMask, imWrk, imWrk, "inf")
     mamba.convertByMask(imWrk, imOut, 0, mamba.computeMaxRange(imIn)[1])
@@ -115,7 +115,7 @@ def minPartialBuild(imIn, imMask, imOut, grid=mamba.DEFAULT_GRID):
     'imIn' and 'imOut' must be different and greyscale images.
     """
     
-    imWrk = mamba.imageMb(imIn, 1)
+    imWrk = mamba.imageMb(imIn, 1, uninitialized=True)
     mC.minima(imIn, imWrk, 1, grid=grid)
     mamba.logic(imMask, imWrk, imWrk, "inf")
     mamba.convertByMask(imWrk, imOut, mamba.computeMaxRange(imIn)[1], 0)
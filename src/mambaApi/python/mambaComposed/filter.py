@@ -59,9 +59,9 @@ def autoMedian(imIn, imOut, n, se=mC.DEFAULT_SE):
     Morphological automedian filter performed with alternate sequential filters.
     """
     
-    oc_im = mamba.imageMb(imIn)
-    co_im = mamba.imageMb(imIn)
-    imWrk = mamba.imageMb(imIn)
+    oc_im = mamba.imageMb(imIn, uninitialized=True)
+    co_im = mamba.imageMb(imIn, uninitialized=True)
+    imWrk = mamba.imageMb(imIn, uninitialized=True)
     alternateFilter(imIn, oc_im, n, True, se=se)
     alternateFilter(imIn, co_im, n, False, se=se)
     mamba.copy(imIn, imOut)
@@ -80,9 +80,9 @@ def simpleLevelling(imIn, imMask, imOut, grid=mamba.DEFAULT_GRID):
     image of homogeneous grey values.
     """
     
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    mask_im = mamba.imageMb(imIn, 1)
+    imWrk1 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk2 = mamba.imageMb(imIn, uninitialized=True)
+    mask_im = mamba.imageMb(imIn, 1, uninitialized=True)
     mamba.logic(imIn, imMask, imWrk1, "inf")
     mC.build(imIn, imWrk1, grid=grid)
     mamba.logic(imIn, imMask, imWrk2, "sup")
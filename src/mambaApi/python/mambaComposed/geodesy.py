@@ -31,8 +31,8 @@ def upperGeodesicDilate(imIn, imMask, imOut, n=1, se=mC.DEFAULT_SE):
             mC.dilate(imOut, imOut, se=se)
             mamba.logic(imMask, imOut, imOut, "sup")
     else:
-        imWrk1 = mamba.imageMb(imIn)
-        imWrk2 = mamba.imageMb(imIn, 1)
+        imWrk1 = mamba.imageMb(imIn, uninitialized=True)
+        imWrk2 = mamba.imageMb(imIn, 1, uninitialized=True)
         for i in range(n):
             mamba.generateSupMask(imOut, imMask, imWrk2, True)
             mamba.convertByMask(imWrk2, imWrk1, 0, mamba.computeMaxRange(imWrk1)[1])
@@ -97,8 +97,8 @@ def lowerGeodesicErode(imIn, imMask, imOut, n=1, se=mC.DEFAULT_SE):
         lowerGeodesicDilate(imOut, imMask, imOut, n, se=se)
         mamba.diff(imMask, imOut, imOut)
     else:
-        imWrk1 = mamba.imageMb(imIn)
-        imWrk2 = mamba.imageMb(imIn, 1)
+        imWrk1 = mamba.imageMb(imIn, uninitialized=True)
+        imWrk2 = mamba.imageMb(imIn, 1, uninitialized=True)
         mamba.logic(imIn, imMask, imOut, "inf")
         for i in range(n):
             mamba.generateSupMask(imOut, imMask, imWrk2, False)
@@ -120,18 +120,27 @@ def geodesicErode(imIn, imMask, imOut, n=1, se=mC.DEFAULT_SE):
     else:
         upperGeodesicErode(imIn, imMask, imOut, n, se=se)
 
-def build(imMask, imInout, grid=mamba.DEFAULT_GRID):
+def build(imMask, imInout, grid=mamba.DEFAULT_GRID, method='hybrid'):
     """
     Builds image 'imInout' using 'imMask' as a mask. This operator performs the
     geodesic reconstruction of 'imInout' inside the mask image and puts the
     result in the same image.
     
-    This operator uses a recursive implementation of the reconstruction.
+    'method' selects the algorithm: 'hybrid' (default) uses the raster scans
+    and FIFO queue of hybridBuild, whose cost only depends on the size of the
+    image; 'iterative' repeats the builds by neighbors in all the directions
+    until the image stops changing (one pass per step of the longest
+    geodesic path).
     
     This function will use the mamba default grid unless specified otherwise in
     'grid'.
     """
     
+    if method=='hybrid':
+        mamba.hybridBuild(imMask, imInout, grid=grid)
+        return
+    elif method!='iterative':
+        raise ValueError("Incorrect build method: %s" % (method))
     vol = 0
     prec_vol = -1
     dirs = mamba.getDirections(grid)[1:]
@@ -140,18 +149,24 @@ def build(imMask, imInout, grid=mamba.DEFAULT_GRID):
         for d in dirs:
             vol = mamba.buildNeighbor(imMask, imInout, d, grid)
 
-def dualBuild(imMask, imInout, grid=mamba.DEFAULT_GRID):
+def dualBuild(imMask, imInout, grid=mamba.DEFAULT_GRID, method='hybrid'):
     """
     Builds (dual build) image 'imInout' using 'imMask' as a mask. This operator
     performs the geodesic dual reconstruction (by erosions) of 'imInout' inside
     the mask image and puts the result in the same image.
     
-    This operator uses a recursive implementation of the reconstruction.
+    'method' selects the algorithm, 'hybrid' (default) or 'iterative' (see
+    build).
     
     This function will use the mamba default grid unless specified otherwise in
     'grid'.
     """
     
+    if method=='hybrid':
+        mamba.hybridDualBuild(imMask, imInout, grid=grid)
+        return
+    elif method!='iterative':
+        raise ValueError("Incorrect build method: %s" % (method))
     vol = 0
     prec_vol = -1
     dirs = mamba.getDirections(grid)[1:]
@@ -248,7 +263,7 @@ def geodesicDistance(imIn, imMask, imOut, se=mC.DEFAULT_SE):
     if imIn.getDepth() != 1:
         mamba.raiseExceptionOnError(ERR_BAD_DEPTH)
     imOut.reset()
-    imWrk = mamba.imageMb(imIn)
+    imWrk = mamba.imageMb(imIn, uninitialized=True)
     mamba.logic(imIn, imMask, imWrk, "inf")
     while mamba.computeVolume(imWrk) != 0:
         mamba.add(imOut, imWrk, imOut)
@@ -262,13 +277,13 @@ def hierarBuild32(imMask, imOut, grid=mamba.DEFAULT_GRID):
     of the image complexity.
 
     This operator may be considered as an alternative to the build
-    operator for 32-bit images (not necessarily faster).
+    operator for 32-bit images (the hybrid build is usually faster).
     """
     
-    imWrk1 = mamba.imageMb(imMask)
-    imWrk2 = mamba.imageMb(imMask)
-    imWrk3 = mamba.imageMb(imMask)
-    cutMask = mamba.imageMb(imMask)
+    imWrk1 = mamba.imageMb(imMask, uninitialized=True)
+    imWrk2 = mamba.imageMb(imMask, uninitialized=True)
+    imWrk3 = mamba.imageMb(imMask, uninitialized=True)
+    cutMask = mamba.imageMb(imMask, uninitialized=True)
     imCut1 = mamba.imageMb(imMask, 8)
     imCut2 = mamba.imageMb(imMask, 8)
     [current_level, max_level] = mamba.computeRange(imOut)
@@ -295,13 +310,13 @@ def hierarDualBuild32(imMask, imOut, grid=mamba.DEFAULT_GRID):
     of the image complexity.  
     
     This operator may be considered as an alternative to the dualBuild
-    operator for 32-bit images (not necessarily faster).
+    operator for 32-bit images (the hybrid build is usually faster).
     """
     
-    imWrk1 = mamba.imageMb(imMask)
-    imWrk2 = mamba.imageMb(imMask)
-    imWrk3 = mamba.imageMb(imMask)
-    cutMask = mamba.imageMb(imMask)
+    imWrk1 = mamba.imageMb(imMask, uninitialized=True)
+    imWrk2 = mamba.imageMb(imMask, uninitialized=True)
+    imWrk3 = mamba.imageMb(imMask, uninitialized=True)
+    cutMask = mamba.imageMb(imMask, uninitialized=True)
     imCut1 = mamba.imageMb(imMask, 8)
     imCut2 = mamba.imageMb(imMask, 8)
     [current_level, max_level] = mamba.computeRange(imOut)
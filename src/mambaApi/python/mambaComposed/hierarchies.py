@@ -20,7 +20,7 @@ def hierarchy(imIn, imMask, imOut, grid=mamba.DEFAULT_GRID):
     The hierarchical image is put in 'imOut'.
     """
     
-    imWrk = mamba.imageMb(imIn)
+    imWrk = mamba.imageMb(imIn, uninitialized=True)
     if mamba.checkEmptiness(imIn):
         mamba.copy(imIn, imOut)
     else:
@@ -38,11 +38,11 @@ def hierarchicalLevel(imIn, imOut, grid=mamba.DEFAULT_GRID):
     'imIn' must be a valued watershed image.
     """
     
-    imWrk0 = mamba.imageMb(imIn)
-    imWrk1 = mamba.imageMb(imIn, 1)
-    imWrk2 = mamba.imageMb(imIn, 1)
-    imWrk3 = mamba.imageMb(imIn, 1)
-    imWrk4 = mamba.imageMb(imIn, 32)
+    imWrk0 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk1 = mamba.imageMb(imIn, 1, uninitialized=True)
+    imWrk2 = mamba.imageMb(imIn, 1, uninitialized=True)
+    imWrk3 = mamba.imageMb(imIn, 1, uninitialized=True)
+    imWrk4 = mamba.imageMb(imIn, 32, uninitialized=True)
     mamba.threshold(imIn,imWrk1, 0, 0)
     mamba.negate(imWrk1, imWrk2)
     hierarchy(imIn, imWrk2, imWrk0, grid=grid)
@@ -69,9 +69,9 @@ def waterfalls(imIn, imOut, grid=mamba.DEFAULT_GRID):
     This transformation returns the number of hierarchical levels.
     """
     
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    imWrk3 = mamba.imageMb(imIn, 1)
+    imWrk1 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk2 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk3 = mamba.imageMb(imIn, 1, uninitialized=True)
     mamba.copy(imIn, imWrk1)
     imOut.reset()
     nbLevels = 0
@@ -98,11 +98,11 @@ def enhancedWaterfalls(imIn, imOut, grid=mamba.DEFAULT_GRID):
     This transformation returns the number of hierarchical levels.    
     """
     
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    imWrk3 = mamba.imageMb(imIn)
-    imWrk4 = mamba.imageMb(imIn, 1)
-    imWrk5 = mamba.imageMb(imIn, 32)   
+    imWrk1 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk2 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk3 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk4 = mamba.imageMb(imIn, 1, uninitialized=True)
+    imWrk5 = mamba.imageMb(imIn, 32, uninitialized=True)   
     mamba.copy(imIn, imWrk1)
     imOut.reset()
     nbLevels = 0
@@ -141,13 +141,13 @@ def standardSegment(imIn, imOut, gain=2.0, grid=mamba.DEFAULT_GRID):
     This transformation returns the number of hierarchical levels.    
     """
     
-    imWrk0 = mamba.imageMb(imIn)
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    imWrk3 = mamba.imageMb(imIn)
-    imWrk4 = mamba.imageMb(imIn, 1)
-    imWrk5 = mamba.imageMb(imIn, 1)
-    imWrk6 = mamba.imageMb(imIn, 32)    
+    imWrk0 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk1 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk2 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk3 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk4 = mamba.imageMb(imIn, 1, uninitialized=True)
+    imWrk5 = mamba.imageMb(imIn, 1, uninitialized=True)
+    imWrk6 = mamba.imageMb(imIn, 32, uninitialized=True)    
     mamba.copy(imIn, imWrk1)
     mC.mulRealConst(imIn, gain, imWrk6)
     mC.floorSubConst(imWrk6, 1, imWrk6)
@@ -196,12 +196,12 @@ def segmentByP(imIn, imOut, gain=2.0, grid=mamba.DEFAULT_GRID):
     This transformation returns the number of hierarchical levels.    
     """
     
-    imWrk0 = mamba.imageMb(imIn)
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    imWrk3 = mamba.imageMb(imIn)
-    imWrk4 = mamba.imageMb(imIn, 1)
-    imWrk5 = mamba.imageMb(imIn, 32)    
+    imWrk0 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk1 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk2 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk3 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk4 = mamba.imageMb(imIn, 1, uninitialized=True)
+    imWrk5 = mamba.imageMb(imIn, 32, uninitialized=True)    
     mamba.copy(imIn, imWrk1)
     mC.mulRealConst(imIn, gain, imWrk5)
     mC.floorSubConst(imWrk5, 1, imWrk5)
@@ -250,13 +250,13 @@ def generalSegment(imIn, imOut, gain=2.0, offset=1, grid=mamba.DEFAULT_GRID):
     This transformation returns the number of hierarchical levels.    
     """
     
-    imWrk0 = mamba.imageMb(imIn)
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    imWrk3 = mamba.imageMb(imIn)
-    imWrk4 = mamba.imageMb(imIn, 1)
-    imWrk5 = mamba.imageMb(imIn, 1)
-    imWrk6 = mamba.imageMb(imIn, 32)    
+    imWrk0 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk1 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk2 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk3 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk4 = mamba.imageMb(imIn, 1, uninitialized=True)
+    imWrk5 = mamba.imageMb(imIn, 1, uninitialized=True)
+    imWrk6 = mamba.imageMb(imIn, 32, uninitialized=True)    
     mamba.copy(imIn, imWrk1)
     mC.mulRealConst(imIn, gain, imWrk6)
     mC.floorSubConst(imWrk6, 1, imWrk6)
@@ -306,12 +306,12 @@ def extendedSegment(imIn, imTest, imOut, offset=255, grid=mamba.DEFAULT_GRID):
     This transformation returns the number of hierarchical levels.    
     """
     
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    imWrk3 = mamba.imageMb(imIn)
-    imWrk4 = mamba.imageMb(imIn, 1)
-    imWrk5 = mamba.imageMb(imIn, 1)
-    imWrk6 = mamba.imageMb(imIn, 32)    
+    imWrk1 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk2 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk3 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk4 = mamba.imageMb(imIn, 1, uninitialized=True)
+    imWrk5 = mamba.imageMb(imIn, 1, uninitialized=True)
+    imWrk6 = mamba.imageMb(imIn, 32, uninitialized=True)    
     mamba.copy(imIn, imWrk1)
     imOut.reset()
     nbLevels = 0
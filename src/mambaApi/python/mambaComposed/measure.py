@@ -47,7 +47,7 @@ def computeDiameter(imIn, dir, scale=(1.0, 1.0), grid=mamba.DEFAULT_GRID):
     if dir == 0:
         return 0.0
     dir = ((dir - 1)%(mamba.gridNeighbors(grid)//2)) +1
-    imWrk = mamba.imageMb(imIn)
+    imWrk = mamba.imageMb(imIn, uninitialized=True)
     mamba.copy(imIn, imWrk)
     mamba.diffNeighbor(imIn, imWrk, dir, grid=grid)
     if grid == mamba.HEXAGONAL:
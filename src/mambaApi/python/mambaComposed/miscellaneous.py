@@ -26,7 +26,7 @@ def isotropicDistance(imIn, imOut, edge=mamba.FILLED):
     imOut.reset()
     oldn = 0
     size = 0
-    imWrk1 = mamba.imageMb(imIn)
+    imWrk1 = mamba.imageMb(imIn, uninitialized=True)
     imWrk2 = mamba.imageMb(imIn)
     mamba.copy(imIn, imWrk1)
     while mamba.computeVolume(imWrk1) != 0:
@@ -65,8 +65,8 @@ def ceilingAddConst(imIn, v, imOut):
     of the addition is always truncated for 8-bit images.
     """
     
-    imMask = mamba.imageMb(imIn, 1)
-    imWrk = mamba.imageMb(imIn)
+    imMask = mamba.imageMb(imIn, 1, uninitialized=True)
+    imWrk = mamba.imageMb(imIn, uninitialized=True)
     mamba.addConst(imIn, v, imWrk)
     mamba.generateSupMask(imIn, imWrk, imMask, True)
     mamba.convertByMask(imMask, imOut, 0, mamba.computeMaxRange(imOut)[1])
@@ -85,8 +85,8 @@ def ceilingAdd(imIn1, imIn2, imOut):
     of the addition is always truncated for 8-bit images.
     """
     
-    imMask = mamba.imageMb(imIn1, 1)
-    imWrk = mamba.imageMb(imIn1)
+    imMask = mamba.imageMb(imIn1, 1, uninitialized=True)
+    imWrk = mamba.imageMb(imIn1, uninitialized=True)
     mamba.add(imIn1, imIn2, imWrk)
     mamba.generateSupMask(imIn1, imWrk, imMask, True)
     mamba.convertByMask(imMask, imOut, 0, mamba.computeMaxRange(imOut)[1])
@@ -101,8 +101,8 @@ def floorSubConst(imIn, v, imOut):
     of the subtraction is always truncated for 8-bit images.
     """
     
-    imMask = mamba.imageMb(imIn, 1)
-    imWrk = mamba.imageMb(imIn)
+    imMask = mamba.imageMb(imIn, 1, uninitialized=True)
+    imWrk = mamba.imageMb(imIn, uninitialized=True)
     mamba.subConst(imIn, v, imWrk)
     mamba.generateSupMask(imIn, imWrk, imMask, False)
     mamba.convertByMask(imMask, imOut, 0, mamba.computeMaxRange(imOut)[1])
@@ -120,8 +120,8 @@ def floorSub(imIn1, imIn2, imOut):
     of the subtractiontion is always truncated for 8-bit images.
     """
     
-    imMask = mamba.imageMb(imIn1, 1)
-    imWrk = mamba.imageMb(imIn1)
+    imMask = mamba.imageMb(imIn1, 1, uninitialized=True)
+    imWrk = mamba.imageMb(imIn1, uninitialized=True)
     mamba.sub(imIn1, imIn2, imWrk)
     mamba.generateSupMask(imIn1, imWrk, imMask, False)
     mamba.convertByMask(imMask, imOut, 0, mamba.computeMaxRange(imOut)[1])
@@ -159,7 +159,7 @@ def mulRealConst(imIn, v, imOut, nearest=False):
     if imIn.getDepth()==1 or imOut.getDepth()==1:
         mamba.raiseExceptionOnError(mambaCore.ERR_BAD_DEPTH)
     imWrk1 = mamba.imageMb(imIn, 32)
-    imWrk2 = mamba.imageMb(imIn, 1)
+    imWrk2 = mamba.imageMb(imIn, 1, uninitialized=True)
     v1 = int(v * 100)
     if imIn.getDepth()==8:
         imWrk1.reset()
@@ -47,7 +47,7 @@ def buildOpen(imIn, imOut, n=1, se=mC.DEFAULT_SE):
     result in 'imOut'. 'n' controls the size of the opening.
     """
     
-    imWrk = mamba.imageMb(imIn)
+    imWrk = mamba.imageMb(imIn, uninitialized=True)
     mamba.copy(imIn, imWrk)
     mC.erode(imIn, imOut, n, se=se)
     mC.build(imWrk, imOut, grid=se.getGrid())
@@ -58,7 +58,7 @@ def buildClose(imIn, imOut, n=1, se=mC.DEFAULT_SE):
     the result in 'imOut'. 'n' controls the size of the closing.
     """
     
-    imWrk = mamba.imageMb(imIn)
+    imWrk = mamba.imageMb(imIn, uninitialized=True)
     mamba.copy(imIn, imWrk)
     mC.dilate(imIn, imOut, n, se=se)
     mC.dualBuild(imWrk, imOut, grid=se.getGrid())
@@ -101,7 +101,7 @@ def supOpen(imIn, imOut, n, grid=mamba.DEFAULT_GRID):
     similar to the horizontal and vertical size.    
     """
     
-    imWrk1 = mamba.imageMb(imIn)
+    imWrk1 = mamba.imageMb(imIn, uninitialized=True)
     imWrk2 = mamba.imageMb(imIn)
     imWrk1.reset()
     if grid == mamba.SQUARE:
@@ -131,7 +131,7 @@ def infClose(imIn, imOut, n, grid=mamba.DEFAULT_GRID):
     similar to the horizontal and vertical size.    
     """
     
-    imWrk1 = mamba.imageMb(imIn)
+    imWrk1 = mamba.imageMb(imIn, uninitialized=True)
     imWrk2 = mamba.imageMb(imIn)
     imWrk1.fill(mamba.computeMaxRange(imIn)[1])
     if grid == mamba.SQUARE:
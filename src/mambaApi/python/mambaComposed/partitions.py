@@ -24,8 +24,8 @@ def cellsErode(imIn, imOut, n=1, se=mC.DEFAULT_SE, edge=mamba.FILLED):
     This operation works on 8-bit and 32-bit partitions.
     """
     
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn, 1)
+    imWrk1 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk2 = mamba.imageMb(imIn, 1, uninitialized=True)
     mC.dilate(imIn, imWrk1, n=n, se=se)
     mC.erode(imIn, imOut, n=n, se=se, edge=edge)
     mamba.generateSupMask(imOut, imWrk1, imWrk2, False)
@@ -42,7 +42,7 @@ def cellsOpen(imIn, imOut, n=1, se=mC.DEFAULT_SE, edge=mamba.FILLED):
     This operation works on 8-bit and 32-bit partitions.
     """
     
-    imWrk = mamba.imageMb(imIn)
+    imWrk = mamba.imageMb(imIn, uninitialized=True)
     cellsErode(imIn, imWrk, n, se=se, edge=edge)
     mC.dilate(imWrk, imOut, n, se=se.transpose())
        
@@ -55,8 +55,8 @@ def cellsComputeDistance(imIn, imOut, grid=mamba.DEFAULT_GRID, edge=mamba.EMPTY)
     default.
     """
     
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn, 1)
+    imWrk1 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk2 = mamba.imageMb(imIn, 1, uninitialized=True)
     se = mC.structuringElement(mamba.getDirections(grid), grid)
     cellsErode(imIn, imWrk1, 1, se=se, edge=edge)
     mamba.threshold(imWrk1, imWrk2, 1, 255)
@@ -74,8 +74,8 @@ def equalNeighbor(imIn, imOut, nb, grid=mamba.DEFAULT_GRID, edge=mamba.FILLED):
     This operator works for 8-bit and 32-bit images.
     """
     
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn, 1)
+    imWrk1 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk2 = mamba.imageMb(imIn, 1, uninitialized=True)
     mamba.copy(imIn, imWrk1)
     mamba.copy(imIn, imOut)
     mamba.supNeighbor(imIn, imWrk1, nb, 1, grid=grid, edge=edge)
@@ -95,9 +95,9 @@ def nonEqualNeighbor(imIn, imOut, nb, grid=mamba.DEFAULT_GRID, edge=mamba.FILLED
     This operator works for 8-bit and 32-bit images.
     """
     
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    imWrk3 = mamba.imageMb(imIn, 1)
+    imWrk1 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk2 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk3 = mamba.imageMb(imIn, 1, uninitialized=True)
     mamba.copy(imIn, imWrk1)
     mamba.copy(imIn, imWrk2)
     mamba.supNeighbor(imWrk1, imWrk1, nb, 1, grid=grid, edge=edge)
@@ -114,7 +114,7 @@ def cellsHMT(imIn, imOut, dse, edge=mamba.EMPTY):
     in 'imOut'. 'edge' is set to EMPTY by default.
     """
     
-    imWrk1 = mamba.imageMb(imIn)
+    imWrk1 = mamba.imageMb(imIn, uninitialized=True)
     imWrk2 = mamba.imageMb(imIn)
     cse0 = dse.getStructuringElement(0)
     cse1 = dse.getStructuringElement(1)
@@ -135,7 +135,7 @@ def cellsThin(imIn, imOut, dse, edge=mamba.EMPTY):
     is put in 'imOut'. 'edge' is set to EMPTY by default. 
     """
     
-    imWrk = mamba.imageMb(imIn)
+    imWrk = mamba.imageMb(imIn, uninitialized=True)
     cellsHMT(imIn, imWrk, dse, edge=edge)
     mamba.sub(imIn, imWrk, imOut)
 
@@ -168,9 +168,9 @@ def cellsBuild(imIn, imInOut, grid=mamba.DEFAULT_GRID):
     'grid' can be set to HEXAGONAL or SQUARE.    
     """
     
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    imWrk3 = mamba.imageMb(imIn, 1)
+    imWrk1 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk2 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk3 = mamba.imageMb(imIn, 1, uninitialized=True)
     vol = 0
     prec_vol = -1
     dirs = mamba.getDirections(grid)[1:]
@@ -199,8 +199,8 @@ def cellsExtract(imIn, imMarkers, imOut, grid=mamba.DEFAULT_GRID):
     'grid' can be set to HEXAGONAL or SQUARE.
     """
     
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
+    imWrk1 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk2 = mamba.imageMb(imIn, uninitialized=True)
     mamba.copy(imIn, imWrk1)
     mamba.convertByMask(imMarkers, imWrk2, 0, mamba.computeMaxRange(imIn)[1])
     mamba.logic(imIn, imWrk2,imOut, "inf")
@@ -214,7 +214,7 @@ def cellsOpenByBuild(imIn, imOut, n=1, se=mC.DEFAULT_SE):
     The images can be 8-bit or 32-bit images.
     """
     
-    imWrk = mamba.imageMb(imIn)
+    imWrk = mamba.imageMb(imIn, uninitialized=True)
     mamba.copy(imIn, imWrk)
     cellsErode(imIn, imOut, n=n, se=se)
     cellsBuild(imWrk, imOut, grid=se.getGrid())
@@ -228,7 +228,7 @@ def partitionErode(imIn, imOut, n=1, grid=mamba.DEFAULT_GRID):
     'grid' can be set to HEXAGONAL or SQUARE.
     """
     
-    imWrk = mamba.imageMb(imIn)
+    imWrk = mamba.imageMb(imIn, uninitialized=True)
     mamba.negate(imIn, imWrk)
     mamba.copy(imWrk, imOut)
     se = mC.structuringElement(mamba.getDirections(grid), grid)
@@ -246,7 +246,7 @@ def partitionDilate(imIn, imOut, n=1, grid=mamba.DEFAULT_GRID):
     'grid' can be set to HEXAGONAL or SQUARE.    
     """
     
-    imWrk = mamba.imageMb(imIn)
+    imWrk = mamba.imageMb(imIn, uninitialized=True)
     mamba.copy(imIn, imOut)
     mamba.copy(imIn, imWrk)
     se = mC.structuringElement(mamba.getDirections(grid), grid)
@@ -48,8 +48,8 @@ def binaryUltimateErosion(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID, edge=ma
     The edge is set to 'FILLED' by default.
     """
 
-    imWrk1 = mamba.imageMb(imIn, 32)
-    imWrk2 = mamba.imageMb(imIn, 32)
+    imWrk1 = mamba.imageMb(imIn, 32, uninitialized=True)
+    imWrk2 = mamba.imageMb(imIn, 32, uninitialized=True)
     mamba.computeDistance(imIn, imWrk1, grid=grid, edge=edge)
     mC.maxima(imWrk1, imOut1, grid=grid)
     mamba.convertByMask(imOut1, imWrk2, 0, mamba.computeMaxRange(imWrk2)[1])
@@ -69,9 +69,9 @@ def ultimateErosion(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID):
     """
 
     maskIm = mamba.imageMb(imIn, 1)
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    imWrk3 = mamba.imageMb(imIn, 32)
+    imWrk1 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk2 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk3 = mamba.imageMb(imIn, 32, uninitialized=True)
     se = mC.structuringElement(mamba.getDirections(grid), grid)
     i = 0
     mamba.copy(imIn, imWrk1)
@@ -106,8 +106,8 @@ def binarySkeletonByOpening(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID, edge=
     The edge is set to 'FILLED' by default.
     """
 
-    imWrk1 = mamba.imageMb(imIn, 32)
-    imWrk2 = mamba.imageMb(imIn, 32)
+    imWrk1 = mamba.imageMb(imIn, 32, uninitialized=True)
+    imWrk2 = mamba.imageMb(imIn, 32, uninitialized=True)
     se = mC.structuringElement(mamba.getDirections(grid), grid)
     mamba.computeDistance(imIn, imWrk1, grid=grid, edge=edge)
     mC.whiteTopHat(imWrk1, imWrk2, 1, se=se)
@@ -130,9 +130,9 @@ def skeletonByOpening(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID):
     """
 
     maskIm = mamba.imageMb(imIn, 1)
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    imWrk3 = mamba.imageMb(imIn, 32)
+    imWrk1 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk2 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk3 = mamba.imageMb(imIn, 32, uninitialized=True)
     se = mC.structuringElement(mamba.getDirections(grid), grid)
     i = 0
     mamba.copy(imIn, imWrk1)
@@ -164,10 +164,10 @@ def ultimateOpening(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID):
     """
 
     maskIm = mamba.imageMb(imIn, 1)
-    imWrk1 = mamba.imageMb(imIn)
+    imWrk1 = mamba.imageMb(imIn, uninitialized=True)
     imWrk2 = mamba.imageMb(imIn)
-    imWrk3 = mamba.imageMb(imIn, 32)
-    imWrk4 = mamba.imageMb(imIn)
+    imWrk3 = mamba.imageMb(imIn, 32, uninitialized=True)
+    imWrk4 = mamba.imageMb(imIn, uninitialized=True)
     se = mC.structuringElement(mamba.getDirections(grid), grid)
     i = 0
     mamba.copy(imIn, imWrk1)
@@ -205,9 +205,9 @@ def ultimateIsotropicOpening(imIn, imOut1, imOut2, step =1, grid=mamba.DEFAULT_G
     """
 
     maskIm = mamba.imageMb(imIn, 1)
-    imWrk1 = mamba.imageMb(imIn)
+    imWrk1 = mamba.imageMb(imIn, uninitialized=True)
     imWrk2 = mamba.imageMb(imIn)
-    imWrk3 = mamba.imageMb(imIn, 32)
+    imWrk3 = mamba.imageMb(imIn, 32, uninitialized=True)
     i = 0
     mamba.copy(imIn, imWrk1)
     v2 = mamba.computeVolume(imWrk1)
@@ -244,10 +244,10 @@ def ultimateBuildOpening(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID):
     """
 
     maskIm = mamba.imageMb(imIn, 1)
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    imWrk3 = mamba.imageMb(imIn, 32)
-    imWrk4 = mamba.imageMb(imIn)
+    imWrk1 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk2 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk3 = mamba.imageMb(imIn, 32, uninitialized=True)
+    imWrk4 = mamba.imageMb(imIn, uninitialized=True)
     se = mC.structuringElement(mamba.getDirections(grid), grid)
     i = 0
     mamba.copy(imIn, imWrk1)
@@ -277,9 +277,9 @@ def _initialQuasiDist_(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID):
     """
     
     maskIm = mamba.imageMb(imIn, 1)
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    imWrk3 = mamba.imageMb(imIn, 32)
+    imWrk1 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk2 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk3 = mamba.imageMb(imIn, 32, uninitialized=True)
     se = mC.structuringElement(mamba.getDirections(grid), grid)
     i = 0
     mamba.copy(imIn, imWrk1)
@@ -312,10 +312,10 @@ def quasiDistance(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID):
     Depth of 'imOut1' is the same as 'imIn', depth of 'imOut2' is 32.
     """
 
-    imWrk1 = mamba.imageMb(imIn, 32)
-    imWrk2 = mamba.imageMb(imIn, 32)
-    imWrk3 = mamba.imageMb(imIn, 32)
-    maskIm = mamba.imageMb(imIn, 1) 
+    imWrk1 = mamba.imageMb(imIn, 32, uninitialized=True)
+    imWrk2 = mamba.imageMb(imIn, 32, uninitialized=True)
+    imWrk3 = mamba.imageMb(imIn, 32, uninitialized=True)
+    maskIm = mamba.imageMb(imIn, 1, uninitialized=True) 
     se = mC.structuringElement(mamba.getDirections(grid), grid)
     _initialQuasiDist_(imIn, imOut1, imOut2, grid=grid)
     mamba.copy(imOut2, imWrk1)
@@ -344,7 +344,7 @@ def fullRegularisedGradient(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID, maxSi
     Warning! 'imOut2' is a greyscale image (depth equal to 8).
     """
 
-    imWrk = mamba.imageMb(imIn)
+    imWrk = mamba.imageMb(imIn, uninitialized=True)
     maskIm = mamba.imageMb(imIn, 1) 
     imOut1.reset()
     imOut2.reset()
@@ -15,8 +15,8 @@ def markerControlledWatershed(imIn, imMarkers, imOut, grid=mamba.DEFAULT_GRID):
     'imOut' contains the valued watershed.
     """
     
-    im_mark = mamba.imageMb(imIn, 32)
-    imWrk = mamba.imageMb(imIn)
+    im_mark = mamba.imageMb(imIn, 32, uninitialized=True)
+    imWrk = mamba.imageMb(imIn, uninitialized=True)
     mamba.label(imMarkers, im_mark, grid=grid)
     mamba.watershedSegment(imIn, im_mark, grid=grid)
     mamba.copyBytePlane(im_mark, 3, imWrk)
@@ -29,7 +29,7 @@ def valuedWatershed(imIn, imOut, grid=mamba.DEFAULT_GRID):
     in initial image 'imIn'.
     """
     
-    im_min = mamba.imageMb(imIn, 1)
+    im_min = mamba.imageMb(imIn, 1, uninitialized=True)
     mC.minima(imIn, im_min, grid=grid)
     markerControlledWatershed(imIn, im_min, imOut, grid=grid)
 
@@ -40,7 +40,7 @@ def fastSKIZ(imIn, imOut, grid=mamba.DEFAULT_GRID):
     transform by hierarchical queues.
     """
     
-    imWrk = mamba.imageMb(imIn, 8)
+    imWrk = mamba.imageMb(imIn, 8, uninitialized=True)
     mamba.convertByMask(imIn, imWrk, 1, 0)
     markerControlledWatershed(imWrk, imIn, imWrk, grid=grid)
     mamba.threshold(imWrk, imOut, 0, 0)
@@ -51,8 +51,8 @@ def geodesicSKIZ(imIn, imMask, imOut, grid=mamba.DEFAULT_GRID):
     geodesic mask 'imMask'. The result is in binary image 'imOut'.
     """
     
-    imWrk1 = mamba.imageMb(imIn, 8)
-    imWrk2 = mamba.imageMb(imIn)
+    imWrk1 = mamba.imageMb(imIn, 8, uninitialized=True)
+    imWrk2 = mamba.imageMb(imIn, uninitialized=True)
     mamba.copy(imIn, imWrk2)
     mC.build(imMask, imWrk2, grid=grid)
     mamba.convertByMask(imWrk2, imWrk1, 2, 1)
@@ -71,8 +71,8 @@ def mosaic(imIn, imOut, imWts, grid=mamba.DEFAULT_GRID):
     the maximum value of 'imIn' pixels inside them.
     """
    
-    imWrk1 = mamba.imageMb(imIn, 1)
-    imWrk2 = mamba.imageMb(imIn)
+    imWrk1 = mamba.imageMb(imIn, 1, uninitialized=True)
+    imWrk2 = mamba.imageMb(imIn, uninitialized=True)
     mamba.copy(imIn, imWrk2)
     im_mark = mamba.imageMb(imIn, 32)
     se = mC.structuringElement(mamba.getDirections(grid), grid)
@@ -96,12 +96,12 @@ def mosaicGradient(imIn, imOut, grid=mamba.DEFAULT_GRID):
     second one been valued by the infima.
     """
     
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    imWrk3 = mamba.imageMb(imIn)
-    imWrk4 = mamba.imageMb(imIn)
-    imWrk5 = mamba.imageMb(imIn)
-    imWrk6 = mamba.imageMb(imIn, 1)
+    imWrk1 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk2 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk3 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk4 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk5 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk6 = mamba.imageMb(imIn, 1, uninitialized=True)
     mosaic(imIn, imWrk2, imWrk3, grid=grid)
     mamba.sub(imWrk2, imWrk3, imWrk1)
     mamba.logic(imWrk2, imWrk3, imWrk2, "sup")
@@ -132,42 +132,7 @@ def basinSegment32(imIn, imMarker, grid=mamba.DEFAULT_GRID, max_level=-1):
     image is flooded.
     """
     
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    imWrk3 = mamba.imageMb(imIn, 8)
-    imMask = mamba.imageMb(imIn)
-    (mi, ma) = mamba.computeRange(imIn)
-    current_level = mi
-    if max_level < 0:
-        high_level = ma+1
-    else:
-        high_level = min(max_level,ma+1)
-    mamba.subConst(imIn, mi, imWrk1)
-    imMask.fill(255)
-    mamba.logic(imWrk1, imMask, imWrk2, "inf")
-    mamba.copyBytePlane(imWrk2, 0, imWrk3)
-    if high_level-current_level<256:
-        if high_level>=(ma+1):
-            level=256
-        else:
-            level=high_level-current_level
-    else:
-        level=255
-    mamba.basinSegment(imWrk3, imMarker, grid=grid, max_level=level)
-    current_level += level
-    while current_level<high_level:
-        mC.floorSubConst(imWrk1, 254, imWrk1)
-        mamba.logic(imWrk1, imMask, imWrk2, "inf")
-        mamba.copyBytePlane(imWrk2, 0, imWrk3)
-        if high_level-current_level<256:
-            if high_level>=(ma+1):
-                level=256
-            else:
-                level=high_level-current_level
-        else:
-            level=255
-        mamba.basinSegment(imWrk3, imMarker, grid=grid, max_level=level)
-        current_level += level
+    mamba.basinSegment(imIn, imMarker, grid=grid, max_level=max_level)
         
 def watershedSegment32(imIn, imMarker, grid=mamba.DEFAULT_GRID, max_level=-1):
     """
@@ -178,44 +143,4 @@ def watershedSegment32(imIn, imMarker, grid=mamba.DEFAULT_GRID, max_level=-1):
     image is flooded.
     """
     
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    imWrk3 = mamba.imageMb(imIn, 8)
-    imMask = mamba.imageMb(imIn)
-    imBinMask = mamba.imageMb(imIn, 1)
-    (mi, ma) = mamba.computeRange(imIn)
-    current_level = mi
-    if max_level < 0:
-        high_level = ma+1
-    else:
-        high_level = min(max_level,ma+1)
-    mamba.subConst(imIn, mi, imWrk1)
-    imMask.fill(255)
-    mamba.logic(imWrk1, imMask, imWrk2, "inf")
-    mamba.copyBytePlane(imWrk2, 0, imWrk3)
-    if high_level-current_level<256:
-        if high_level>=(ma+1):
-            level=256
-        else:
-            level=high_level-current_level
-    else:
-        level=255
-    mamba.watershedSegment(imWrk3, imMarker, grid=grid, max_level=level)
-    current_level += level
-    while current_level<high_level:
-        mC.floorSubConst(imWrk1, 254, imWrk1)
-        mamba.copyBytePlane(imMarker, 3, imWrk3)
-        mamba.threshold(imWrk3, imBinMask, 0, 254)
-        mamba.convertByMask(imBinMask, imWrk2, 0, mamba.computeMaxRange(imWrk2)[1])
-        mamba.logic(imMarker, imWrk2, imMarker, "inf")
-        mamba.logic(imWrk1, imMask, imWrk2, "inf")
-        mamba.copyBytePlane(imWrk2, 0, imWrk3)
-        if high_level-current_level<256:
-            if high_level>=(ma+1):
-                level=256
-            else:
-                level=high_level-current_level
-        else:
-            level=255
-        mamba.watershedSegment(imWrk3, imMarker, grid=grid, max_level=level)
-        current_level += level
+    mamba.watershedSegment(imIn, imMarker, grid=grid, max_level=max_level)
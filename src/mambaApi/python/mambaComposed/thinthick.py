@@ -147,7 +147,7 @@ def thin(imIn, imOut, dse, edge=mamba.EMPTY):
     'edge' is set to EMPTY by default.
     """
         
-    imWrk = mamba.imageMb(imIn)
+    imWrk = mamba.imageMb(imIn, uninitialized=True)
     binaryHMT(imIn, imWrk, dse, edge=edge)
     mamba.diff(imIn, imWrk, imOut)
     
@@ -160,7 +160,7 @@ def thick(imIn, imOut, dse):
     The edge is always EMPTY (as for mamba.hitOrMiss).
     """
         
-    imWrk = mamba.imageMb(imIn)
+    imWrk = mamba.imageMb(imIn, uninitialized=True)
     mamba.hitOrMiss(imIn, imWrk, *dse.getCSE(), grid=dse.getGrid())
     mamba.logic(imIn, imWrk, imOut, "sup") 
         
@@ -206,7 +206,7 @@ def rotatingThick(imIn, imOut, dse):
     
     """
     
-    imWrk = mamba.imageMb(imIn)
+    imWrk = mamba.imageMb(imIn, uninitialized=True)
     mamba.copy(imIn, imOut)
     for i in range(mamba.gridNeighbors(dse.getGrid())):
         mamba.hitOrMiss(imOut, imWrk, *dse.getCSE(), grid=dse.getGrid())
@@ -224,8 +224,8 @@ def infThin(imIn, imOut, dse, edge=mamba.EMPTY):
     'edge' is set to EMPTY by default.
     """
     
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
+    imWrk1 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk2 = mamba.imageMb(imIn, uninitialized=True)
     mamba.copy(imIn, imOut)
     mamba.copy(imIn, imWrk1)
     for i in range(mamba.gridNeighbors(dse.getGrid())):
@@ -244,8 +244,8 @@ def supThick(imIn, imOut, dse):
     The edge is always set to EMPTY.
     """
     
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
+    imWrk1 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk2 = mamba.imageMb(imIn, uninitialized=True)
     mamba.copy(imIn, imWrk1)
     mamba.copy(imIn, imOut)
     for i in range(mamba.gridNeighbors(dse.getGrid())):
@@ -264,7 +264,7 @@ def fullThin(imIn, imOut, dse, edge=mamba.EMPTY):
     """
     
     if edge == mamba.EMPTY:
-        imWrk = mamba.imageMb(imIn)
+        imWrk = mamba.imageMb(imIn, uninitialized=True)
         mamba.copy(imIn, imOut)
         v1 = mamba.computeVolume(imOut)
         v2 = 0
@@ -442,8 +442,8 @@ def endPoints(imIn, imOut, grid=mamba.DEFAULT_GRID, edge=mamba.FILLED):
     extremities touching the edge.
     """
     
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
+    imWrk1 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk2 = mamba.imageMb(imIn, uninitialized=True)
     if grid == mamba.HEXAGONAL:
         dse1 = hexagonalE
         dse2 = hexagonalL
@@ -472,8 +472,8 @@ def multiplePoints(imIn, imOut, grid=mamba.DEFAULT_GRID):
     to be missed.
     """
     
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
+    imWrk1 = mamba.imageMb(imIn, uninitialized=True)
+    imWrk2 = mamba.imageMb(imIn, uninitialized=True)
     endPoints(imIn, imWrk2)
     if grid == mamba.HEXAGONAL:
         dse_list = [hexagonalS1, hexagonalS2]
@@ -565,7 +565,7 @@ def computeSKIZ(imIn, imOut, grid=mamba.DEFAULT_GRID):
     module).
     """
 
-    imWrk = mamba.imageMb(imIn)
+    imWrk = mamba.imageMb(imIn, uninitialized=True)
     mamba.copy(imIn, imWrk)
     if grid == mamba.SQUARE:
         dse = squareS3
@@ -614,7 +614,7 @@ def rotatingGeodesicThick(imIn, imMask, imOut, dse):
     'imIn', 'imMask' and 'imOut' are binary images.
     """
 
-    imWrk = mamba.imageMb(imIn)
+    imWrk = mamba.imageMb(imIn, uninitialized=True)
     mamba.copy(imIn, imOut)
     for i in range(mamba.gridNeighbors(dse.getGrid())):
         mamba.hitOrMiss(imOut, imWrk, *dse.getCSE(), grid=dse.getGrid())    
@@ -0,0 +1,137 @@
+"""
+This module provides functions to compute an operator on an image tile by
+tile. Each tile is extended by a margin, large enough for the result inside
+the tile not to be disturbed by the edges of the extended tile. Only the
+inside of the tiles is put in the result, which is therefore identical to the
+result obtained on the whole image.
+
+The work images used by the operator have the size of the extended tiles, so
+the memory used by the computation does not grow with the size of the image.
+"""
+
+from mambaIm import mamba
+from mambaIm import mambaCore
+import mambaComposed as mC
+
+import threading
+
+# The positions and sizes of the tiles are multiples of these values, so that
+# binary tiles hold whole words of pixels and hexagonal tiles keep the parity
+# of the lines.
+_TILE_ROUND_W = 64
+_TILE_ROUND_H = 2
+
+def _roundUp(value, step):
+    return ((value + step-1)//step)*step
+
+def _cropCopy(imIn, posIn, imOut, posOut, size):
+    """
+    Same as mamba.cropCopy without display update (the tiles are copied by
+    several threads).
+    """
+    err = mambaCore.MB_CropCopy(imIn.mbIm, posIn[0], posIn[1],
+                                imOut.mbIm, posOut[0], posOut[1],
+                                size[0], size[1])
+    mamba.raiseExceptionOnError(err)
+
+def tileMargin(size, se=mC.DEFAULT_SE, steps=1):
+    """
+    Returns the margin needed around the tiles by an operator made of 'steps'
+    successive erosions or dilations of size 'size' with structuring element
+    'se' (for instance, 1 step for an erosion, 2 steps for an opening or a
+    gradient, 4 steps for an alternate filter of size 'size').
+    """
+
+    if se.getDirections(withoutZero=True):
+        return steps*size
+    return 0
+
+def tiledCompute(func, imIn, imOut, margin, tileSize=1024, threads=1):
+    """
+    Computes operator 'func' on image 'imIn' tile by tile and puts the result
+    in image 'imOut'. 'func' is called as func(tileIn, tileOut), like the
+    operators of mambaComposed, on images of the size of an extended tile. When
+    'func' has several inputs or outputs, 'imIn' and 'imOut' can be lists of
+    images and 'func' is called as func(tileIn1, tileIn2, ..., tileOut1, ...).
+    Use a lambda or functools.partial to give the other arguments of 'func'.
+
+    'margin' is the distance (in pixels) up to which the result of 'func' at a
+    pixel depends on the input pixels (see tileMargin). Operators whose result
+    depends on far pixels (reconstructions, watersheds, ultimate openings, ...)
+    cannot be computed by tiles. The edges of the tiles lying on the edges of
+    the image are treated as the edges of the image, following the edge
+    setting of 'func'.
+
+    'tileSize' is the size of the tiles (an integer or a tuple width, height).
+    It is rounded up to a multiple of 64 for the width and of 2 for the height.
+    'threads' tiles are computed at the same time, each thread using its own
+    tile images.
+
+    All the images must have the same size. The output images must be
+    different from the input images.
+    """
+
+    if not isinstance(imIn, (list, tuple)):
+        imIn = [imIn]
+    if not isinstance(imOut, (list, tuple)):
+        imOut = [imOut]
+    (width, height) = imIn[0].getSize()
+    for im in list(imIn)+list(imOut):
+        if im.getSize()!=(width, height):
+            mamba.raiseExceptionOnError(mambaCore.ERR_BAD_SIZE)
+    for im in imOut:
+        if [i for i in imIn if i is im]:
+            mamba.raiseExceptionOnError(mambaCore.ERR_BAD_PARAMETER)
+    if not isinstance(tileSize, (list, tuple)):
+        tileSize = (tileSize, tileSize)
+    tileW = _roundUp(max(tileSize[0], 1), _TILE_ROUND_W)
+    tileH = _roundUp(max(tileSize[1], 1), _TILE_ROUND_H)
+    marginW = _roundUp(margin, _TILE_ROUND_W)
+    marginH = _roundUp(margin, _TILE_ROUND_H)
+
+    # The tiles positions, taken by the threads from the end of the list
+    positions = [(x, y) for y in range(0, height, tileH) for x in range(0, width, tileW)]
+    positions.reverse()
+    lock = threading.Lock()
+    errors = []
+
+    def worker():
+        tiles = None
+        while True:
+            with lock:
+                if errors or not positions:
+                    return
+                (x, y) = positions.pop()
+            try:
+                # extended tile
+                x0 = max(x-marginW, 0)
+                y0 = max(y-marginH, 0)
+                w = min(x+tileW+marginW, width)-x0
+                h = min(y+tileH+marginH, height)-y0
+                if tiles is None or tiles[0][0].getSize()!=(w, h):
+                    tiles = ([mamba.imageMb(w, h, im.getDepth()) for im in imIn],
+                             [mamba.imageMb(w, h, im.getDepth()) for im in imOut])
+                for im, tile in zip(imIn, tiles[0]):
+                    _cropCopy(im, (x0, y0), tile, (0, 0), (w, h))
+                func(*(tiles[0]+tiles[1]))
+                # inside of the tile
+                size = (min(tileW, width-x), min(tileH, height-y))
+                for im, tile in zip(imOut, tiles[1]):
+                    _cropCopy(tile, (x-x0, y-y0), im, (x, y), size)
+            except BaseException as exc:
+                with lock:
+                    errors.append(exc)
+                return
+
+    if threads>1:
+        workers = [threading.Thread(target=worker) for i in range(threads)]
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+    else:
+        worker()
+    if errors:
+        raise errors[0]
+    for im in imOut:
+        im.updateDisplay()
@@ -389,15 +389,9 @@ class _imageDisplay(tk.Toplevel):
         f_name = tkFileDialog.askopenfilename()
         if f_name:
             im = mbUtls.load(f_name, size=(self.mbIm.width,self.mbIm.height))
-            if self.mbIm.depth==1:
-                err = mambaCore.MB_Convert(im, self.mbIm)
-                raiseExceptionOnError(err)
-            elif self.mbIm.depth==8:
-                err = mambaCore.MB_Copy(im, self.mbIm)
-                raiseExceptionOnError(err)
-            else:
-                err = mambaCore.MB_CopyBytePlane(im, self.mbIm, 0)
-                raiseExceptionOnError(err)
+            im = mbUtls.fitDepth(im, self.mbIm.depth)
+            err = mambaCore.MB_Copy(im, self.mbIm)
+            raiseExceptionOnError(err)
             self.updateim()
     def saveImage(self):
         # Saves the image into the selected file.
@@ -0,0 +1,189 @@
+"""
+This module loads and saves images on background threads, so that the
+decoding of the files overlaps the computations of a batch pipeline.
+
+The module is available in the mamba module as mamba.io:
+
+    import mamba
+    import mambaComposed
+
+    with mamba.io.ImageWriter() as writer:
+        for im in mamba.io.ImageStream(paths, prefetch=4, workers=2):
+            mambaComposed.gradient(im, imOut)
+            writer.write(imOut, "out_"+im.getName())
+
+The library releases the GIL while it decodes PGM, PPM and TIFF files (see
+imageMb.load), PIL also releases it for most of the other formats.
+"""
+
+from __future__ import division
+
+import collections
+import os.path
+
+from . import mamba
+from . import mambaCore
+from . import mambaUtils as mbUtls
+from .mambaError import raiseExceptionOnError
+
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    ThreadPoolExecutor = None
+
+def _roundedSize(width, height):
+    """Returns the size of an image created with size 'width'x'height'"""
+    w = mamba.NumpyWrapper.MB_ROUND_WIDTH
+    h = mamba.NumpyWrapper.MB_ROUND_HEIGHT
+    return (((width+w-1)//w)*w, ((height+h-1)//h)*h)
+
+def _decode(path, mbIm, rgbfilter):
+    """
+    Decodes file 'path' directly into the C core image 'mbIm' when the library
+    reads the file and 'mbIm' has its size and depth, and returns None.
+    Otherwise, returns a new C core image holding the file.
+    """
+    err, width, height, depth = mambaCore.MB_FileInfo(path)
+    if err==mambaCore.NO_ERR and mbIm is not None:
+        if (mbIm.width, mbIm.height)==_roundedSize(width, height) and mbIm.depth==depth:
+            mbUtls.loadFile(mbIm, path, rgbfilter)
+            return None
+    return mbUtls.load(path, rgb2l=rgbfilter)
+
+def _save(mbIm, path, palette):
+    mbUtls.save(mbIm, path, palette)
+
+class ImageStream(object):
+    """
+    Iterates over the images stored in the files 'paths' and yields them in
+    the order of 'paths'. The files are decoded in advance by 'workers'
+    threads, 'prefetch' files at most being decoded or waiting for the
+    iteration.
+
+    The images are recycled: the image yielded by an iteration is reused to
+    decode another file as soon as the next image is requested (copy it to keep
+    it). Only prefetch+1 images are therefore allocated when all the files
+    have the same size. The name of each image is the name of its file.
+
+    'rgbfilter' is used to convert colour files into greyscale images (see
+    imageMb.load).
+    """
+
+    def __init__(self, paths, prefetch=4, workers=2, rgbfilter=None):
+        if ThreadPoolExecutor is None:
+            raise NameError("Could not import concurrent.futures")
+        self.paths = paths
+        self.prefetch = max(prefetch, 1)
+        self.workers = max(workers, 1)
+        self.rgbfilter = rgbfilter
+
+    def __iter__(self):
+        paths = iter(self.paths)
+        free = []
+        pending = collections.deque()
+        executor = ThreadPoolExecutor(self.workers)
+        try:
+            while True:
+                # the files are submitted with the images they are decoded in
+                while len(pending)<self.prefetch:
+                    try:
+                        path = next(paths)
+                    except StopIteration:
+                        break
+                    im = free.pop() if free else None
+                    mbIm = im.mbIm if im is not None else None
+                    pending.append((executor.submit(_decode, path, mbIm, self.rgbfilter), path, im))
+                if not pending:
+                    break
+                (job, path, im) = pending.popleft()
+                mbIm = job.result()
+                if mbIm is not None:
+                    # the file was decoded in a new C core image (the images
+                    # are created here, outside of the threads)
+                    if im is None:
+                        im = mamba.imageMb(mbIm.width, mbIm.height, mbIm.depth)
+                    im.mbIm = mbIm
+                im.setName(os.path.split(path)[1])
+                yield im
+                free.append(im)
+        finally:
+            for (job, path, im) in pending:
+                job.cancel()
+            executor.shutdown(wait=True)
+
+class ImageWriter(object):
+    """
+    Saves images on 'workers' background threads (see imageMb.save). At most
+    'pending' images wait to be saved, write blocks beyond.
+
+    The images given to write are copied, they can be modified as soon as
+    write returns. The copies are recycled for the following images of the
+    same size and depth.
+
+    close waits until all the images are saved and raises the first error
+    encountered. The writer can be used in a with statement, which closes it.
+    """
+
+    def __init__(self, pending=4, workers=2):
+        if ThreadPoolExecutor is None:
+            raise NameError("Could not import concurrent.futures")
+        self.pending = max(pending, 1)
+        self._executor = ThreadPoolExecutor(max(workers, 1))
+        self._jobs = collections.deque()
+        self._free = []
+
+    def _wait(self):
+        (job, im) = self._jobs.popleft()
+        try:
+            job.result()
+        finally:
+            self._free.append(im)
+
+    def _image(self, imIn):
+        for im in self._free:
+            if im.getSize()==imIn.getSize() and im.getDepth()==imIn.getDepth():
+                self._free.remove(im)
+                return im
+        if self._free:
+            # the pool does not grow when the sizes change
+            self._free.pop()
+        return mamba.imageMb(imIn)
+
+    def write(self, im, path):
+        """
+        Saves image 'im' in file 'path' on a background thread.
+        """
+        while len(self._jobs)>=self.pending:
+            self._wait()
+        imCopy = self._image(im)
+        err = mambaCore.MB_Copy(im.mbIm, imCopy.mbIm)
+        raiseExceptionOnError(err)
+        self._jobs.append((self._executor.submit(_save, imCopy.mbIm, path, im.palette), imCopy))
+
+    def close(self):
+        """
+        Waits until all the images are saved.
+        """
+        error = None
+        while self._jobs:
+            try:
+                self._wait()
+            except Exception as exc:
+                if error is None:
+                    error = exc
+        self._executor.shutdown(wait=True)
+        if error is not None:
+            raise error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            # the error of the with block is not hidden by the writer errors
+            try:
+                self.close()
+            except Exception:
+                pass
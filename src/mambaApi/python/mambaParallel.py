@@ -0,0 +1,168 @@
+"""
+This module computes the same pipeline of operators on many independent
+images with a pool of processes.
+
+The images given to the processes are created on shared memory blocks (see
+multiprocessing.shared_memory, available since Python 3.8). Only the names of
+the blocks and the sizes of the images are sent to the processes, the pixels
+are never pickled.
+
+The module is available in the mamba module as mamba.parallel:
+
+    import mamba
+    import mambaComposed
+
+    def pipeline(imIn, imOut):
+        mambaComposed.gradient(imIn, imOut)
+
+    results = mamba.parallel.map(pipeline, images, workers=4)
+"""
+
+from __future__ import division
+
+import collections
+import multiprocessing
+
+from . import mamba
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
+class _sharedImage(object):
+    """
+    Image created on a shared memory block. The block is created when 'name'
+    is None, otherwise the existing block 'name' is opened.
+    """
+
+    def __init__(self, width, height, depth, name=None):
+        size = mamba.NumpyWrapper.bufferSize(height, width, depth)
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        try:
+            wrapper = mamba.NumpyWrapper(height, width, depth, buffer=self.shm.buf)
+            self.image = mamba.imageMb(wrapper)
+        except:
+            self.shm.close()
+            if name is None:
+                self.shm.unlink()
+            raise
+
+    def release(self, unlink=False):
+        """
+        Destroys the image and closes the shared memory block. The block is
+        removed from the system if 'unlink' is True.
+        """
+        # the image holds the block memory, it is destroyed first
+        self.image = None
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+def _run(pipeline, width, height, depthIn, depthOut, nameIn, nameOut):
+    """
+    Computes the pipeline in a process of the pool on the images held by the
+    shared memory blocks 'nameIn' and 'nameOut'.
+    """
+    imIn = _sharedImage(width, height, depthIn, nameIn)
+    try:
+        imOut = _sharedImage(width, height, depthOut, nameOut)
+        try:
+            pipeline(imIn.image, imOut.image)
+        finally:
+            imOut.release()
+    finally:
+        imIn.release()
+
+def _submit(pool, pipeline, imIn, depth):
+    """
+    Copies 'imIn' in shared memory and sends the computation to the pool.
+    Returns the job (shared input, shared output and pending result).
+    """
+    (width, height) = imIn.getSize()
+    depthIn = imIn.getDepth()
+    depthOut = depth or depthIn
+    shIn = _sharedImage(width, height, depthIn)
+    try:
+        shOut = _sharedImage(width, height, depthOut)
+    except:
+        shIn.release(True)
+        raise
+    job = (shIn, shOut, None)
+    try:
+        mamba.copy(imIn, shIn.image)
+        args = (pipeline, width, height, depthIn, depthOut, shIn.shm.name, shOut.shm.name)
+        job = (shIn, shOut, pool.apply_async(_run, args))
+    except:
+        _release(job)
+        raise
+    return job
+
+def _release(job):
+    """
+    Destroys the shared memory blocks of a job.
+    """
+    (shIn, shOut, result) = job
+    shIn.release(True)
+    shOut.release(True)
+
+def _collect(job):
+    """
+    Waits for the end of a job and returns its result in a new image.
+    """
+    try:
+        job[2].get()
+        imOut = mamba.imageMb(job[1].image)
+        mamba.copy(job[1].image, imOut)
+    finally:
+        _release(job)
+    return imOut
+
+def map(pipeline, inputs, workers=None, depth=None):
+    """
+    Computes 'pipeline' on each image of 'inputs' with a pool of 'workers'
+    processes (one per processor by default) and returns the list of the
+    results in the order of 'inputs'.
+
+    'pipeline' is called as pipeline(imIn, imOut), where 'imIn' holds a copy
+    of an input image and 'imOut' receives the result. 'imOut' has the size of
+    the input image and the depth 'depth' (by default, the depth of the input
+    image). 'pipeline' is sent to the processes, it must be a function defined
+    at the top level of a module (or a functools.partial of such a function).
+
+    Only a few images wait in shared memory at a time, so 'inputs' can be a
+    generator producing a large number of images.
+
+    An exception raised by 'pipeline' stops the computations and is raised
+    again by this function.
+    """
+
+    if shared_memory is None:
+        raise NameError("Could not import multiprocessing.shared_memory")
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+
+    results = []
+    pending = collections.deque()
+    pool = multiprocessing.Pool(workers)
+    try:
+        for imIn in inputs:
+            if len(pending) >= 2*workers:
+                results.append(_collect(pending.popleft()))
+            pending.append(_submit(pool, pipeline, imIn, depth))
+        while pending:
+            results.append(_collect(pending.popleft()))
+    except:
+        pool.terminate()
+        raise
+    else:
+        pool.close()
+    finally:
+        pool.join()
+        while pending:
+            _release(pending.popleft())
+
+    return results
@@ -7,7 +7,9 @@ These functions are not meant to be used by the end user.
 
 from __future__ import division
 
-import struct
+import sys
+import os
+import threading
 
 from . import mambaCore
 from .mambaError import raiseExceptionOnError
@@ -28,17 +30,140 @@ except ImportError:
 # convert mamba image structures easily. They also allow you to set the global
 # variables used for computations.
         
-def create(width,height,depth):
+###############################################################################
+#  Pool of images
+#
+# The C core images of the destroyed imageMb objects are kept in a pool and
+# given back by the following creations of images of the same size and depth,
+# which saves the allocation of their memory (the work images of the operators
+# in mambaComposed are created and destroyed at every call). When the pool
+# exceeds its size in bytes, the least recently released images are freed.
+# The imageMb objects using a C core image are counted in _owners, so that an
+# image shared by several of them is only released by the last one.
+
+_pool = []
+_owners = {}
+_pool_bytes = 0
+_pool_size = 256*1024*1024
+_pool_hits = 0
+_pool_misses = 0
+_pool_lock = threading.Lock()
+
+def _imageBytes(width, height, depth):
+    # size of the pixel array of an image (with its edge)
+    return (height+2)*((width*depth+7)//8+32)
+
+def _poolGet(key):
+    global _pool_bytes, _pool_hits, _pool_misses
+    with _pool_lock:
+        for i in range(len(_pool)-1, -1, -1):
+            if _pool[i][0]==key:
+                _pool_hits += 1
+                _pool_bytes -= _imageBytes(*key)
+                return _pool.pop(i)[1]
+        _pool_misses += 1
+    return None
+
+def own(im):
+    """
+    Records that the C core image 'im' is used by one more imageMb object.
+    """
+    with _pool_lock:
+        entry = _owners.get(id(im))
+        if entry is None:
+            _owners[id(im)] = [im, 1]
+        else:
+            entry[1] += 1
+
+def release(im):
+    """
+    Records that the C core image 'im' is used by one less imageMb object.
+    When no object uses it anymore, the image is given to the pool of images
+    (only the images whose memory was allocated by the library are kept).
+    
+    Returns True if the image is no longer used.
+    """
+    global _pool_bytes
+    key = (im.width, im.height, im.depth)
+    nbytes = _imageBytes(*key)
+    freed = []
+    with _pool_lock:
+        entry = _owners.get(id(im))
+        if entry is not None:
+            entry[1] -= 1
+            if entry[1]>0:
+                return False
+            del _owners[id(im)]
+        if not im.allocated or nbytes>_pool_size:
+            return True
+        _pool.append((key, im))
+        _pool_bytes += nbytes
+        while _pool_bytes>_pool_size:
+            (k, old) = _pool.pop(0)
+            _pool_bytes -= _imageBytes(*k)
+            freed.append(old)
+    # the images are freed outside the lock
+    del freed
+    return True
+    
+def setPoolSize(size):
+    """
+    Sets the size in bytes of the pool of images (0 disables the pool).
+    """
+    global _pool_size, _pool_bytes
+    with _pool_lock:
+        _pool_size = max(size, 0)
+        freed = []
+        while _pool_bytes>_pool_size:
+            (k, old) = _pool.pop(0)
+            _pool_bytes -= _imageBytes(*k)
+            freed.append(old)
+    del freed
+
+def poolStats(reset=False):
+    """
+    Returns the statistics of the pool of images. The counters of hits and
+    misses are set to 0 if 'reset' is True.
+    """
+    global _pool_hits, _pool_misses
+    with _pool_lock:
+        stats = {'hits': _pool_hits, 'misses': _pool_misses,
+                 'images': len(_pool), 'bytes': _pool_bytes,
+                 'size': _pool_size}
+        if reset:
+            _pool_hits = 0
+            _pool_misses = 0
+    return stats
+
+def create(width,height,depth,clear=True):
     """
     Creates an empty C core image (filled with black, i.e. 0) of size 
-    'width'x'height' with the required 'depth' of the image.
+    'width'x'height' with the required 'depth' of the image. The pixels are
+    left undefined when 'clear' is False.
+    
+    The image is taken from the pool of images when possible.
     
     Returns a mamba image structure.
     """
 
+    # Reusing an image of the pool (the size of the images is rounded)
+    try:
+        key = (((width+63)//64)*64, ((height+1)//2)*2, depth)
+    except TypeError:
+        key = None
+    im = _poolGet(key)
+    if im is not None:
+        if clear:
+            err = mambaCore.MB_ConSet(im, 0)
+            raiseExceptionOnError(err)
+        return im
+
     # Creating the image.
     im = mambaCore.MB_Image()
-    err = mambaCore.MB_Create(im,width,height,depth)
+    if clear:
+        err = mambaCore.MB_Create(im,width,height,depth)
+    else:
+        err = mambaCore.MB_CreateUninit(im,width,height,depth)
     raiseExceptionOnError(err)
     
     return im
@@ -47,7 +172,9 @@ def create_from_numpy(wrapper):
 
     # Creating the image.
     im = mambaCore.MB_Image()
-    if wrapper.depth == 8:
+    if wrapper.depth == 1:
+        function = mambaCore.MB_Create_from_numpyb
+    elif wrapper.depth == 8:
         function = mambaCore.MB_Create_from_numpy8
     elif wrapper.depth == 32:
         function = mambaCore.MB_Create_from_numpy32
@@ -84,6 +211,8 @@ def loadFromPILFormat(pilim, size=None, rgb2l = None):
     # Mode management
     # By default, the image depth is 8bit
     depth = 8
+    # 16-bit data are widened by the library (None for the other formats)
+    bigendian = None
     if pilim.mode == 'RGB':
         pilim = pilim.convert("L", rgb2l)
     elif pilim.mode == '1':
@@ -95,20 +224,16 @@ def loadFromPILFormat(pilim, size=None, rgb2l = None):
     # 32 bit image are extracted from I formats
     elif pilim.mode=="I;16":
         depth = 32
-        fmt = "H"
-        end = ""
+        bigendian = 0
     elif pilim.mode=="I;16B":
         depth = 32
-        fmt = "H"
-        end = ">"
-    elif pilim.mode=="I;32":
+        bigendian = 1
+    elif pilim.mode=="I;32" or pilim.mode=="I":
         depth = 32
-        fmt = "I"
-        end = ""
-    elif pilim.mode=="F;32":
+    elif pilim.mode=="F;32" or pilim.mode=="F":
+        # The float values are truncated into integers by PIL
         depth = 32
-        fmt = "f"
-        end = ""
+        pilim = pilim.convert("I")
     else:
         # Ugly ...
         pilim = pilim.convert('RGB').convert("L", rgb2l)
@@ -137,20 +262,30 @@ def loadFromPILFormat(pilim, size=None, rgb2l = None):
         pilim_crop = pilim.crop((0,0,min(wc, w),min(hc, h)))
         prov_im.paste(pilim_crop, (0,0,min(wc, w),min(hc, h)))
         pilim = prov_im   
-    s = pilim.tostring()
-    if depth==32:
-        # For 32-bit image, the pil image format may not be exacty the
-        # desired format (unsigned 32 bit value). The data are converted
-        # into the appropriate format.
-        bypd = struct.calcsize(fmt)
-        unpack_data = struct.unpack(end+wc*hc*fmt, s)
-        unpack_data = map(int, unpack_data)
-        s = struct.pack(wc*hc*"I", *unpack_data)
-    err = mambaCore.MB_Load(im_out,s,len(s))
+    s = pilim.tobytes()
+    if bigendian!=None:
+        # The 16-bit values are converted into 32-bit pixels by the library
+        # in a single pass over the data.
+        err = mambaCore.MB_Load16(im_out,s,len(s),bigendian)
+    else:
+        err = mambaCore.MB_Load(im_out,s,len(s))
     raiseExceptionOnError(err)
     
     return im_out
         
+def loadFile(im_out, filename, rgb2l=None):
+    """
+    Loads the file 'filename' into the C core image 'im_out'. The file must be
+    read by the library (see MB_FileInfo) and 'im_out' must have the depth
+    returned by MB_FileInfo. The file is cropped or padded to the size of
+    'im_out'. 'rgb2l' is used as in function load.
+    """
+    
+    if rgb2l==None or len(rgb2l)!=3:
+        rgb2l = (0.299, 0.587, 0.114)
+    err = mambaCore.MB_LoadFile(im_out, filename, rgb2l[0], rgb2l[1], rgb2l[2])
+    raiseExceptionOnError(err)
+        
 def load(filename, size=None, rgb2l = None):
     """
     Loads an image into a C core image object. You can give any image format
@@ -166,15 +301,59 @@ def load(filename, size=None, rgb2l = None):
     If the image is not fitting in the current size, the image is either padded
     or cropped.
     
+    Binary PBM, PGM and PPM files, uncompressed greyscale TIFF files and MBI
+    files are read directly by the library, the other files are read with PIL.
+    PBM files are loaded into binary images and MBI files into images of the
+    depth of the saved image.
+    
     Returns a mamba image structure.
     """
     
+    # Files read by the library (16-bit files are loaded in 32-bit images)
+    err, w, h, depth = mambaCore.MB_FileInfo(filename)
+    if err==mambaCore.NO_ERR:
+        if size!=None:
+            (w,h) = size
+        im_out = create(w, h, depth)
+        loadFile(im_out, filename, rgb2l)
+        return im_out
+    
     # Mode management
     pilim = Image.open(filename)
     im_out = loadFromPILFormat(pilim, size, rgb2l)
     
     return im_out
 
+def fitDepth(im_in, depth):
+    """
+    Returns the C core image 'im_in' given by load with the given 'depth'.
+    Binary images (PBM files) first go through an 8-bit image where their
+    pixels are 0 or 255. Binary images are then made of the pixels which are
+    not 0 and 32-bit images get the 8-bit values in their first byte plane.
+    
+    Returns 'im_in' itself when it already has the right depth.
+    """
+    
+    if im_in.depth==depth:
+        return im_in
+    if im_in.depth==1:
+        im8 = create(im_in.width, im_in.height, 8, False)
+        err = mambaCore.MB_Convert(im_in, im8)
+        raiseExceptionOnError(err)
+        if depth==8:
+            return im8
+        im_in = im8
+    im_out = create(im_in.width, im_in.height, depth)
+    if depth==1:
+        err = mambaCore.MB_Convert(im_in, im_out)
+    elif depth==8:
+        err = mambaCore.MB_Copy(im_in, im_out)
+    else:
+        err = mambaCore.MB_CopyBytePlane(im_in, im_out, 0)
+    raiseExceptionOnError(err)
+    
+    return im_out
+
 def convertToPILFormat(im_in, palette=None):
     """
     Converts a mamba C core image 'im_in' structure into a PIL image.
@@ -193,34 +372,32 @@ def convertToPILFormat(im_in, palette=None):
     # Extracting the data from the image.
     if im_in.depth==32:
         # 32-bit images
-        im = create(im_in.width, im_in.height, 8)
-        lpilim = []
-        for i in range(4):
-            err = mambaCore.MB_CopyBytePlane(im_in, im, i)
-            raiseExceptionOnError(err)
-            err,s = mambaCore.MB_Extract(im)
-            raiseExceptionOnError(err)
-            # Creating the PIL image 
-            pilim = Image.fromstring("L",(w,h),s)
-            lpilim.append(pilim)
+        # The pixels are extracted at once and their four bytes are split by
+        # PIL into the bands of a RGBA image, the least significant byte in
+        # the first band.
+        err,s = mambaCore.MB_Extract(im_in)
+        raiseExceptionOnError(err)
+        if sys.byteorder=="little":
+            rawmode = "RGBA"
+        else:
+            rawmode = "ABGR"
+        lpilim = Image.frombytes("RGBA",(w,h),s,"raw",rawmode).split()
         pilim = Image.new("L", (w*2,h*2))
         for i,im in enumerate(lpilim):
             pilim.paste(im, (w*(i%2),h*(i//2)))
     elif im_in.depth==1:
         # binary images
-        im = create(im_in.width, im_in.height, 8)
-        err = mambaCore.MB_Convert(im_in,im)
-        raiseExceptionOnError(err)
-        err,s = mambaCore.MB_Extract(im)
+        # The packed pixels are extracted at once and expanded by PIL.
+        err,s = mambaCore.MB_ExtractBin(im_in, 1)
         raiseExceptionOnError(err)
         # Creating the PIL image 
-        pilim = Image.fromstring("L",(w,h),s)
+        pilim = Image.frombytes("1",(w,h),s,"raw","1").convert("L")
     else:
         # greyscale images
         err,s = mambaCore.MB_Extract(im_in)
         raiseExceptionOnError(err)
         # Creating the PIL image 
-        pilim = Image.fromstring("L",(w,h),s)
+        pilim = Image.frombytes("L",(w,h),s)
     
     if palette:
         pilim.putpalette(palette)
@@ -232,8 +409,33 @@ def save(im_in, outname, palette=None):
     Saves a mamba C core image 'im_in' at the location path given in 'outname'.
     You can store it in any image format that is actually supported by PIL.
     'palette' is given to the convertImageToPILFormat function.
+    
+    Binary and 8-bit images without palette are written directly by the library
+    in PGM and TIFF files (extensions .pgm, .tif and .tiff) and binary images in
+    PBM files (extension .pbm). Images of any depth are written in MBI files
+    (extension .mbi), the format of the library, in which case the palette is
+    not saved.
     """
     
+    ext = os.path.splitext(outname)[1].lower()
+    if ext==".mbi":
+        err = mambaCore.MB_SaveMBI(im_in, outname, mambaCore.MB_CODEC_LZ4)
+        raiseExceptionOnError(err)
+        return
+    if palette==None and im_in.depth!=32:
+        if ext==".pgm":
+            err = mambaCore.MB_SavePGM(im_in, outname)
+            raiseExceptionOnError(err)
+            return
+        elif ext==".tif" or ext==".tiff":
+            err = mambaCore.MB_SaveTIFF(im_in, outname)
+            raiseExceptionOnError(err)
+            return
+        elif ext==".pbm" and im_in.depth==1:
+            err = mambaCore.MB_SavePBM(im_in, outname)
+            raiseExceptionOnError(err)
+            return
+    
     # Creating a PIL image with size and data
     # and saving it using the PIL save function.
     pilim = convertToPILFormat(im_in, palette)
@@ -2,24 +2,11 @@
 # setup.py
 # This is the default distutils setup function of Mamba Image library
 
-# The behavior of this script may vary depending on the system on which you
-# are operating. This script is the minimal, safest way to compile and
-# package the mamba library. It is guaranteed to work on all supported systems
-# and with all supported compilers. However it may not produce the fastest and
-# most optimized version of the library (this is indeed true on 32-bits systems
-# for which the SSE2 is not enabled by default).
-
-# To produce more optimized results use the other setup scripts
-#   -> setup_mingw32_SSE2.py : optimized setup script for 32-bits systems using
-#      gcc compiler (mingw32 on Windows). Produces a version using SSE2 
-#      instructions. Works only with GCC (see script header for information).
-#   -> setup_visualcpp_SSE2.py : optimized setup script for 32-bits Windows system
-#      using the Visual C++ compiler. Produces a version using SSE2 
-#      instructions. Works only with Visual C++ (see script header for information).
-
-# If there is no optimized setup script for your system, it can be for two reasons.
-# Firstly, the default script is already the best one you can get or secondly, your
-# system is not currently supported by Mamba.
+# The same script is used on all the supported systems and with all the
+# supported compilers. The SIMD instruction sets (SSE2, SSE4.1, AVX2 and
+# AVX-512) are compiled in the library whatever the compiler options and the
+# fastest versions of the computations supported by the processor are selected
+# when the library is loaded (see getCpuFeatures and setKernelLevel).
 
 import distutils
 from distutils.core import setup, Extension
@@ -37,11 +24,9 @@ import setup_tools
 if platform.architecture()[0] == '64bit':
     DEF_MACROS = [('BINARY64', None)]
     SWIGDEF64 = ['-DBINARY64']
-    ext_version = ''
 else:
     DEF_MACROS = []
     SWIGDEF64 = []
-    ext_version = '.noSSE2'
 # compiler options
 INC_DIRS = ['./include','./include-private','../commons']
 # swig options
@@ -54,6 +39,7 @@ EXTENSION = [
                   setup_tools.files,
                   swig_opts=SWIG_OPTS,
                   include_dirs=INC_DIRS,
+                  libraries=setup_tools.libraries,
                   define_macros=DEF_MACROS)
             ]
 
@@ -62,7 +48,7 @@ EXTENSION = [
 ################################################################################
 
 NAME = "Mamba Image"
-VERSION = setup_tools.getVersion(os.path.join("python","mamba.py"))+ext_version
+VERSION = setup_tools.getVersion(os.path.join("python","mamba.py"))
 DESCRIPTION = "A fast and simple mathematical morphology image analysis library for python"
 AUTHOR = "Nicolas BEUCHER", "nicolas.beucher@ensta.org"
 HOMEPAGE = "www.mamba-image.org"
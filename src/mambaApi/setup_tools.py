@@ -41,7 +41,9 @@ MB_API_SRC = [
     "MB_SupFarNb8", "MB_SupFarNb32", "MB_HierarBld", "MB_HierarDualBld",
     "MB_DualBldNb32", "MB_BldNb32", "MB_SupVectorb", "MB_SupVector8",
     "MB_SupVector32", "MB_InfVectorb", "MB_InfVector8", "MB_InfVector32",
-    "MB_ShiftVectorb", "MB_ShiftVector8", "MB_ShiftVector32"
+    "MB_ShiftVectorb", "MB_ShiftVector8", "MB_ShiftVector32", "MB_Thread", "MB_Cpu", "MB_Line32",
+    "MB_Program", "MB_File", "MB_Lz4", "MB_Build",
+    "MB_Watershed32"
     ]
 MB_API_SRC.sort() #Compilation in alphabetic order 
 
@@ -52,6 +54,12 @@ for s in MB_API_SRC:
 
 PACKAGES = ['','mambaComposed','mambaShell']
 
+# Libraries linked with the extension (the worker threads use the Win32 API on
+# Windows and the POSIX threads elsewhere)
+libraries = []
+if platform.platform().find("Windows")<0:
+    libraries = ['pthread']
+
 ################################################################################
 # IDLE Shell data and scripts
 ################################################################################
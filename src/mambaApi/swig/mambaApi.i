@@ -28,7 +28,12 @@
  * THE SOFTWARE.
  */
 
-%module mambaCore
+/*
+ * Every function of the library is called without holding the Python
+ * interpreter lock, so that several Python threads can compute images
+ * concurrently.
+ */
+%module(threads="1") mambaCore
 
 /* Inclusion inside the c file wrapper created by swig*/
 %{
@@ -168,13 +173,70 @@
     }
 }
 
+%typemap(in) (MB_Image **images, Uint32 nb_images) {
+    if (PyList_Check($input)) {
+        int size = PyList_Size($input);
+        int i = 0;
+        $2 = (Uint32) size;
+        $1 = (MB_Image **) malloc((size+1)*sizeof(MB_Image *));
+        for (i = 0; i < size; i++) {
+            PyObject *o = PyList_GetItem($input,i);
+            if (!SWIG_IsOK(SWIG_ConvertPtr(o, (void **) &$1[i], $descriptor(MB_Image *), 0))) {
+                PyErr_SetString(PyExc_TypeError,"list must contain images");
+                free($1);
+                return NULL;
+            }
+        }
+    } else {
+        PyErr_SetString(PyExc_TypeError,"not a list");
+        return NULL;
+    }
+}
+
+%typemap(freearg) (MB_Image **images, Uint32 nb_images) {
+    free((MB_Image **) $1);
+}
+
+%typemap(in) (Uint32 *program, Uint32 len) {
+    if (PyList_Check($input)) {
+        int size = PyList_Size($input);
+        int i = 0;
+        $2 = (Uint32) size;
+        $1 = (Uint32 *) malloc((size+1)*sizeof(Uint32));
+        for (i = 0; i < size; i++) {
+            PyObject *o = PyList_GetItem($input,i);
+            if (PyInt_Check(o) || PyLong_Check(o))
+                $1[i] = (Uint32) PyLong_AsLongLong(o);
+            else {
+                PyErr_SetString(PyExc_TypeError,"list must contain integer");
+                free($1);
+                return NULL;
+            }
+        }
+    } else {
+        PyErr_SetString(PyExc_TypeError,"not a list");
+        return NULL;
+    }
+}
+
+%typemap(freearg) (Uint32 *program, Uint32 len) {
+    free((Uint32 *) $1);
+}
+
 %apply int *OUTPUT {Sint32 *px, Sint32 *py};
 %apply unsigned int *OUTPUT {Uint32 *min, Uint32 *max};
 %apply unsigned long long *OUTPUT {Uint64 *pVolume};
+%apply unsigned long long *OUTPUT {Uint64 *address};
+%apply unsigned int *OUTPUT {Uint32 *stride};
 %apply unsigned int *OUTPUT {Uint32 *isEmpty};
 %apply unsigned int *OUTPUT {Uint32 *pNbobj};
 %apply unsigned int *OUTPUT {Uint32 *pixVal};
+%apply unsigned int *OUTPUT {Uint32 *nb_threads};
+%apply unsigned int *OUTPUT {Uint32 *flags, Uint32 *threshold};
+%apply unsigned int *OUTPUT {Uint32 *features};
+%apply unsigned int *OUTPUT {Uint32 *level};
 %apply unsigned int *OUTPUT {Uint32 *ulx, Uint32 *uly, Uint32 *brx, Uint32 *bry};
+%apply unsigned int *OUTPUT {Uint32 *fwidth, Uint32 *fheight, Uint32 *fdepth};
 
 %{
 #define SWIG_FILE_WITH_INIT
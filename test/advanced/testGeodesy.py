@@ -112,6 +112,25 @@ class TestGeodesy(unittest.TestCase):
             (x,y) = compare(self.im8_4, self.im8_2, self.im8_3)
             self.assertTrue(x<0)
             
+    def testBuildMethods(self):
+        """Verifies that the build methods give the same result"""
+        for (imMask, imWrk1, imWrk2, maxv) in ((self.im1_1, self.im1_2, self.im1_3, 1),
+                                               (self.im32_1, self.im32_2, self.im32_3, 100000)):
+            (w,h) = imMask.getSize()
+            imMask.reset()
+            self._drawTestIm(imMask, maxv)
+            for grid in (HEXAGONAL, SQUARE):
+                for (f, fill) in ((build, 0), (dualBuild, maxv)):
+                    imWrk1.fill(fill)
+                    imWrk1.setPixel(maxv-fill, (1,1))
+                    copy(imWrk1, imWrk2)
+                    f(imMask, imWrk1, grid=grid, method='hybrid')
+                    f(imMask, imWrk2, grid=grid, method='iterative')
+                    (x,y) = compare(imWrk1, imWrk2, imWrk2)
+                    self.assertTrue(x<0)
+        self.assertRaises(ValueError, build, self.im8_1, self.im8_2, method='queue')
+        self.assertRaises(ValueError, dualBuild, self.im8_1, self.im8_2, method='queue')
+            
     def testLowerGeodesicDilate_1(self):
         """Verifies the lower geodesic dilation operation for binary images"""
         (w,h) = self.im1_1.getSize()
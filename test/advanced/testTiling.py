@@ -0,0 +1,106 @@
+"""
+Test cases for the computation of operators tile by tile found in the tiling
+module of mambaComposed package.
+
+Python functions and classes:
+    tileMargin
+    tiledCompute
+"""
+
+from __future__ import division
+from mamba import *
+from mambaComposed import *
+import unittest
+import random
+
+def _twoOutputs(imIn, imOut1, imOut2):
+    erode(imIn, imOut1, 3, se=SQUARE3X3)
+    dilate(imIn, imOut2, 3, se=SQUARE3X3)
+
+class TestTiling(unittest.TestCase):
+
+    def setUp(self):
+        self.im1_1 = imageMb(1000, 700, 1)
+        self.im1_2 = imageMb(1000, 700, 1)
+        self.im1_3 = imageMb(1000, 700, 1)
+        self.im8_1 = imageMb(1000, 700, 8)
+        self.im8_2 = imageMb(1000, 700, 8)
+        self.im8_3 = imageMb(1000, 700, 8)
+        self.im8_4 = imageMb(1000, 700, 8)
+        self.im32_1 = imageMb(1000, 700, 32)
+        self.im32_2 = imageMb(1000, 700, 32)
+        self.im32_3 = imageMb(1000, 700, 32)
+        (w,h) = self.im8_1.getSize()
+        for i in range(5000):
+            self.im8_1.setPixel(random.randint(0,255), (random.randint(0,w-1), random.randint(0,h-1)))
+
+    def tearDown(self):
+        del(self.im1_1)
+        del(self.im1_2)
+        del(self.im1_3)
+        del(self.im8_1)
+        del(self.im8_2)
+        del(self.im8_3)
+        del(self.im8_4)
+        del(self.im32_1)
+        del(self.im32_2)
+        del(self.im32_3)
+        if getImageCounter()!=0:
+            print("ERROR : Mamba image are not all deleted !")
+
+    def testTileMargin(self):
+        """Verifies the margins computed from the structuring elements"""
+        self.assertEqual(tileMargin(5), 5)
+        self.assertEqual(tileMargin(5, se=SQUARE3X3, steps=2), 10)
+        self.assertEqual(tileMargin(5, se=structuringElement([0], SQUARE)), 0)
+
+    def testComputation_8(self):
+        """Verifies that tiled greyscale operators give the whole image result"""
+        for size in (1, 4, 9):
+            gradient(self.im8_1, self.im8_2, size)
+            tiledCompute(lambda i, o: gradient(i, o, size), self.im8_1, self.im8_3,
+                         tileMargin(size, steps=2), tileSize=200)
+            (x,y) = compare(self.im8_2, self.im8_3, self.im8_4)
+            self.assertTrue(x<0, "gradient %d: diff in (%d,%d)"%(size,x,y))
+            open(self.im8_1, self.im8_2, size, se=SQUARE3X3)
+            tiledCompute(lambda i, o: open(i, o, size, se=SQUARE3X3), self.im8_1, self.im8_3,
+                         tileMargin(size, SQUARE3X3, 2), tileSize=(128, 300), threads=3)
+            (x,y) = compare(self.im8_2, self.im8_3, self.im8_4)
+            self.assertTrue(x<0, "open %d: diff in (%d,%d)"%(size,x,y))
+
+    def testComputation_1(self):
+        """Verifies that tiled binary operators give the whole image result"""
+        threshold(self.im8_1, self.im1_1, 100, 255)
+        close(self.im1_1, self.im1_2, 6)
+        tiledCompute(lambda i, o: close(i, o, 6), self.im1_1, self.im1_3,
+                     tileMargin(6, steps=2), tileSize=256, threads=2)
+        (x,y) = compare(self.im1_2, self.im1_3, self.im1_3)
+        self.assertTrue(x<0, "diff in (%d,%d)"%(x,y))
+
+    def testSeveralOutputs(self):
+        """Verifies that operators with several images are computed by tiles"""
+        copyBytePlane(self.im8_1, 0, self.im32_1)
+        _twoOutputs(self.im32_1, self.im32_2, self.im32_3)
+        imOut1 = imageMb(self.im32_1)
+        imOut2 = imageMb(self.im32_1)
+        tiledCompute(_twoOutputs, [self.im32_1], [imOut1, imOut2], 3, tileSize=100)
+        (x,y) = compare(self.im32_2, imOut1, imOut1)
+        self.assertTrue(x<0, "erosion: diff in (%d,%d)"%(x,y))
+        (x,y) = compare(self.im32_3, imOut2, imOut2)
+        self.assertTrue(x<0, "dilation: diff in (%d,%d)"%(x,y))
+        del(imOut1)
+        del(imOut2)
+
+    def testErrors(self):
+        """Verifies that incorrect images raise an exception"""
+        im = imageMb(128, 128, 8)
+        self.assertRaises(MambaError, tiledCompute, copy, self.im8_1, im, 0)
+        self.assertRaises(MambaError, tiledCompute, copy, self.im8_1, self.im8_1, 0)
+        self.assertRaises(MambaError, tiledCompute, copy, self.im8_1, self.im32_1, 0, tileSize=128, threads=2)
+        del(im)
+
+def getSuite():
+    return unittest.TestLoader().loadTestsFromTestCase(TestTiling)
+
+if __name__ == '__main__':
+    unittest.main()
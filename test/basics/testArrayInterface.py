@@ -0,0 +1,96 @@
+"""
+Test cases for the numpy array interface of the images.
+
+The array returned by numpy.asarray shares the pixels of the image: the values
+read in the array must be the pixels of the image and a modification of the
+array must be seen in the image.
+
+Python functions and classes:
+    imageMb.__array_interface__
+
+C functions:
+    MB_GetPixelLayout
+"""
+
+from mamba import *
+import unittest
+import random
+import numpy as np
+
+class TestArrayInterface(unittest.TestCase):
+
+    def setUp(self):
+        self.im1_1 = imageMb(320, 130, 1)
+        self.im8_1 = imageMb(320, 130, 8)
+        self.im32_1 = imageMb(320, 130, 32)
+
+    def tearDown(self):
+        del(self.im1_1)
+        del(self.im8_1)
+        del(self.im32_1)
+        if getImageCounter()!=0:
+            print("ERROR : Mamba image are not all deleted !")
+
+    def _positions(self, im):
+        (w,h) = im.getSize()
+        return [(random.randint(0,w-1), random.randint(0,h-1)) for i in range(200)]
+
+    def testShape(self):
+        """Verifies the shape and the type of the arrays"""
+        a = np.asarray(self.im8_1)
+        self.assertEqual(a.shape, (130, 320))
+        self.assertEqual(a.dtype, np.uint8)
+        a = np.asarray(self.im32_1)
+        self.assertEqual(a.shape, (130, 320))
+        self.assertEqual(a.dtype, np.uint32)
+        a = np.asarray(self.im1_1)
+        self.assertEqual(a.shape, (130, 40))
+        self.assertEqual(a.dtype, np.uint8)
+
+    def testRead(self):
+        """Verifies that the array holds the pixels of the image"""
+        for im, maxi in ((self.im8_1, 255), (self.im32_1, 0xffffffff)):
+            positions = self._positions(im)
+            for (x,y) in positions:
+                im.setPixel(random.randint(0,maxi), (x,y))
+            a = np.asarray(im)
+            for (x,y) in positions:
+                self.assertEqual(a[y,x], im.getPixel((x,y)))
+            self.assertEqual(int(a.sum(dtype=np.uint64)), computeVolume(im))
+
+    def testWrite(self):
+        """Verifies that a modification of the array modifies the image"""
+        for im, maxi in ((self.im8_1, 255), (self.im32_1, 0xffffffff)):
+            a = np.asarray(im)
+            for (x,y) in self._positions(im):
+                v = random.randint(0,maxi)
+                a[y,x] = v
+                self.assertEqual(im.getPixel((x,y)), v)
+            a[:] = 7
+            self.assertEqual(computeVolume(im), 7*a.size)
+
+    def testBinary(self):
+        """Verifies the packed array of binary images"""
+        positions = self._positions(self.im1_1)
+        for (x,y) in positions:
+            self.im1_1.setPixel(1, (x,y))
+        bits = np.unpackbits(np.asarray(self.im1_1), axis=1, bitorder='little')
+        self.assertEqual(bits.shape, (130, 320))
+        self.assertEqual(int(bits.sum()), computeVolume(self.im1_1))
+        for (x,y) in positions:
+            self.assertEqual(bits[y,x], 1)
+
+    def testLifetime(self):
+        """Verifies that the array keeps the image alive"""
+        im = imageMb(64, 64, 8)
+        im.fill(12)
+        a = np.asarray(im)
+        del(im)
+        self.assertEqual(int(a.sum()), 12*64*64)
+        del(a)
+
+def getSuite():
+    return unittest.TestLoader().loadTestsFromTestCase(TestArrayInterface)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,7 @@
 """
 Test cases for the image basin segmentation function.
 
-The function works on 8-bit images and returns in a 32-bit image, the watershed
+The function works on 8-bit and 32-bit images and returns in a 32-bit image, the watershed
 segmentation (only the catchment basins) as found using the same 32-bit image as 
 an initialisation for wells.
 
@@ -11,8 +11,9 @@ flooding process.
 Python function:
     basinSegment
     
-C function:
+C functions:
     MB_Basins
+    MB_Basins32
 """
 from __future__ import division
 from mamba import *
@@ -60,7 +61,7 @@ class TestBasin(unittest.TestCase):
         #self.assertRaises(MambaError, basinSegment, self.im8_1, self.im32_2)
         self.assertRaises(MambaError, basinSegment, self.im32_1, self.im1_2)
         self.assertRaises(MambaError, basinSegment, self.im32_1, self.im8_2)
-        self.assertRaises(MambaError, basinSegment, self.im32_1, self.im32_2)
+        #self.assertRaises(MambaError, basinSegment, self.im32_1, self.im32_2)
 
     def testSizeCheck(self):
         """Tests that different sizes raise an exception"""
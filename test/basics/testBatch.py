@@ -0,0 +1,128 @@
+"""
+Test cases for the batch computation of operators.
+
+A batch records a sequence of operators which is computed in a single call
+to the library. The result must be the same as the one obtained by calling
+the operators one by one.
+
+Python classes and functions:
+    batch
+
+C functions:
+    MB_RunProgram
+"""
+
+from mamba import *
+from mambaComposed import *
+import unittest
+import random
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.im1_1 = imageMb(128, 128, 1)
+        self.im1_2 = imageMb(128, 128, 1)
+        self.im1_3 = imageMb(128, 128, 1)
+        self.im8_1 = imageMb(128, 128, 8)
+        self.im8_2 = imageMb(128, 128, 8)
+        self.im8_3 = imageMb(128, 128, 8)
+        self.im8_4 = imageMb(128, 128, 8)
+        self.im32_1 = imageMb(128, 128, 32)
+        self.im32_2 = imageMb(128, 128, 32)
+        self.im32_3 = imageMb(128, 128, 32)
+
+    def tearDown(self):
+        del(self.im1_1)
+        del(self.im1_2)
+        del(self.im1_3)
+        del(self.im8_1)
+        del(self.im8_2)
+        del(self.im8_3)
+        del(self.im8_4)
+        del(self.im32_1)
+        del(self.im32_2)
+        del(self.im32_3)
+        if getImageCounter()!=0:
+            print("ERROR : Mamba image are not all deleted !")
+
+    def _random(self, im, maxi):
+        (w,h) = im.getSize()
+        for i in range(500):
+            im.setPixel(random.randint(0,maxi), (random.randint(0,w-1), random.randint(0,h-1)))
+
+    def testComputation_1(self):
+        """Verifies that a binary batch gives the result of the operators"""
+        self._random(self.im1_1, 1)
+        copy(self.im1_1, self.im1_2)
+        supNeighbor(self.im1_1, self.im1_2, 2, 1, grid=HEXAGONAL)
+        logic(self.im1_1, self.im1_2, self.im1_2, "xor")
+        b = batch()
+        b.copy(self.im1_1, self.im1_3)
+        b.supNeighbor(self.im1_1, self.im1_3, 2, 1, grid=HEXAGONAL)
+        b.logic(self.im1_1, self.im1_3, self.im1_3, "xor")
+        b.run()
+        (x,y) = compare(self.im1_2, self.im1_3, self.im1_3)
+        self.assertTrue(x<0, "diff in (%d,%d)"%(x,y))
+
+    def testComputation_8(self):
+        """Verifies that a greyscale batch gives the result of the operators"""
+        self._random(self.im8_1, 255)
+        copy(self.im8_1, self.im8_2)
+        infFarNeighbor(self.im8_1, self.im8_2, 3, 7, grid=SQUARE)
+        supVector(self.im8_1, self.im8_2, (-3, 5))
+        add(self.im8_1, self.im8_2, self.im8_2)
+        negate(self.im8_2, self.im8_2)
+        b = batch()
+        b.copy(self.im8_1, self.im8_3)
+        b.infFarNeighbor(self.im8_1, self.im8_3, 3, 7, grid=SQUARE)
+        b.supVector(self.im8_1, self.im8_3, (-3, 5))
+        b.add(self.im8_1, self.im8_3, self.im8_3)
+        b.negate(self.im8_3, self.im8_3)
+        b.run()
+        (x,y) = compare(self.im8_2, self.im8_3, self.im8_4)
+        self.assertTrue(x<0, "diff in (%d,%d)"%(x,y))
+        # a batch can be computed several times
+        b.run()
+        (x,y) = compare(self.im8_2, self.im8_3, self.im8_4)
+        self.assertTrue(x<0, "second run: diff in (%d,%d)"%(x,y))
+
+    def testComputation_32(self):
+        """Verifies that a 32-bit batch gives the result of the operators"""
+        self._random(self.im32_1, 100000)
+        self.im32_2.fill(1000)
+        sub(self.im32_1, self.im32_2, self.im32_2)
+        infNeighbor(self.im32_1, self.im32_2, 1, 2, grid=HEXAGONAL)
+        b = batch()
+        b.fill(self.im32_3, 1000)
+        b.sub(self.im32_1, self.im32_3, self.im32_3)
+        b.infNeighbor(self.im32_1, self.im32_3, 1, 2, grid=HEXAGONAL)
+        b.run()
+        (x,y) = compare(self.im32_2, self.im32_3, self.im32_3)
+        self.assertTrue(x<0, "diff in (%d,%d)"%(x,y))
+
+    def testLargeErode(self):
+        """Verifies the large erosions and dilations computed with a batch"""
+        self._random(self.im8_1, 255)
+        largeHexagonalErode(self.im8_1, self.im8_2, 5)
+        erode(self.im8_1, self.im8_3, 5, se=HEXAGON)
+        (x,y) = compare(self.im8_2, self.im8_3, self.im8_4)
+        self.assertTrue(x<0, "erosion: diff in (%d,%d)"%(x,y))
+        largeSquareDilate(self.im8_1, self.im8_2, 4)
+        dilate(self.im8_1, self.im8_3, 4, se=SQUARE3X3)
+        (x,y) = compare(self.im8_2, self.im8_3, self.im8_4)
+        self.assertTrue(x<0, "dilation: diff in (%d,%d)"%(x,y))
+
+    def testErrors(self):
+        """Verifies that an incorrect batch raises an exception"""
+        b = batch()
+        b.copy(self.im8_1, self.im32_1)
+        self.assertRaises(MambaError, b.run)
+        b = batch()
+        b.infNeighbor(self.im8_1, self.im8_2, 12, 1, grid=SQUARE)
+        self.assertRaises(MambaError, b.run)
+
+def getSuite():
+    return unittest.TestLoader().loadTestsFromTestCase(TestBatch)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+"""
+Test cases for the hybrid build functions.
+
+The functions work on binary, greyscale and 32-bit images. All images, both
+input and output, must have the same depth.
+
+The functions build (or dual build) an image using the first input image as a
+mask. The result must be the one obtained by repeating the builds by neighbors
+in all the directions until the image stops changing.
+
+The function result depends on choice over grid.
+
+Python functions:
+    hybridBuild
+    hybridDualBuild
+
+C functions:
+    MB_Build
+    MB_DualBuild
+"""
+
+from __future__ import division
+from mamba import *
+import unittest
+import random
+
+class TestBuild(unittest.TestCase):
+
+    def setUp(self):
+        # Creating three images for each possible depth
+        self.im1_1 = imageMb(200, 51, 1)
+        self.im1_2 = imageMb(200, 51, 1)
+        self.im1_3 = imageMb(200, 51, 1)
+        self.im8_1 = imageMb(200, 51, 8)
+        self.im8_2 = imageMb(200, 51, 8)
+        self.im8_3 = imageMb(200, 51, 8)
+        self.im32_1 = imageMb(200, 51, 32)
+        self.im32_2 = imageMb(200, 51, 32)
+        self.im32_3 = imageMb(200, 51, 32)
+        self.im8s2_1 = imageMb(128,128,8)
+
+    def tearDown(self):
+        del(self.im1_1)
+        del(self.im1_2)
+        del(self.im1_3)
+        del(self.im8_1)
+        del(self.im8_2)
+        del(self.im8_3)
+        del(self.im32_1)
+        del(self.im32_2)
+        del(self.im32_3)
+        del(self.im8s2_1)
+        if getImageCounter()!=0:
+            print("ERROR : Mamba image are not all deleted !")
+
+    def testDepthAcceptation(self):
+        """Tests that incorrect depth raises an exception"""
+        for f in (hybridBuild, hybridDualBuild):
+            self.assertRaises(MambaError, f, self.im1_1, self.im8_2)
+            self.assertRaises(MambaError, f, self.im1_1, self.im32_2)
+            self.assertRaises(MambaError, f, self.im8_1, self.im1_2)
+            self.assertRaises(MambaError, f, self.im8_1, self.im32_2)
+            self.assertRaises(MambaError, f, self.im32_1, self.im1_2)
+            self.assertRaises(MambaError, f, self.im32_1, self.im8_2)
+
+    def testSizeCheck(self):
+        """Tests that different sizes raise an exception"""
+        self.assertRaises(MambaError, hybridBuild, self.im8s2_1, self.im8_2)
+        self.assertRaises(MambaError, hybridDualBuild, self.im8_1, self.im8s2_1)
+
+    def _fill(self, im, count, maxv):
+        (w,h) = im.getSize()
+        im.reset()
+        for i in range(count):
+            im.setPixel(random.randint(0,maxv), (random.randint(0,w-1), random.randint(0,h-1)))
+
+    def _iterative(self, imMask, imInout, grid, dual):
+        vol = 0
+        prec_vol = -1
+        while prec_vol!=vol:
+            prec_vol = vol
+            for d in getDirections(grid)[1:]:
+                if dual:
+                    vol = dualbuildNeighbor(imMask, imInout, d, grid=grid)
+                else:
+                    vol = buildNeighbor(imMask, imInout, d, grid=grid)
+
+    def testComputation(self):
+        """Verifies that the hybrid builds give the iterative result"""
+        for (ims, maxv) in (((self.im1_1, self.im1_2, self.im1_3), 1),
+                            ((self.im8_1, self.im8_2, self.im8_3), 255),
+                            ((self.im32_1, self.im32_2, self.im32_3), 0xffffffff)):
+            (imMask, imMarker, imRef) = ims
+            for grid in (HEXAGONAL, SQUARE):
+                for dual in (False, True):
+                    # a mask made of thin winding paths
+                    self._fill(imMask, 6000, maxv)
+                    self._fill(imMarker, 30, maxv)
+                    if dual:
+                        negate(imMarker, imMarker)
+                    copy(imMarker, imRef)
+                    self._iterative(imMask, imRef, grid, dual)
+                    if dual:
+                        hybridDualBuild(imMask, imMarker, grid=grid)
+                    else:
+                        hybridBuild(imMask, imMarker, grid=grid)
+                    (x,y) = compare(imRef, imMarker, imRef)
+                    self.assertTrue(x<0, "%d-bit %s dual=%s: diff in (%d,%d)"
+                                    % (imMask.getDepth(), repr(grid), dual, x, y))
+
+    def testGridEffect(self):
+        """Verifies that grid is correctly taken into account"""
+        self.im8_1.reset()
+        for (x,y) in ((10,10), (9,9), (9,11), (11,9), (11,11)):
+            self.im8_1.setPixel(255, (x,y))
+        self.im8_2.reset()
+        self.im8_2.setPixel(255, (10,10))
+        hybridBuild(self.im8_1, self.im8_2, grid=SQUARE)
+        self.assertEqual(computeVolume(self.im8_2), 5*255)
+        # on the hexagonal grid, only the pixels on the left are connected on
+        # an even line
+        self.im8_2.reset()
+        self.im8_2.setPixel(255, (10,10))
+        hybridBuild(self.im8_1, self.im8_2, grid=HEXAGONAL)
+        self.assertEqual(computeVolume(self.im8_2), 3*255)
+        self.assertEqual(self.im8_2.getPixel((9,9)), 255)
+        self.assertEqual(self.im8_2.getPixel((9,11)), 255)
+
+def getSuite():
+    return unittest.TestLoader().loadTestsFromTestCase(TestBuild)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -239,6 +239,23 @@ class TestCopy(unittest.TestCase):
             (x,y) = compare(self.im32_2, self.im32_1, self.im32_3)
             self.assertTrue(x<0, "%d,%d - %d,%d" % (x,y,xi,yi))
 
+    def testCropCopy_1(self):
+        """Verifies that image crop copy works with binary image"""
+        (w,h) = self.im1s2_1.getSize()
+        (W,H) = self.im1_1.getSize()
+        for i in range(100):
+            self.im1s2_1.fill(1)
+            xi = random.randint(0,(W-w)//64)*64
+            yi = random.randint(0,h-1)
+            self.im1_2.reset()
+            drawSquare(self.im1_2,[xi,yi,xi+w-1,yi+h-1],1)
+            self.im1_1.reset()
+            cropCopy(self.im1s2_1, (0,0), self.im1_1, (xi,yi), (w,h))
+            (x,y) = compare(self.im1_2, self.im1_1, self.im1_3)
+            self.assertTrue(x<0, "%d,%d - %d,%d" % (x,y,xi,yi))
+        self.assertRaises(MambaError, cropCopy, self.im1s2_1, (0,0), self.im1_1, (32,0), (w,h))
+        self.assertRaises(MambaError, cropCopy, self.im1s2_1, (0,0), self.im1_1, (0,0), (100,h))
+
 def getSuite():
     return unittest.TestLoader().loadTestsFromTestCase(TestCopy)
 
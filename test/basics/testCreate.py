@@ -13,18 +13,23 @@ Python function:
 C function:
     MB_Create
     MB_Load
+    MB_Load16
+    MB_LoadBin
     MB_Extract
+    MB_ExtractBin
 """
 
 from __future__ import division
 from mamba import *
 import mambaCore
+import mambaUtils
 import unittest
 try:
     import Image
 except ImportError:
     from PIL import Image
 import random
+import struct
 import os
 
 class TestCreate(unittest.TestCase):
@@ -39,9 +44,6 @@ class TestCreate(unittest.TestCase):
         for i in range(100):
             if i!=1 and i!=8 and i!=32:
                 self.assertRaises(MambaError, imageMb, i)
-        im1 = imageMb(128,128,1)
-        self.assertRaises(MambaError, im1.extractRaw)
-        self.assertRaises(MambaError, im1.loadRaw, "")
         
                 
     def testSizeDepthParameters(self):
@@ -173,6 +175,35 @@ class TestCreate(unittest.TestCase):
             im32.save("test32.jpg")
             os.remove("test32.jpg")
             
+    def testLoad16(self):
+        """Ensures that 16-bit images are loaded in 32-bit images"""
+        (w,h) = (200,51)
+        values = [random.randint(0,0xffff) for i in range(w*h)]
+        for mode, end in (("I;16", "<"), ("I;16B", ">")):
+            pilim = Image.frombytes(mode, (w,h), struct.pack(end+"%dH" % (w*h), *values))
+            im32 = imageMb(w,h,32)
+            im32.mbIm = mambaUtils.loadFromPILFormat(pilim, (w,h))
+            self.assertTrue(im32.getDepth()==32)
+            for i in range(200):
+                (x,y) = (random.randint(0,w-1), random.randint(0,h-1))
+                self.assertTrue(im32.getPixel((x,y))==values[x+y*w], "%s: %d,%d" %(mode,x,y))
+            self.assertTrue(computeVolume(im32)==sum(values))
+            
+    def testConvert32(self):
+        """Ensures that the byte planes of 32-bit images are converted"""
+        (w,h) = (128,64)
+        im32 = imageMb(w,h,32)
+        for i in range(200):
+            im32.setPixel(random.randint(0,0xffffffff), (random.randint(0,w-1), random.randint(0,h-1)))
+        pilim = mambaUtils.convertToPILFormat(im32.mbIm)
+        self.assertTrue(pilim.size==(2*w,2*h))
+        for i in range(200):
+            (x,y) = (random.randint(0,w-1), random.randint(0,h-1))
+            v = im32.getPixel((x,y))
+            for plane in range(4):
+                pixel = pilim.getpixel((x+w*(plane%2),y+h*(plane//2)))
+                self.assertTrue(pixel[0]==(v>>(8*plane))&0xff)
+        
     def testLoadRaw(self):
         """Ensures that the load raw method works correctly"""
         im8 = imageMb(128,128,8)
@@ -188,6 +219,33 @@ class TestCreate(unittest.TestCase):
         vol = computeVolume(im32)
         self.assertTrue(vol==128*128*0x11, "32: %d,%d" %(vol,128*128*0x11))
         
+    def testLoadRaw_1(self):
+        """Ensures that binary images are loaded with packed pixels"""
+        im1 = imageMb(128,128,1)
+        im8 = imageMb(128,128,8)
+        # the first pixel of each byte is in its most significant bit
+        rawdata = 128*16*b"\x80"
+        self.assertRaises(AssertionError, im1.loadRaw, rawdata[1:])
+        im1.loadRaw(rawdata)
+        self.assertEqual(computeVolume(im1), 128*16)
+        self.assertEqual(im1.getPixel((0,5)), 1)
+        self.assertEqual(im1.getPixel((1,5)), 0)
+        self.assertEqual(im1.getPixel((8,5)), 1)
+        # the data are given to the library as they are
+        rawdata = bytes(bytearray(random.randint(0,255) for i in range(128*16)))
+        im1.loadRaw(rawdata)
+        self.assertEqual(im1.extractRaw(), rawdata)
+        err,s = mambaCore.MB_ExtractBin(im1.mbIm, 0)
+        self.assertEqual(err, mambaCore.NO_ERR)
+        reverse = lambda b: int('{0:08b}'.format(b)[::-1], 2)
+        self.assertEqual(bytearray(s), bytearray(reverse(b) for b in bytearray(rawdata)))
+        for i in range(100):
+            (x,y) = (random.randint(0,127), random.randint(0,127))
+            b = (bytearray(rawdata)[y*16+x//8]>>(7-x%8))&1
+            self.assertEqual(im1.getPixel((x,y)), b)
+        err = mambaCore.MB_LoadBin(im8.mbIm, rawdata, len(rawdata), 1)
+        self.assertEqual(err, mambaCore.ERR_BAD_DEPTH)
+        
     def testExtractRaw(self):
         """Ensures that the extract raw method works properly"""
         im8 = imageMb(128,128,8)
@@ -200,6 +258,12 @@ class TestCreate(unittest.TestCase):
         rawdata = im32.extractRaw()
         self.assertTrue(len(rawdata)==128*128*4)
         self.assertTrue(rawdata==128*128*b"\x44\x33\x22\x11")
+        im1 = imageMb(128,128,1)
+        im1.setPixel(1, (2,0))
+        im1.setPixel(1, (127,127))
+        rawdata = im1.extractRaw()
+        self.assertTrue(len(rawdata)==128*16)
+        self.assertTrue(rawdata==b"\x20"+(128*16-2)*b"\x00"+b"\x01")
         
 
 def getSuite():
@@ -0,0 +1,308 @@
+"""
+Test cases for the image files read and written by the library (binary PBM,
+PGM and PPM files, uncompressed greyscale TIFF files, MBI files).
+
+Python functions:
+    imageMb.load
+    imageMb.loadRegion
+    imageMb.save
+
+C functions:
+    MB_FileInfo
+    MB_LoadFile
+    MB_SavePGM
+    MB_SaveTIFF
+    MB_SavePBM
+    MB_SaveMBI
+    MB_LoadMBI
+"""
+
+from mamba import *
+import mambaCore
+import mambaUtils
+import unittest
+try:
+    import Image
+except ImportError:
+    from PIL import Image
+import random
+import struct
+import tempfile
+import shutil
+import os
+
+class TestFile(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.im1_1 = imageMb(200, 51, 1)
+        self.im8_1 = imageMb(200, 51, 8)
+        self.im8_2 = imageMb(200, 51, 8)
+        self.im8_3 = imageMb(200, 51, 8)
+        self.im32_1 = imageMb(200, 51, 32)
+        (w,h) = self.im8_1.getSize()
+        for i in range(2000):
+            self.im8_1.setPixel(random.randint(0,255), (random.randint(0,w-1), random.randint(0,h-1)))
+
+    def tearDown(self):
+        del(self.im1_1)
+        del(self.im8_1)
+        del(self.im8_2)
+        del(self.im8_3)
+        del(self.im32_1)
+        shutil.rmtree(self.dir)
+        if getImageCounter()!=0:
+            print("ERROR : Mamba image are not all deleted !")
+
+    def _path(self, name):
+        return os.path.join(self.dir, name)
+
+    def testSaveLoad_8(self):
+        """Verifies that 8-bit images are saved and loaded by the library"""
+        for name in ("test.pgm", "test.tif", "test.TIFF"):
+            path = self._path(name)
+            self.im8_1.save(path)
+            (w,h) = self.im8_1.getSize()
+            self.assertEqual(mambaCore.MB_FileInfo(path), [mambaCore.NO_ERR, w, h, 8])
+            im = imageMb(path)
+            (x,y) = compare(self.im8_1, im, self.im8_3)
+            self.assertTrue(x<0, "%s: diff in (%d,%d)"%(name,x,y))
+            # the file can also be read by PIL
+            pilim = Image.open(path)
+            self.assertEqual(pilim.size, (w,h))
+            self.assertEqual(pilim.getpixel((17,9)), self.im8_1.getPixel((17,9)))
+            del(im)
+
+    def testSaveLoad_1(self):
+        """Verifies that binary images are saved as 0 and 255"""
+        threshold(self.im8_1, self.im1_1, 1, 255)
+        path = self._path("test.pgm")
+        self.im1_1.save(path)
+        self.im8_2.load(path)
+        convert(self.im1_1, self.im8_3)
+        (x,y) = compare(self.im8_2, self.im8_3, self.im8_2)
+        self.assertTrue(x<0, "diff in (%d,%d)"%(x,y))
+
+    def testSaveLoad_PBM(self):
+        """Verifies that binary images are saved and loaded in PBM files"""
+        threshold(self.im8_1, self.im1_1, 1, 255)
+        path = self._path("test.pbm")
+        self.im1_1.save(path)
+        (w,h) = self.im1_1.getSize()
+        self.assertEqual(mambaCore.MB_FileInfo(path), [mambaCore.NO_ERR, w, h, 1])
+        im = imageMb(path)
+        self.assertEqual(im.getDepth(), 1)
+        (x,y) = compare(self.im1_1, im, im)
+        self.assertTrue(x<0, "diff in (%d,%d)"%(x,y))
+        # the file is read by PIL with the same pixels (1 is white)
+        pilim = Image.open(path)
+        self.assertEqual(pilim.mode, "1")
+        for i in range(200):
+            (x,y) = (random.randint(0,w-1), random.randint(0,h-1))
+            self.assertEqual(pilim.getpixel((x,y))!=0, self.im1_1.getPixel((x,y))==1)
+        # loaded into greyscale images as 0 and 255
+        self.im8_2.load(path)
+        convert(self.im1_1, self.im8_3)
+        (x,y) = compare(self.im8_2, self.im8_3, self.im8_2)
+        self.assertTrue(x<0, "diff in (%d,%d)"%(x,y))
+        self.assertEqual(mambaCore.MB_SavePBM(self.im8_1.mbIm, path), mambaCore.ERR_BAD_DEPTH)
+        del(im)
+
+    def testLoad_PBM(self):
+        """Verifies that PBM files of any width are loaded"""
+        (w,h) = (77,9)
+        bits = [[random.randint(0,1) for x in range(w)] for y in range(h)]
+        path = self._path("test77.pbm")
+        f = open(path, "wb")
+        f.write(b"P4\n# binary\n77 9\n")
+        for y in range(h):
+            row = bytearray((w+7)//8)
+            for x in range(w):
+                if bits[y][x]:
+                    row[x//8] |= 0x80>>(x%8)
+            # the bits after the last pixel are not used
+            row[-1] |= 0x07
+            f.write(bytes(row))
+        f.close()
+        im = imageMb(path)
+        self.assertEqual(im.getSize(), (128, 10))
+        for y in range(10):
+            for x in range(128):
+                v = (1-bits[y][x]) if (x<w and y<h) else 0
+                self.assertEqual(im.getPixel((x,y)), v, "(%d,%d)"%(x,y))
+        del(im)
+
+    def testLoad_16(self):
+        """Verifies that 16-bit files are loaded in 32-bit images"""
+        (w,h) = (70,9)
+        values = [random.randint(0,0xffff) for i in range(w*h)]
+        path = self._path("test16.pgm")
+        f = open(path, "wb")
+        f.write(b"P5\n# 16-bit\n70 9\n65535\n")
+        f.write(struct.pack(">%dH" % (w*h), *values))
+        f.close()
+        im = imageMb(path)
+        self.assertEqual(im.getDepth(), 32)
+        self.assertEqual(im.getSize(), (128, 10))
+        for i in range(200):
+            (x,y) = (random.randint(0,w-1), random.randint(0,h-1))
+            self.assertEqual(im.getPixel((x,y)), values[x+y*w])
+        self.assertEqual(computeVolume(im), sum(values))
+        del(im)
+
+    def testLoad_RGB(self):
+        """Verifies that colour files are converted as with PIL"""
+        pilim = Image.new("RGB", (128,10))
+        pilim.putdata([(random.randint(0,255), random.randint(0,255), random.randint(0,255)) for i in range(128*10)])
+        path = self._path("test.ppm")
+        pilim.save(path)
+        for rgb2l in (None, (0.5, 0.5, 0.0)):
+            im = imageMb(path, rgbfilter=rgb2l)
+            imPIL = imageMb(128, 10, 8)
+            imPIL.mbIm = mambaUtils.loadFromPILFormat(Image.open(path), rgb2l=rgb2l)
+            (x,y) = compare(im, imPIL, imPIL)
+            self.assertTrue(x<0, "%s: diff in (%d,%d)"%(str(rgb2l),x,y))
+            del(im)
+            del(imPIL)
+
+    def testCropPad(self):
+        """Verifies that files of another size are cropped or padded"""
+        path = self._path("test.tif")
+        self.im8_1.save(path)
+        im = imageMb(64, 20, 8)
+        im.fill(255)
+        im.load(path)
+        for i in range(200):
+            (x,y) = (random.randint(0,63), random.randint(0,19))
+            self.assertEqual(im.getPixel((x,y)), self.im8_1.getPixel((x,y)))
+        im = imageMb(320, 60, 8)
+        im.fill(255)
+        im.load(path)
+        self.assertEqual(computeVolume(im), computeVolume(self.im8_1))
+        del(im)
+
+    def testMBI(self):
+        """Verifies that images of any depth are saved and loaded in MBI files"""
+        threshold(self.im8_1, self.im1_1, 1, 255)
+        (w,h) = self.im32_1.getSize()
+        for i in range(2000):
+            self.im32_1.setPixel(random.randint(0,0xffffffff), (random.randint(0,w-1), random.randint(0,h-1)))
+        path = self._path("test.mbi")
+        for imIn in (self.im1_1, self.im8_1, self.im32_1):
+            imIn.save(path)
+            self.assertEqual(mambaCore.MB_FileInfo(path), [mambaCore.NO_ERR, w, h, imIn.getDepth()])
+            im = imageMb(path)
+            self.assertEqual(im.getDepth(), imIn.getDepth())
+            imWrk = imageMb(imIn)
+            (x,y) = compare(imIn, im, imWrk)
+            self.assertTrue(x<0, "%d-bit: diff in (%d,%d)"%(imIn.getDepth(),x,y))
+            del(im)
+            del(imWrk)
+        # a constant image is compressed
+        self.im32_1.fill(0x12345678)
+        self.im32_1.save(path)
+        self.assertTrue(os.path.getsize(path)<w*h)
+
+    def testMBIRegion(self):
+        """Verifies that a part of a MBI file is loaded"""
+        im32 = imageMb(600, 520, 32)
+        im8 = imageMb(im32, 8)
+        (w,h) = im32.getSize()
+        for i in range(5000):
+            im32.setPixel(random.randint(0,0xffffffff), (random.randint(0,w-1), random.randint(0,h-1)))
+        copyBytePlane(im32, 1, im8)
+        im1 = imageMb(im32, 1)
+        threshold(im8, im1, 128, 255)
+        for imSrc in (im1, im8, im32):
+            depth = imSrc.getDepth()
+            path = self._path("region%d.mbi" % depth)
+            imSrc.save(path)
+            for (x,y) in ((0,0), (256,256), (37,101), (500,480), (700,10)):
+                im = imageMb(128, 64, depth)
+                im.fill(1)
+                im.loadRegion(path, x, y)
+                # the expected part is cut in the 8-bit or 32-bit image
+                imRef = imageMb(im, 32 if depth==32 else 8)
+                if x<w and y<h:
+                    cropCopy(im32 if depth==32 else im8, (x,y), imRef, (0,0), (128,64))
+                if depth==1:
+                    imRef1 = imageMb(im)
+                    threshold(imRef, imRef1, 128, 255)
+                    imRef = imRef1
+                (xd,yd) = compare(imRef, im, imRef)
+                self.assertTrue(xd<0, "%d-bit (%d,%d): diff in (%d,%d)"%(depth,x,y,xd,yd))
+                del(im)
+                del(imRef)
+        del(im1)
+        del(im8)
+        del(im32)
+
+    def _tiff(self, name, width, height, rowsperstrip, nbstrips, data):
+        # little endian TIFF file with 8-bit pixels whose strip offsets are
+        # LONG values (the first one at the end of the header)
+        path = self._path(name)
+        entries = [(256,4,1,width), (257,4,1,height), (258,3,1,8), (259,3,1,1),
+                   (262,3,1,1), (278,4,1,rowsperstrip), (273,4,nbstrips,98)]
+        f = open(path, "wb")
+        f.write(b"II*\0"+struct.pack("<IH", 8, len(entries)))
+        for (tag, typ, count, value) in entries:
+            f.write(struct.pack("<HHII", tag, typ, count, value))
+        f.write(struct.pack("<I", 0))
+        f.write(data)
+        f.close()
+        return path
+
+    def testCorruptTIFF(self):
+        """Verifies that TIFF files with an impossible header are rejected"""
+        path = self._tiff("good.tif", 64, 10, 10, 1, b"\x80"*640)
+        self.assertEqual(mambaCore.MB_FileInfo(path), [mambaCore.NO_ERR, 64, 10, 8])
+        # the strip goes past the end of the file
+        path = self._tiff("short.tif", 64, 10, 10, 1, b"\x80"*600)
+        self.assertEqual(mambaCore.MB_FileInfo(path)[0], mambaCore.ERR_LOAD_DATA)
+        # the table of the strips goes past the end of the file
+        path = self._tiff("strips.tif", 1, 0x40000001, 1, 0x40000001, b"\0"*200000)
+        self.assertEqual(mambaCore.MB_FileInfo(path)[0], mambaCore.ERR_LOAD_DATA)
+        # the image is too large for the library
+        path = self._tiff("large.tif", 0x10000, 0x10001, 0x10001, 1, b"\0"*100)
+        self.assertEqual(mambaCore.MB_FileInfo(path)[0], mambaCore.ERR_LOAD_DATA)
+
+    def testCorruptMBI(self):
+        """Verifies that MBI files with an impossible header are rejected"""
+        path = self._path("corrupt.mbi")
+        for (w, h, depth, tw, th, offsets) in (
+                # tiles too large, or not a multiple of 64
+                (64, 64, 32, 65536, 65536, (52, 52)),
+                (64, 64, 32, 100, 64, (52, 52)),
+                # table of the tiles past the end of the file
+                (0x10000000, 16, 8, 64, 64, (52, 52)),
+                # tile past the end of the file
+                (64, 64, 8, 64, 64, (52, 52+4096))):
+            f = open(path, "wb")
+            f.write(b"MAMBAIMG"+struct.pack("<7I", 1, w, h, depth, tw, th, 0))
+            f.write(struct.pack("<%dQ" % len(offsets), *offsets))
+            f.close()
+            self.assertEqual(mambaCore.MB_FileInfo(path)[0], mambaCore.ERR_LOAD_DATA)
+            im = imageMb(64, 64, depth)
+            self.assertEqual(mambaCore.MB_LoadMBI(im.mbIm, path, 0, 0), mambaCore.ERR_LOAD_DATA)
+            del(im)
+
+    def testFallback(self):
+        """Verifies that the other files are left to PIL"""
+        path = self._path("test.png")
+        self.im8_1.save(path)
+        self.assertEqual(mambaCore.MB_FileInfo(path)[0], mambaCore.ERR_LOAD_DATA)
+        self.assertEqual(mambaCore.MB_FileInfo(self._path("none.pgm"))[0], mambaCore.ERR_LOAD_DATA)
+        im = imageMb(path)
+        (x,y) = compare(self.im8_1, im, self.im8_3)
+        self.assertTrue(x<0, "diff in (%d,%d)"%(x,y))
+        # 32-bit images are saved with PIL
+        path = self._path("test32.tif")
+        self.im32_1.save(path)
+        self.assertEqual(Image.open(path).size, (512, 104))
+        del(im)
+
+def getSuite():
+    return unittest.TestLoader().loadTestsFromTestCase(TestFile)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+Test cases for the creation of images from numpy arrays.
+
+An array whose memory holds the edge of the library is used by the image
+without copy, the other arrays are copied in a padded array. In both cases the
+pixels of the image must be the values of the array.
+
+Python functions and classes:
+    imageMb.fromArray
+"""
+
+from mamba import *
+import unittest
+import random
+import numpy as np
+
+class TestFromArray(unittest.TestCase):
+
+    def tearDown(self):
+        if getImageCounter()!=0:
+            print("ERROR : Mamba image are not all deleted !")
+
+    def _random(self, shape, maxi, dtype):
+        return np.array([[random.randint(0,maxi) for x in range(shape[1])] for y in range(shape[0])], dtype=dtype)
+
+    def _check(self, im, arr):
+        for i in range(200):
+            (x,y) = (random.randint(0,arr.shape[1]-1), random.randint(0,arr.shape[0]-1))
+            self.assertEqual(im.getPixel((x,y)), arr[y,x])
+
+    def testCopy_8(self):
+        """Verifies that a plain uint8 array is copied in a greyscale image"""
+        arr = self._random((77, 100), 255, np.uint8)
+        im = imageMb.fromArray(arr)
+        self.assertEqual(im.getSize(), (128, 78))
+        self.assertEqual(im.getDepth(), 8)
+        self._check(im, arr)
+        self.assertEqual(computeVolume(im), int(arr.sum()))
+        # the image does not share the array
+        im.reset()
+        self.assertNotEqual(int(arr.sum()), 0)
+        del(im)
+
+    def testCopy_32(self):
+        """Verifies that uint16 and uint32 arrays give 32-bit images"""
+        for maxi, dtype in ((0xffff, np.uint16), (0xffffffff, np.uint32), (0xffffffff, '>u4')):
+            arr = self._random((64, 64), maxi, dtype)
+            im = imageMb.fromArray(arr)
+            self.assertEqual(im.getDepth(), 32)
+            self._check(im, arr)
+            del(im)
+
+    def testCopy_1(self):
+        """Verifies that a bool array gives a binary image"""
+        arr = self._random((50, 70), 1, np.bool_)
+        im = imageMb.fromArray(arr)
+        self.assertEqual(im.getDepth(), 1)
+        self.assertEqual(im.getSize(), (128, 50))
+        self._check(im, arr)
+        self.assertEqual(computeVolume(im), int(arr.sum()))
+        del(im)
+
+    def testAdopt(self):
+        """Verifies that an array with the edge of the library is not copied"""
+        for maxi, depth in ((255, 8), (0xffffffff, 32)):
+            wrapper = NumpyWrapper(130, 320, depth)
+            arr = wrapper.view
+            arr[:] = self._random(arr.shape, maxi, arr.dtype)
+            im = imageMb.fromArray(arr, copy=False)
+            self.assertEqual(im.getSize(), (320, 130))
+            self._check(im, arr)
+            # the image and the array share their pixels
+            im.fill(3)
+            self.assertEqual(int(arr.sum()), 3*arr.size)
+            del(im)
+            # a forced copy does not share them
+            im = imageMb.fromArray(arr, copy=True)
+            im.reset()
+            self.assertEqual(int(arr.sum()), 3*arr.size)
+            del(im)
+
+    def testErrors(self):
+        """Verifies that incorrect arrays raise an exception"""
+        arr = np.zeros((64, 64), dtype=np.uint8)
+        self.assertRaises(ValueError, imageMb.fromArray, arr, copy=False)
+        self.assertRaises(ValueError, imageMb.fromArray, np.zeros((64, 64), dtype=np.int16))
+        self.assertRaises(ValueError, imageMb.fromArray, np.zeros((64, 64, 3), dtype=np.uint8))
+        # misaligned view
+        wrapper = NumpyWrapper(64, 128, 8)
+        self.assertRaises(ValueError, imageMb.fromArray, wrapper.array[1:65, 17:81], copy=False)
+
+    def testReuse(self):
+        """Verifies that the padded arrays are reused and cleared"""
+        arr = np.full((50, 100), 200, dtype=np.uint8)
+        im = imageMb.fromArray(arr)
+        addConst(im, 10, im)
+        del(im)
+        arr = np.full((50, 100), 1, dtype=np.uint8)
+        im = imageMb.fromArray(arr)
+        # the padding of the previous image is not left in the image
+        self.assertEqual(computeVolume(im), arr.size)
+        del(im)
+
+def getSuite():
+    return unittest.TestLoader().loadTestsFromTestCase(TestFromArray)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+Test cases for the loading and saving of images on background threads.
+
+The images yielded by a stream must be the images of the files, in the order
+of the files, and the files written by a writer must hold the images given to
+it, even when these images are modified after the call.
+
+Python functions and classes:
+    mamba.io.ImageStream
+    mamba.io.ImageWriter
+"""
+
+import mamba
+from mamba import *
+import unittest
+import random
+import tempfile
+import shutil
+import os
+
+class TestIO(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.images = []
+        self.paths = []
+        for i in range(7):
+            im = imageMb(256, 130, 8)
+            (w,h) = im.getSize()
+            for j in range(500):
+                im.setPixel(random.randint(0,255), (random.randint(0,w-1), random.randint(0,h-1)))
+            path = os.path.join(self.dir, "im%d.pgm" % i)
+            im.save(path)
+            self.images.append(im)
+            self.paths.append(path)
+        self.imWrk = imageMb(256, 130, 8)
+
+    def tearDown(self):
+        del(self.images)
+        del(self.imWrk)
+        shutil.rmtree(self.dir)
+        if getImageCounter()!=0:
+            print("ERROR : Mamba image are not all deleted !")
+
+    def _check(self, im, imRef):
+        self.assertEqual(im.getSize(), imRef.getSize())
+        (x,y) = compare(imRef, im, self.imWrk)
+        self.assertTrue(x<0, "diff in (%d,%d)"%(x,y))
+
+    def testStream(self):
+        """Verifies that the images are yielded in order and recycled"""
+        ids = set()
+        n = 0
+        for i, im in enumerate(mamba.io.ImageStream(self.paths, prefetch=2, workers=3)):
+            self._check(im, self.images[i])
+            self.assertEqual(im.getName(), "im%d.pgm" % i)
+            ids.add(id(im))
+            n += 1
+        self.assertEqual(n, len(self.paths))
+        self.assertTrue(len(ids)<=3)
+
+    def testStreamFormats(self):
+        """Verifies that files of other sizes and formats are loaded"""
+        paths = list(self.paths)
+        im = imageMb(100, 50, 8)
+        im.fill(12)
+        paths.insert(2, os.path.join(self.dir, "small.png"))
+        im.save(paths[2])
+        images = list(self.images)
+        images.insert(2, None)
+        for i, imIn in enumerate(mamba.io.ImageStream(paths, prefetch=3)):
+            if images[i] is None:
+                self.assertEqual(imIn.getSize(), (128, 50))
+                self.assertEqual(computeVolume(imIn), 12*128*50)
+            else:
+                self._check(imIn, images[i])
+        del(im)
+
+    def testStreamError(self):
+        """Verifies that a missing file raises an exception"""
+        paths = self.paths[:2] + [os.path.join(self.dir, "none.pgm")]
+        stream = iter(mamba.io.ImageStream(paths))
+        next(stream)
+        next(stream)
+        self.assertRaises(IOError, next, stream)
+
+    def testWriter(self):
+        """Verifies that the written images are the images given"""
+        paths = [os.path.join(self.dir, "out%d.tif" % i) for i in range(len(self.images))]
+        im = imageMb(256, 130, 8)
+        with mamba.io.ImageWriter(pending=2, workers=2) as writer:
+            for imIn, path in zip(self.images, paths):
+                copy(imIn, im)
+                writer.write(im, path)
+                # the image can be modified at once
+                im.reset()
+        for imIn, path in zip(self.images, paths):
+            self._check(imageMb(path), imIn)
+        del(im)
+
+    def testWriterError(self):
+        """Verifies that the errors are raised when the writer is closed"""
+        writer = mamba.io.ImageWriter()
+        writer.write(self.images[0], os.path.join(self.dir, "none", "out.pgm"))
+        self.assertRaises(MambaError, writer.close)
+
+def getSuite():
+    return unittest.TestLoader().loadTestsFromTestCase(TestIO)
+
+if __name__ == '__main__':
+    unittest.main()
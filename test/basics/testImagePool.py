@@ -0,0 +1,129 @@
+"""
+Test cases for the pool of images.
+
+The memory of a destroyed image must be reused by the next image of the same
+size and depth, which must nevertheless be created black (unless it is created
+uninitialized). The pool must not exceed its size, the least recently
+destroyed images being freed first.
+
+Python functions:
+    setImagePoolSize
+    getImagePoolStats
+    getImageCounter
+    imageMb (uninitialized=True)
+"""
+
+from mamba import *
+import mambaComposed as mC
+import unittest
+
+class TestImagePool(unittest.TestCase):
+
+    def setUp(self):
+        # the pool is emptied of the images left by the other tests
+        setImagePoolSize(0)
+        setImagePoolSize(256*1024*1024)
+        getImagePoolStats(reset=True)
+
+    def tearDown(self):
+        setImagePoolSize(0)
+        setImagePoolSize(256*1024*1024)
+        if getImageCounter()!=0:
+            print("ERROR : Mamba image are not all deleted !")
+
+    def testReuse(self):
+        """Verifies that the destroyed images are reused and cleared"""
+        for depth, value in ((1, 1), (8, 255), (32, 0x12345678)):
+            im = imageMb(300, 101, depth)
+            im.fill(value)
+            del(im)
+            stats = getImagePoolStats(reset=True)
+            self.assertEqual(stats['images'], 1)
+            im = imageMb(320, 102, depth)
+            stats = getImagePoolStats()
+            self.assertEqual(stats['hits'], 1)
+            self.assertEqual(stats['misses'], 0)
+            self.assertEqual(stats['images'], 0)
+            self.assertEqual(computeVolume(im), 0)
+            # other sizes and depths are not taken from the pool
+            im2 = imageMb(im, 8 if depth!=8 else 32)
+            im3 = imageMb(64, 102, depth)
+            self.assertEqual(getImagePoolStats()['misses'], 2)
+            del(im)
+            del(im2)
+            del(im3)
+            setImagePoolSize(0)
+            setImagePoolSize(256*1024*1024)
+
+    def testCounter(self):
+        """Verifies that the images of the pool are not counted"""
+        n = getImageCounter()
+        im = imageMb(128, 128, 8)
+        self.assertEqual(getImageCounter(), n+1)
+        del(im)
+        self.assertEqual(getImageCounter(), n)
+        self.assertEqual(getImagePoolStats()['images'], 1)
+
+    def testSize(self):
+        """Verifies that the least recently destroyed images are freed"""
+        # size of the memory of an 8-bit image 1024x1024 (with its edge)
+        nbytes = 1026*(1024+32)
+        setImagePoolSize(2*nbytes)
+        images = [imageMb(1024, 1024, 8) for i in range(3)]
+        del(images)
+        stats = getImagePoolStats()
+        self.assertEqual(stats['images'], 2)
+        self.assertEqual(stats['bytes'], 2*nbytes)
+        setImagePoolSize(nbytes)
+        self.assertEqual(getImagePoolStats()['images'], 1)
+        setImagePoolSize(0)
+        stats = getImagePoolStats()
+        self.assertEqual(stats['images'], 0)
+        im = imageMb(1024, 1024, 8)
+        del(im)
+        self.assertEqual(getImagePoolStats()['images'], 0)
+
+    def testUninitialized(self):
+        """Verifies that uninitialized images are usable and not cleared"""
+        for depth, value in ((1, 1), (8, 255), (32, 0x12345678)):
+            im = imageMb(300, 101, depth)
+            im.fill(value)
+            imRef = imageMb(im)
+            copy(im, imRef)
+            del(im)
+            im = imageMb(imRef, uninitialized=True)
+            self.assertEqual(getImagePoolStats(reset=True)['hits'], 1)
+            self.assertEqual(im.getSize(), imRef.getSize())
+            self.assertEqual(im.getDepth(), depth)
+            self.assertEqual(computeVolume(im), computeVolume(imRef))
+            del(im)
+            setImagePoolSize(0)
+            setImagePoolSize(256*1024*1024)
+            # newly allocated, the image works as any other image
+            im = imageMb(imRef, uninitialized=True)
+            copy(imRef, im)
+            (x,y) = compare(imRef, im, imRef)
+            self.assertTrue(x<0, "diff in (%d,%d)"%(x,y))
+            imRef.reset()
+            mC.dilate(im, imRef)
+            self.assertEqual(computeVolume(imRef), computeVolume(im))
+            del(im)
+            del(imRef)
+
+    def testShared(self):
+        """Verifies that an image still used is not put in the pool"""
+        im = imageMb(128, 128, 8)
+        im2 = imageMb(64, 64, 8)
+        im2.mbIm = im.mbIm
+        # the C core image given up by im2 is put in the pool
+        self.assertEqual(getImagePoolStats()['images'], 1)
+        del(im)
+        self.assertEqual(getImagePoolStats()['images'], 1)
+        del(im2)
+        self.assertEqual(getImagePoolStats()['images'], 2)
+
+def getSuite():
+    return unittest.TestLoader().loadTestsFromTestCase(TestImagePool)
+
+if __name__ == '__main__':
+    unittest.main()
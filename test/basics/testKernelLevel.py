@@ -0,0 +1,113 @@
+"""
+Test cases for the SIMD instruction sets control functions.
+
+The computations are compiled for several SIMD instruction sets and the
+widest one supported by the processor is selected when the library is loaded.
+The level can be lowered by the user, down to computations without SIMD
+instructions. The result of a computation must not depend on the level.
+
+Python functions:
+    getCpuFeatures
+    setKernelLevel
+    getKernelLevel
+
+C functions:
+    MB_GetCpuFeatures
+    MB_SetKernelLevel
+    MB_GetKernelLevel
+"""
+
+from mamba import *
+import unittest
+import random
+
+class TestKernelLevel(unittest.TestCase):
+
+    def setUp(self):
+        self.im8_1 = imageMb(256, 128, 8)
+        self.im8_2 = imageMb(256, 128, 8)
+        self.im8_3 = imageMb(256, 128, 8)
+        self.im8_4 = imageMb(256, 128, 8)
+        self.im32_1 = imageMb(256, 128, 32)
+        self.im32_2 = imageMb(256, 128, 32)
+        self.im32_3 = imageMb(256, 128, 32)
+        self.im32_4 = imageMb(256, 128, 32)
+
+    def tearDown(self):
+        setKernelLevel('auto')
+        del(self.im8_1)
+        del(self.im8_2)
+        del(self.im8_3)
+        del(self.im8_4)
+        del(self.im32_1)
+        del(self.im32_2)
+        del(self.im32_3)
+        del(self.im32_4)
+        if getImageCounter()!=0:
+            print("ERROR : Mamba image are not all deleted !")
+
+    def _levels(self):
+        return ['none'] + getCpuFeatures()
+
+    def testCpuFeatures(self):
+        """Verifies that the processor features are correctly listed"""
+        features = getCpuFeatures()
+        self.assertTrue(isinstance(features, list))
+        for f in features:
+            self.assertTrue(f in ('sse2', 'sse41', 'avx2', 'avx512'))
+
+    def testKernelLevel(self):
+        """Verifies that the SIMD level can be set and retrieved"""
+        for level in self._levels():
+            setKernelLevel(level)
+            self.assertEqual(getKernelLevel(), level)
+        setKernelLevel('auto')
+        self.assertEqual(getKernelLevel(), self._levels()[-1])
+
+    def testIncorrectLevel(self):
+        """Verifies that an incorrect or unsupported level raises an exception"""
+        self.assertRaises(MambaError, setKernelLevel, 'sse3')
+        if 'avx512' not in getCpuFeatures():
+            self.assertRaises(MambaError, setKernelLevel, 'avx512')
+
+    def testComputation_8(self):
+        """Verifies that 8-bit computations give the same result at all levels"""
+        (w,h) = self.im8_1.getSize()
+        for i in range(2000):
+            self.im8_1.setPixel(random.randint(0,255), (random.randint(0,w-1), random.randint(0,h-1)))
+            self.im8_2.setPixel(random.randint(0,255), (random.randint(0,w-1), random.randint(0,h-1)))
+        setKernelLevel('none')
+        add(self.im8_1, self.im8_2, self.im8_3)
+        supFarNeighbor(self.im8_3, self.im8_3, 2, 5, grid=HEXAGONAL)
+        buildNeighbor(self.im8_1, self.im8_3, 1, grid=SQUARE)
+        for level in self._levels():
+            setKernelLevel(level)
+            add(self.im8_1, self.im8_2, self.im8_4)
+            supFarNeighbor(self.im8_4, self.im8_4, 2, 5, grid=HEXAGONAL)
+            buildNeighbor(self.im8_1, self.im8_4, 1, grid=SQUARE)
+            (x,y) = compare(self.im8_3, self.im8_4, self.im8_4)
+            self.assertTrue(x<0, "%s: diff in (%d,%d)"%(level,x,y))
+
+    def testComputation_32(self):
+        """Verifies that 32-bit computations give the same result at all levels"""
+        (w,h) = self.im32_1.getSize()
+        for i in range(2000):
+            self.im32_1.setPixel(random.randint(0,100000), (random.randint(0,w-1), random.randint(0,h-1)))
+            self.im32_2.setPixel(random.randint(0,100000), (random.randint(0,w-1), random.randint(0,h-1)))
+        setKernelLevel('none')
+        logic(self.im32_1, self.im32_2, self.im32_3, "inf")
+        infNeighbor(self.im32_3, self.im32_3, 3, 2, grid=SQUARE)
+        buildNeighbor(self.im32_1, self.im32_3, 4, grid=HEXAGONAL)
+        for level in self._levels():
+            setKernelLevel(level)
+            logic(self.im32_1, self.im32_2, self.im32_4, "inf")
+            infNeighbor(self.im32_4, self.im32_4, 3, 2, grid=SQUARE)
+            buildNeighbor(self.im32_1, self.im32_4, 4, grid=HEXAGONAL)
+            (x,y) = compare(self.im32_3, self.im32_4, self.im32_4)
+            self.assertTrue(x<0, "%s: diff in (%d,%d)"%(level,x,y))
+
+def getSuite():
+    return unittest.TestLoader().loadTestsFromTestCase(TestKernelLevel)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+"""
+Test cases for the flat zones labelling function.
+
+The function works with greyscale or 32-bit images as input and 32-bit image
+as output.
+
+Every flat zone of the input image (connected pixels of the same value) is
+given a value (its label) that is unique inside the image. All the pixels are
+labelled.
+
+Python function:
+    label
+
+C functions:
+    MB_LabelFlatZones
+"""
+
+from __future__ import division
+from mamba import *
+import unittest
+import random
+
+class TestLabelFlatZones(unittest.TestCase):
+
+    def setUp(self):
+        self.im1_1 = imageMb(1)
+        self.im8_1 = imageMb(8)
+        self.im8_2 = imageMb(8)
+        self.im32_1 = imageMb(32)
+        self.im32_2 = imageMb(32)
+        self.im32_3 = imageMb(32)
+        self.im8s2_1 = imageMb(128,128,8)
+        self.im32s2_1 = imageMb(128,128,32)
+
+    def tearDown(self):
+        del(self.im1_1)
+        del(self.im8_1)
+        del(self.im8_2)
+        del(self.im32_1)
+        del(self.im32_2)
+        del(self.im32_3)
+        del(self.im8s2_1)
+        del(self.im32s2_1)
+        if getImageCounter()!=0:
+            print("ERROR : Mamba image are not all deleted !")
+
+    def testDepthAcceptation(self):
+        """Tests that incorrect depth raises an exception"""
+        self.assertRaises(MambaError, label, self.im8_1, self.im1_1)
+        self.assertRaises(MambaError, label, self.im8_1, self.im8_2)
+        self.assertRaises(MambaError, label, self.im32_1, self.im1_1)
+        self.assertRaises(MambaError, label, self.im32_1, self.im8_2)
+        label(self.im8_1, self.im32_2)
+        label(self.im32_1, self.im32_2)
+
+    def testSizeCheck(self):
+        """Tests that different sizes raise an exception"""
+        self.assertRaises(MambaError, label, self.im8s2_1, self.im32_1)
+        self.assertRaises(MambaError, label, self.im8_1, self.im32s2_1)
+        self.assertRaises(MambaError, label, self.im32s2_1, self.im32_1)
+
+    def testParameterRange(self):
+        """Verifies that an incorrect parameter raises an exception"""
+        for i in range(257, 300):
+            self.assertRaises(MambaError, label, self.im8_1, self.im32_1, 0, i)
+        self.assertRaises(MambaError, label, self.im8_1, self.im32_1, 255, 254)
+
+    def testComputationUniform(self):
+        """Labelling a uniform image"""
+        for v in (0, 128, 255):
+            self.im8_1.fill(v)
+            for grid in (SQUARE, HEXAGONAL):
+                n = label(self.im8_1, self.im32_1, grid=grid)
+                self.assertTrue(n==1)
+                mi, ma = computeRange(self.im32_1)
+                self.assertTrue(mi==1 and ma==1)
+
+    def testComputationStripes(self):
+        """Labelling vertical stripes of different values"""
+        (w,h) = self.im8_1.getSize()
+
+        for wi in range(w):
+            for hi in range(h):
+                self.im8_1.setPixel(wi%3, (wi,hi))
+                self.im32_1.setPixel((wi%3)*0x01000000, (wi,hi))
+
+        for grid in (SQUARE, HEXAGONAL):
+            n = label(self.im8_1, self.im32_2, grid=grid)
+            self.assertTrue(n==w)
+            n = label(self.im32_1, self.im32_3, grid=grid)
+            self.assertTrue(n==w)
+            (x,y) = compare(self.im32_2, self.im32_3, self.im32_2)
+            self.assertTrue(x<0)
+            # the stripes are numbered from left to right
+            for wi in range(w):
+                exp = 1 + (wi%255) + 256*(wi//255)
+                self.assertTrue(self.im32_3.getPixel((wi,h//2))==exp)
+
+    def testComputationGridEffect(self):
+        """Verifies grid configuration on labelling"""
+        self.im8_1.fill(10)
+
+        # first 'object'
+        self.im8_1.setPixel(20, (6,3))
+        self.im8_1.setPixel(20, (5,4))
+        self.im8_1.setPixel(20, (6,5))
+
+        n = label(self.im8_1, self.im32_1, grid=SQUARE)
+        self.assertTrue(n==2)
+
+        n = label(self.im8_1, self.im32_1, grid=HEXAGONAL)
+        self.assertTrue(n==4)
+
+    def testComputationBinary(self):
+        """Verifies that the set pixels are labelled as in a binary image"""
+        (w,h) = self.im8_1.getSize()
+
+        self.im1_1.reset()
+        for i in range(w*h//4):
+            self.im1_1.setPixel(1, (random.randint(0,w-1), random.randint(0,h-1)))
+        convert(self.im1_1, self.im8_1)
+
+        for grid in (SQUARE, HEXAGONAL):
+            n1 = label(self.im1_1, self.im32_1, grid=grid)
+            n8 = label(self.im8_1, self.im32_2, grid=grid)
+            # the flat zones of the background are labelled too
+            self.assertTrue(n8>n1)
+            # the labels of the objects differ but their zones are the same
+            for wi in range(w):
+                for hi in range(h):
+                    if self.im1_1.getPixel((wi,hi)):
+                        for (xn,yn) in ((wi+1,hi),(wi,hi+1)):
+                            if xn<w and yn<h and self.im1_1.getPixel((xn,yn)):
+                                self.assertTrue(self.im32_2.getPixel((wi,hi))==
+                                                self.im32_2.getPixel((xn,yn)))
+
+    def testComputationRange(self):
+        """Labelling in the lower byte according to range specified"""
+        (w,h) = self.im8_1.getSize()
+
+        for wi in range(w):
+            for hi in range(h):
+                # all the neighbors of a pixel have another value
+                self.im8_1.setPixel((wi%2)+2*(hi%2), (wi,hi))
+
+        for grid in (SQUARE, HEXAGONAL):
+            n = label(self.im8_1, self.im32_1, 10, 230, grid=grid)
+            self.assertTrue(n==w*h)
+            copyBytePlane(self.im32_1, 0, self.im8_2)
+            mi, ma = computeRange(self.im8_2)
+            self.assertTrue(mi==10)
+            self.assertTrue(ma==229)
+
+def getSuite():
+    return unittest.TestLoader().loadTestsFromTestCase(TestLabelFlatZones)
+
+if __name__ == '__main__':
+    unittest.main()
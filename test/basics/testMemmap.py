@@ -0,0 +1,103 @@
+"""
+Test cases for the images held in files mapped in memory.
+
+The file contains the pixels in the memory layout of the library. An image
+saved with saveMemmap must be identical once mapped again, and the
+modifications of a mapped image must be written in the file (unless the
+mapping is a copy on write).
+
+Python functions and classes:
+    imageMb.fromMemmap
+    imageMb.saveMemmap
+"""
+
+from mamba import *
+import unittest
+import random
+import tempfile
+import os
+
+class TestMemmap(unittest.TestCase):
+
+    def setUp(self):
+        self.im1_1 = imageMb(320, 130, 1)
+        self.im1_2 = imageMb(320, 130, 1)
+        self.im8_1 = imageMb(320, 130, 8)
+        self.im8_2 = imageMb(320, 130, 8)
+        self.im32_1 = imageMb(320, 130, 32)
+        self.im32_2 = imageMb(320, 130, 32)
+        (fd, self.path) = tempfile.mkstemp(suffix='.mbraw')
+        os.close(fd)
+
+    def tearDown(self):
+        del(self.im1_1)
+        del(self.im1_2)
+        del(self.im8_1)
+        del(self.im8_2)
+        del(self.im32_1)
+        del(self.im32_2)
+        os.remove(self.path)
+        if getImageCounter()!=0:
+            print("ERROR : Mamba image are not all deleted !")
+
+    def _random(self, im, maxi):
+        (w,h) = im.getSize()
+        for i in range(1000):
+            im.setPixel(random.randint(0,maxi), (random.randint(0,w-1), random.randint(0,h-1)))
+
+    def testSaveMap(self):
+        """Verifies that a saved image is identical once mapped"""
+        for im, imWrk, maxi in ((self.im1_1, self.im1_2, 1),
+                                (self.im8_1, self.im8_2, 255),
+                                (self.im32_1, self.im32_2, 0xffffffff)):
+            self._random(im, maxi)
+            im.saveMemmap(self.path)
+            (w,h) = im.getSize()
+            self.assertEqual(os.path.getsize(self.path), NumpyWrapper.bufferSize(h, w, im.getDepth()))
+            imMap = imageMb.fromMemmap(self.path, w, h, im.getDepth())
+            self.assertEqual(imMap.getSize(), (w,h))
+            self.assertEqual(imMap.getDepth(), im.getDepth())
+            (x,y) = compare(im, imMap, imWrk)
+            self.assertTrue(x<0, "depth %d: diff in (%d,%d)"%(im.getDepth(),x,y))
+            del(imMap)
+
+    def testWriteThrough(self):
+        """Verifies that the modifications are written in the file"""
+        (w,h) = self.im8_1.getSize()
+        self._random(self.im8_1, 255)
+        self.im8_1.saveMemmap(self.path)
+        imMap = imageMb.fromMemmap(self.path, w, h, 8)
+        negate(imMap, imMap)
+        del(imMap)
+        negate(self.im8_1, self.im8_1)
+        imMap = imageMb.fromMemmap(self.path, w, h, 8, mode='c')
+        (x,y) = compare(self.im8_1, imMap, self.im8_2)
+        self.assertTrue(x<0, "diff in (%d,%d)"%(x,y))
+        # copy on write, the file is not modified
+        imMap.reset()
+        del(imMap)
+        imMap = imageMb.fromMemmap(self.path, w, h, 8)
+        (x,y) = compare(self.im8_1, imMap, self.im8_2)
+        self.assertTrue(x<0, "diff in (%d,%d)"%(x,y))
+        del(imMap)
+
+    def testCreate(self):
+        """Verifies that a mapped image can be created"""
+        imMap = imageMb.fromMemmap(self.path, 100, 51, 32, mode='w+')
+        self.assertEqual(imMap.getSize(), (128, 52))
+        self.assertEqual(computeVolume(imMap), 0)
+        del(imMap)
+
+    def testErrors(self):
+        """Verifies that incorrect files or modes raise an exception"""
+        self.im8_1.saveMemmap(self.path)
+        (w,h) = self.im8_1.getSize()
+        self.assertRaises(MambaError, imageMb.fromMemmap, self.path, w, h, 32)
+        self.assertRaises(MambaError, imageMb.fromMemmap, self.path, w+64, h, 8)
+        self.assertRaises(ValueError, imageMb.fromMemmap, self.path, w, h, 8, mode='r')
+
+def getSuite():
+    return unittest.TestLoader().loadTestsFromTestCase(TestMemmap)
+
+if __name__ == '__main__':
+    unittest.main()
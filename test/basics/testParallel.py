@@ -0,0 +1,88 @@
+"""
+Test cases for the computation of a pipeline on many images with a pool of
+processes.
+
+The images are exchanged with the processes through shared memory. The
+results must be the ones obtained by computing the pipeline in the current
+process, and they must be returned in the order of the inputs.
+
+Python functions:
+    parallel.map
+    NumpyWrapper.bufferSize
+
+C functions:
+    MB_Create_from_numpyb
+    MB_Create_from_numpy8
+    MB_Create_from_numpy32
+"""
+
+from mamba import *
+import mambaComposed as mC
+import unittest
+import random
+import functools
+
+def _pipeline(imIn, imOut):
+    mC.gradient(imIn, imOut, 2)
+
+def _threshold(imIn, imOut, low):
+    threshold(imIn, imOut, low, 255)
+
+def _failing(imIn, imOut):
+    copy(imIn, imOut)
+
+class TestParallel(unittest.TestCase):
+
+    def setUp(self):
+        self.images = [imageMb(256, 128, 8) for i in range(10)]
+        for im in self.images:
+            (w,h) = im.getSize()
+            for i in range(500):
+                im.setPixel(random.randint(0,255), (random.randint(0,w-1), random.randint(0,h-1)))
+        self.im8 = imageMb(256, 128, 8)
+        self.im1 = imageMb(256, 128, 1)
+
+    def tearDown(self):
+        del(self.images)
+        del(self.im8)
+        del(self.im1)
+        if getImageCounter()!=0:
+            print("ERROR : Mamba image are not all deleted !")
+
+    def testMap(self):
+        """Verifies that the results are computed and returned in order"""
+        results = parallel.map(_pipeline, self.images, workers=3)
+        self.assertEqual(len(results), len(self.images))
+        for imIn, imRes in zip(self.images, results):
+            self.assertEqual(imRes.getSize(), imIn.getSize())
+            self.assertEqual(imRes.getDepth(), 8)
+            _pipeline(imIn, self.im8)
+            (x,y) = compare(imRes, self.im8, self.im8)
+            self.assertTrue(x<0, "diff in (%d,%d)"%(x,y))
+        del(results)
+
+    def testMapDepth(self):
+        """Verifies that the results can have another depth than the inputs"""
+        results = parallel.map(functools.partial(_threshold, low=100), iter(self.images), workers=2, depth=1)
+        for imIn, imRes in zip(self.images, results):
+            self.assertEqual(imRes.getDepth(), 1)
+            _threshold(imIn, self.im1, 100)
+            (x,y) = compare(imRes, self.im1, self.im1)
+            self.assertTrue(x<0, "diff in (%d,%d)"%(x,y))
+        del(results)
+
+    def testMapError(self):
+        """Verifies that an error in the pipeline is raised again"""
+        self.assertRaises(MambaError, parallel.map, _failing, self.images, workers=2, depth=32)
+
+    def testBufferSize(self):
+        """Verifies the size of the arrays holding the images"""
+        self.assertEqual(NumpyWrapper.bufferSize(128, 256, 8), 130*(256+32))
+        self.assertEqual(NumpyWrapper.bufferSize(127, 200, 32), 130*(256*4+32))
+        self.assertEqual(NumpyWrapper.bufferSize(128, 256, 1), 130*(256//8+32))
+
+def getSuite():
+    return unittest.TestLoader().loadTestsFromTestCase(TestParallel)
+
+if __name__ == '__main__':
+    unittest.main()
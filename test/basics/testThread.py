@@ -0,0 +1,180 @@
+"""
+Test cases for the multithreading control functions.
+
+The pixel-wise operators can split the images in horizontal bands which are
+computed concurrently by a pool of threads. The number of threads can be set
+by the user (0 meaning one thread per processor). The neighbor operators
+(working in place or not) are split the same way. The result of a computation
+must not depend on the number of threads.
+
+The library can also be called by several Python threads working on different
+images at the same time.
+
+The memory of the large images can be allocated with huge pages and cleared
+by the threads computing the bands. The images must behave as any other image.
+
+Python functions:
+    setThreadCount
+    getThreadCount
+    setImageAllocation
+    getImageAllocation
+
+C functions:
+    MB_SetThreadCount
+    MB_GetThreadCount
+    MB_SetAllocation
+    MB_GetAllocation
+"""
+
+from mamba import *
+import unittest
+import random
+import threading
+
+class TestThread(unittest.TestCase):
+
+    def setUp(self):
+        # Creating large images so that they are split in several bands
+        self.im8_1 = imageMb(1024, 1024, 8)
+        self.im8_2 = imageMb(1024, 1024, 8)
+        self.im8_3 = imageMb(1024, 1024, 8)
+        self.im8_4 = imageMb(1024, 1024, 8)
+        self.im32_1 = imageMb(1024, 1024, 32)
+        self.im32_2 = imageMb(1024, 1024, 32)
+        self.im32_3 = imageMb(1024, 1024, 32)
+
+    def tearDown(self):
+        setThreadCount(1)
+        setImageAllocation()
+        setImagePoolSize(256*1024*1024)
+        del(self.im8_1)
+        del(self.im8_2)
+        del(self.im8_3)
+        del(self.im8_4)
+        del(self.im32_1)
+        del(self.im32_2)
+        del(self.im32_3)
+        if getImageCounter()!=0:
+            print("ERROR : Mamba image are not all deleted !")
+
+    def testThreadCount(self):
+        """Verifies that the number of threads can be set and retrieved"""
+        self.assertEqual(getThreadCount(), 1)
+        setThreadCount(4)
+        self.assertEqual(getThreadCount(), 4)
+        setThreadCount(0)
+        self.assertTrue(getThreadCount()>=1)
+        setThreadCount(1)
+        self.assertEqual(getThreadCount(), 1)
+
+    def testIncorrectCount(self):
+        """Verifies that an incorrect number of threads raises an exception"""
+        self.assertRaises(MambaError, setThreadCount, 100000)
+
+    def testComputation_8(self):
+        """Verifies that threaded 8-bit computations give the serial result"""
+        (w,h) = self.im8_1.getSize()
+        for i in range(200):
+            self.im8_1.setPixel(random.randint(0,255), (random.randint(0,w-1), random.randint(0,h-1)))
+        add(self.im8_1, self.im8_1, self.im8_2)
+        for n in (2, 3, 8, 0):
+            setThreadCount(n)
+            add(self.im8_1, self.im8_1, self.im8_3)
+            (x,y) = compare(self.im8_2, self.im8_3, self.im8_3)
+            self.assertTrue(x<0, "%d threads: diff in (%d,%d)"%(n,x,y))
+
+    def testComputation_32(self):
+        """Verifies that threaded 32-bit computations give the serial result"""
+        (w,h) = self.im32_1.getSize()
+        for i in range(200):
+            self.im32_1.setPixel(random.randint(0,100000), (random.randint(0,w-1), random.randint(0,h-1)))
+        mulConst(self.im32_1, 3, self.im32_2)
+        for n in (2, 3, 8, 0):
+            setThreadCount(n)
+            mulConst(self.im32_1, 3, self.im32_3)
+            (x,y) = compare(self.im32_2, self.im32_3, self.im32_3)
+            self.assertTrue(x<0, "%d threads: diff in (%d,%d)"%(n,x,y))
+
+    def testComputationNeighbor(self):
+        """Verifies that threaded neighbor computations give the serial result"""
+        (w,h) = self.im8_1.getSize()
+        for i in range(2000):
+            self.im8_1.setPixel(random.randint(0,255), (random.randint(0,w-1), random.randint(0,h-1)))
+        for grid in (HEXAGONAL, SQUARE):
+            for d in getDirections(grid):
+                setThreadCount(1)
+                copy(self.im8_1, self.im8_2)
+                infNeighbor(self.im8_2, self.im8_2, d, 3, grid=grid)
+                copy(self.im8_1, self.im8_3)
+                supFarNeighbor(self.im8_1, self.im8_3, d, 20, grid=grid)
+                for n in (3, 0):
+                    setThreadCount(n)
+                    copy(self.im8_1, self.im8_4)
+                    infNeighbor(self.im8_4, self.im8_4, d, 3, grid=grid)
+                    (x,y) = compare(self.im8_2, self.im8_4, self.im8_4)
+                    self.assertTrue(x<0, "infNeighbor %d threads: diff in (%d,%d)"%(n,x,y))
+                    copy(self.im8_1, self.im8_4)
+                    supFarNeighbor(self.im8_1, self.im8_4, d, 20, grid=grid)
+                    (x,y) = compare(self.im8_3, self.im8_4, self.im8_4)
+                    self.assertTrue(x<0, "supFarNeighbor %d threads: diff in (%d,%d)"%(n,x,y))
+
+    def testAllocation(self):
+        """Verifies that the large images can use huge pages and first touch"""
+        self.assertEqual(getImageAllocation(),
+                         {'hugePages': False, 'firstTouch': False, 'threshold': 16*1024*1024})
+        (w,h) = self.im32_1.getSize()
+        for i in range(200):
+            self.im32_1.setPixel(random.randint(0,100000), (random.randint(0,w-1), random.randint(0,h-1)))
+        setThreadCount(4)
+        # the pool would give back the images allocated before
+        setImagePoolSize(0)
+        for (huge, touch) in ((True, False), (False, True), (True, True)):
+            setImageAllocation(hugePages=huge, firstTouch=touch, threshold=1024*1024)
+            info = getImageAllocation()
+            self.assertEqual((info['hugePages'], info['firstTouch']), (huge, touch))
+            im = imageMb(self.im32_1)
+            self.assertEqual(computeVolume(im), 0)
+            copy(self.im32_1, im)
+            (x,y) = compare(self.im32_1, im, self.im32_3)
+            self.assertTrue(x<0, "%s: diff in (%d,%d)"%(str(info),x,y))
+            im = imageMb(self.im32_1, uninitialized=True)
+            if touch:
+                self.assertEqual(computeVolume(im), 0)
+            del(im)
+
+    def _segment(self, imIn, imOut, seed):
+        imMarker = imageMb(imIn, 32)
+        r = random.Random(seed)
+        (w,h) = imIn.getSize()
+        for i in range(100):
+            imMarker.setPixel(i+1, (r.randint(0,w-1), r.randint(0,h-1)))
+        watershedSegment(imIn, imMarker, grid=SQUARE)
+        copy(imMarker, imOut)
+
+    def testPythonThreads(self):
+        """Verifies that computations called by several Python threads give the serial result"""
+        (w,h) = self.im8_1.getSize()
+        for i in range(2000):
+            self.im8_1.setPixel(random.randint(0,255), (random.randint(0,w-1), random.randint(0,h-1)))
+        refs = [imageMb(self.im32_1) for i in range(4)]
+        outs = [imageMb(self.im32_1) for i in range(4)]
+        for i in range(4):
+            self._segment(self.im8_1, refs[i], i)
+        for n in (1, 0):
+            setThreadCount(n)
+            threads = [threading.Thread(target=self._segment, args=(self.im8_1, outs[i], i)) for i in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            for i in range(4):
+                (x,y) = compare(refs[i], outs[i], self.im32_3)
+                self.assertTrue(x<0, "%d threads, image %d: diff in (%d,%d)"%(n,i,x,y))
+        del(refs)
+        del(outs)
+
+def getSuite():
+    return unittest.TestLoader().loadTestsFromTestCase(TestThread)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,7 @@
 """
 Test cases for the image watershed segmentation function.
 
-The function works on 8-bit images and returns in a 32-bit image, the watershed
+The function works on 8-bit and 32-bit images and returns in a 32-bit image, the watershed
 segmentation (only the catchment basins and watershed lines) as found using 
 the same 32-bit image as an initialisation for wells.
 
@@ -11,8 +11,9 @@ process.
 Python function:
     watershedSegment
     
-C function:
+C functions:
     MB_Watershed
+    MB_Watershed32
 """
 
 from __future__ import division
@@ -61,7 +62,7 @@ class TestWatershed(unittest.TestCase):
         #self.assertRaises(MambaError, watershedSegment, self.im8_1, self.im32_2)
         self.assertRaises(MambaError, watershedSegment, self.im32_1, self.im1_2)
         self.assertRaises(MambaError, watershedSegment, self.im32_1, self.im8_2)
-        self.assertRaises(MambaError, watershedSegment, self.im32_1, self.im32_2)
+        #self.assertRaises(MambaError, watershedSegment, self.im32_1, self.im32_2)
 
     def testSizeCheck(self):
         """Tests that different sizes raise an exception"""
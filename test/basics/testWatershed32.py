@@ -0,0 +1,107 @@
+"""
+Test cases for the watershed and basin segmentation functions of 32-bit
+images.
+
+The functions work on 32-bit images and return in a 32-bit image, the watershed
+segmentation (catchment basins and, for the watershed, watershed lines) as found
+using the same 32-bit image as an initialisation for wells.
+
+The flooding of a 32-bit image must give the same result as the flooding of
+an 8-bit image holding the same relief, whatever the scale of its values.
+
+Python functions:
+    watershedSegment
+    basinSegment
+
+C functions:
+    MB_Watershed32
+    MB_Basins32
+"""
+
+from __future__ import division
+from mamba import *
+import unittest
+import random
+
+class TestWatershed32(unittest.TestCase):
+
+    def setUp(self):
+        self.im8_1 = imageMb(8)
+        self.im32_1 = imageMb(32)
+        self.im32_2 = imageMb(32)
+        self.im32_3 = imageMb(32)
+        self.im32_4 = imageMb(32)
+        self.im32s2_1 = imageMb(128,128,32)
+
+    def tearDown(self):
+        del(self.im8_1)
+        del(self.im32_1)
+        del(self.im32_2)
+        del(self.im32_3)
+        del(self.im32_4)
+        del(self.im32s2_1)
+        if getImageCounter()!=0:
+            print("ERROR : Mamba image are not all deleted !")
+
+    def testSizeCheck(self):
+        """Tests that different sizes raise an exception"""
+        for f in (watershedSegment, basinSegment):
+            self.assertRaises(MambaError, f, self.im32s2_1, self.im32_1)
+            self.assertRaises(MambaError, f, self.im32_1, self.im32s2_1)
+
+    def _relief(self, scale, offset):
+        # random relief in the 8-bit image, scaled in the 32-bit image
+        (w,h) = self.im8_1.getSize()
+        for wi in range(w):
+            for hi in range(h):
+                vi = random.randint(0,255)
+                self.im8_1.setPixel(vi, (wi,hi))
+                self.im32_1.setPixel(vi*scale+offset, (wi,hi))
+        # 10 random wells
+        self.im32_2.reset()
+        for vi in range(1,11):
+            self.im32_2.setPixel(vi*1000, (random.randint(0,w-1), random.randint(0,h-1)))
+
+    def testComputation(self):
+        """Verifies that the 32-bit flooding gives the 8-bit result"""
+        for (scale, offset) in ((1,0), (1000,7), (16000000,12345)):
+            self._relief(scale, offset)
+            for f in (watershedSegment, basinSegment):
+                for grid in (SQUARE, HEXAGONAL):
+                    for level in (-1, 100):
+                        copy(self.im32_2, self.im32_3)
+                        f(self.im8_1, self.im32_3, grid=grid, max_level=level)
+                        copy(self.im32_2, self.im32_4)
+                        f(self.im32_1, self.im32_4, grid=grid,
+                          max_level=level if level<0 else level*scale+offset)
+                        (x,y) = compare(self.im32_3, self.im32_4, self.im32_3)
+                        self.assertTrue(x<0, "scale %d, level %d: diff in (%d,%d)"
+                                        % (scale, level, x, y))
+
+    def testComputationRange(self):
+        """Verifies the watershed line between two wells on a large range"""
+        (w,h) = self.im32_1.getSize()
+
+        for i in range(w//4,(3*w)//4,7):
+            # creating a wall image with values up to the maximum
+            self.im32_1.fill(0x7fffffff)
+            for hi in range(h):
+                self.im32_1.setPixel(0xffffffff, (i,hi))
+            self.im32_1.setPixel(0, (w//4-1,h//2))
+
+            # adding 2 well
+            self.im32_2.reset()
+            self.im32_2.setPixel(50, (w//4-1,h//2))
+            self.im32_2.setPixel(100, ((3*w)//4,h//2))
+
+            watershedSegment(self.im32_1, self.im32_2, grid=SQUARE)
+            copyBytePlane(self.im32_2, 3, self.im8_1)
+            for hi in range(h):
+                self.assertEqual(self.im8_1.getPixel((i,hi)), 255)
+            self.assertEqual(computeVolume(self.im8_1), 255*h)
+
+def getSuite():
+    return unittest.TestLoader().loadTestsFromTestCase(TestWatershed32)
+
+if __name__ == '__main__':
+    unittest.main()
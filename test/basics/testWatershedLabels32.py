@@ -0,0 +1,117 @@
+"""
+Test cases for the watershed and basin segmentation functions with labels
+using the 32 bits of the marker image.
+
+The functions work on 8-bit or 32-bit images and return in a 32-bit image,
+the watershed segmentation (catchment basins and, for the watershed, watershed
+lines set to 0) as found using the same 32-bit image as an initialisation for
+wells. The number of labels is not limited to 2^24.
+
+Python functions:
+    watershedSegment
+    basinSegment
+
+C functions:
+    MB_WatershedLabels32
+    MB_BasinsLabels32
+"""
+
+from mamba import *
+import unittest
+import random
+
+class TestWatershedLabels32(unittest.TestCase):
+
+    def setUp(self):
+        self.im1_1 = imageMb(1)
+        self.im8_1 = imageMb(8)
+        self.im8_2 = imageMb(8)
+        self.im32_1 = imageMb(32)
+        self.im32_2 = imageMb(32)
+        self.im32_3 = imageMb(32)
+        self.im32s2_1 = imageMb(128,128,32)
+
+    def tearDown(self):
+        del(self.im1_1)
+        del(self.im8_1)
+        del(self.im8_2)
+        del(self.im32_1)
+        del(self.im32_2)
+        del(self.im32_3)
+        del(self.im32s2_1)
+        if getImageCounter()!=0:
+            print("ERROR : Mamba image are not all deleted !")
+
+    def testDepthAcceptation(self):
+        """Tests that incorrect depth raises an exception"""
+        for f in (watershedSegment, basinSegment):
+            self.assertRaises(MambaError, f, self.im1_1, self.im32_1, labels32=True)
+            self.assertRaises(MambaError, f, self.im8_1, self.im8_2, labels32=True)
+            self.assertRaises(MambaError, f, self.im32_1, self.im8_2, labels32=True)
+            f(self.im8_1, self.im32_1, labels32=True)
+            f(self.im32_2, self.im32_1, labels32=True)
+
+    def testSizeCheck(self):
+        """Tests that different sizes raise an exception"""
+        for f in (watershedSegment, basinSegment):
+            self.assertRaises(MambaError, f, self.im32s2_1, self.im32_1, labels32=True)
+            self.assertRaises(MambaError, f, self.im32_1, self.im32s2_1, labels32=True)
+
+    def testComputation(self):
+        """Verifies that the segmentation gives the 24-bit labels result"""
+        (w,h) = self.im8_1.getSize()
+        for wi in range(w):
+            for hi in range(h):
+                self.im8_1.setPixel(random.randint(0,255), (wi,hi))
+        self.im32_1.reset()
+        for vi in range(1,11):
+            self.im32_1.setPixel(vi*1000, (random.randint(0,w-1), random.randint(0,h-1)))
+
+        for grid in (SQUARE, HEXAGONAL):
+            copy(self.im32_1, self.im32_2)
+            basinSegment(self.im8_1, self.im32_2, grid=grid)
+            copy(self.im32_1, self.im32_3)
+            basinSegment(self.im8_1, self.im32_3, grid=grid, labels32=True)
+            (x,y) = compare(self.im32_2, self.im32_3, self.im32_2)
+            self.assertTrue(x<0, "basins diff in (%d,%d)" % (x,y))
+
+            copy(self.im32_1, self.im32_2)
+            watershedSegment(self.im8_1, self.im32_2, grid=grid)
+            copy(self.im32_1, self.im32_3)
+            watershedSegment(self.im8_1, self.im32_3, grid=grid, labels32=True)
+            for wi in range(w):
+                for hi in range(h):
+                    v = self.im32_2.getPixel((wi,hi))
+                    exp = 0 if (v>>24)==255 else v
+                    self.assertEqual(self.im32_3.getPixel((wi,hi)), exp)
+
+    def testLargeLabels(self):
+        """Verifies that the labels above 2^24 are kept"""
+        (w,h) = self.im32_1.getSize()
+
+        # a wall in the middle of the image
+        self.im8_1.fill(10)
+        for hi in range(h):
+            self.im8_1.setPixel(255, (w//2,hi))
+
+        # 2 wells whose labels only differ in the last byte
+        self.im32_1.reset()
+        self.im32_1.setPixel(0x01000001, (w//4,h//2))
+        self.im32_1.setPixel(0x02000001, ((3*w)//4,h//2))
+
+        copy(self.im32_1, self.im32_2)
+        watershedSegment(self.im8_1, self.im32_2, grid=SQUARE, labels32=True)
+        copy(self.im32_1, self.im32_3)
+        basinSegment(self.im8_1, self.im32_3, grid=SQUARE, labels32=True)
+        for hi in range(h):
+            self.assertEqual(self.im32_2.getPixel((0,hi)), 0x01000001)
+            self.assertEqual(self.im32_2.getPixel((w//2,hi)), 0)
+            self.assertEqual(self.im32_2.getPixel((w-1,hi)), 0x02000001)
+            self.assertEqual(self.im32_3.getPixel((0,hi)), 0x01000001)
+            self.assertEqual(self.im32_3.getPixel((w-1,hi)), 0x02000001)
+
+def getSuite():
+    return unittest.TestLoader().loadTestsFromTestCase(TestWatershedLabels32)
+
+if __name__ == '__main__':
+    unittest.main()
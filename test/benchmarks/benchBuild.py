@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+"""
+Benchmark of the reconstruction (build) algorithms.
+
+The script measures the build of mambaComposed with the hybrid method (raster
+scans and FIFO queue) and with the iterative method (builds by neighbors
+repeated until the image stops changing) on binary, 8-bit and 32-bit images.
+The mask is a thin serpentine path covering the whole image, which is the
+worst case of the iterative method. The hierarchical build of the 8-bit
+images is measured too.
+
+Usage:
+    python benchBuild.py <options>
+    options :
+        -h or --help displays this short description
+        -s <size> size of the images (default is 1024)
+        -n <count> number of repetitions of each build (default is 3)
+
+The mamba module must be importable (for instance after a "make prep" in
+the test directory).
+"""
+
+import sys
+import getopt
+import timeit
+
+from mamba import *
+from mambaComposed import build
+
+def serpentine(imOut, value):
+    """Draws a path going through every fourth line of 'imOut'"""
+    (w,h) = imOut.getSize()
+    imOut.reset()
+    for y in range(0, h, 4):
+        for x in range(w):
+            imOut.setPixel(value, (x,y))
+        for yy in range(y, min(y+4, h)):
+            imOut.setPixel(value, (w-1 if (y//4)%2==0 else 0, yy))
+
+def measure(size, number):
+    """Measures the builds and prints one line per depth"""
+    print("Build along a serpentine path in %dx%d images (ms per call)" % (size, size))
+    print("%-8s%12s%12s%12s   speed-up" % ("depth", "hybrid", "iterative", "hierar"))
+    for depth, value in ((1, 1), (8, 200), (32, 200)):
+        imMask = imageMb(size, size, depth)
+        imMarker = imageMb(size, size, depth)
+        imWrk = imageMb(size, size, depth)
+        serpentine(imMask, value)
+        imMarker.setPixel(value, (0,0))
+        times = []
+        for method in ('hybrid', 'iterative'):
+            def run():
+                copy(imMarker, imWrk)
+                build(imMask, imWrk, grid=SQUARE, method=method)
+            times.append(timeit.timeit(run, number=number)/number*1000.0)
+        if depth==8:
+            def run():
+                copy(imMarker, imWrk)
+                hierarBuild(imMask, imWrk, grid=SQUARE)
+            hierar = "%12.2f" % (timeit.timeit(run, number=number)/number*1000.0)
+        else:
+            hierar = "%12s" % "-"
+        print("%-8d%12.2f%12.2f%s   x%.2f" % (depth, times[0], times[1], hierar, times[1]/times[0]))
+
+if __name__ == '__main__':
+    try:
+        opts, args = getopt.getopt(sys.argv[1:], "hs:n:", ["help"])
+    except getopt.GetoptError as err:
+        print(str(err))
+        print(__doc__)
+        sys.exit(2)
+    size = 1024
+    number = 3
+    for o, a in opts:
+        if o in ("-h", "--help"):
+            print(__doc__)
+            sys.exit(0)
+        elif o == "-s":
+            size = int(a)
+        elif o == "-n":
+            number = int(a)
+
+    measure(size, number)
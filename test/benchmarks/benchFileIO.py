@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""
+Benchmark of the image files read and written by the library.
+
+The script measures the loading and the saving of PGM and uncompressed TIFF
+files (8-bit and 16-bit) by the library and compares them with the same
+operations done through PIL (the path used for the other file formats). The
+MBI files of the library (8-bit and 32-bit images) are compared with PNG
+files written and read through PIL. Binary images are saved and loaded in PBM
+files with their packed pixels, PIL going through 8-bit images.
+
+Usage:
+    python benchFileIO.py <options>
+    options :
+        -h or --help displays this short description
+        -s <size> size of the images (default is 4096)
+        -n <count> number of repetitions of each operation (default is 5)
+
+The mamba module must be importable (for instance after a "make prep" in
+the test directory).
+"""
+
+import sys
+import os
+import getopt
+import random
+import shutil
+import struct
+import tempfile
+import timeit
+
+from mamba import *
+import mambaUtils
+try:
+    import Image
+except ImportError:
+    from PIL import Image
+
+def _pilLoad(path):
+    return mambaUtils.loadFromPILFormat(Image.open(path))
+
+def _pilSave(im, path):
+    mambaUtils.convertToPILFormat(im.mbIm).save(path)
+
+def prepare(directory, size):
+    """Writes the files used by the benchmark and returns their paths"""
+    im = imageMb(size, size, 8)
+    random.seed(0)
+    for i in range(10000):
+        im.setPixel(random.randint(0, 255), (random.randrange(size), random.randrange(size)))
+    paths = {}
+    for ext in ('pgm', 'tif', 'mbi', 'png'):
+        paths[ext] = os.path.join(directory, 'image8.'+ext)
+        im.save(paths[ext])
+    # 16-bit PGM file written by hand (the values are big endian)
+    paths['pgm16'] = os.path.join(directory, 'image16.pgm')
+    f = open(paths['pgm16'], 'wb')
+    f.write(('P5\n%d %d\n65535\n' % (size, size)).encode())
+    line = struct.pack('>%dH' % size, *[random.randint(0, 65535) for i in range(size)])
+    for i in range(size):
+        f.write(line)
+    f.close()
+    # binary image and 32-bit image of labels
+    im1 = imageMb(size, size, 1)
+    threshold(im, im1, 1, 255)
+    paths['pbm'] = os.path.join(directory, 'image1.pbm')
+    im1.save(paths['pbm'])
+    im32 = imageMb(size, size, 32)
+    label(im1, im32)
+    return im, im1, im32, paths
+
+def measure(size, number):
+    """Measures the operations and prints one line per operation"""
+    directory = tempfile.mkdtemp()
+    try:
+        im, im1, im32, paths = prepare(directory, size)
+        out = os.path.join(directory, 'out')
+        operations = [
+            ('load pgm 8-bit', lambda: mambaUtils.load(paths['pgm']), lambda: _pilLoad(paths['pgm'])),
+            ('load tif 8-bit', lambda: mambaUtils.load(paths['tif']), lambda: _pilLoad(paths['tif'])),
+            ('load pgm 16-bit', lambda: mambaUtils.load(paths['pgm16']), lambda: _pilLoad(paths['pgm16'])),
+            ('save pgm 8-bit', lambda: im.save(out+'.pgm'), lambda: _pilSave(im, out+'.pgm')),
+            ('save tif 8-bit', lambda: im.save(out+'.tif'), lambda: _pilSave(im, out+'.tif')),
+            ('load pbm binary', lambda: mambaUtils.load(paths['pbm']), lambda: _pilLoad(paths['pbm'])),
+            ('save pbm binary', lambda: im1.save(out+'.pbm'), lambda: _pilSave(im1, out+'.pbm')),
+            ('load mbi/png 8', lambda: mambaUtils.load(paths['mbi']), lambda: _pilLoad(paths['png'])),
+            ('save mbi/png 8', lambda: im.save(out+'.mbi'), lambda: _pilSave(im, out+'.png')),
+            ('save mbi/png 32', lambda: im32.save(out+'.mbi'), lambda: _pilSave(im32, out+'.png')),
+        ]
+        print("Image files of %dx%d pixels (ms per call)" % (size, size))
+        print("%-18s%10s%10s   speed-up" % ("operation", "library", "PIL"))
+        for name, native, pil in operations:
+            tn = timeit.timeit(native, number=number)/number*1000.0
+            tp = timeit.timeit(pil, number=number)/number*1000.0
+            print("%-18s%10.2f%10.2f   x%.2f" % (name, tn, tp, tp/tn))
+    finally:
+        shutil.rmtree(directory)
+
+if __name__ == '__main__':
+    try:
+        opts, args = getopt.getopt(sys.argv[1:], "hs:n:", ["help"])
+    except getopt.GetoptError as err:
+        print(str(err))
+        print(__doc__)
+        sys.exit(2)
+    size = 4096
+    number = 5
+    for o, a in opts:
+        if o in ("-h", "--help"):
+            print(__doc__)
+            sys.exit(0)
+        elif o == "-s":
+            size = int(a)
+        elif o == "-n":
+            number = int(a)
+
+    measure(size, number)
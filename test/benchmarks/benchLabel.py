@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+"""
+Benchmark of the labelling of binary images and of the flat zones of
+greyscale and 32-bit images.
+
+The script measures the labelling of random binary images of increasing
+density (the densities around 0.5 give the longest chains of equivalences
+between the labels), of a comb whose teeth are only joined by the last line,
+and of random greyscale and 32-bit images with a few values. The computation
+is measured with one thread and with all the threads.
+
+Usage:
+    python benchLabel.py <options>
+    options :
+        -h or --help displays this short description
+        -s <size> size of the images (default is 1024)
+        -n <count> number of repetitions of each labelling (default is 3)
+
+The mamba module must be importable (for instance after a "make prep" in
+the test directory).
+"""
+
+import sys
+import getopt
+import timeit
+import random
+
+from mamba import *
+
+def randomSet(imOut, density):
+    """Sets the pixels of binary image 'imOut' with probability 'density'"""
+    (w,h) = imOut.getSize()
+    imOut.reset()
+    for y in range(h):
+        for x in range(w):
+            if random.random()<density:
+                imOut.fastSetPixel(1, (x,y))
+
+def comb(imOut):
+    """Draws a comb in binary image 'imOut'"""
+    (w,h) = imOut.getSize()
+    imOut.reset()
+    for x in range(0, w, 2):
+        for y in range(h):
+            imOut.fastSetPixel(1, (x,y))
+    for x in range(w):
+        imOut.fastSetPixel(1, (x,h-1))
+
+def randomValues(imOut, count):
+    """Fills 'imOut' with 'count' random values"""
+    (w,h) = imOut.getSize()
+    values = [random.randint(0, 255 if imOut.getDepth()==8 else 0xffffffff)
+              for i in range(count)]
+    for y in range(h):
+        for x in range(w):
+            imOut.fastSetPixel(random.choice(values), (x,y))
+
+def measure(size, number):
+    """Measures the labellings and prints one line per image"""
+    print("Labelling of %dx%d images (ms per call)" % (size, size))
+    threads = getThreadCount()
+    print("%-12s%12s%12s%12s%12s" % ("image", "square", "hexagonal",
+                                     "square", "hexagonal"))
+    print("%-12s%24s%24s" % ("", "1 thread", "%d threads" % threads))
+    imOut = imageMb(size, size, 32)
+    images = []
+    for density in (0.2, 0.5, 0.8):
+        imIn = imageMb(size, size, 1)
+        randomSet(imIn, density)
+        images.append(("binary %.1f" % density, imIn))
+    imIn = imageMb(size, size, 1)
+    comb(imIn)
+    images.append(("comb", imIn))
+    for depth in (8, 32):
+        imIn = imageMb(size, size, depth)
+        randomValues(imIn, 3)
+        images.append(("%d-bit" % depth, imIn))
+    for name, imIn in images:
+        times = []
+        for nb in (1, threads):
+            setThreadCount(nb)
+            for grid in (SQUARE, HEXAGONAL):
+                def run():
+                    label(imIn, imOut, grid=grid)
+                times.append(timeit.timeit(run, number=number)/number*1000.0)
+        setThreadCount(threads)
+        print("%-12s%12.2f%12.2f%12.2f%12.2f" % ((name,)+tuple(times)))
+
+if __name__ == '__main__':
+    try:
+        opts, args = getopt.getopt(sys.argv[1:], "hs:n:", ["help"])
+    except getopt.GetoptError as err:
+        print(str(err))
+        print(__doc__)
+        sys.exit(2)
+    size = 1024
+    number = 3
+    for o, a in opts:
+        if o in ("-h", "--help"):
+            print(__doc__)
+            sys.exit(0)
+        elif o == "-s":
+            size = int(a)
+        elif o == "-n":
+            number = int(a)
+
+    measure(size, number)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+"""
+Benchmark of the 32-bit neighbor, vector and build operators.
+
+The script measures the operators with each SIMD instruction set supported
+by the processor and compares them with the scalar computations. The SIMD
+level is selected with the MAMBA_SIMD_LEVEL environment variable which is
+read when the library is loaded, so every level is measured in a separate
+process.
+
+Usage:
+    python benchSimd32.py <options>
+    options :
+        -h or --help displays this short description
+        -s <size> size of the images (default is 2048)
+        -n <count> number of repetitions of each operator (default is 10)
+
+The mamba module must be importable (for instance after a "make prep" in
+the test directory).
+"""
+
+import sys
+import os
+import getopt
+import subprocess
+import timeit
+
+LEVELS = ['none', 'sse41', 'avx2']
+
+OPERATORS = [
+    ('infNeighbor', 'infNeighbor(im1, im2, 1, 1, grid=SQUARE)'),
+    ('supNeighbor', 'supNeighbor(im1, im2, 3, 1, grid=HEXAGONAL)'),
+    ('infFarNeighbor', 'infFarNeighbor(im1, im2, 1, 5, grid=SQUARE)'),
+    ('supVector', 'supVector(im1, im2, (7, 3))'),
+    ('shift', 'shift(im1, im2, 1, 5, 0, grid=SQUARE)'),
+    ('buildNeighbor', 'buildNeighbor(im1, im2, 2, grid=SQUARE)'),
+    ('dualBuildNeighbor', 'dualbuildNeighbor(im1, im2, 2, grid=SQUARE)'),
+]
+
+def measure(size, number):
+    """Measures the operators in the current process (one line per operator)"""
+    import random
+    setup = "\n".join([
+        "from mamba import *",
+        "im1 = imageMb(%d, %d, 32)" % (size, size),
+        "im2 = imageMb(%d, %d, 32)" % (size, size),
+        "random.seed(0)",
+        "for i in range(1000):",
+        "    im1.setPixel(random.randint(0, 100000), (random.randrange(%d), random.randrange(%d)))" % (size, size),
+        "copy(im1, im2)",
+    ])
+    for name, stmt in OPERATORS:
+        t = timeit.timeit(stmt, setup=setup, number=number, globals={'random': random})
+        print("%s %f" % (name, t/number))
+
+def run(level, size, number):
+    """Runs the measure in a child process with the given SIMD level"""
+    env = dict(os.environ)
+    env['MAMBA_SIMD_LEVEL'] = level
+    out = subprocess.check_output([sys.executable, __file__, '--child',
+                                   '-s', str(size), '-n', str(number)],
+                                  env=env, universal_newlines=True)
+    result = {}
+    for line in out.splitlines():
+        name, t = line.split()
+        result[name] = float(t)
+    return result
+
+if __name__ == '__main__':
+    try:
+        opts, args = getopt.getopt(sys.argv[1:], "hs:n:", ["help", "child"])
+    except getopt.GetoptError as err:
+        print(str(err))
+        print(__doc__)
+        sys.exit(2)
+    size = 2048
+    number = 10
+    child = False
+    for o, a in opts:
+        if o in ("-h", "--help"):
+            print(__doc__)
+            sys.exit(0)
+        elif o == "-s":
+            size = int(a)
+        elif o == "-n":
+            number = int(a)
+        elif o == "--child":
+            child = True
+
+    if child:
+        measure(size, number)
+        sys.exit(0)
+
+    results = [run(level, size, number) for level in LEVELS]
+    print("32-bit operators on %dx%d images (ms per call)" % (size, size))
+    print("%-18s" % "operator" + "".join(["%10s" % l for l in LEVELS]) + "   speed-up")
+    for name, stmt in OPERATORS:
+        times = [r[name]*1000.0 for r in results]
+        print("%-18s" % name + "".join(["%10.2f" % t for t in times]) +
+              "   x%.2f" % (times[0]/min(times)))
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+"""
+Benchmark of the watershed segmentation of 32-bit images.
+
+The script measures the watershed and basin segmentations of random 32-bit
+images whose values cover ranges of increasing size, and of an 8-bit image
+for reference. The 32-bit images are flooded directly, thus the computation
+time must not grow with the range of the values. The segmentations with the
+labels on 32 bits are measured too, they must not be slower.
+
+Usage:
+    python benchWatershed.py <options>
+    options :
+        -h or --help displays this short description
+        -s <size> size of the images (default is 1024)
+        -n <count> number of repetitions of each segmentation (default is 3)
+
+The mamba module must be importable (for instance after a "make prep" in
+the test directory).
+"""
+
+import sys
+import getopt
+import timeit
+import random
+
+from mamba import *
+
+def relief(imOut, maxv):
+    """Fills 'imOut' with random values between 0 and 'maxv'"""
+    (w,h) = imOut.getSize()
+    for y in range(h):
+        for x in range(w):
+            imOut.fastSetPixel(random.randint(0, maxv), (x,y))
+
+def wells(imOut, count):
+    """Puts 'count' wells with distinct labels in 'imOut'"""
+    (w,h) = imOut.getSize()
+    imOut.reset()
+    for i in range(count):
+        imOut.setPixel(i+1, (random.randint(0,w-1), random.randint(0,h-1)))
+
+def measure(size, number):
+    """Measures the segmentations and prints one line per range"""
+    print("Segmentation of %dx%d images (ms per call)" % (size, size))
+    print("%-8s%12s%12s%12s%12s%12s" % ("depth", "range", "watershed", "basins",
+                                        "wts lab32", "bas lab32"))
+    imMarker = imageMb(size, size, 32)
+    imWrk = imageMb(size, size, 32)
+    wells(imMarker, 1000)
+    for depth, maxv in ((8, 255), (32, 255), (32, 65535), (32, 0xffffff), (32, 0xffffffff)):
+        imIn = imageMb(size, size, depth)
+        relief(imIn, maxv)
+        times = []
+        for labels32 in (False, True):
+            for f in (watershedSegment, basinSegment):
+                def run():
+                    copy(imMarker, imWrk)
+                    f(imIn, imWrk, grid=SQUARE, labels32=labels32)
+                times.append(timeit.timeit(run, number=number)/number*1000.0)
+        print("%-8d%12d%12.2f%12.2f%12.2f%12.2f" % ((depth, maxv)+tuple(times)))
+
+if __name__ == '__main__':
+    try:
+        opts, args = getopt.getopt(sys.argv[1:], "hs:n:", ["help"])
+    except getopt.GetoptError as err:
+        print(str(err))
+        print(__doc__)
+        sys.exit(2)
+    size = 1024
+    number = 3
+    for o, a in opts:
+        if o in ("-h", "--help"):
+            print(__doc__)
+            sys.exit(0)
+        elif o == "-s":
+            size = int(a)
+        elif o == "-n":
+            number = int(a)
+
+    measure(size, number)